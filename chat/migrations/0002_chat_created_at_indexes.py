@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groupchat',
+            index=models.Index(fields=['group', 'created_at'], name='chat_group_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='khatmachat',
+            index=models.Index(fields=['khatma', 'created_at'], name='chat_khatma_created_idx'),
+        ),
+    ]
@@ -19,6 +19,7 @@ class KhatmaChat(models.Model):
         '''"""Class representing Meta."""'''
         ordering = ['created_at']
         verbose_name = _('Khatma Chat Message')
+        indexes = [models.Index(fields=['khatma', 'created_at'], name='chat_khatma_created_idx')]
         verbose_name_plural = _('Khatma Chat Messages')
 
     def __str__(self):
@@ -41,6 +42,7 @@ class GroupChat(models.Model):
         '''"""Class representing Meta."""'''
         ordering = ['created_at']
         verbose_name = _('Group Chat Message')
+        indexes = [models.Index(fields=['group', 'created_at'], name='chat_group_created_idx')]
         verbose_name_plural = _('Group Chat Messages')
 
     def __str__(self):
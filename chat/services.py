@@ -1 +1,83 @@
-"""Business logic for chat app."""
\ No newline at end of file
+"""Business logic for chat app."""
+import logging
+
+from django.urls import reverse
+
+from core.utils.pagination import decode_cursor, encode_cursor, newer_than, older_than
+
+logger = logging.getLogger(__name__)
+
+CHAT_PAGE_SIZE = 50
+MAX_CHAT_PAGE_SIZE = 200
+
+
+def get_chat_page(queryset, since=None, before=None, limit=CHAT_PAGE_SIZE):
+    """
+    Return one page of chat messages using keyset pagination on (created_at, id).
+
+    Without cursors the latest page is returned. ``since`` returns the messages
+    posted after a cursor (for polling) and ``before`` the page preceding a
+    cursor (for loading history). Messages are always in chronological order.
+
+    Args:
+        queryset: KhatmaChat or GroupChat queryset of one conversation
+        since: Optional cursor; only newer messages are returned
+        before: Optional cursor; only older messages are returned
+        limit: Maximum number of messages
+
+    Returns:
+        dict: {'messages': list, 'has_more': bool, 'older_cursor': str or None, 'latest_cursor': str or None}
+            ``older_cursor`` is set when older history remains; with ``since``,
+            ``has_more`` means more new messages are waiting.
+    """
+    queryset = queryset.select_related('user')
+    limit = max(1, min(limit, MAX_CHAT_PAGE_SIZE))
+    if since:
+        rows = list(newer_than(queryset, since).order_by('created_at', 'id')[:limit + 1])
+        has_more = len(rows) > limit
+        messages = rows[:limit]
+    else:
+        if before:
+            queryset = older_than(queryset, before)
+        rows = list(queryset.order_by('-created_at', '-id')[:limit + 1])
+        has_more = len(rows) > limit
+        messages = rows[:limit][::-1]
+
+    older_cursor = encode_cursor(messages[0]) if messages and has_more and not since else None
+    latest_cursor = encode_cursor(messages[-1]) if messages else since
+    return {'messages': messages, 'has_more': has_more, 'older_cursor': older_cursor, 'latest_cursor': latest_cursor}
+
+
+def serialize_message(message, user, pin_url_name=None, delete_url_name=None, can_pin=False, can_moderate=False):
+    """
+    Convert a chat message into a JSON-serializable dict.
+
+    Args:
+        message: KhatmaChat or GroupChat instance with ``user`` loaded
+        user: The requesting user
+        pin_url_name, delete_url_name: URL names of the pin and delete views
+        can_pin: Whether the user may pin messages
+        can_moderate: Whether the user may delete other users' messages
+
+    Returns:
+        dict: Message data
+    """
+    conversation_id = message.khatma_id if hasattr(message, 'khatma_id') else message.group_id
+    data = {
+        'id': message.pk,
+        'user': message.user.username,
+        'is_mine': message.user_id == user.pk,
+        'message': message.message,
+        'message_type': message.message_type,
+        'image': message.image.url if message.image else None,
+        'audio': message.audio.url if message.audio else None,
+        'is_pinned': message.is_pinned,
+        'created_at': message.created_at.isoformat(),
+        'pin_url': None,
+        'delete_url': None,
+    }
+    if can_pin and pin_url_name:
+        data['pin_url'] = reverse(pin_url_name, args=[conversation_id, message.pk])
+    if (can_moderate or data['is_mine']) and delete_url_name:
+        data['delete_url'] = reverse(delete_url_name, args=[conversation_id, message.pk])
+    return data
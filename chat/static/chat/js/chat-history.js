@@ -0,0 +1,165 @@
+/*
+ * Incremental chat history.
+ *
+ * The chat page renders only the latest page of messages. This script polls the
+ * messages API with the `since` cursor to append new messages and uses the
+ * `before` cursor to load older history on demand.
+ */
+(function () {
+    'use strict';
+
+    const container = document.getElementById('chat-messages');
+    if (!container || !container.dataset.messagesUrl) {
+        return;
+    }
+
+    const url = container.dataset.messagesUrl;
+    const pollInterval = parseInt(container.dataset.pollInterval || '10000', 10);
+    const pinnedLabel = container.dataset.pinnedLabel || 'Pinned';
+    const confirmDelete = container.dataset.confirmDelete || '';
+    const olderButton = document.getElementById('chat-load-older');
+    let latestCursor = container.dataset.latestCursor || '';
+    let olderCursor = container.dataset.olderCursor || '';
+
+    function fetchPage(params) {
+        return fetch(url + '?' + new URLSearchParams(params).toString(), {
+            credentials: 'same-origin',
+            headers: {'X-Requested-With': 'XMLHttpRequest'}
+        }).then(function (response) {
+            if (!response.ok) {
+                throw new Error('HTTP ' + response.status);
+            }
+            return response.json();
+        });
+    }
+
+    function element(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) {
+            node.className = className;
+        }
+        if (text) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    function actionLink(href, className, icon, confirmText) {
+        const link = element('a', 'btn btn-sm ' + className);
+        link.href = href;
+        link.appendChild(element('i', 'bi ' + icon));
+        if (confirmText) {
+            link.addEventListener('click', function (event) {
+                if (!window.confirm(confirmText)) {
+                    event.preventDefault();
+                }
+            });
+        }
+        return link;
+    }
+
+    function renderMessage(data) {
+        const message = element('div', 'message' + (data.is_mine ? ' message-mine' : '') + (data.is_pinned ? ' message-pinned' : ''));
+        const header = element('div', 'message-header');
+        header.appendChild(element('strong', '', data.user));
+        header.appendChild(document.createTextNode(' '));
+        header.appendChild(element('small', 'text-muted', new Date(data.created_at).toLocaleString()));
+        if (data.is_pinned) {
+            const badge = element('span', 'badge bg-warning text-dark', ' ' + pinnedLabel);
+            badge.prepend(element('i', 'bi bi-pin-fill'));
+            header.appendChild(badge);
+        }
+        const actions = element('div', 'message-actions');
+        if (data.pin_url) {
+            actions.appendChild(actionLink(data.pin_url, 'btn-outline-warning', data.is_pinned ? 'bi-pin-fill' : 'bi-pin'));
+        }
+        if (data.delete_url) {
+            actions.appendChild(actionLink(data.delete_url, 'btn-outline-danger', 'bi-trash', confirmDelete));
+        }
+        header.appendChild(actions);
+        message.appendChild(header);
+
+        const content = element('div', 'message-content');
+        if (data.message) {
+            const text = element('p', data.message_type === 'system' ? 'text-muted' : '');
+            text.style.whiteSpace = 'pre-line';
+            text.textContent = data.message;
+            content.appendChild(text);
+        }
+        if (data.image) {
+            const image = element('img', 'img-fluid rounded');
+            image.src = data.image;
+            image.alt = 'Shared image';
+            content.appendChild(image);
+        }
+        if (data.audio) {
+            const audio = element('audio', 'w-100');
+            audio.controls = true;
+            audio.src = data.audio;
+            content.appendChild(audio);
+        }
+        message.appendChild(content);
+        return message;
+    }
+
+    function removeEmptyState() {
+        const empty = document.getElementById('chat-empty');
+        if (empty) {
+            empty.remove();
+        }
+    }
+
+    function schedule(delay) {
+        window.setTimeout(poll, delay);
+    }
+
+    function poll() {
+        if (document.hidden) {
+            schedule(pollInterval);
+            return;
+        }
+        fetchPage(latestCursor ? {since: latestCursor} : {}).then(function (page) {
+            const atBottom = container.scrollHeight - container.scrollTop - container.clientHeight < 50;
+            if (page.messages.length) {
+                removeEmptyState();
+                page.messages.forEach(function (data) {
+                    container.appendChild(renderMessage(data));
+                });
+                if (atBottom) {
+                    container.scrollTop = container.scrollHeight;
+                }
+            }
+            latestCursor = page.latest_cursor || latestCursor;
+            schedule(page.has_more ? 0 : pollInterval);
+        }).catch(function () {
+            schedule(pollInterval * 3);
+        });
+    }
+
+    function loadOlder() {
+        if (!olderCursor) {
+            return;
+        }
+        olderButton.disabled = true;
+        fetchPage({before: olderCursor}).then(function (page) {
+            const previousHeight = container.scrollHeight;
+            const anchor = olderButton.nextSibling;
+            page.messages.forEach(function (data) {
+                container.insertBefore(renderMessage(data), anchor);
+            });
+            container.scrollTop += container.scrollHeight - previousHeight;
+            olderCursor = page.older_cursor || '';
+            olderButton.disabled = false;
+            if (!olderCursor) {
+                olderButton.remove();
+            }
+        }).catch(function () {
+            olderButton.disabled = false;
+        });
+    }
+
+    if (olderButton) {
+        olderButton.addEventListener('click', loadOlder);
+    }
+    schedule(pollInterval);
+}());
@@ -1,2 +1,113 @@
 """Service tests for chat app."""
-from django.test import TestCase
\ No newline at end of file
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from chat.models import GroupChat, KhatmaChat
+from chat.services import decode_cursor, get_chat_page
+from groups.models import GroupMembership, ReadingGroup
+from khatma.models import Khatma, Participant
+from notifications.models import Notification
+
+
+@override_settings(NOTIFICATION_DISPATCH_ASYNC=False)
+class ChatNotificationTest(TestCase):
+    """Tests for chat message notifications."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.sender = User.objects.create_user(username='sender', password='password')
+        self.khatma = Khatma.objects.create(title='ختمة', creator=self.sender)
+        Participant.objects.get_or_create(user=self.sender, khatma=self.khatma)
+        self.readers = User.objects.bulk_create([User(username=f'reader{index}') for index in range(5)])
+        Participant.objects.bulk_create([Participant(user=reader, khatma=self.khatma) for reader in self.readers])
+        Notification.objects.all().delete()
+        self.client.login(username='sender', password='password')
+
+    def test_khatma_chat_notifies_participants_once_per_burst(self):
+        url = reverse('chat:khatma_chat', args=[self.khatma.id])
+        for text in ('one', 'two', 'three'):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(url, {'message': text})
+            self.assertEqual(response.status_code, 302)
+        notifications = Notification.objects.filter(notification_type='khatma_chat')
+        self.assertEqual(notifications.count(), 5)
+        self.assertEqual(set(notifications.values_list('message', flat=True)), {'3 new messages in khatma ختمة'})
+        self.assertFalse(notifications.filter(user=self.sender).exists())
+
+
+class ChatHistoryTest(TestCase):
+    """Tests for cursor-paginated chat history."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', password='password')
+        self.khatma = Khatma.objects.create(title='ختمة', creator=self.user)
+        Participant.objects.get_or_create(user=self.user, khatma=self.khatma)
+        start = timezone.now() - timedelta(hours=1)
+        KhatmaChat.objects.bulk_create([KhatmaChat(khatma=self.khatma, user=self.user, message=f'message {index}') for index in range(12)])
+        for index, message in enumerate(KhatmaChat.objects.order_by('id')):
+            # Messages 4 and 5 share a timestamp to exercise the id tie-breaker.
+            KhatmaChat.objects.filter(pk=message.pk).update(created_at=start + timedelta(minutes=min(index, 4) if index < 6 else index))
+        self.queryset = KhatmaChat.objects.filter(khatma=self.khatma)
+        self.url = reverse('chat:khatma_chat_messages', args=[self.khatma.id])
+
+    def texts(self, messages):
+        return [message.message for message in messages]
+
+    def test_latest_page_and_older_pages(self):
+        with self.assertNumQueries(1):
+            page = get_chat_page(self.queryset, limit=5)
+            self.assertEqual(page['messages'][0].user.username, 'reader')
+        self.assertEqual(self.texts(page['messages']), [f'message {index}' for index in range(7, 12)])
+        self.assertTrue(page['has_more'])
+
+        page = get_chat_page(self.queryset, before=page['older_cursor'], limit=5)
+        self.assertEqual(self.texts(page['messages']), [f'message {index}' for index in range(2, 7)])
+        page = get_chat_page(self.queryset, before=page['older_cursor'], limit=5)
+        self.assertEqual(self.texts(page['messages']), ['message 0', 'message 1'])
+        self.assertFalse(page['has_more'])
+        self.assertIsNone(page['older_cursor'])
+
+    def test_since_returns_only_new_messages(self):
+        latest = get_chat_page(self.queryset)['latest_cursor']
+        self.assertEqual(get_chat_page(self.queryset, since=latest)['messages'], [])
+        KhatmaChat.objects.create(khatma=self.khatma, user=self.user, message='new')
+        page = get_chat_page(self.queryset, since=latest)
+        self.assertEqual(self.texts(page['messages']), ['new'])
+        self.assertEqual(decode_cursor(page['latest_cursor'])[1], page['messages'][0].pk)
+
+    def test_messages_endpoint(self):
+        self.client.login(username='reader', password='password')
+        data = self.client.get(self.url, {'limit': 5}).json()
+        self.assertEqual([message['message'] for message in data['messages']], [f'message {index}' for index in range(7, 12)])
+        self.assertTrue(data['messages'][0]['is_mine'])
+        self.assertIsNotNone(data['messages'][0]['delete_url'])
+
+        data = self.client.get(self.url, {'before': data['older_cursor'], 'limit': 5}).json()
+        self.assertEqual(data['messages'][-1]['message'], 'message 6')
+        self.assertEqual(self.client.get(self.url, {'since': 'not-a-cursor'}).status_code, 400)
+
+    def test_group_messages_endpoint_stays_within_its_query_budget(self):
+        # bulk_create: the groups post_save signal cannot create its chat room in this tree
+        group, = ReadingGroup.objects.bulk_create([ReadingGroup(name='مجموعة', creator=self.user)])
+        GroupMembership.objects.create(user=self.user, group=group, role='admin')
+        GroupChat.objects.bulk_create([GroupChat(group=group, user=self.user, message=f'message {index}') for index in range(12)])
+        self.client.login(username='reader', password='password')
+        data = self.client.get(reverse('chat:group_chat_messages', args=[group.id]), {'limit': 5}).json()
+        self.assertEqual([message['message'] for message in data['messages']], [f'message {index}' for index in range(7, 12)])
+        self.assertIsNotNone(data['messages'][0]['pin_url'])
+
+    def test_messages_endpoint_requires_participation(self):
+        User.objects.create_user(username='outsider', password='password')
+        self.client.login(username='outsider', password='password')
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_messages_endpoint_missing_khatma_or_group_is_404(self):
+        self.client.login(username='reader', password='password')
+        self.assertEqual(self.client.get(reverse('chat:khatma_chat_messages', args=[self.khatma.id + 100])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('chat:group_chat_messages', args=[999])).status_code, 404)
@@ -6,11 +6,13 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.utils.translation import gettext_lazy as _
 '\n'
+from core.utils.query_optimization import query_budget
 from khatma.models import Khatma, Participant
 from groups.models import ReadingGroup, GroupMembership
-from notifications.models import Notification
+from notifications.services import enqueue_notifications
 '\n'
 from .models import KhatmaChat, GroupChat
+from .services import CHAT_PAGE_SIZE, get_chat_page, serialize_message
 
 @login_required
 def khatma_chat(request, khatma_id):
@@ -29,14 +31,13 @@ def khatma_chat(request, khatma_id):
                 messages.error(request, _('Cannot send an empty message'))
                 return redirect('chat:khatma_chat', khatma_id=khatma.id)
             KhatmaChat.objects.create(khatma=khatma, user=request.user, message=message_text, message_type=message_type, image=image, audio=audio)
-            other_participants = Participant.objects.filter(khatma=khatma).exclude(user=request.user)
-            for participant in other_participants:
-                Notification.objects.create(user=participant.user, notification_type='comment', message=f'{request.user.username} sent a new message in khatma {khatma.title}', related_khatma=khatma, related_user=request.user)
+            recipient_ids = Participant.objects.filter(khatma=khatma).exclude(user=request.user).values_list('user_id', flat=True)
+            enqueue_notifications(recipient_ids, 'khatma_chat', f'{request.user.username} sent a new message in khatma {khatma.title}', coalesce_message=f'{{count}} new messages in khatma {khatma.title}', related_khatma_id=khatma.id, related_user_id=request.user.id)
             messages.success(request, _('Message sent successfully'))
             return redirect('chat:khatma_chat', khatma_id=khatma.id)
-        chat_messages = KhatmaChat.objects.filter(khatma=khatma).order_by('created_at')
+        page = get_chat_page(KhatmaChat.objects.filter(khatma=khatma))
         participants_count = Participant.objects.filter(khatma=khatma).count()
-        context = {'khatma': khatma, 'chat_messages': chat_messages, 'participants_count': participants_count}
+        context = {'khatma': khatma, 'chat_messages': page['messages'], 'older_cursor': page['older_cursor'], 'latest_cursor': page['latest_cursor'], 'participants_count': participants_count}
         return render(request, 'chat/khatma_chat.html', context)
     except Exception as e:
         logging.error('Error in khatma_chat: ' + str(e))
@@ -61,20 +62,66 @@ def group_chat(request, group_id):
                 messages.error(request, _('Cannot send an empty message'))
                 return redirect('chat:group_chat', group_id=group.id)
             GroupChat.objects.create(group=group, user=request.user, message=message_text, message_type=message_type, image=image, audio=audio)
-            other_members = GroupMembership.objects.filter(group=group).exclude(user=request.user)
-            for membership in other_members:
-                Notification.objects.create(user=membership.user, notification_type='group_chat', message=f'{request.user.username} sent a new message in group {group.name}', related_user=request.user)
+            recipient_ids = GroupMembership.objects.filter(group=group).exclude(user=request.user).values_list('user_id', flat=True)
+            enqueue_notifications(recipient_ids, 'group_chat', f'{request.user.username} sent a new message in group {group.name}', coalesce_message=f'{{count}} new messages in group {group.name}', related_group_id=group.id, related_user_id=request.user.id)
             messages.success(request, _('Message sent successfully'))
             return redirect('chat:group_chat', group_id=group.id)
-        chat_messages = GroupChat.objects.filter(group=group).order_by('created_at')
+        page = get_chat_page(GroupChat.objects.filter(group=group))
         members_count = group.members.count()
-        pinned_messages = GroupChat.objects.filter(group=group, is_pinned=True).order_by('-created_at')
-        context = {'group': group, 'chat_messages': chat_messages, 'members_count': members_count, 'pinned_messages': pinned_messages, 'user_role': user_role, 'is_admin': user_role == 'admin', 'is_moderator': user_role in ['admin', 'moderator']}
+        pinned_messages = GroupChat.objects.filter(group=group, is_pinned=True).select_related('user').order_by('-created_at')
+        context = {'group': group, 'chat_messages': page['messages'], 'older_cursor': page['older_cursor'], 'latest_cursor': page['latest_cursor'], 'members_count': members_count, 'pinned_messages': pinned_messages, 'user_role': user_role, 'is_admin': user_role == 'admin', 'is_moderator': user_role in ['admin', 'moderator']}
         return render(request, 'chat/group_chat.html', context)
     except Exception as e:
         logging.error('Error in group_chat: ' + str(e))
         return render(request, 'core/error.html', context={'error': e})
 
+def _chat_page_response(request, queryset, **serialize_options):
+    """Return a JSON page of chat messages for the since/before/limit query parameters."""
+    try:
+        limit = int(request.GET.get('limit', CHAT_PAGE_SIZE))
+    except ValueError:
+        limit = CHAT_PAGE_SIZE
+    try:
+        page = get_chat_page(queryset, since=request.GET.get('since'), before=request.GET.get('before'), limit=limit)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({
+        'messages': [serialize_message(message, request.user, **serialize_options) for message in page['messages']],
+        'has_more': page['has_more'],
+        'older_cursor': page['older_cursor'],
+        'latest_cursor': page['latest_cursor'],
+    })
+
+@query_budget(8)
+@login_required
+def khatma_chat_messages(request, khatma_id):
+    'JSON API returning a cursor-paginated page of khatma chat messages'
+    # A missing object is a 404, not a server error
+    khatma = get_object_or_404(Khatma, id=khatma_id)
+    try:
+        if not Participant.objects.filter(user=request.user, khatma=khatma).exists():
+            return JsonResponse({'error': 'forbidden'}, status=403)
+        is_creator = request.user.id == khatma.creator_id
+        return _chat_page_response(request, KhatmaChat.objects.filter(khatma=khatma), pin_url_name='chat:pin_khatma_message', delete_url_name='chat:delete_khatma_message', can_pin=is_creator, can_moderate=is_creator)
+    except Exception as e:
+        logging.error('Error in khatma_chat_messages: ' + str(e))
+        return JsonResponse({'error': 'server error'}, status=500)
+
+@query_budget(8)
+@login_required
+def group_chat_messages(request, group_id):
+    'JSON API returning a cursor-paginated page of group chat messages'
+    group = get_object_or_404(ReadingGroup, id=group_id)
+    try:
+        membership = GroupMembership.objects.filter(user=request.user, group=group).first()
+        if membership is None:
+            return JsonResponse({'error': 'forbidden'}, status=403)
+        is_moderator = membership.role in ['admin', 'moderator']
+        return _chat_page_response(request, GroupChat.objects.filter(group=group), pin_url_name='chat:pin_group_message', delete_url_name='chat:delete_group_message', can_pin=is_moderator, can_moderate=is_moderator)
+    except Exception as e:
+        logging.error('Error in group_chat_messages: ' + str(e))
+        return JsonResponse({'error': 'server error'}, status=500)
+
 @login_required
 def pin_khatma_message(request, khatma_id, message_id):
     try:
@@ -5,8 +5,9 @@ from django.contrib.auth.admin import UserAdmin
 '\n'
 from users.models import Profile
 from notifications.models import Notification
+from notifications.services import invalidate_unread_count
 '\n'
-from .models import Post, PostReaction
+from .models import Activity, Post, PostReaction, SiteStatistics
 admin.site.site_header = 'إدارة تطبيق ختمة'
 admin.site.site_title = 'لوحة تحكم ختمة'
 admin.site.index_title = 'مرحباً بك في لوحة تحكم تطبيق ختمة'
@@ -58,12 +59,16 @@ class NotificationAdmin(admin.ModelAdmin):
 
     def mark_as_read(self, request, queryset):
         '''"""Function to mark as read."""'''
+        user_ids = list(queryset.values_list('user_id', flat=True))
         queryset.update(is_read=True)
+        invalidate_unread_count(user_ids)
     mark_as_read.short_description = 'تحديد الإشعارات المحددة كمقروءة'
 
     def mark_as_unread(self, request, queryset):
         '''"""Function to mark as unread."""'''
+        user_ids = list(queryset.values_list('user_id', flat=True))
         queryset.update(is_read=False)
+        invalidate_unread_count(user_ids)
     mark_as_unread.short_description = 'تحديد الإشعارات المحددة كغير مقروءة'
 
 @admin.register(Post)
@@ -82,4 +87,29 @@ class PostReactionAdmin(admin.ModelAdmin):
     list_filter = ('reaction_type', 'created_at')
     search_fields = ('user__username', 'message')
     readonly_fields = ('created_at',)
-    date_hierarchy = 'created_at'
\ No newline at end of file
+    date_hierarchy = 'created_at'
+
+@admin.register(SiteStatistics)
+class SiteStatisticsAdmin(admin.ModelAdmin):
+    """Read-only view of the daily site statistics rollup"""
+    list_display = ('date',) + SiteStatistics.COUNTER_FIELDS
+    date_hierarchy = 'date'
+    readonly_fields = ('date',) + SiteStatistics.COUNTER_FIELDS + ('updated_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+@admin.register(Activity)
+class ActivityAdmin(admin.ModelAdmin):
+    """Read-only view of the append-only activity log"""
+    list_display = ('verb', 'actor', 'summary', 'part_number', 'is_public', 'created_at')
+    list_filter = ('verb', 'is_public')
+    list_select_related = ('actor',)
+    raw_id_fields = ('actor', 'khatma', 'group')
+    date_hierarchy = 'created_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -1,37 +1,61 @@
 '''"""This module contains Module functionality."""'''
-from datetime import timedelta
-'\n'
 from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
 from django.template.response import TemplateResponse
-from django.contrib.auth.models import User
-from django.db.models import Count, Q
-from django.utils import timezone
 '\n'
-from khatma.models import Khatma, Deceased, PartAssignment
-from groups.models import ReadingGroup
-from notifications.models import Notification
+from core.instrumentation import flush_metrics, get_view_metrics
+from core.services import count_active_khatmas, get_site_statistics_series, get_site_timeline, get_site_totals
 
 @staff_member_required
 def admin_dashboard(request):
     """
     Custom admin dashboard view with statistics and recent activity.
+
+    Counters come from the daily SiteStatistics rollup instead of COUNT(*)
+    queries over the raw tables, and recent activity from the Activity log.
+    """
+    totals = get_site_totals()
+    series = get_site_statistics_series(days=30)
+    last_week = series[-7:]
+    recent_activities = [
+        {'activity_type': f'{activity.get_verb_display()}: {activity.summary}' + (f' (الجزء {activity.part_number})' if activity.part_number else ''),
+         'user': activity.actor.username if activity.actor else 'غير معروف',
+         'timestamp': activity.created_at,
+         'url': f'/admin/khatma/khatma/{activity.khatma_id}/change/' if activity.khatma_id else f'/admin/core/activity/{activity.pk}/change/'}
+        for activity in get_site_timeline(limit=10, public_only=False)['activities']
+    ]
+    context = {
+        'title': 'لوحة التحكم',
+        'user_count': totals['users_joined'],
+        'khatma_count': totals['khatmas_created'],
+        'deceased_count': totals['deceased_added'],
+        'group_count': totals['groups_created'],
+        'active_khatmas': count_active_khatmas(),
+        'recent_khatmas': sum(day['khatmas_created'] for day in series),
+        'recent_users': sum(day['users_joined'] for day in series),
+        'recent_completions': sum(day['parts_completed'] for day in last_week),
+        'daily_statistics': series,
+        'growth_charts': [
+            (title, field, max([day[field] for day in series] + [1]))
+            for title, field in (('مستخدمون جدد يومياً', 'users_joined'), ('ختمات جديدة يومياً', 'khatmas_created'), ('أجزاء مكتملة يومياً', 'parts_completed'))
+        ],
+        'recent_activities': recent_activities,
+    }
+    return TemplateResponse(request, 'admin/dashboard.html', context)
+
+@staff_member_required
+def view_metrics_api(request):
+    """
+    API view returning the per-view request metrics recorded by QueryBudgetMiddleware.
+
+    `days` (default 1) selects the period, `sort` the order (e.g. `-queries`,
+    `-db_time`, `-template_time`, `-duration`) and `over_budget=1` keeps only
+    views with requests over their query budget.
     """
-    user_count = User.objects.count()
-    khatma_count = Khatma.objects.count()
-    deceased_count = Deceased.objects.count()
-    group_count = ReadingGroup.objects.count()
-    active_khatmas = Khatma.objects.filter(is_completed=False).count()
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    recent_khatmas = Khatma.objects.filter(created_at__gte=thirty_days_ago).count()
-    recent_users = User.objects.filter(date_joined__gte=thirty_days_ago).count()
-    seven_days_ago = timezone.now() - timedelta(days=7)
-    recent_completions = PartAssignment.objects.filter(completed_at__gte=seven_days_ago, is_completed=True).count()
-    recent_activities = []
-    for khatma in Khatma.objects.filter(created_at__gte=thirty_days_ago).order_by('-created_at')[:10]:
-        recent_activities.append({'activity_type': f'إنشاء ختمة: {khatma.title}', 'user': khatma.creator.username, 'timestamp': khatma.created_at, 'url': f'/admin/khatma/khatma/{khatma.id}/change/'})
-    for assignment in PartAssignment.objects.filter(completed_at__gte=seven_days_ago, is_completed=True).order_by('-completed_at')[:10]:
-        recent_activities.append({'activity_type': f'إكمال جزء {assignment.part.part_number} في ختمة {assignment.khatma.title}', 'user': assignment.participant.username if assignment.participant else 'غير معروف', 'timestamp': assignment.completed_at, 'url': f'/admin/khatma/partassignment/{assignment.id}/change/'})
-    recent_activities.sort(key=lambda x: x['timestamp'], reverse=True)
-    recent_activities = recent_activities[:10]
-    context = {'title': 'لوحة التحكم', 'user_count': user_count, 'khatma_count': khatma_count, 'deceased_count': deceased_count, 'group_count': group_count, 'active_khatmas': active_khatmas, 'recent_khatmas': recent_khatmas, 'recent_users': recent_users, 'recent_completions': recent_completions, 'recent_activities': recent_activities}
-    return TemplateResponse(request, 'admin/dashboard.html', context)
\ No newline at end of file
+    try:
+        days = int(request.GET.get('days', 1))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'طلب غير صالح'}, status=400)
+    flush_metrics()
+    views = get_view_metrics(days=days, over_budget_only=request.GET.get('over_budget') == '1', order_by=request.GET.get('sort', '-queries'))
+    return JsonResponse({'status': 'success', 'days': days, 'views': views})
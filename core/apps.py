@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     '''"""Class representing CoreConfig."""'''
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'core'
\ No newline at end of file
+    name = 'core'
+
+    def ready(self):
+        '''"""Function to ready."""'''
+        import core.signals
@@ -0,0 +1,186 @@
+"""Latency and query count benchmarks of the hot views (``manage.py benchmark_views``).
+
+Each view is requested through the Django test client (the full middleware
+stack, without a network server) a number of times after a warm-up, logged in
+as a representative user. The number of queries comes from
+``core.instrumentation.collect`` and the latency from the wall clock, reported
+as percentiles. Results can be saved as a JSON baseline and later runs
+compared against it, flagging views whose query count grew or whose p95
+latency grew beyond a tolerance. Run it against data from ``seed_load``.
+"""
+import json
+import logging
+import math
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from groups.models import GroupMembership
+from khatma.models import Khatma, Participant
+
+from .instrumentation import collect
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_VIEWS = ('index', 'khatma_detail', 'khatma_list', 'community_leaderboard', 'search_quran', 'group_detail', 'notifications')
+DEFAULT_ITERATIONS = 20
+DEFAULT_WARMUP = 2
+DEFAULT_TOLERANCE = 0.2
+SEARCH_TEXT = 'الرحمن'
+
+
+def get_baseline_path():
+    """Return the path of the stored benchmark baseline."""
+    return getattr(settings, 'BENCHMARK_BASELINE', os.path.join(settings.BASE_DIR, 'benchmarks', 'baseline.json'))
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def pick_benchmark_user(username=None):
+    """
+    Choose the user the views are requested as.
+
+    Defaults to the user in the most khatmas, so the personal views render
+    realistic amounts of data.
+
+    Returns:
+        User or None
+    """
+    if username:
+        return User.objects.filter(username=username).first()
+    busiest = Participant.objects.values('user').annotate(khatmas=Count('id')).order_by('-khatmas').values_list('user', flat=True).first()
+    return User.objects.filter(pk=busiest).first() if busiest else User.objects.order_by('pk').first()
+
+
+def benchmark_urls(user):
+    """
+    Build the URL of each benchmarked view for a user.
+
+    The khatma is the user's most recent one and the group one of theirs, so
+    the views take their member code paths. Views without a suitable object
+    are left out.
+
+    Returns:
+        dict: URL per view name
+    """
+    urls = {
+        'index': reverse('core:index'),
+        'khatma_list': reverse('khatma:khatma_list'),
+        'community_leaderboard': reverse('core:community_leaderboard'),
+        'search_quran': f"{reverse('quran:search')}?search_text={SEARCH_TEXT}&search_type=text",
+        'notifications': reverse('core:notifications'),
+    }
+    khatma_id = Khatma.objects.filter(participant__user=user).order_by('-created_at').values_list('pk', flat=True).first() if user else None
+    if khatma_id:
+        urls['khatma_detail'] = reverse('khatma:khatma_detail', args=[khatma_id])
+    group_id = GroupMembership.objects.filter(user=user).values_list('group', flat=True).first() if user else None
+    if group_id:
+        urls['group_detail'] = reverse('groups:group_detail', args=[group_id])
+    return {name: urls[name] for name in BENCHMARK_VIEWS if name in urls}
+
+
+def _client(user):
+    host = next((host for host in settings.ALLOWED_HOSTS if host and '*' not in host and not host.startswith('.')), 'localhost')
+    client = Client(HTTP_HOST=host)
+    if user is not None:
+        client.force_login(user)
+    return client
+
+
+def run_benchmarks(user, views=None, iterations=DEFAULT_ITERATIONS, warmup=DEFAULT_WARMUP):
+    """
+    Time the views.
+
+    Args:
+        user: User to request the views as (None for anonymous)
+        views: Names of the views to run (defaults to all available)
+        iterations: Measured requests per view
+        warmup: Unmeasured requests per view first, to fill the caches
+
+    Returns:
+        dict: Per view the 'url', 'status', 'iterations', median and max
+            'queries', and the latency 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'
+    """
+    urls = benchmark_urls(user)
+    client = _client(user)
+    results = {}
+    # Keep the benchmark requests out of the sampled production view metrics
+    with override_settings(QUERY_METRICS_SAMPLE_RATE=0):
+        for name, url in urls.items():
+            if views and name not in views:
+                continue
+            for _ in range(warmup):
+                client.get(url, secure=True)
+            latencies, queries, status = [], [], None
+            for _ in range(iterations):
+                with collect() as metrics:
+                    start = time.perf_counter()
+                    response = client.get(url, secure=True)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                queries.append(metrics.queries)
+                status = response.status_code
+            results[name] = {
+                'url': url,
+                'status': status,
+                'iterations': iterations,
+                'queries': percentile(queries, 50),
+                'max_queries': max(queries, default=None),
+                'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+                'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+                'p99_ms': round(percentile(latencies, 99), 2) if latencies else None,
+                'max_ms': round(max(latencies), 2) if latencies else None,
+            }
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Find the views that regressed against a baseline.
+
+    A view regresses when it runs more queries than in the baseline, or when
+    its p95 latency grows by more than ``tolerance`` (a fraction).
+
+    Returns:
+        list: One dict per regression with 'view', 'metric', 'baseline' and 'current'
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if result['max_queries'] is not None and previous.get('max_queries') is not None and result['max_queries'] > previous['max_queries']:
+            regressions.append({'view': name, 'metric': 'max_queries', 'baseline': previous['max_queries'], 'current': result['max_queries']})
+        if result['p95_ms'] is not None and previous.get('p95_ms') and result['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append({'view': name, 'metric': 'p95_ms', 'baseline': previous['p95_ms'], 'current': result['p95_ms']})
+    return regressions
+
+
+def load_baseline(path=None):
+    """Read a stored baseline, or return an empty one."""
+    path = path or get_baseline_path()
+    try:
+        with open(path, encoding='utf-8') as baseline:
+            return json.load(baseline)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results, path=None):
+    """Store benchmark results as the baseline; returns its path."""
+    path = path or get_baseline_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as baseline:
+        json.dump(results, baseline, indent=2, sort_keys=True)
+    return path
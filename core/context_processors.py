@@ -1,16 +1,12 @@
 '''"""This module contains Module functionality."""'''
+try:
+    from notifications.services import get_unread_count
+except ImportError:
+    get_unread_count = None
 
 def unread_notifications(request):
     """Context processor to add unread notifications count to all templates"""
     unread_count = 0
-    if request.user.is_authenticated:
-        try:
-            from notifications.models import Notification
-            unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
-        except ImportError:
-            try:
-                from core.models import Notification
-                unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
-            except (ImportError, AttributeError):
-                pass
-    return {'unread_count': unread_count}
\ No newline at end of file
+    if get_unread_count is not None and request.user.is_authenticated:
+        unread_count = get_unread_count(request.user.pk)
+    return {'unread_count': unread_count}
@@ -0,0 +1,267 @@
+"""Per-view request instrumentation behind ``core.middleware.QueryBudgetMiddleware``.
+
+``collect`` measures a block of code: the number and duration of database
+queries (through ``connection.execute_wrapper``, so it works with
+``DEBUG = False``), template rendering time and cache hits and misses. The
+template and cache hooks are installed once per process by ``install`` and
+only count while a collection is active in the current context.
+
+Sampled requests are added to per-process aggregates keyed by resolved view
+name, which ``flush_metrics`` adds to the daily ``ViewMetrics`` rows every
+``QUERY_METRICS_FLUSH_INTERVAL`` seconds. ``query_budget_report`` and the
+staff metrics endpoint read those rows.
+"""
+import contextvars
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Max, Sum
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import ViewMetrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 0.05
+DEFAULT_FLUSH_INTERVAL = 60
+SORT_FIELDS = {
+    'queries': 'avg_queries', 'max_queries': 'max_queries', 'db_time': 'avg_db_ms', 'template_time': 'avg_template_ms',
+    'duration': 'avg_duration_ms', 'requests': 'requests', 'over_budget': 'over_budget',
+}
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+_MISSING = object()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode (tests) when a view runs more queries than its declared budget."""
+
+
+class RequestMetrics:
+    """Counters of one instrumented block of code."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.template_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        """Database execute wrapper counting the query and its duration."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+@contextmanager
+def collect():
+    """
+    Measure the queries, template rendering and cache use of a block.
+
+    Yields:
+        RequestMetrics: The counters, complete when the block exits
+    """
+    install()
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(metrics.record_query))
+            yield metrics
+    finally:
+        _current.reset(token)
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def install():
+    """Hook template rendering and the configured cache backends (once per process)."""
+    global _installed
+    if _installed:
+        return
+    with _install_lock:
+        if _installed:
+            return
+        from django.template.backends.django import Template
+        _wrap_template_render(Template)
+        for alias in settings.CACHES:
+            _wrap_cache_class(type(caches[alias]))
+        _installed = True
+
+
+def _wrap_template_render(cls):
+    original = cls.render
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return original(self, context, request)
+        # Templates rendered from inside another one (e.g. by a tag) are part of the outer time
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_time += time.perf_counter() - start
+
+    cls.render = render
+
+
+def _wrap_cache_class(cls):
+    if getattr(cls, '_metrics_wrapped', False):
+        return
+    original_get, original_get_many = cls.get, cls.get_many
+
+    def get(self, key, default=None, version=None):
+        value = original_get(self, key, _MISSING, version=version)
+        metrics = _current.get()
+        if metrics is not None:
+            if value is _MISSING:
+                metrics.cache_misses += 1
+            else:
+                metrics.cache_hits += 1
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        metrics = _current.get()
+        # Backends without a native get_many call get() for every key; count the keys once here
+        token = _current.set(None)
+        try:
+            found = original_get_many(self, keys, version=version)
+        finally:
+            _current.reset(token)
+        if metrics is not None:
+            metrics.cache_hits += len(found)
+            metrics.cache_misses += len(keys) - len(found)
+        return found
+
+    cls.get, cls.get_many = get, get_many
+    cls._metrics_wrapped = True
+
+
+class MetricsAggregator:
+    """Per-process sums of the sampled requests, flushed to ViewMetrics."""
+
+    FIELDS = ('requests', 'queries', 'db_time', 'template_time', 'duration', 'cache_hits', 'cache_misses', 'over_budget')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+        self._last_flush = time.monotonic()
+
+    def add(self, view_name, metrics, duration, budget=None):
+        """Add a sampled request of a view."""
+        over_budget = budget is not None and metrics.queries > budget
+        with self._lock:
+            row = self._views.setdefault(view_name, {**dict.fromkeys(self.FIELDS, 0), 'max_queries': 0, 'budget': None})
+            row['requests'] += 1
+            row['queries'] += metrics.queries
+            row['max_queries'] = max(row['max_queries'], metrics.queries)
+            row['db_time'] += metrics.db_time
+            row['template_time'] += metrics.template_time
+            row['duration'] += duration
+            row['cache_hits'] += metrics.cache_hits
+            row['cache_misses'] += metrics.cache_misses
+            row['over_budget'] += over_budget
+            row['budget'] = budget
+
+    def take(self):
+        """Return and clear the pending sums."""
+        with self._lock:
+            views, self._views = self._views, {}
+            self._last_flush = time.monotonic()
+        return views
+
+    def flush_due(self):
+        """Return whether the flush interval has passed."""
+        interval = getattr(settings, 'QUERY_METRICS_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+        return interval is not None and time.monotonic() - self._last_flush >= interval
+
+
+metrics_aggregator = MetricsAggregator()
+
+
+def flush_metrics():
+    """
+    Add this process's pending sums to the ViewMetrics row of each view for today.
+
+    Returns:
+        int: Number of views written
+    """
+    views = metrics_aggregator.take()
+    day = timezone.localdate()
+    for view_name, row in views.items():
+        increments = {field: F(field) + row[field] for field in MetricsAggregator.FIELDS}
+        updates = {**increments, 'max_queries': Greatest(F('max_queries'), row['max_queries']), 'budget': row['budget']}
+        try:
+            with transaction.atomic():
+                if not ViewMetrics.objects.filter(view_name=view_name, day=day).update(**updates):
+                    ViewMetrics.objects.create(view_name=view_name, day=day, max_queries=row['max_queries'], budget=row['budget'],
+                                               **{field: row[field] for field in MetricsAggregator.FIELDS})
+        except IntegrityError:
+            # Another process created today's row first
+            ViewMetrics.objects.filter(view_name=view_name, day=day).update(**updates)
+    return len(views)
+
+
+def get_view_metrics(days=1, over_budget_only=False, order_by='-queries'):
+    """
+    Summarize the recorded metrics per view.
+
+    Args:
+        days: Number of most recent days to include
+        over_budget_only: Only list views with requests over their budget
+        order_by: A SORT_FIELDS key, prefixed with '-' for descending order
+
+    Returns:
+        list: One dict per view with totals and per-request averages
+    """
+    since = timezone.localdate() - timedelta(days=max(days, 1) - 1)
+    rows = (
+        ViewMetrics.objects.filter(day__gte=since)
+        .values('view_name')
+        .annotate(
+            requests=Sum('requests'), queries=Sum('queries'), max_queries=Max('max_queries'), db_time=Sum('db_time'),
+            template_time=Sum('template_time'), duration=Sum('duration'), cache_hits=Sum('cache_hits'),
+            cache_misses=Sum('cache_misses'), over_budget=Sum('over_budget'), budget=Max('budget'),
+        )
+    )
+    if over_budget_only:
+        rows = rows.filter(over_budget__gt=0)
+    report = []
+    for row in rows:
+        requests = row['requests'] or 1
+        lookups = row['cache_hits'] + row['cache_misses']
+        report.append({
+            'view': row['view_name'],
+            'requests': row['requests'],
+            'avg_queries': round(row['queries'] / requests, 2),
+            'max_queries': row['max_queries'],
+            'budget': row['budget'],
+            'over_budget': row['over_budget'],
+            'avg_db_ms': round(row['db_time'] * 1000 / requests, 2),
+            'avg_template_ms': round(row['template_time'] * 1000 / requests, 2),
+            'avg_duration_ms': round(row['duration'] * 1000 / requests, 2),
+            'cache_hit_rate': round(row['cache_hits'] / lookups, 3) if lookups else None,
+        })
+    key = SORT_FIELDS.get(order_by.lstrip('-'), 'avg_queries')
+    report.sort(key=lambda row: row[key] or 0, reverse=order_by.startswith('-'))
+    return report
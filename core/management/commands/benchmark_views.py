@@ -0,0 +1,94 @@
+"""Management command to benchmark the hot views against a stored baseline."""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import (
+    BENCHMARK_VIEWS, DEFAULT_ITERATIONS, DEFAULT_TOLERANCE, DEFAULT_WARMUP, compare_to_baseline, get_baseline_path, load_baseline,
+    pick_benchmark_user, run_benchmarks, save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure query counts and latency percentiles of the hot views and compare them with the stored baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--view',
+            choices=BENCHMARK_VIEWS,
+            action='append',
+            help='View to benchmark. May be repeated; defaults to all views.',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=DEFAULT_ITERATIONS,
+            help='Measured requests per view.',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=DEFAULT_WARMUP,
+            help='Unmeasured requests per view before measuring.',
+        )
+        parser.add_argument(
+            '--user',
+            help='Username to request the views as; defaults to the user in the most khatmas.',
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Path of the baseline file (default: BENCHMARK_BASELINE setting or benchmarks/baseline.json).',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Store these results as the new baseline for the benchmarked views.',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help='Allowed p95 latency growth over the baseline, as a fraction (default: 0.2).',
+        )
+        parser.add_argument(
+            '--fail-on-regression',
+            action='store_true',
+            help='Exit with an error if any view regressed.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the results and regressions as JSON.',
+        )
+
+    def handle(self, *args, **options):
+        user = pick_benchmark_user(options['user'])
+        if options['user'] and user is None:
+            raise CommandError(f"User {options['user']} not found")
+        path = options['baseline'] or get_baseline_path()
+        baseline = load_baseline(path)
+
+        results = run_benchmarks(user, views=options['view'], iterations=options['iterations'], warmup=options['warmup'])
+        regressions = compare_to_baseline(results, baseline, tolerance=options['tolerance'])
+
+        if options['json']:
+            self.stdout.write(json.dumps({'results': results, 'regressions': regressions}, indent=2))
+        else:
+            self.stdout.write(f"Requests as {user.username if user else 'anonymous'}, {options['iterations']} iterations per view")
+            self.stdout.write(f"{'view':<24} {'status':>6} {'queries':>8} {'max':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'base p95':>9}")
+            for name, row in results.items():
+                previous = baseline.get(name, {}).get('p95_ms')
+                self.stdout.write(
+                    f"{name:<24} {row['status']:>6} {row['queries']:>8} {row['max_queries']:>5} {row['p50_ms']:>9} "
+                    f"{row['p95_ms']:>9} {row['p99_ms']:>9} {previous if previous is not None else '-':>9}"
+                )
+            for regression in regressions:
+                self.stdout.write(self.style.WARNING(
+                    f"{regression['view']}: {regression['metric']} {regression['current']} (baseline {regression['baseline']})"
+                ))
+
+        if options['save_baseline']:
+            save_baseline({**baseline, **results}, path)
+            self.stdout.write(self.style.SUCCESS(f'Baseline saved to {path}'))
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)} benchmark regression(s) against {path}')
@@ -0,0 +1,58 @@
+"""Management command to report the per-view request metrics."""
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.instrumentation import SORT_FIELDS, get_view_metrics
+
+
+class Command(BaseCommand):
+    help = 'Report query count, DB time, template time and cache hit rate per view from the sampled requests'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=1,
+            help='Number of most recent days to include (default: 1, i.e. today).',
+        )
+        parser.add_argument(
+            '--sort',
+            default='queries',
+            choices=sorted(SORT_FIELDS),
+            help='Sort the views by this average, highest first (default: queries).',
+        )
+        parser.add_argument(
+            '--over-budget',
+            action='store_true',
+            help='Only list views with requests over their query budget.',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=30,
+            help='Maximum number of views listed.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the report as JSON.',
+        )
+
+    def handle(self, *args, **options):
+        views = get_view_metrics(days=options['days'], over_budget_only=options['over_budget'], order_by=f"-{options['sort']}")
+        views = views[:options['limit']]
+        if options['json']:
+            self.stdout.write(json.dumps(views, indent=2))
+            return
+        if not views:
+            self.stdout.write('No sampled requests recorded for this period')
+            return
+        self.stdout.write(f"{'view':<45} {'requests':>8} {'queries':>8} {'max':>5} {'budget':>6} {'over':>5} "
+                          f"{'db ms':>8} {'tpl ms':>8} {'total ms':>9} {'cache':>6}")
+        for row in views:
+            hit_rate = f"{row['cache_hit_rate']:.0%}" if row['cache_hit_rate'] is not None else '-'
+            line = (f"{row['view'][:45]:<45} {row['requests']:>8} {row['avg_queries']:>8} {row['max_queries']:>5} "
+                    f"{row['budget'] if row['budget'] is not None else '-':>6} {row['over_budget']:>5} "
+                    f"{row['avg_db_ms']:>8} {row['avg_template_ms']:>8} {row['avg_duration_ms']:>9} {hit_rate:>6}")
+            self.stdout.write(self.style.WARNING(line) if row['over_budget'] else line)
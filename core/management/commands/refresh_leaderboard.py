@@ -0,0 +1,33 @@
+"""Management command to rebuild the materialized community leaderboard."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services import refresh_leaderboard, LEADERBOARD_BOARDS
+
+
+class Command(BaseCommand):
+    help = 'Recompute the community leaderboard rankings (run periodically, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--board',
+            choices=LEADERBOARD_BOARDS,
+            action='append',
+            help='Board to refresh. May be repeated; defaults to all boards.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of ranking rows inserted per query.',
+        )
+
+    def handle(self, *args, **options):
+        boards = options['board'] or LEADERBOARD_BOARDS
+        start = time.monotonic()
+        counts = refresh_leaderboard(boards=boards, batch_size=options['batch_size'])
+        elapsed = time.monotonic() - start
+        for board, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f'{board}: ranked {count} users'))
+        self.stdout.write(self.style.SUCCESS(f'Leaderboard refreshed in {elapsed:.2f}s'))
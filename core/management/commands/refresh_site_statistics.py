@@ -0,0 +1,36 @@
+"""Management command to rebuild the daily SiteStatistics rollup."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services import refresh_site_statistics
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily site statistics from the raw tables (run periodically, e.g. nightly from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=2,
+            help='Number of most recent days to recompute (default: 2, i.e. yesterday and today).',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Rebuild the statistics for the whole history.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of daily rows written per query.',
+        )
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        days = None if options['all'] else max(options['days'], 1)
+        count = refresh_site_statistics(days=days, batch_size=options['batch_size'])
+        elapsed = time.monotonic() - start
+        self.stdout.write(self.style.SUCCESS(f'Site statistics refreshed for {count} days in {elapsed:.2f}s'))
@@ -0,0 +1,71 @@
+"""Management command to fill the database with synthetic load data."""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.seeding import DEFAULT_VOLUMES, LoadSeeder, clear_seed_data, has_seed_data
+
+
+class Command(BaseCommand):
+    help = 'Create realistic volumes of users, groups, khatmas, readings, chat messages and notifications with bulk inserts (for benchmarks)'
+
+    def add_arguments(self, parser):
+        for volume, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(
+                f"--{volume.replace('_', '-')}",
+                type=int,
+                dest=volume,
+                help=f'Number of {volume.replace("_", " ")} (default: {default}, scaled by --scale).',
+            )
+        parser.add_argument(
+            '--scale',
+            type=float,
+            default=1.0,
+            help='Multiply the default users, groups and khatmas by this factor (e.g. 0.01 for a quick run).',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed, so runs are reproducible.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Maximum number of rows per INSERT.',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously seeded data first.',
+        )
+        parser.add_argument(
+            '--clear-only',
+            action='store_true',
+            help='Delete previously seeded data and stop.',
+        )
+
+    def handle(self, *args, **options):
+        if options['clear'] or options['clear_only']:
+            deleted = clear_seed_data()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} seeded rows'))
+            if options['clear_only']:
+                return
+        elif has_seed_data():
+            raise CommandError('Seeded data already exists; use --clear to replace it')
+
+        volumes = {}
+        for volume, default in DEFAULT_VOLUMES.items():
+            if options[volume] is not None:
+                volumes[volume] = options[volume]
+            elif volume in ('users', 'groups', 'khatmas'):
+                volumes[volume] = max(int(default * options['scale']), 1)
+
+        start = time.monotonic()
+        seeder = LoadSeeder(volumes=volumes, seed=options['seed'], batch_size=options['batch_size'], progress=self.stdout.write)
+        counts = seeder.run()
+        elapsed = time.monotonic() - start
+        for kind, count in counts.items():
+            self.stdout.write(f'{kind}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Load data seeded in {elapsed:.1f}s'))
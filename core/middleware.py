@@ -1,15 +1,19 @@
 '''"""This module contains Module functionality."""'''
 import traceback
 import logging
+import random
 import sys
 import json
+import time
 '\n'
 from django.shortcuts import render, redirect
-from django.http import HttpResponseServerError, JsonResponse, HttpResponseRedirect
+from django.http import Http404, HttpResponseServerError, JsonResponse, HttpResponseRedirect
 from django.db.utils import DatabaseError, IntegrityError, OperationalError
 from django.core.exceptions import ValidationError, PermissionDenied, ObjectDoesNotExist
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
+
+from core.instrumentation import DEFAULT_SAMPLE_RATE, QueryBudgetExceeded, collect, flush_metrics, metrics_aggregator
 logger = logging.getLogger(__name__)
 
 class ErrorHandlerMiddleware:
@@ -68,7 +72,7 @@ class ErrorHandlerMiddleware:
             return {'error_title': _('Validation Error'), 'error_message': _('The submitted data is invalid. Please check your inputs and try again.'), 'error_details': error_details, 'error_type': 'validation', 'status_code': 400}
         elif isinstance(exception, PermissionDenied):
             return {'error_title': _('Permission Denied'), 'error_message': _('You do not have permission to access this resource.'), 'error_details': str(exception), 'error_type': 'permission', 'status_code': 403}
-        elif isinstance(exception, ObjectDoesNotExist):
+        elif isinstance(exception, (ObjectDoesNotExist, Http404)):
             return {'error_title': _('Not Found'), 'error_message': _('The requested resource was not found.'), 'error_details': str(exception), 'error_type': 'not_found', 'status_code': 404}
         return {'error_title': _('Server Error'), 'error_message': _('An unexpected error occurred. Please try again later.'), 'error_details': str(exception), 'error_type': 'server', 'status_code': 500}
 
@@ -106,4 +110,48 @@ class PreventLeaderboardRedirectMiddleware:
             # Prevent the redirection
             return redirect('/')
 
-        return response
\ No newline at end of file
+        return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Record the queries, DB time, template time and cache use of sampled requests per view.
+
+    A fraction ``QUERY_METRICS_SAMPLE_RATE`` of the requests is measured (see
+    core.instrumentation) and added to the per-view metrics. Views declare a
+    query budget with ``core.utils.query_optimization.query_budget`` or in
+    ``QUERY_BUDGETS``; a sampled request over its budget is logged, and raises
+    QueryBudgetExceeded when ``QUERY_BUDGET_STRICT`` is set (under
+    ``manage.py test``) so the test making the request fails.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = getattr(settings, 'QUERY_METRICS_SAMPLE_RATE', DEFAULT_SAMPLE_RATE)
+        if rate <= 0 or random.random() >= rate:
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with collect() as metrics:
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        if match is None:
+            return response
+        view_name = match.view_name or match._func_path
+        budget = getattr(settings, 'QUERY_BUDGETS', {}).get(view_name, getattr(match.func, 'query_budget', None))
+        metrics_aggregator.add(view_name, metrics, duration, budget)
+        if budget is not None and metrics.queries > budget:
+            message = f'{view_name} ran {metrics.queries} queries, over its budget of {budget}'
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        if metrics_aggregator.flush_due():
+            try:
+                flush_metrics()
+            except DatabaseError as e:
+                logger.error(f"Error flushing view metrics: {str(e)}")
+        return response
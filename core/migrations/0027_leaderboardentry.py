@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_newslettersubscription_delete_newquranbookmark'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('readers', 'أكثر القراء نشاطاً'), ('creators', 'أكثر المنشئين نشاطاً')], max_length=20, verbose_name='اللوحة')),
+                ('rank', models.PositiveIntegerField(verbose_name='الترتيب')),
+                ('score', models.PositiveIntegerField(default=0, verbose_name='النقاط')),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='تاريخ التحديث')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL, verbose_name='المستخدم')),
+            ],
+            options={
+                'verbose_name': 'ترتيب لوحة الشرف',
+                'verbose_name_plural': 'ترتيبات لوحة الشرف',
+                'ordering': ['board', 'rank'],
+                'unique_together': {('board', 'user')},
+                'indexes': [models.Index(fields=['board', 'rank'], name='core_leaderboard_rank_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_leaderboardentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='التاريخ')),
+                ('users_joined', models.IntegerField(default=0, verbose_name='المستخدمون الجدد')),
+                ('khatmas_created', models.IntegerField(default=0, verbose_name='الختمات المنشأة')),
+                ('khatmas_completed', models.IntegerField(default=0, verbose_name='الختمات المكتملة')),
+                ('parts_completed', models.IntegerField(default=0, verbose_name='الأجزاء المكتملة')),
+                ('readings_started', models.IntegerField(default=0, verbose_name='القراءات')),
+                ('deceased_added', models.IntegerField(default=0, verbose_name='المتوفون المضافون')),
+                ('groups_created', models.IntegerField(default=0, verbose_name='المجموعات المنشأة')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+            ],
+            options={
+                'verbose_name': 'إحصائيات الموقع اليومية',
+                'verbose_name_plural': 'إحصائيات الموقع اليومية',
+                'ordering': ['-date'],
+            },
+        ),
+    ]
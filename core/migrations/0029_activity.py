@@ -0,0 +1,75 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+
+
+def backfill_activities(apps, schema_editor):
+    Activity = apps.get_model('core', 'Activity')
+    Khatma = apps.get_model('khatma', 'Khatma')
+    Participant = apps.get_model('khatma', 'Participant')
+    KhatmaPart = apps.get_model('khatma', 'KhatmaPart')
+
+    def rows():
+        for khatma in Khatma.objects.only('pk', 'creator_id', 'group_id', 'title', 'is_public', 'created_at').iterator():
+            yield Activity(actor_id=khatma.creator_id, verb='khatma_created', khatma_id=khatma.pk, group_id=khatma.group_id,
+                           summary=khatma.title[:255], is_public=khatma.is_public, created_at=khatma.created_at)
+        participants = Participant.objects.exclude(user_id=models.F('khatma__creator_id')).values_list(
+            'user_id', 'khatma_id', 'khatma__group_id', 'khatma__title', 'khatma__is_public', 'joined_at')
+        for user_id, khatma_id, group_id, title, is_public, joined_at in participants.iterator():
+            yield Activity(actor_id=user_id, verb='joined', khatma_id=khatma_id, group_id=group_id,
+                           summary=title[:255], is_public=is_public, created_at=joined_at)
+        parts = KhatmaPart.objects.filter(is_completed=True, completed_at__isnull=False).values_list(
+            'assigned_to_id', 'khatma_id', 'khatma__group_id', 'khatma__title', 'khatma__is_public', 'part_number', 'completed_at')
+        for user_id, khatma_id, group_id, title, is_public, part_number, completed_at in parts.iterator():
+            yield Activity(actor_id=user_id, verb='part_completed', khatma_id=khatma_id, group_id=group_id, part_number=part_number,
+                           summary=title[:255], is_public=is_public, created_at=completed_at)
+
+    batch = []
+    for activity in rows():
+        batch.append(activity)
+        if len(batch) >= 1000:
+            Activity.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Activity.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_sitestatistics'),
+        ('groups', '0003_groupmembership_is_active'),
+        ('khatma', '0003_khatmaevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Activity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('verb', models.CharField(choices=[('khatma_created', 'إنشاء ختمة'), ('part_completed', 'إكمال جزء'), ('joined', 'انضمام'), ('comment', 'تعليق'), ('reaction', 'تفاعل')], max_length=20, verbose_name='النشاط')),
+                ('part_number', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='رقم الجزء')),
+                ('summary', models.CharField(blank=True, max_length=255, verbose_name='الملخص')),
+                ('is_public', models.BooleanField(default=False, verbose_name='عام')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='التاريخ')),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activities', to=settings.AUTH_USER_MODEL, verbose_name='المستخدم')),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activities', to='groups.readinggroup', verbose_name='المجموعة')),
+                ('khatma', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='activities', to='khatma.khatma', verbose_name='الختمة')),
+            ],
+            options={
+                'verbose_name': 'نشاط',
+                'verbose_name_plural': 'النشاطات',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [
+                    models.Index(fields=['-created_at', '-id'], name='core_activity_site_idx'),
+                    models.Index(fields=['actor', '-created_at', '-id'], name='core_activity_actor_idx'),
+                    models.Index(fields=['group', '-created_at', '-id'], name='core_activity_group_idx'),
+                    models.Index(fields=['khatma', '-created_at', '-id'], name='core_activity_khatma_idx'),
+                    models.Index(fields=['is_public', '-created_at', '-id'], name='core_activity_public_idx'),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_activities, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_activity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViewMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view_name', models.CharField(max_length=200, verbose_name='الصفحة')),
+                ('day', models.DateField(verbose_name='اليوم')),
+                ('requests', models.PositiveIntegerField(default=0, verbose_name='الطلبات المرصودة')),
+                ('queries', models.PositiveBigIntegerField(default=0, verbose_name='الاستعلامات')),
+                ('max_queries', models.PositiveIntegerField(default=0, verbose_name='أقصى عدد استعلامات')),
+                ('budget', models.PositiveIntegerField(blank=True, null=True, verbose_name='حد الاستعلامات')),
+                ('over_budget', models.PositiveIntegerField(default=0, verbose_name='طلبات تجاوزت الحد')),
+                ('db_time', models.FloatField(default=0, verbose_name='زمن قاعدة البيانات (ثوان)')),
+                ('template_time', models.FloatField(default=0, verbose_name='زمن القوالب (ثوان)')),
+                ('duration', models.FloatField(default=0, verbose_name='زمن الاستجابة (ثوان)')),
+                ('cache_hits', models.PositiveBigIntegerField(default=0, verbose_name='إصابات الذاكرة المؤقتة')),
+                ('cache_misses', models.PositiveBigIntegerField(default=0, verbose_name='إخفاقات الذاكرة المؤقتة')),
+            ],
+            options={
+                'verbose_name': 'قياسات صفحة',
+                'verbose_name_plural': 'قياسات الصفحات',
+                'ordering': ['-day', 'view_name'],
+                'unique_together': {('view_name', 'day')},
+            },
+        ),
+    ]
@@ -56,4 +56,100 @@ class NewsletterSubscription(models.Model):
 
     def __str__(self):
         '''"""Function to   str  ."""'''
-        return self.email
\ No newline at end of file
+        return self.email
+
+class LeaderboardEntry(models.Model):
+    """Materialized community leaderboard ranking, rebuilt by core.services.refresh_leaderboard"""
+    BOARD_CHOICES = [('readers', 'أكثر القراء نشاطاً'), ('creators', 'أكثر المنشئين نشاطاً')]
+    board = models.CharField(max_length=20, choices=BOARD_CHOICES, verbose_name='اللوحة')
+    rank = models.PositiveIntegerField(verbose_name='الترتيب')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_entries', verbose_name='المستخدم')
+    score = models.PositiveIntegerField(default=0, verbose_name='النقاط')
+    refreshed_at = models.DateTimeField(default=timezone.now, verbose_name='تاريخ التحديث')
+
+    class Meta:
+        verbose_name = 'ترتيب لوحة الشرف'
+        verbose_name_plural = 'ترتيبات لوحة الشرف'
+        ordering = ['board', 'rank']
+        unique_together = ('board', 'user')
+        indexes = [models.Index(fields=['board', 'rank'], name='core_leaderboard_rank_idx')]
+
+    def __str__(self):
+        return f'{self.get_board_display()} #{self.rank} - {self.user.username}'
+
+class SiteStatistics(models.Model):
+    """Daily site activity counters, kept up to date by core.signals and core.services.refresh_site_statistics"""
+    COUNTER_FIELDS = ('users_joined', 'khatmas_created', 'khatmas_completed', 'parts_completed', 'readings_started', 'deceased_added', 'groups_created')
+    date = models.DateField(unique=True, verbose_name='التاريخ')
+    users_joined = models.IntegerField(default=0, verbose_name='المستخدمون الجدد')
+    khatmas_created = models.IntegerField(default=0, verbose_name='الختمات المنشأة')
+    khatmas_completed = models.IntegerField(default=0, verbose_name='الختمات المكتملة')
+    parts_completed = models.IntegerField(default=0, verbose_name='الأجزاء المكتملة')
+    readings_started = models.IntegerField(default=0, verbose_name='القراءات')
+    deceased_added = models.IntegerField(default=0, verbose_name='المتوفون المضافون')
+    groups_created = models.IntegerField(default=0, verbose_name='المجموعات المنشأة')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')
+
+    class Meta:
+        verbose_name = 'إحصائيات الموقع اليومية'
+        verbose_name_plural = 'إحصائيات الموقع اليومية'
+        ordering = ['-date']
+
+    def __str__(self):
+        return str(self.date)
+
+class Activity(models.Model):
+    """Append-only activity log behind the user, group and site timelines, written by core.signals"""
+    KHATMA_CREATED = 'khatma_created'
+    PART_COMPLETED = 'part_completed'
+    JOINED = 'joined'
+    COMMENT = 'comment'
+    REACTION = 'reaction'
+    VERB_CHOICES = [(KHATMA_CREATED, 'إنشاء ختمة'), (PART_COMPLETED, 'إكمال جزء'), (JOINED, 'انضمام'), (COMMENT, 'تعليق'), (REACTION, 'تفاعل')]
+    actor = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='activities', verbose_name='المستخدم')
+    verb = models.CharField(max_length=20, choices=VERB_CHOICES, verbose_name='النشاط')
+    khatma = models.ForeignKey('khatma.Khatma', on_delete=models.CASCADE, null=True, blank=True, related_name='activities', verbose_name='الختمة')
+    group = models.ForeignKey('groups.ReadingGroup', on_delete=models.CASCADE, null=True, blank=True, related_name='activities', verbose_name='المجموعة')
+    part_number = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name='رقم الجزء')
+    summary = models.CharField(max_length=255, blank=True, verbose_name='الملخص')
+    is_public = models.BooleanField(default=False, verbose_name='عام')
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='التاريخ')
+
+    class Meta:
+        verbose_name = 'نشاط'
+        verbose_name_plural = 'النشاطات'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='core_activity_site_idx'),
+            models.Index(fields=['actor', '-created_at', '-id'], name='core_activity_actor_idx'),
+            models.Index(fields=['group', '-created_at', '-id'], name='core_activity_group_idx'),
+            models.Index(fields=['khatma', '-created_at', '-id'], name='core_activity_khatma_idx'),
+            models.Index(fields=['is_public', '-created_at', '-id'], name='core_activity_public_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_verb_display()} - {self.summary}'
+
+class ViewMetrics(models.Model):
+    """Daily per-view sums of the requests sampled by core.middleware.QueryBudgetMiddleware"""
+    view_name = models.CharField(max_length=200, verbose_name='الصفحة')
+    day = models.DateField(verbose_name='اليوم')
+    requests = models.PositiveIntegerField(default=0, verbose_name='الطلبات المرصودة')
+    queries = models.PositiveBigIntegerField(default=0, verbose_name='الاستعلامات')
+    max_queries = models.PositiveIntegerField(default=0, verbose_name='أقصى عدد استعلامات')
+    budget = models.PositiveIntegerField(null=True, blank=True, verbose_name='حد الاستعلامات')
+    over_budget = models.PositiveIntegerField(default=0, verbose_name='طلبات تجاوزت الحد')
+    db_time = models.FloatField(default=0, verbose_name='زمن قاعدة البيانات (ثوان)')
+    template_time = models.FloatField(default=0, verbose_name='زمن القوالب (ثوان)')
+    duration = models.FloatField(default=0, verbose_name='زمن الاستجابة (ثوان)')
+    cache_hits = models.PositiveBigIntegerField(default=0, verbose_name='إصابات الذاكرة المؤقتة')
+    cache_misses = models.PositiveBigIntegerField(default=0, verbose_name='إخفاقات الذاكرة المؤقتة')
+
+    class Meta:
+        verbose_name = 'قياسات صفحة'
+        verbose_name_plural = 'قياسات الصفحات'
+        ordering = ['-day', 'view_name']
+        unique_together = ('view_name', 'day')
+
+    def __str__(self):
+        return f'{self.view_name} ({self.day})'
@@ -0,0 +1,268 @@
+"""Synthetic load data for benchmarks (``manage.py seed_load``).
+
+``LoadSeeder`` fills the database with realistic volumes of users, groups,
+khatmas with their parts, participants and readings, chat messages and
+notifications. Every table is written with bulk inserts in batches, and the
+khatmas are generated in chunks (one transaction each) so memory stays flat at
+any volume. Signal-driven rows (profiles, notification settings) and the
+denormalized counters (khatma progress, participant parts read) are written
+directly, since bulk inserts bypass ``post_save``; the leaderboards and site
+statistics are rebuilt at the end.
+
+All seeded usernames, group names and deceased names start with
+``SEED_PREFIX``, which is how ``clear_seed_data`` finds them again. Bulk
+inserts must return primary keys (PostgreSQL, SQLite), as in
+``khatma.services.KhatmaFactory``.
+"""
+import logging
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from chat.models import KhatmaChat
+from groups.models import GroupMembership, ReadingGroup
+from khatma.models import Deceased, Khatma, KhatmaPart, Participant, QuranReading
+from notifications.models import Notification, NotificationSetting
+from users.models import Profile
+
+from .models import Activity
+from .services import refresh_leaderboard, refresh_site_statistics
+
+logger = logging.getLogger(__name__)
+
+SEED_PREFIX = 'load_'
+SEED_PASSWORD = 'load-password'
+DEFAULT_VOLUMES = {
+    'users': 100_000,
+    'groups': 2_000,
+    'members_per_group': 25,
+    'khatmas': 50_000,
+    'readings_per_part': 2,
+    'messages_per_khatma': 5,
+    'notifications_per_user': 10,
+}
+HISTORY_DAYS = 365
+KHATMA_TYPE_WEIGHTS = {'regular': 50, 'memorial': 20, 'charity': 10, 'healing': 8, 'birth': 4, 'graduation': 3, 'wedding': 3, 'group': 2}
+NOTIFICATION_TYPES = ('khatma_progress', 'part_assigned', 'part_completed', 'khatma_completed', 'khatma_chat', 'achievement')
+CHAT_MESSAGES = ('تقبل الله منا ومنكم', 'تم إكمال الجزء بحمد الله', 'جزاكم الله خيراً', 'اللهم ارحمه واغفر له', 'بارك الله فيكم')
+
+
+def clear_seed_data():
+    """
+    Delete everything created by ``LoadSeeder`` (cascading from the seeded users).
+
+    Returns:
+        int: Number of rows deleted
+    """
+    with transaction.atomic():
+        # Skip the pre_delete handler posting "member left" chat messages and notifications for every membership
+        memberships = GroupMembership.objects.filter(user__username__startswith=SEED_PREFIX)
+        memberships._raw_delete(memberships.db)
+        Deceased.objects.filter(name__startswith=SEED_PREFIX).delete()
+        deleted, _ = User.objects.filter(username__startswith=SEED_PREFIX).delete()
+    return deleted
+
+
+def has_seed_data():
+    """Return whether seeded users exist."""
+    return User.objects.filter(username__startswith=SEED_PREFIX).exists()
+
+
+class LoadSeeder:
+    """
+    Generate synthetic load data with bulk inserts.
+
+    Args:
+        volumes: Overrides of DEFAULT_VOLUMES
+        seed: Random seed, so a run can be reproduced
+        batch_size: Maximum number of rows per INSERT
+        chunk_size: Number of khatmas (with all their rows) written per transaction
+        progress: Optional callable receiving a message after each step
+    """
+
+    def __init__(self, volumes=None, seed=0, batch_size=2000, chunk_size=500, progress=None):
+        self.volumes = {**DEFAULT_VOLUMES, **(volumes or {})}
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.progress = progress or (lambda message: None)
+        self.now = timezone.now()
+        self.counts = dict.fromkeys(('users', 'groups', 'memberships', 'khatmas', 'parts', 'participants', 'readings', 'messages', 'notifications'), 0)
+
+    def run(self):
+        """
+        Seed all the tables.
+
+        Returns:
+            dict: Number of rows created per kind
+        """
+        user_ids = self.seed_users()
+        group_members = self.seed_groups(user_ids)
+        khatma_ids = self.seed_khatmas(user_ids, group_members)
+        self.seed_notifications(user_ids, khatma_ids)
+        refresh_leaderboard()
+        refresh_site_statistics()
+        self.progress('Leaderboards and site statistics rebuilt')
+        return self.counts
+
+    def _past(self, days=HISTORY_DAYS):
+        """Return a random moment in the last ``days`` days."""
+        return self.now - timedelta(seconds=self.random.randrange(days * 24 * 60 * 60))
+
+    def seed_users(self):
+        """Create the users with their profiles and notification settings; return their ids."""
+        password = make_password(SEED_PASSWORD)
+        user_ids = []
+        total = self.volumes['users']
+        for start in range(0, total, self.batch_size):
+            users = [
+                User(username=f'{SEED_PREFIX}{number:07d}', email=f'{SEED_PREFIX}{number}@example.com', password=password,
+                     first_name=f'قارئ {number}', date_joined=self._past())
+                for number in range(start, min(start + self.batch_size, total))
+            ]
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                Profile.objects.bulk_create([
+                    Profile(user_id=user.pk, total_points=self.random.randrange(0, 5000), last_activity_date=self._past(30).date())
+                    for user in users
+                ])
+                NotificationSetting.objects.bulk_create([NotificationSetting(user_id=user.pk) for user in users])
+            user_ids.extend(user.pk for user in users)
+            self.progress(f'Users: {len(user_ids)}/{total}')
+        self.counts['users'] = len(user_ids)
+        return user_ids
+
+    def seed_groups(self, user_ids):
+        """Create the reading groups and memberships; return the member ids of each group id."""
+        groups = [
+            ReadingGroup(name=f'{SEED_PREFIX}مجموعة {number}', creator_id=self.random.choice(user_ids), is_public=self.random.random() < 0.8)
+            for number in range(self.volumes['groups'])
+        ]
+        ReadingGroup.objects.bulk_create(groups, batch_size=self.batch_size)
+        group_members = {}
+        memberships = []
+        size = min(self.volumes['members_per_group'], len(user_ids))
+        for group in groups:
+            members = [group.creator_id] + [user_id for user_id in self.random.sample(user_ids, size) if user_id != group.creator_id][:size - 1]
+            group_members[group.pk] = members
+            memberships.extend(
+                GroupMembership(user_id=user_id, group_id=group.pk, role='admin' if index == 0 else 'moderator' if index < 3 else 'member')
+                for index, user_id in enumerate(members)
+            )
+        GroupMembership.objects.bulk_create(memberships, batch_size=self.batch_size)
+        self.counts['groups'] = len(groups)
+        self.counts['memberships'] = len(memberships)
+        self.progress(f'Groups: {len(groups)} with {len(memberships)} memberships')
+        return group_members
+
+    def seed_khatmas(self, user_ids, group_members):
+        """Create the khatmas chunk by chunk; return their ids."""
+        khatma_ids = []
+        total = self.volumes['khatmas']
+        for start in range(0, total, self.chunk_size):
+            with transaction.atomic():
+                khatma_ids.extend(self._seed_khatma_chunk(range(start, min(start + self.chunk_size, total)), user_ids, group_members))
+            self.progress(f'Khatmas: {len(khatma_ids)}/{total}')
+        return khatma_ids
+
+    def _seed_khatma_chunk(self, numbers, user_ids, group_members):
+        types, weights = zip(*KHATMA_TYPE_WEIGHTS.items())
+        group_ids = list(group_members)
+        khatmas, members, deceased = [], [], []
+        for number in numbers:
+            khatma_type = self.random.choices(types, weights)[0]
+            group_id = self.random.choice(group_ids) if group_ids and self.random.random() < 0.2 else None
+            # Group khatmas are read by the group's members, the others by any users
+            pool = group_members[group_id] if group_id else None
+            creator_id = pool[0] if pool else self.random.choice(user_ids)
+            khatma = Khatma(
+                title=f'ختمة {number}', creator_id=creator_id, khatma_type=khatma_type, group_id=group_id, is_group_khatma=group_id is not None,
+                is_public=self.random.random() < 0.7, visibility='group' if group_id else 'public', created_at=self._past(),
+            )
+            if khatma_type == 'memorial':
+                deceased.append((khatma, Deceased(name=f'{SEED_PREFIX}المرحوم {number}', death_date=khatma.created_at.date(), added_by_id=creator_id)))
+            count = self.random.randint(1, 30)
+            readers = set(self.random.sample(pool, min(count, len(pool))) if pool else self.random.sample(user_ids, min(count, len(user_ids))))
+            readers.discard(creator_id)
+            members.append([creator_id, *readers])
+            khatmas.append(khatma)
+
+        Deceased.objects.bulk_create([person for _, person in deceased], batch_size=self.batch_size)
+        for khatma, person in deceased:
+            khatma.deceased = person
+
+        parts, participants, readings, messages = [], [], [], []
+        for khatma, readers in zip(khatmas, members):
+            self._plan_khatma(khatma, readers, parts, participants, readings, messages)
+        Khatma.objects.bulk_create(khatmas, batch_size=self.batch_size)
+        KhatmaPart.objects.bulk_create(parts, batch_size=self.batch_size)
+        Participant.objects.bulk_create(participants, batch_size=self.batch_size)
+        QuranReading.objects.bulk_create(readings, batch_size=self.batch_size)
+        KhatmaChat.objects.bulk_create(messages, batch_size=self.batch_size)
+        Activity.objects.bulk_create([
+            Activity(verb=Activity.KHATMA_CREATED, actor_id=khatma.creator_id, khatma_id=khatma.pk, group_id=khatma.group_id,
+                     summary=khatma.title, is_public=khatma.is_public, created_at=khatma.created_at)
+            for khatma in khatmas
+        ], batch_size=self.batch_size)
+
+        self.counts['khatmas'] += len(khatmas)
+        self.counts['parts'] += len(parts)
+        self.counts['participants'] += len(participants)
+        self.counts['readings'] += len(readings)
+        self.counts['messages'] += len(messages)
+        return [khatma.pk for khatma in khatmas]
+
+    def _plan_khatma(self, khatma, readers, parts, participants, readings, messages):
+        """Build the unsaved parts, participants, readings and chat messages of a khatma and set its progress."""
+        completed_target = Khatma.TOTAL_PARTS if self.random.random() < 0.3 else self.random.randint(0, Khatma.TOTAL_PARTS - 1)
+        assigned_count = self.random.randint(completed_target, Khatma.TOTAL_PARTS)
+        parts_read = dict.fromkeys(readers, 0)
+        age = max((self.now - khatma.created_at).days, 1)
+        for number in range(1, Khatma.TOTAL_PARTS + 1):
+            assignee = readers[(number - 1) % len(readers)] if number <= assigned_count else None
+            is_completed = number <= completed_target
+            completed_at = khatma.created_at + timedelta(days=self.random.randrange(age)) if is_completed else None
+            parts.append(KhatmaPart(khatma=khatma, part_number=number, assigned_to_id=assignee, is_completed=is_completed, completed_at=completed_at))
+            if assignee is None:
+                continue
+            if is_completed:
+                parts_read[assignee] += 1
+            if not self.volumes['readings_per_part']:
+                continue
+            # The assignee's reading of the part, then re-readings by other participants
+            others = [reader for reader in readers if reader != assignee]
+            for reader in [assignee, *self.random.sample(others, min(self.volumes['readings_per_part'] - 1, len(others)))]:
+                done = is_completed if reader == assignee else self.random.random() < 0.5
+                readings.append(QuranReading(
+                    khatma=khatma, participant_id=reader, part_number=number, status='completed' if done else 'in_progress',
+                    start_date=khatma.created_at, completion_date=(completed_at or self.now) if done else None,
+                ))
+        participants.extend(Participant(khatma=khatma, user_id=user_id, parts_read=count) for user_id, count in parts_read.items())
+        messages.extend(
+            KhatmaChat(khatma=khatma, user_id=self.random.choice(readers), message=self.random.choice(CHAT_MESSAGES))
+            for _ in range(self.volumes['messages_per_khatma'])
+        )
+        khatma.completed_parts_count = completed_target
+        khatma.progress = completed_target * 100 / Khatma.TOTAL_PARTS
+        khatma.is_completed = completed_target == Khatma.TOTAL_PARTS
+        khatma.completed_at = max(part.completed_at for part in parts[-Khatma.TOTAL_PARTS:]) if khatma.is_completed else None
+
+    def seed_notifications(self, user_ids, khatma_ids):
+        """Create the notifications of every user, most of them read."""
+        per_user = self.volumes['notifications_per_user']
+        if not per_user or not khatma_ids:
+            return
+        for start in range(0, len(user_ids), self.batch_size):
+            notifications = [
+                Notification(user_id=user_id, notification_type=self.random.choice(NOTIFICATION_TYPES), message='إشعار تجريبي',
+                             related_khatma_id=self.random.choice(khatma_ids), is_read=self.random.random() < 0.7, created_at=self._past(90))
+                for user_id in user_ids[start:start + self.batch_size]
+                for _ in range(per_user)
+            ]
+            Notification.objects.bulk_create(notifications, batch_size=self.batch_size)
+            self.counts['notifications'] += len(notifications)
+            self.progress(f"Notifications: {self.counts['notifications']}")
@@ -1,163 +1,201 @@
 """Business logic for core app."""
 
 import logging
-from django.db.models import Count, Q, Sum
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
 from django.utils import timezone
 from django.contrib.auth.models import User
 
 # Import models from other apps
 from users.models import Profile, UserAchievement
-from khatma.models import Khatma, Deceased, PartAssignment, Participant, QuranReading
+from khatma.listing import get_public_khatma_page
+from khatma.models import Khatma, Deceased, KhatmaPart, PartAssignment, Participant, QuranReading
 from quran.models import QuranPart, Surah, Ayah
 from groups.models import ReadingGroup, GroupMembership
 from notifications.models import Notification
+from .models import Activity, LeaderboardEntry, SiteStatistics
+from .utils.pagination import encode_cursor, older_than
 
 logger = logging.getLogger(__name__)
 
+LEADERBOARD_BOARDS = ('readers', 'creators')
+LEADERBOARD_SCORE_FIELDS = {'readers': 'completed_parts', 'creators': 'created_khatmas'}
+LEADERBOARD_PAGE_SIZE = 20
+# Seconds a background leaderboard refresh may hold its lock
+LEADERBOARD_LOCK_TIMEOUT = 10 * 60
+
+DASHBOARD_SNAPSHOT_KEY = 'dashboard:{user_id}'
+DASHBOARD_KHATMAS = 5
+DASHBOARD_ACTIVITIES = 5
+DASHBOARD_NOTIFICATIONS = 10
+
+ACTIVITY_PAGE_SIZE = 20
+MAX_ACTIVITY_PAGE_SIZE = 100
+
 def get_dashboard_data(user):
     """
     Get dashboard data for a user.
 
+    The data is a per-user snapshot of plain values built by
+    ``build_dashboard_snapshot`` and cached until an event touching the user
+    (part completion, joining a khatma, a new notification) invalidates it or
+    ``DASHBOARD_SNAPSHOT_TIMEOUT`` expires.
+
     Args:
         user: The user to get dashboard data for
 
     Returns:
-        dict: Dashboard data including khatmas, groups, and statistics
+        dict: Dashboard data including khatmas, groups, statistics and a
+            ``timings`` breakdown (milliseconds per section)
     """
+    key = DASHBOARD_SNAPSHOT_KEY.format(user_id=user.pk)
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        snapshot['cached'] = True
+        return snapshot
     try:
-        # Get user's khatmas
-        user_khatmas = Khatma.objects.filter(
-            Q(creator=user) | Q(participants=user)
-        ).distinct().select_related('creator').prefetch_related('participants')
-
-        # Get user's groups
-        user_groups = ReadingGroup.objects.filter(
-            Q(creator=user) | Q(members=user)
-        ).distinct().select_related('creator').prefetch_related('members')
-
-        # Get user's part assignments
-        part_assignments = PartAssignment.objects.filter(
-            participant=user
-        ).select_related('khatma', 'part')
-
-        # Get completed parts
-        completed_parts = part_assignments.filter(is_completed=True).count()
-
-        # Get total parts
-        total_parts = part_assignments.count()
-
-        # Get completion percentage
-        completion_percentage = 0
-        if total_parts > 0:
-            completion_percentage = (completed_parts / total_parts) * 100
-
-        # Get recent activities
-        recent_activities = []
-
-        # Add recent part completions
-        recent_completions = QuranReading.objects.filter(
-            participant=user
-        ).order_by('-completion_date')[:5]
-
-        for completion in recent_completions:
-            recent_activities.append({
-                'type': 'completion',
-                'date': completion.completion_date,
-                'part_number': completion.part_number,
-                'khatma': completion.khatma
-            })
-
-        # Add recent khatma creations
-        recent_khatmas = Khatma.objects.filter(
-            creator=user
-        ).order_by('-creation_date')[:5]
-
-        for khatma in recent_khatmas:
-            recent_activities.append({
-                'type': 'khatma_creation',
-                'date': khatma.creation_date,
-                'khatma': khatma
-            })
-
-        # Sort activities by date
-        recent_activities.sort(key=lambda x: x['date'], reverse=True)
-
-        # Get user achievements
-        achievements = UserAchievement.objects.filter(user=user).select_related('achievement')
-
-        # Get notifications
-        notifications = Notification.objects.filter(
-            user=user
-        ).order_by('-created_at')[:10]
-
-        return {
-            'user_khatmas': user_khatmas,
-            'user_groups': user_groups,
-            'part_assignments': part_assignments,
-            'completed_parts': completed_parts,
-            'total_parts': total_parts,
-            'completion_percentage': completion_percentage,
-            'recent_activities': recent_activities,
-            'achievements': achievements,
-            'notifications': notifications
-        }
+        snapshot = build_dashboard_snapshot(user)
     except Exception as e:
         logger.error(f"Error getting dashboard data for user {user.username}: {str(e)}")
         return {
             'user_khatmas': [],
-            'user_groups': [],
-            'part_assignments': [],
+            'khatmas_count': 0,
+            'groups_count': 0,
             'completed_parts': 0,
             'total_parts': 0,
             'completion_percentage': 0,
             'recent_activities': [],
-            'achievements': [],
-            'notifications': []
+            'achievements_count': 0,
+            'notifications': [],
+            'timings': {},
+            'cached': False,
         }
+    cache.set(key, snapshot, getattr(settings, 'DASHBOARD_SNAPSHOT_TIMEOUT', 5 * 60))
+    snapshot['cached'] = False
+    return snapshot
+
+
+def build_dashboard_snapshot(user):
+    """
+    Build the dashboard data of a user with a fixed number of queries.
+
+    Every section is reduced to plain dicts and numbers so the snapshot can be
+    cached, and the time spent on each section is recorded in ``timings``.
+
+    Args:
+        user: The user to build the dashboard for
+
+    Returns:
+        dict: Dashboard data (see ``get_dashboard_data``)
+    """
+    timings = {}
+    snapshot = {'timings': timings}
+    timed = partial(_timed, timings)
+
+    with timed('khatmas'):
+        # A subquery instead of an OR across the participants join avoids distinct()
+        khatmas = Khatma.objects.filter(
+            Q(creator=user) | Q(pk__in=Participant.objects.filter(user=user).values('khatma_id'))
+        )
+        snapshot['khatmas_count'] = khatmas.count()
+        snapshot['user_khatmas'] = [
+            {
+                'id': khatma.pk,
+                'title': khatma.title,
+                'khatma_type_display': khatma.get_khatma_type_display(),
+                'is_creator': khatma.creator_id == user.pk,
+                'participants_count': khatma.participants_count,
+                'progress': khatma.progress,
+                'is_completed': khatma.is_completed,
+            }
+            for khatma in khatmas.annotate(participants_count=Count('participant')).order_by('-created_at')[:DASHBOARD_KHATMAS]
+        ]
+
+    with timed('groups'):
+        snapshot['groups_count'] = ReadingGroup.objects.filter(
+            Q(creator=user) | Q(pk__in=GroupMembership.objects.filter(user=user).values('group_id'))
+        ).count()
+
+    with timed('parts'):
+        parts = KhatmaPart.objects.filter(assigned_to=user).aggregate(
+            total=Count('pk'), completed=Count('pk', filter=Q(is_completed=True)))
+        snapshot['total_parts'] = parts['total']
+        snapshot['completed_parts'] = parts['completed']
+        snapshot['completion_percentage'] = parts['completed'] * 100 / parts['total'] if parts['total'] else 0
+
+    with timed('activities'):
+        snapshot['recent_activities'] = [
+            serialize_activity(activity) for activity in get_user_timeline(user, limit=DASHBOARD_ACTIVITIES)['activities']
+        ]
+
+    with timed('achievements'):
+        snapshot['achievements_count'] = UserAchievement.objects.filter(user=user).count()
+
+    with timed('notifications'):
+        snapshot['notifications'] = list(
+            Notification.objects.filter(user=user).order_by('-created_at')
+            .values('id', 'notification_type', 'message', 'action_url', 'is_read', 'created_at')[:DASHBOARD_NOTIFICATIONS]
+        )
+
+    timings['total'] = round(sum(timings.values()), 2)
+    return snapshot
+
+
+@contextmanager
+def _timed(timings, section):
+    """Record the milliseconds spent in a block under timings[section]."""
+    start = time.perf_counter()
+    yield
+    timings[section] = round((time.perf_counter() - start) * 1000, 2)
+
+
+def invalidate_dashboard(user_ids):
+    """Drop the cached dashboard snapshots of the given users."""
+    cache.delete_many([DASHBOARD_SNAPSHOT_KEY.format(user_id=user_id) for user_id in set(user_ids)])
+
 
 def get_community_data():
     """
     Get community data for the community page.
 
+    Site totals come from the SiteStatistics rollup and the top readers from
+    the materialized leaderboard, so no global COUNT(*) runs per page view.
+
     Returns:
         dict: Community data including public khatmas, leaderboard, and statistics
     """
     try:
-        # Get public khatmas
-        public_khatmas = Khatma.objects.filter(
-            is_public=True
-        ).order_by('-creation_date').select_related('creator', 'deceased')
+        totals = get_site_totals()
 
-        # Get top users by completed parts
-        top_users = User.objects.annotate(
-            completed_parts_count=Count('participant__part_assignments__quran_reading',
-                                        filter=Q(participant__part_assignments__is_completed=True))
-        ).order_by('-completed_parts_count')[:10]
-
-        # Get total users
-        total_users = User.objects.count()
-
-        # Get total khatmas
-        total_khatmas = Khatma.objects.count()
-
-        # Get total completed parts
-        total_completed_parts = QuranReading.objects.count()
+        # First keyset page of the public khatmas (no COUNT or OFFSET)
+        public_khatmas = get_public_khatma_page(with_count=False)
 
         # Get recent khatmas
-        recent_khatmas = Khatma.objects.order_by('-creation_date')[:5].select_related('creator')
+        recent_khatmas = Khatma.objects.order_by('-created_at').select_related('creator')[:5]
 
         return {
-            'public_khatmas': public_khatmas,
-            'top_users': top_users,
-            'total_users': total_users,
-            'total_khatmas': total_khatmas,
-            'total_completed_parts': total_completed_parts,
+            'public_khatmas': public_khatmas['khatmas'],
+            'public_khatmas_next_cursor': public_khatmas['next_cursor'],
+            'top_users': get_leaderboard('readers'),
+            'total_users': totals['users_joined'],
+            'total_khatmas': totals['khatmas_created'],
+            'total_completed_parts': totals['parts_completed'],
             'recent_khatmas': recent_khatmas
         }
     except Exception as e:
         logger.error(f"Error getting community data: {str(e)}")
         return {
             'public_khatmas': [],
+            'public_khatmas_next_cursor': None,
             'top_users': [],
             'total_users': 0,
             'total_khatmas': 0,
@@ -222,4 +260,424 @@ def search_global(query):
             'groups': [],
             'deceased': [],
             'surahs': []
-        }
\ No newline at end of file
+        }
+
+def _leaderboard_scores(board):
+    """
+    Build the aggregate query that scores every user for a leaderboard.
+
+    Args:
+        board: 'readers' (completed readings) or 'creators' (created khatmas)
+
+    Returns:
+        QuerySet: (user_id, score) tuples ordered best first
+    """
+    if board == 'readers':
+        scores = QuranReading.objects.filter(status='completed').values('participant')
+        user_field = 'participant'
+    elif board == 'creators':
+        scores = Khatma.objects.values('creator')
+        user_field = 'creator'
+    else:
+        raise ValueError(f"Unknown leaderboard: {board}")
+    return scores.annotate(score=Count('id')).order_by('-score', user_field).values_list(user_field, 'score')
+
+
+def _leaderboard_refresh_interval():
+    """Return the number of seconds a materialized leaderboard stays fresh."""
+    return getattr(settings, 'LEADERBOARD_REFRESH_INTERVAL', 15 * 60)
+
+
+def refresh_leaderboard(boards=LEADERBOARD_BOARDS, batch_size=1000):
+    """
+    Recompute and materialize leaderboard rankings.
+
+    Each board costs one aggregate query plus batched inserts, regardless of
+    the number of users.
+
+    Args:
+        boards: Iterable of board names to refresh
+        batch_size: Number of ranking rows inserted per query
+
+    Returns:
+        dict: Number of ranked users per board
+    """
+    refreshed_at = timezone.now()
+    counts = {}
+    with transaction.atomic():
+        for board in boards:
+            LeaderboardEntry.objects.filter(board=board).delete()
+            entries = [
+                LeaderboardEntry(board=board, rank=rank, user_id=user_id, score=score, refreshed_at=refreshed_at)
+                for rank, (user_id, score) in enumerate(_leaderboard_scores(board).iterator(), start=1)
+            ]
+            LeaderboardEntry.objects.bulk_create(entries, batch_size=batch_size)
+            counts[board] = len(entries)
+    for board in boards:
+        cache.delete_many([f'leaderboard:{board}:top:{limit}' for limit in (10, LEADERBOARD_PAGE_SIZE)])
+        cache.set(f'leaderboard:{board}:fresh', True, _leaderboard_refresh_interval())
+    logger.info(f"Leaderboard refreshed: {counts}")
+    return counts
+
+
+def _ensure_leaderboard_fresh(board):
+    """
+    Start a background refresh of a board whose materialized ranking has expired.
+
+    The request keeps reading the stale snapshot; one worker at a time
+    (the holder of the cache lock) rebuilds it in a thread once the current
+    transaction commits.
+
+    Returns:
+        bool: Whether the snapshot was fresh
+    """
+    if cache.get(f'leaderboard:{board}:fresh'):
+        return True
+    if cache.add(f'leaderboard:{board}:lock', True, LEADERBOARD_LOCK_TIMEOUT):
+        thread = threading.Thread(target=_refresh_leaderboard_in_background, args=(board,), name=f'leaderboard-{board}', daemon=True)
+        transaction.on_commit(thread.start)
+    return False
+
+
+def _refresh_leaderboard_in_background(board):
+    """Rebuild a board outside the request that found it stale, then release its lock."""
+    try:
+        close_old_connections()
+        refresh_leaderboard(boards=(board,))
+    except Exception as e:
+        logger.error(f"Error refreshing the {board} leaderboard: {str(e)}")
+    finally:
+        close_old_connections()
+        cache.delete(f'leaderboard:{board}:lock')
+
+
+def _leaderboard_row(entry, board):
+    """Convert a LeaderboardEntry into the dict consumed by templates and the API."""
+    user = entry.user
+    try:
+        profile = user.profile
+    except Profile.DoesNotExist:
+        profile = None
+    return {
+        'rank': entry.rank,
+        'user_id': user.id,
+        'username': user.username,
+        'date_joined': user.date_joined,
+        'profile': profile,
+        'score': entry.score,
+        LEADERBOARD_SCORE_FIELDS[board]: entry.score,
+    }
+
+
+def _leaderboard_rows(board, first_rank, count):
+    """Fetch `count` consecutive ranking rows starting at `first_rank` in a single query."""
+    entries = LeaderboardEntry.objects.filter(
+        board=board, rank__gte=first_rank, rank__lt=first_rank + count
+    ).select_related('user', 'user__profile').order_by('rank')
+    return [_leaderboard_row(entry, board) for entry in entries]
+
+
+def get_leaderboard(board, limit=10):
+    """
+    Get the top users of a leaderboard.
+
+    Args:
+        board: 'readers' or 'creators'
+        limit: Number of users to return
+
+    Returns:
+        list: Ranking rows, best first
+    """
+    cache_key = f'leaderboard:{board}:top:{limit}'
+    rows = cache.get(cache_key)
+    if rows is None:
+        fresh = _ensure_leaderboard_fresh(board)
+        rows = _leaderboard_rows(board, 1, limit)
+        # Rows of a stale snapshot would outlive the refresh that replaces them
+        if fresh:
+            cache.set(cache_key, rows, _leaderboard_refresh_interval())
+    return rows
+
+
+def get_leaderboard_page(board, page=1, page_size=LEADERBOARD_PAGE_SIZE):
+    """
+    Get one page of a leaderboard.
+
+    Args:
+        board: 'readers' or 'creators'
+        page: 1-based page number
+        page_size: Number of rows per page
+
+    Returns:
+        dict: Page rows and pagination information
+    """
+    page = max(int(page), 1)
+    _ensure_leaderboard_fresh(board)
+    rows = _leaderboard_rows(board, (page - 1) * page_size + 1, page_size + 1)
+    return {
+        'board': board,
+        'page': page,
+        'page_size': page_size,
+        'has_previous': page > 1,
+        'has_next': len(rows) > page_size,
+        'entries': rows[:page_size],
+    }
+
+
+def get_user_rank(user, board, page_size=LEADERBOARD_PAGE_SIZE):
+    """
+    Look up a user's leaderboard position and the page that contains it.
+
+    Args:
+        user: The user to look up
+        board: 'readers' or 'creators'
+        page_size: Number of rows per page
+
+    Returns:
+        dict: Rank, score and the surrounding page, or None if the user is unranked
+    """
+    _ensure_leaderboard_fresh(board)
+    entry = LeaderboardEntry.objects.filter(board=board, user=user).values('rank', 'score').first()
+    if entry is None:
+        return None
+    result = get_leaderboard_page(board, (entry['rank'] - 1) // page_size + 1, page_size)
+    result.update(rank=entry['rank'], score=entry['score'])
+    return result
+
+
+def _site_statistics_sources():
+    """Return the raw queryset and date field each daily SiteStatistics counter is derived from."""
+    return {
+        'users_joined': (User.objects.all(), 'date_joined'),
+        'khatmas_created': (Khatma.objects.all(), 'created_at'),
+        'khatmas_completed': (Khatma.objects.filter(is_completed=True, completed_at__isnull=False), 'completed_at'),
+        'parts_completed': (KhatmaPart.objects.filter(is_completed=True, completed_at__isnull=False), 'completed_at'),
+        'readings_started': (QuranReading.objects.all(), 'start_date'),
+        'deceased_added': (Deceased.objects.all(), 'created_at'),
+        'groups_created': (ReadingGroup.objects.all(), 'created_at'),
+    }
+
+
+def record_site_statistic(field, amount=1, day=None):
+    """
+    Add to a daily SiteStatistics counter once the current transaction commits.
+
+    Args:
+        field: One of SiteStatistics.COUNTER_FIELDS
+        amount: Amount to add (negative to subtract)
+        day: Date of the bucket (defaults to today in the site's time zone)
+    """
+    day = day or timezone.localdate()
+
+    def apply():
+        increment = {field: F(field) + amount, 'updated_at': timezone.now()}
+        if not SiteStatistics.objects.filter(date=day).update(**increment):
+            SiteStatistics.objects.bulk_create([SiteStatistics(date=day)], ignore_conflicts=True)
+            SiteStatistics.objects.filter(date=day).update(**increment)
+    transaction.on_commit(apply)
+
+
+def refresh_site_statistics(days=None, batch_size=500):
+    """
+    Recompute the daily SiteStatistics counters from the raw tables.
+
+    Signals keep today's counters current; this repairs drift (e.g. from
+    deletions or bulk updates). Each counter costs one GROUP BY query.
+
+    Args:
+        days: Number of most recent days to recompute, or None to rebuild everything
+        batch_size: Number of rows upserted per query
+
+    Returns:
+        int: Number of daily rows written
+    """
+    since = timezone.localdate() - timedelta(days=days - 1) if days else None
+    counters = defaultdict(lambda: dict.fromkeys(SiteStatistics.COUNTER_FIELDS, 0))
+    if since:
+        for offset in range(days):
+            counters[since + timedelta(days=offset)]
+    for field, (queryset, date_field) in _site_statistics_sources().items():
+        if since:
+            queryset = queryset.filter(**{f'{date_field}__date__gte': since})
+        rows = queryset.order_by().annotate(day=TruncDate(date_field)).values('day').annotate(count=Count('pk')).values_list('day', 'count')
+        for day, count in rows:
+            counters[day][field] = count
+
+    with transaction.atomic():
+        if since is None:
+            SiteStatistics.objects.all().delete()
+        SiteStatistics.objects.bulk_create(
+            [SiteStatistics(date=day, **values) for day, values in counters.items()],
+            update_conflicts=True,
+            unique_fields=['date'],
+            update_fields=[*SiteStatistics.COUNTER_FIELDS, 'updated_at'],
+            batch_size=batch_size,
+        )
+    logger.info(f"Site statistics refreshed for {len(counters)} days")
+    return len(counters)
+
+
+def get_site_totals():
+    """
+    Get all-time site totals from the SiteStatistics rollup in one query.
+
+    Returns:
+        dict: Total per counter field
+    """
+    return SiteStatistics.objects.aggregate(**{field: Coalesce(Sum(field), 0) for field in SiteStatistics.COUNTER_FIELDS})
+
+
+def count_active_khatmas():
+    """
+    Count the khatmas still in progress.
+
+    Counted directly (a scan of the partial ``khatma_active_idx`` index)
+    rather than derived from the daily rollup, whose counters do not go down
+    when khatmas are deleted.
+
+    Returns:
+        int: Number of incomplete khatmas
+    """
+    return Khatma.objects.filter(is_completed=False).count()
+
+
+def get_site_statistics_series(days=30):
+    """
+    Get the daily counters of the last days, oldest first, with empty days filled in.
+
+    Args:
+        days: Number of days, including today
+
+    Returns:
+        list: One dict per day with 'date' and every counter field
+    """
+    since = timezone.localdate() - timedelta(days=days - 1)
+    rows = {row['date']: row for row in SiteStatistics.objects.filter(date__gte=since).values('date', *SiteStatistics.COUNTER_FIELDS)}
+    empty = dict.fromkeys(SiteStatistics.COUNTER_FIELDS, 0)
+    return [rows.get(day, dict(empty, date=day)) for day in (since + timedelta(days=offset) for offset in range(days))]
+
+
+def record_activity(verb, actor_id, khatma=None, group_id=None, part_number=None, summary='', is_public=False):
+    """
+    Append an entry to the activity log.
+
+    When a khatma is given its group, title and visibility are copied onto the
+    entry, so timelines never join back to the khatma table.
+
+    Args:
+        verb: One of the Activity verbs
+        actor_id: The id of the acting user (or None)
+        khatma: Optional Khatma the activity is about
+        group_id, part_number, summary, is_public: Activity fields
+
+    Returns:
+        Activity: The created entry
+    """
+    return Activity.objects.create(**_activity_fields(verb, actor_id, khatma, group_id, part_number, summary, is_public))
+
+
+def record_activities(activities):
+    """
+    Append several entries to the activity log with one INSERT.
+
+    Args:
+        activities: Iterable of dicts of ``record_activity`` arguments
+    """
+    Activity.objects.bulk_create([
+        Activity(**_activity_fields(**activity)) for activity in activities
+    ], batch_size=500)
+
+
+def _activity_fields(verb, actor_id, khatma=None, group_id=None, part_number=None, summary='', is_public=False):
+    """Build the field values of an Activity, snapshotting the khatma's group, title and visibility."""
+    fields = {'verb': verb, 'actor_id': actor_id, 'part_number': part_number, 'group_id': group_id,
+              'summary': summary, 'is_public': is_public}
+    if khatma is not None:
+        fields.update(khatma_id=khatma.pk, group_id=group_id or khatma.group_id,
+                      summary=summary or khatma.title, is_public=khatma.is_public)
+    fields['summary'] = fields['summary'][:255]
+    return fields
+
+
+def _activity_page(queryset, before=None, limit=ACTIVITY_PAGE_SIZE):
+    """Return one newest-first page of an activity queryset using keyset pagination on (created_at, id)."""
+    limit = max(1, min(limit, MAX_ACTIVITY_PAGE_SIZE))
+    if before:
+        queryset = older_than(queryset, before)
+    rows = list(queryset.select_related('actor').order_by('-created_at', '-id')[:limit + 1])
+    activities = rows[:limit]
+    return {'activities': activities, 'next_cursor': encode_cursor(activities[-1]) if len(rows) > limit else None}
+
+
+def get_user_timeline(user, before=None, limit=ACTIVITY_PAGE_SIZE, public_only=False):
+    """
+    Get the activities of a user, newest first.
+
+    Every timeline is a single range scan of one (…, created_at, id) index.
+
+    Args:
+        user: The acting user
+        before: Optional cursor; only older activities are returned
+        limit: Maximum number of activities
+        public_only: Only include activities about public khatmas
+
+    Returns:
+        dict: {'activities': list, 'next_cursor': str or None}
+    """
+    queryset = Activity.objects.filter(actor=user)
+    if public_only:
+        queryset = queryset.filter(is_public=True)
+    return _activity_page(queryset, before, limit)
+
+
+def get_group_timeline(group, before=None, limit=ACTIVITY_PAGE_SIZE, public_only=False):
+    """
+    Get the activities of a reading group's khatmas and members, newest first (see ``get_user_timeline``).
+
+    Args:
+        public_only: Leave out the activities of the group's private khatmas (for non-members)
+    """
+    queryset = Activity.objects.filter(group=group)
+    if public_only:
+        # The visibility snapshotted on the row, so the page never joins the khatmas
+        queryset = queryset.filter(Q(is_public=True) | Q(khatma__isnull=True))
+    return _activity_page(queryset, before, limit)
+
+
+def get_khatma_timeline(khatma, before=None, limit=ACTIVITY_PAGE_SIZE):
+    """Get the activities of a khatma, newest first (see ``get_user_timeline``)."""
+    return _activity_page(Activity.objects.filter(khatma=khatma), before, limit)
+
+
+def get_site_timeline(before=None, limit=ACTIVITY_PAGE_SIZE, public_only=True):
+    """
+    Get the site-wide activities, newest first (see ``get_user_timeline``).
+
+    Args:
+        public_only: Only include public activities (False for staff views)
+    """
+    queryset = Activity.objects.filter(is_public=True) if public_only else Activity.objects.all()
+    return _activity_page(queryset, before, limit)
+
+
+def serialize_activity(activity):
+    """
+    Convert an activity into a JSON-serializable dict.
+
+    Args:
+        activity: Activity instance with ``actor`` loaded
+
+    Returns:
+        dict: Activity data (``created_at`` stays a datetime; JsonResponse encodes it)
+    """
+    return {
+        'id': activity.pk,
+        'verb': activity.verb,
+        'verb_display': activity.get_verb_display(),
+        'user': activity.actor.username if activity.actor else None,
+        'khatma_id': activity.khatma_id,
+        'group_id': activity.group_id,
+        'part_number': activity.part_number,
+        'summary': activity.summary,
+        'created_at': activity.created_at,
+    }
@@ -0,0 +1,297 @@
+"""Cached share images (Open Graph cards) of the khatmas.
+
+A card shows the title, type, progress and dedication of a khatma. It is
+cached on disk under ``SHARE_IMAGE_ROOT`` by (khatma id, progress bucket, hash
+of the drawn texts), so a card is rendered again only when the progress
+crosses a ``SHARE_IMAGE_PROGRESS_STEP`` bucket or a drawn text changes. Its URL
+carries the bucket and hash, so it can be served with a year-long immutable
+cache header.
+
+Rendering runs in a small process pool (``SHARE_IMAGE_WORKERS`` processes;
+``0`` renders in the calling thread) so a burst of shares cannot pin the web
+workers' CPU. Requests never wait for the pool: the first request for a
+missing image queues it and is told to retry, and the cached file is served
+once it is written. Requests for an image being rendered share its job, at
+most ``SHARE_IMAGE_MAX_PENDING`` distinct images wait for the pool and a cache
+lock keeps other web processes from rendering the same image.
+
+Fonts are looked up once per process in ``SHARE_IMAGE_FONT_DIRS`` (the
+bundled ``core/fonts`` first, then the usual system font folders). Arabic is
+shaped by Pillow's libraqm layout when available and by
+``core.utils.arabic_shaping`` otherwise.
+"""
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from PIL import Image, ImageDraw, ImageFont, features
+
+from .social_media_utils import generate_khatma_hashtags
+from .utils.arabic_shaping import shape_for_display
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout or the bundled fonts change so cached cards are drawn again
+RENDER_VERSION = 2
+WIDTH, HEIGHT = 1200, 630
+MARGIN = 60
+DEFAULT_PROGRESS_STEP = 10
+DEFAULT_MAX_AGE = 365 * 24 * 60 * 60
+# Longest a render may hold the image's cache lock
+RENDER_TIMEOUT = 15
+
+# States of a share image (see ensure_share_image)
+READY, RENDERING, BUSY = 'ready', 'rendering', 'busy'
+
+FONT_FILES = {
+    'bold': ('Amiri-Bold.ttf', 'NotoNaskhArabic-Bold.ttf', 'DejaVuSans-Bold.ttf'),
+    'regular': ('Amiri-Regular.ttf', 'NotoNaskhArabic-Regular.ttf', 'DejaVuSans.ttf'),
+}
+DEFAULT_FONT_DIRS = (
+    os.path.join(os.path.dirname(__file__), 'fonts'),
+    '/usr/share/fonts/truetype/amiri',
+    '/usr/share/fonts/opentype/fonts-hosny-amiri',
+    '/usr/share/fonts/truetype/noto',
+    '/usr/share/fonts/truetype/dejavu',
+)
+
+BACKGROUND = (240, 248, 255)
+COLORS = {'title': (0, 0, 139), 'type': (70, 130, 180), 'progress': (34, 139, 34), 'memorial': (139, 0, 0), 'hashtags': (0, 123, 255)}
+
+
+def get_share_image_root():
+    """Return the folder of the cached share images."""
+    return getattr(settings, 'SHARE_IMAGE_ROOT', os.path.join(settings.MEDIA_ROOT, 'share'))
+
+
+@lru_cache(maxsize=None)
+def find_font(style):
+    """
+    Return the path of the first available font file for a style.
+
+    Args:
+        style: 'bold' or 'regular'
+
+    Returns:
+        str or None: The font path, or None to use Pillow's default font
+    """
+    for directory in getattr(settings, 'SHARE_IMAGE_FONT_DIRS', DEFAULT_FONT_DIRS):
+        for filename in FONT_FILES[style]:
+            path = os.path.join(directory, filename)
+            if os.path.isfile(path):
+                return path
+    logger.warning(f"No Arabic {style} font found for the share images; add one to core/fonts")
+    return None
+
+
+def progress_bucket(progress):
+    """Round a progress percentage down to its share image bucket (100 only when complete)."""
+    step = getattr(settings, 'SHARE_IMAGE_PROGRESS_STEP', DEFAULT_PROGRESS_STEP)
+    return 100 if progress >= 100 else min(int(progress // step * step), 100 - step)
+
+
+def share_image_job(khatma):
+    """
+    Describe the share image of a khatma without rendering it.
+
+    Reads the denormalized progress, so no query is made beyond loading
+    ``khatma.deceased`` (select it with the khatma).
+
+    Args:
+        khatma: The Khatma
+
+    Returns:
+        dict: 'key', 'version' (part of the URL), 'path', 'lines' (text,
+            style, size, color) and 'fonts', everything ``write_share_image`` needs
+    """
+    bucket = progress_bucket(khatma.progress)
+    lines = [
+        (khatma.title or 'ختمة قرآن', 'bold', 60, COLORS['title']),
+        (khatma.get_khatma_type_display(), 'regular', 40, COLORS['type']),
+        (f'التقدم: {bucket}%', 'regular', 40, COLORS['progress']),
+    ]
+    if khatma.khatma_type == 'memorial' and khatma.deceased:
+        lines.append((f'إهداء إلى روح المرحوم: {khatma.deceased.name}', 'regular', 40, COLORS['memorial']))
+    lines.append((generate_khatma_hashtags(khatma), 'regular', 36, COLORS['hashtags']))
+
+    digest = hashlib.sha1(repr((RENDER_VERSION, lines)).encode()).hexdigest()[:12]
+    version = f'{bucket}-{digest}'
+    return {
+        'key': f'{khatma.id}_{version}',
+        'version': version,
+        'path': os.path.join(get_share_image_root(), f'khatma_{khatma.id}_{version}.png'),
+        'lines': lines,
+        'fonts': {style: find_font(style) for style in FONT_FILES},
+        'shaped': not features.check('raqm'),
+    }
+
+
+def share_image_url(khatma):
+    """Return the immutable URL of a khatma's current share image."""
+    return reverse('khatma:share_image', args=[khatma.sharing_link, share_image_job(khatma)['version']])
+
+
+def queue_share_image(khatma):
+    """
+    Queue the rendering of a khatma's share image if it is missing, and return its URL.
+
+    Pages emitting the card (``og:image``, previews) call this, so it is
+    usually on disk before a crawler or the browser fetches it.
+    """
+    job = share_image_job(khatma)
+    ensure_share_image(job)
+    return reverse('khatma:share_image', args=[khatma.sharing_link, job['version']])
+
+
+def _load_font(path, size):
+    return ImageFont.truetype(path, size) if path else ImageFont.load_default(size)
+
+
+def render_share_image(job):
+    """
+    Draw a share image.
+
+    Args:
+        job: A dict from ``share_image_job``
+
+    Returns:
+        bytes: The PNG image
+    """
+    image = Image.new('RGB', (WIDTH, HEIGHT), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    heights = []
+    rendered = []
+    for text, style, size, color in job['lines']:
+        text = shape_for_display(text) if job['shaped'] else text
+        font = _load_font(job['fonts'][style], size)
+        # Shrink long lines (usually the title) to fit the card
+        while draw.textlength(text, font=font) > WIDTH - 2 * MARGIN and size > 24:
+            size -= 4
+            font = _load_font(job['fonts'][style], size)
+        rendered.append((text, font, color))
+        heights.append(size * 1.6)
+
+    top = (HEIGHT - sum(heights)) / 2
+    for (text, font, color), height in zip(rendered, heights):
+        options = {} if job['shaped'] else {'direction': 'rtl'}
+        draw.text((WIDTH / 2, top + height / 2), text, font=font, fill=color, anchor='mm', **options)
+        top += height
+
+    output = BytesIO()
+    image.save(output, format='PNG', optimize=True)
+    return output.getvalue()
+
+
+def write_share_image(job):
+    """
+    Render a share image to its cache path and drop the khatma's older images.
+
+    Runs in the renderer processes, so it only uses the job dict.
+
+    Returns:
+        str: The path of the image
+    """
+    directory = os.path.dirname(job['path'])
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{job['path']}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as image:
+        image.write(render_share_image(job))
+    os.replace(temporary, job['path'])
+
+    prefix = f"khatma_{job['key'].split('_')[0]}_"
+    current = os.path.basename(job['path'])
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith(prefix) and entry.name.endswith('.png') and entry.name != current:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+    return job['path']
+
+
+class ShareImageRenderer:
+    """Process pool rendering the share images, with one job per image and a bounded backlog."""
+
+    def __init__(self):
+        self._executor = None
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def submit(self, job):
+        """
+        Queue a job, joining the pending one for the same image.
+
+        Returns:
+            Future or None: None when the backlog is full
+        """
+        with self._lock:
+            future = self._pending.get(job['key'])
+            if future is not None:
+                return future
+            if len(self._pending) >= getattr(settings, 'SHARE_IMAGE_MAX_PENDING', 8):
+                return None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=getattr(settings, 'SHARE_IMAGE_WORKERS', 2))
+            future = self._executor.submit(write_share_image, job)
+            self._pending[job['key']] = future
+        future.add_done_callback(lambda _: self._done(job['key']))
+        return future
+
+    def _done(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+
+share_image_renderer = ShareImageRenderer()
+
+
+def ensure_share_image(job):
+    """
+    Make sure a share image exists on disk, queueing its rendering when needed.
+
+    Never waits for the renderer pool: a missing image is queued and the
+    caller should ask the client to retry. Only one web process renders a
+    given image at a time; the others see it as rendering too.
+
+    Args:
+        job: A dict from ``share_image_job``
+
+    Returns:
+        str: READY when the image is at ``job['path']``, RENDERING while it is
+            being drawn, BUSY when the renderer backlog is full
+    """
+    if os.path.exists(job['path']):
+        return READY
+    lock = f"share-image:{job['key']}:lock"
+    if not cache.add(lock, True, RENDER_TIMEOUT * 2):
+        return RENDERING
+    if not getattr(settings, 'SHARE_IMAGE_WORKERS', 2):
+        try:
+            write_share_image(job)
+        except Exception as e:
+            logger.error(f"Error rendering share image {job['key']}: {str(e)}")
+            return BUSY
+        finally:
+            cache.delete(lock)
+        return READY
+    future = share_image_renderer.submit(job)
+    if future is None:
+        cache.delete(lock)
+        return BUSY
+    future.add_done_callback(lambda future: _rendered(job, lock, future))
+    return RENDERING
+
+
+def _rendered(job, lock, future):
+    """Release the lock of a rendered image, logging a failed render (which the next request queues again)."""
+    cache.delete(lock)
+    if future.exception() is not None:
+        logger.error(f"Error rendering share image {job['key']}: {str(future.exception())}")
@@ -1,3 +1,127 @@
 """Signal handlers for core app."""
-from django.db.models.signals import post_save, pre_save
-from django.dispatch import receiver
\ No newline at end of file
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from groups.models import GroupMembership, ReadingGroup
+from khatma import events
+from khatma.models import Deceased, Khatma, KhatmaComment, KhatmaInteraction, Participant, PostReaction, QuranReading
+from notifications.signals import notifications_changed
+
+from .models import Activity
+from .services import invalidate_dashboard, record_activities, record_activity, record_site_statistic
+
+# Daily SiteStatistics counter incremented when a row of the model is created
+CREATION_COUNTERS = {
+    User: 'users_joined',
+    Khatma: 'khatmas_created',
+    QuranReading: 'readings_started',
+    Deceased: 'deceased_added',
+    ReadingGroup: 'groups_created',
+}
+
+
+@receiver(events.khatma_event)
+def invalidate_khatma_dashboards(sender, khatma_id, event_type, data, **kwargs):
+    """Drop the dashboard snapshots of a khatma's creator and participants after progress events"""
+    user_ids = set(Participant.objects.filter(khatma_id=khatma_id).values_list('user_id', flat=True))
+    user_ids.update(Khatma.objects.filter(pk=khatma_id).values_list('creator_id', flat=True))
+    invalidate_dashboard(user_ids)
+
+
+@receiver(notifications_changed)
+def invalidate_notified_dashboards(sender, user_ids, **kwargs):
+    """Drop the dashboard snapshots of users who received notifications"""
+    invalidate_dashboard(user_ids)
+
+
+@receiver(post_save)
+def count_created_rows(sender, instance, created, raw=False, **kwargs):
+    """Count new users, khatmas, readings, deceased and groups in today's site statistics"""
+    field = CREATION_COUNTERS.get(sender)
+    if created and field and not raw:
+        record_site_statistic(field)
+
+
+@receiver(events.khatmas_created)
+def count_factory_khatmas(sender, khatmas, **kwargs):
+    """Count khatmas bulk created by KhatmaFactory (which bypasses post_save)"""
+    record_site_statistic('khatmas_created', len(khatmas))
+
+
+@receiver(events.khatma_event)
+def count_completions(sender, khatma_id, event_type, data, **kwargs):
+    """Count completed parts and khatmas in today's site statistics"""
+    if event_type == events.PART_COMPLETED:
+        record_site_statistic('parts_completed')
+    elif event_type == events.PART_UNCOMPLETED:
+        record_site_statistic('parts_completed', -1)
+    elif event_type == events.KHATMA_COMPLETED:
+        if data.get('parts_completed'):
+            record_site_statistic('parts_completed', data['parts_completed'])
+        if data.get('newly_completed'):
+            record_site_statistic('khatmas_completed')
+
+
+@receiver(post_save, sender=Khatma)
+def log_khatma_created(sender, instance, created, raw=False, **kwargs):
+    """Add new khatmas to the activity log"""
+    if created and not raw:
+        record_activity(Activity.KHATMA_CREATED, instance.creator_id, khatma=instance)
+
+
+@receiver(events.khatmas_created)
+def log_factory_khatmas(sender, khatmas, **kwargs):
+    """Add khatmas bulk created by KhatmaFactory to the activity log"""
+    record_activities({'verb': Activity.KHATMA_CREATED, 'actor_id': khatma.creator_id, 'khatma': khatma} for khatma in khatmas)
+
+
+@receiver(post_save, sender=Participant)
+def log_participant_joined(sender, instance, created, raw=False, **kwargs):
+    """Add users joining a khatma (other than its creator) to the activity log"""
+    if created and not raw and instance.user_id != instance.khatma.creator_id:
+        record_activity(Activity.JOINED, instance.user_id, khatma=instance.khatma)
+
+
+@receiver(post_save, sender=GroupMembership)
+def log_group_joined(sender, instance, created, raw=False, **kwargs):
+    """Add users joining a reading group to the activity log"""
+    if created and not raw:
+        group = instance.group
+        record_activity(Activity.JOINED, instance.user_id, group_id=group.pk, summary=group.name, is_public=group.is_public)
+
+
+@receiver(events.khatma_event)
+def log_part_completed(sender, khatma_id, event_type, data, **kwargs):
+    """Add completed parts to the activity log"""
+    if event_type != events.PART_COMPLETED:
+        return
+    khatma = Khatma.objects.only('title', 'group_id', 'is_public').get(pk=khatma_id)
+    record_activity(Activity.PART_COMPLETED, data.get('user_id'), khatma=khatma, part_number=data.get('part_number'))
+
+
+@receiver(post_save, sender=KhatmaComment)
+def log_comment(sender, instance, created, raw=False, **kwargs):
+    """Add comments on public khatmas to the activity log"""
+    if created and not raw:
+        record_activity(Activity.COMMENT, instance.user_id, summary=f'{instance.public_khatma}: {instance.text}', is_public=True)
+
+
+@receiver(post_save, sender=KhatmaInteraction)
+def log_interaction(sender, instance, created, raw=False, **kwargs):
+    """Add interactions with public khatmas to the activity log"""
+    if created and not raw:
+        record_activity(Activity.REACTION, instance.user_id, summary=f'{instance.get_interaction_type_display()}: {instance.public_khatma}', is_public=True)
+
+
+@receiver(post_save, sender=PostReaction)
+def log_reaction(sender, instance, created, raw=False, **kwargs):
+    """Add reactions to khatma chat messages and comments to the activity log"""
+    if not created or raw:
+        return
+    summary = instance.get_reaction_type_display()
+    if instance.khatma_chat_id:
+        khatma = Khatma.objects.only('title', 'group_id', 'is_public').get(pk=instance.khatma_chat.khatma_id)
+        record_activity(Activity.REACTION, instance.user_id, khatma=khatma, summary=f'{summary}: {khatma.title}')
+    else:
+        record_activity(Activity.REACTION, instance.user_id, summary=summary, is_public=True)
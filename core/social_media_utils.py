@@ -1,56 +1,23 @@
 '''"""This module contains Module functionality."""'''
-import os
-from io import BytesIO
-'\n'
 from django.core.files.uploadedfile import SimpleUploadedFile
-'\n'
-from PIL import Image, ImageDraw, ImageFont
 
 def generate_khatma_social_media_image(khatma):
     """
-    Generate a more sophisticated social media sharing image for a Khatma.
-    
+    Generate a social media sharing image for a Khatma.
+
     Args:
         khatma (Khatma): The Khatma instance
-    
+
     Returns:
-        SimpleUploadedFile: Generated image file
+        SimpleUploadedFile or None: The cached share image, or None while it is being rendered
     """
-    width, height = (1200, 630)
-    background_color = (240, 248, 255)
-    image = Image.new('RGB', (width, height), background_color)
-    draw = ImageDraw.Draw(image)
-    try:
-        title_font = ImageFont.truetype('path/to/arabic_bold_font.ttf', 60)
-        subtitle_font = ImageFont.truetype('path/to/arabic_regular_font.ttf', 40)
-    except IOError:
-        title_font = ImageFont.truetype(ImageFont.load_default(), 60)
-        subtitle_font = ImageFont.truetype(ImageFont.load_default(), 40)
-    title = khatma.title or 'ختمة قرآن'
-    title_bbox = draw.textbbox((0, 0), title, font=title_font)
-    title_position = ((width - title_bbox[2]) // 2, 100)
-    draw.text(title_position, title, font=title_font, fill=(0, 0, 139))
-    khatma_type = khatma.get_khatma_type_display()
-    type_bbox = draw.textbbox((0, 0), khatma_type, font=subtitle_font)
-    type_position = ((width - type_bbox[2]) // 2, 200)
-    draw.text(type_position, khatma_type, font=subtitle_font, fill=(70, 130, 180))
-    progress = f'التقدم: {khatma.get_progress_percentage()}%'
-    progress_bbox = draw.textbbox((0, 0), progress, font=subtitle_font)
-    progress_position = ((width - progress_bbox[2]) // 2, 300)
-    draw.text(progress_position, progress, font=subtitle_font, fill=(34, 139, 34))
-    if khatma.khatma_type == 'memorial' and khatma.deceased:
-        memorial_text = f'إهداء إلى روح المرحوم: {khatma.deceased.name}'
-        memorial_bbox = draw.textbbox((0, 0), memorial_text, font=subtitle_font)
-        memorial_position = ((width - memorial_bbox[2]) // 2, 400)
-        draw.text(memorial_position, memorial_text, font=subtitle_font, fill=(139, 0, 0))
-    hashtags = '#ختمة_قرآن #ختمة_رحمة'
-    hashtags_bbox = draw.textbbox((0, 0), hashtags, font=subtitle_font)
-    hashtags_position = ((width - hashtags_bbox[2]) // 2, 500)
-    draw.text(hashtags_position, hashtags, font=subtitle_font, fill=(0, 123, 255))
-    image_io = BytesIO()
-    image.save(image_io, format='PNG')
-    image_io.seek(0)
-    return SimpleUploadedFile(f'khatma_{khatma.id}_social_media.png', image_io.getvalue(), content_type='image/png')
+    from .share_images import READY, ensure_share_image, share_image_job
+    job = share_image_job(khatma)
+    if ensure_share_image(job) != READY:
+        return None
+    with open(job['path'], 'rb') as image:
+        content = image.read()
+    return SimpleUploadedFile(f'khatma_{khatma.id}_social_media.png', content, content_type='image/png')
 
 def generate_khatma_share_link(khatma):
     """
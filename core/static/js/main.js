@@ -93,25 +93,59 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // Function to update Khatma progress
     function updateKhatmaProgress(khatmaId) {
+        if (progressStream) {
+            // The progress stream pushes the new counters
+            return;
+        }
         fetch('/khatma/api/khatma/' + khatmaId + '/progress/')
         .then(response => response.json())
-        .then(data => {
-            var progressBar = document.querySelector('#khatma-progress-bar');
-            if (progressBar) {
-                progressBar.style.width = data.progress_percentage + '%';
-                progressBar.setAttribute('aria-valuenow', data.progress_percentage);
-                document.querySelector('#completed-parts').textContent = data.completed_parts;
-                document.querySelector('#total-parts').textContent = data.total_parts;
-            }
-            
-            // If Khatma is completed, show completion message
-            if (data.is_completed && !document.querySelector('#khatma-completed-alert')) {
-                var alertDiv = document.createElement('div');
-                alertDiv.id = 'khatma-completed-alert';
-                alertDiv.className = 'alert alert-success';
-                alertDiv.innerHTML = '<i class="fas fa-check-circle"></i> تم إكمال الختمة بنجاح!';
-                document.querySelector('.khatma-progress-container').appendChild(alertDiv);
+        .then(renderKhatmaProgress);
+    }
+
+    function renderKhatmaProgress(data) {
+        var progressBar = document.querySelector('#khatma-progress-bar');
+        if (progressBar) {
+            progressBar.style.width = data.progress_percentage + '%';
+            progressBar.setAttribute('aria-valuenow', data.progress_percentage);
+            progressBar.textContent = Math.round(data.progress_percentage) + '%';
+            document.querySelector('#completed-parts').textContent = data.completed_parts;
+            document.querySelector('#total-parts').textContent = data.total_parts;
+        }
+
+        // If Khatma is completed, show completion message
+        if (data.is_completed && !document.querySelector('#khatma-completed-alert')) {
+            var alertDiv = document.createElement('div');
+            alertDiv.id = 'khatma-completed-alert';
+            alertDiv.className = 'alert alert-success';
+            alertDiv.innerHTML = '<i class="fas fa-check-circle"></i> تم إكمال الختمة بنجاح!';
+            document.querySelector('.khatma-progress-container').appendChild(alertDiv);
+        }
+    }
+
+    // Receive progress events pushed by the server instead of polling. The page
+    // only carries a stream URL when the server runs under ASGI; if the stream
+    // fails, close it and go back to fetching the progress after each change
+    var progressContainer = document.querySelector('.khatma-progress-container[data-progress-stream-url]');
+    var progressStream = null;
+    if (progressContainer && window.EventSource) {
+        progressStream = new EventSource(progressContainer.dataset.progressStreamUrl);
+        progressStream.addEventListener('error', function() {
+            if (!progressStream) {
+                return;
             }
+            progressStream.close();
+            progressStream = null;
+            updateKhatmaProgress(progressContainer.dataset.khatmaId);
+        });
+        ['progress', 'part_completed', 'part_uncompleted', 'part_assigned', 'participant_joined', 'khatma_completed'].forEach(function(eventType) {
+            progressStream.addEventListener(eventType, function(e) {
+                var data = JSON.parse(e.data);
+                renderKhatmaProgress(data);
+                var partItem = data.part_number ? document.querySelector('.part-item[data-part-id="' + data.part_number + '"]') : null;
+                if (partItem && (eventType === 'part_completed' || eventType === 'part_uncompleted')) {
+                    partItem.classList.toggle('completed', eventType === 'part_completed');
+                }
+            });
         });
     }
 
@@ -1,2 +1,440 @@
 """Service tests for core app."""
-from django.test import TestCase
\ No newline at end of file
+import os
+import tempfile
+from io import BytesIO, StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from core.benchmarks import BENCHMARK_VIEWS, compare_to_baseline, load_baseline, pick_benchmark_user, run_benchmarks
+from core.instrumentation import QueryBudgetExceeded, collect, flush_metrics, get_view_metrics, metrics_aggregator
+from core.models import Activity, LeaderboardEntry, SiteStatistics, ViewMetrics
+from core.seeding import SEED_PREFIX, LoadSeeder, clear_seed_data, has_seed_data
+from core.share_images import ShareImageRenderer, progress_bucket, share_image_job, share_image_renderer, share_image_url
+from core.social_media_utils import generate_khatma_social_media_image
+from core.services import (
+    count_active_khatmas, get_dashboard_data, get_group_timeline, get_khatma_timeline, get_leaderboard, get_leaderboard_page, get_site_statistics_series, get_site_timeline, get_site_totals,
+    get_user_rank, get_user_timeline, record_activity, refresh_leaderboard, refresh_site_statistics,
+)
+from khatma.models import Deceased, Khatma, KhatmaPart, Participant, QuranReading
+from khatma.services import KhatmaFactory, complete_all_parts, set_part_completion
+from core.utils.arabic_shaping import shape, shape_for_display
+from groups.models import ReadingGroup
+from notifications.models import Notification
+from users.models import Profile
+
+
+class LeaderboardServiceTest(TestCase):
+    """Tests for the materialized leaderboard."""
+
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(f'reader{i}', f'reader{i}@example.com', 'password') for i in range(3)]
+        khatma = Khatma.objects.create(title='ختمة', creator=self.users[0])
+        Khatma.objects.create(title='ختمة ثانية', creator=self.users[0])
+        Khatma.objects.create(title='ختمة ثالثة', creator=self.users[2])
+        for part_number in range(1, 4):
+            QuranReading.objects.create(participant=self.users[1], khatma=khatma, part_number=part_number, status='completed')
+        QuranReading.objects.create(participant=self.users[2], khatma=khatma, part_number=1, status='completed')
+        QuranReading.objects.create(participant=self.users[0], khatma=khatma, part_number=1, status='in_progress')
+
+    def test_refresh_ranks_users_by_score(self):
+        counts = refresh_leaderboard()
+        self.assertEqual(counts, {'readers': 2, 'creators': 2})
+        readers = list(LeaderboardEntry.objects.filter(board='readers').values_list('user__username', 'rank', 'score'))
+        self.assertEqual(readers, [('reader1', 1, 3), ('reader2', 2, 1)])
+
+    def test_top_list_uses_fixed_number_of_queries(self):
+        refresh_leaderboard()
+        cache.clear()
+        cache.set('leaderboard:readers:fresh', True)
+        with self.assertNumQueries(1):
+            rows = get_leaderboard('readers')
+        self.assertEqual(rows[0]['username'], 'reader1')
+        self.assertEqual(rows[0]['completed_parts'], 3)
+        with self.assertNumQueries(0):
+            get_leaderboard('readers')
+
+    def test_stale_board_is_served_while_refreshing_in_background(self):
+        refresh_leaderboard()
+        cache.delete('leaderboard:readers:fresh')
+        QuranReading.objects.create(participant=self.users[2], khatma=Khatma.objects.first(), part_number=5, status='completed')
+        with self.captureOnCommitCallbacks() as callbacks:
+            rows = get_leaderboard('readers')
+            get_leaderboard_page('readers')
+        self.assertEqual([(row['username'], row['score']) for row in rows], [('reader1', 3), ('reader2', 1)])
+        self.assertEqual(len(callbacks), 1)
+        # The stale rows are not cached over the refreshed ranking
+        self.assertIsNone(cache.get('leaderboard:readers:top:10'))
+
+    def test_user_rank_returns_containing_page(self):
+        refresh_leaderboard()
+        result = get_user_rank(self.users[2], 'readers', page_size=1)
+        self.assertEqual(result['rank'], 2)
+        self.assertEqual(result['page'], 2)
+        self.assertEqual([row['username'] for row in result['entries']], ['reader2'])
+        self.assertIsNone(get_user_rank(self.users[0], 'readers'))
+
+
+class DashboardSnapshotTest(TestCase):
+    """Tests for the cached dashboard snapshot."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'password')
+        creator = User.objects.create_user('creator', 'creator@example.com', 'password')
+        self.khatma = Khatma.objects.create(title='ختمة', creator=creator)
+        Participant.objects.create(user=self.user, khatma=self.khatma)
+        Khatma.objects.create(title='ختمتي', creator=self.user)
+        KhatmaPart.objects.filter(khatma=self.khatma, part_number__in=[1, 2]).update(assigned_to=self.user)
+
+    def test_snapshot_is_built_with_bounded_queries_and_cached(self):
+        with self.assertNumQueries(7):
+            data = get_dashboard_data(self.user)
+        self.assertFalse(data['cached'])
+        self.assertEqual(data['khatmas_count'], 2)
+        self.assertEqual([khatma['title'] for khatma in data['user_khatmas']], ['ختمتي', 'ختمة'])
+        self.assertEqual((data['completed_parts'], data['total_parts']), (0, 2))
+        self.assertEqual([activity['verb'] for activity in data['recent_activities']], ['khatma_created', 'joined'])
+        self.assertLessEqual({'khatmas', 'groups', 'parts', 'activities', 'achievements', 'notifications', 'total'}, set(data['timings']))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(get_dashboard_data(self.user)['cached'])
+
+    def test_events_invalidate_snapshot(self):
+        get_dashboard_data(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            set_part_completion(KhatmaPart.objects.get(khatma=self.khatma, part_number=1), True)
+        data = get_dashboard_data(self.user)
+        self.assertFalse(data['cached'])
+        self.assertEqual(data['completed_parts'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(user=self.user, notification_type='khatma_progress', message='جديد')
+        data = get_dashboard_data(self.user)
+        self.assertFalse(data['cached'])
+        self.assertEqual(data['notifications'][0]['message'], 'جديد')
+
+
+class SiteStatisticsTest(TestCase):
+    """Tests for the daily site statistics rollup."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('creator', 'creator@example.com', 'password')
+
+    def test_signals_count_creations_and_completions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user('reader', 'reader@example.com', 'password')
+            khatma = Khatma.objects.create(title='ختمة', creator=self.user)
+            KhatmaFactory(notification_type=None).create_many(Khatma(title=f'ختمة {i}', creator=self.user) for i in range(2))
+            set_part_completion(KhatmaPart.objects.get(khatma=khatma, part_number=1), True)
+            complete_all_parts(khatma)
+        totals = get_site_totals()
+        self.assertEqual(totals['users_joined'], 1)
+        self.assertEqual(totals['khatmas_created'], 3)
+        self.assertEqual(totals['parts_completed'], 30)
+        self.assertEqual(totals['khatmas_completed'], 1)
+        self.assertEqual(SiteStatistics.objects.count(), 1)
+        self.assertEqual(count_active_khatmas(), 2)
+        Khatma.objects.filter(is_completed=False).first().delete()
+        self.assertEqual(count_active_khatmas(), 1)
+
+    def test_refresh_rebuilds_from_raw_tables(self):
+        khatma = Khatma.objects.create(title='ختمة', creator=self.user)
+        complete_all_parts(khatma)
+        Deceased.objects.create(name='متوفى', death_date='2020-01-01', added_by=self.user)
+        SiteStatistics.objects.create(date='2001-01-01', users_joined=99)
+
+        self.assertEqual(refresh_site_statistics(days=2), 2)
+        self.assertTrue(SiteStatistics.objects.filter(date='2001-01-01').exists())
+        refresh_site_statistics()
+        self.assertFalse(SiteStatistics.objects.filter(date='2001-01-01').exists())
+        totals = get_site_totals()
+        self.assertEqual((totals['users_joined'], totals['khatmas_created'], totals['khatmas_completed']), (1, 1, 1))
+        self.assertEqual((totals['parts_completed'], totals['deceased_added']), (30, 1))
+
+        series = get_site_statistics_series(days=30)
+        self.assertEqual(len(series), 30)
+        self.assertEqual(series[-1]['khatmas_created'], 1)
+        self.assertEqual(series[0]['khatmas_created'], 0)
+
+
+class ActivityTimelineTest(TestCase):
+    """Tests for the activity log and its keyset-paginated timelines."""
+
+    def setUp(self):
+        self.creator = User.objects.create_user('creator', 'creator@example.com', 'password')
+        self.reader = User.objects.create_user('reader', 'reader@example.com', 'password')
+        self.khatma = Khatma.objects.create(title='ختمة عامة', creator=self.creator, is_public=True)
+
+    def test_signals_log_activities(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Participant.objects.create(user=self.creator, khatma=self.khatma)
+            Participant.objects.create(user=self.reader, khatma=self.khatma)
+            set_part_completion(KhatmaPart.objects.get(khatma=self.khatma, part_number=3), True, user=self.reader)
+            KhatmaFactory(notification_type=None).create_many(Khatma(title=f'ختمة {i}', creator=self.reader) for i in range(2))
+
+        activities = get_khatma_timeline(self.khatma)['activities']
+        self.assertEqual([activity.verb for activity in activities], [Activity.PART_COMPLETED, Activity.JOINED, Activity.KHATMA_CREATED])
+        self.assertEqual((activities[0].actor, activities[0].part_number, activities[0].summary), (self.reader, 3, 'ختمة عامة'))
+        self.assertEqual(Activity.objects.filter(actor=self.reader, verb=Activity.KHATMA_CREATED).count(), 2)
+
+    def test_timelines_use_keyset_pages(self):
+        for part_number in range(1, 6):
+            record_activity(Activity.PART_COMPLETED, self.reader.pk, khatma=self.khatma, part_number=part_number)
+        private = Khatma.objects.create(title='ختمة خاصة', creator=self.reader)
+
+        with self.assertNumQueries(1):
+            page = get_user_timeline(self.reader, limit=2)
+        self.assertEqual([activity.part_number for activity in page['activities']], [None, 5])
+        seen = []
+        while True:
+            seen += page['activities']
+            if not page['next_cursor']:
+                break
+            page = get_user_timeline(self.reader, before=page['next_cursor'], limit=2)
+        self.assertEqual([activity.part_number for activity in seen], [None, 5, 4, 3, 2, 1])
+
+        site = get_site_timeline()['activities']
+        self.assertNotIn(private.pk, [activity.khatma_id for activity in site])
+        self.assertEqual(len(site), 6)
+        self.assertEqual(len(get_site_timeline(public_only=False)['activities']), 7)
+
+    def test_group_timeline_hides_private_khatmas_from_non_members(self):
+        # bulk_create skips the group's post_save signal, which writes a chat message
+        group, = ReadingGroup.objects.bulk_create([ReadingGroup(name='مجموعة عامة', creator=self.creator, is_public=True)])
+        public = Khatma.objects.create(title='ختمة المجموعة', creator=self.creator, group=group, is_public=True)
+        private = Khatma.objects.create(title='ختمة الأعضاء', creator=self.creator, group=group, is_public=False)
+        record_activity(Activity.JOINED, self.creator.pk, group_id=group.pk, summary=group.name)
+        for khatma in (public, private):
+            record_activity(Activity.PART_COMPLETED, self.creator.pk, khatma=khatma, part_number=1)
+        url = reverse('core:activity_timeline_api')
+
+        self.client.force_login(self.reader)
+        activities = self.client.get(url, {'scope': 'group', 'group_id': group.pk}).json()['activities']
+        self.assertNotIn('ختمة الأعضاء', [activity['summary'] for activity in activities])
+        self.assertEqual(len(activities), len(get_group_timeline(group)['activities']) - 2)
+        with CaptureQueriesContext(connection) as queries:
+            get_group_timeline(group, public_only=True)
+        self.assertNotIn('"khatma_khatma"."is_public"', ' '.join(query['sql'] for query in queries))
+
+        self.client.force_login(self.creator)
+        activities = self.client.get(url, {'scope': 'group', 'group_id': group.pk}).json()['activities']
+        self.assertIn('ختمة الأعضاء', [activity['summary'] for activity in activities])
+
+
+class ShareImageTest(TestCase):
+    """Tests for the cached khatma share images."""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        settings_override = override_settings(SHARE_IMAGE_ROOT=self.root, SHARE_IMAGE_WORKERS=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        user = User.objects.create_user('creator', 'creator@example.com', 'password')
+        deceased = Deceased.objects.create(name='فلان', death_date='2020-01-01', added_by=user)
+        self.khatma = Khatma.objects.create(title='ختمة الرحمة', creator=user, khatma_type='memorial', deceased=deceased)
+
+    def test_buckets_and_versions(self):
+        self.assertEqual([progress_bucket(value) for value in (0, 9.9, 45, 99.9, 100)], [0, 0, 40, 90, 100])
+        self.khatma.progress = 41
+        version = share_image_job(self.khatma)['version']
+        self.khatma.progress = 49
+        self.assertEqual(share_image_job(self.khatma)['version'], version)
+        self.khatma.progress = 50
+        self.assertNotEqual(share_image_job(self.khatma)['version'], version)
+        self.khatma.title = 'ختمة أخرى'
+        self.assertNotEqual(share_image_job(self.khatma)['version'], version)
+
+    def test_renders_once_and_serves_with_long_cache(self):
+        url = share_image_url(self.khatma)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+        image = Image.open(BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual((image.format, image.size), ('PNG', (1200, 630)))
+        path = share_image_job(self.khatma)['path']
+        os.utime(path, (1, 1))
+        self.client.get(url)
+        self.assertEqual(os.stat(path).st_mtime, 1)
+
+        # Crossing a bucket draws a new card, replaces the old one and redirects its URL
+        Khatma.objects.filter(pk=self.khatma.pk).update(progress=20)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.client.get(response['Location']).status_code, 200)
+        self.assertEqual(len(os.listdir(self.root)), 1)
+
+    def test_image_rendered_elsewhere_asks_to_retry(self):
+        url = share_image_url(self.khatma)
+        cache.add(f"share-image:{share_image_job(self.khatma)['key']}:lock", True)
+        response = self.client.get(url)
+        self.assertEqual((response.status_code, response['Retry-After']), (202, '5'))
+
+    @override_settings(SHARE_IMAGE_WORKERS=1)
+    def test_request_queues_the_render_without_waiting(self):
+        url = share_image_url(self.khatma)
+        job = share_image_job(self.khatma)
+        self.assertEqual(self.client.get(url).status_code, 202)
+        future = share_image_renderer.submit(job)
+        self.assertEqual(future.result(timeout=30), job['path'])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(generate_khatma_social_media_image(self.khatma).content_type, 'image/png')
+
+        self.khatma.title = 'ختمة أخرى'
+        self.assertIsNone(generate_khatma_social_media_image(self.khatma))
+        share_image_renderer.submit(share_image_job(self.khatma)).result(timeout=30)
+
+    def test_share_pages_queue_the_card(self):
+        self.client.force_login(self.khatma.creator)
+        response = self.client.get(reverse('khatma:share_khatma', args=[self.khatma.id]))
+        self.assertEqual(response.context['share_image_url'], 'http://testserver' + share_image_url(self.khatma))
+        # The card was rendered with the page, before anyone fetched it
+        self.assertTrue(os.path.exists(share_image_job(self.khatma)['path']))
+
+    @override_settings(SHARE_IMAGE_WORKERS=1, SHARE_IMAGE_MAX_PENDING=1)
+    def test_renderer_pool_shares_pending_jobs(self):
+        renderer = ShareImageRenderer()
+        job = share_image_job(self.khatma)
+        first = renderer.submit(job)
+        self.assertIs(renderer.submit(job), first)
+        self.assertIsNone(renderer.submit({**job, 'key': 'other'}))
+        self.assertEqual(first.result(timeout=30), job['path'])
+
+    def test_bundled_arabic_fonts(self):
+        fonts = share_image_job(self.khatma)['fonts']
+        self.assertEqual({style: os.path.basename(path) for style, path in fonts.items()}, {'bold': 'Amiri-Bold.ttf', 'regular': 'Amiri-Regular.ttf'})
+        self.assertEqual(os.path.dirname(fonts['regular']), os.path.join(settings.BASE_DIR, 'core', 'fonts'))
+
+    def test_arabic_shaping(self):
+        self.assertEqual(shape('سلام'), '\ufeb3\ufefc\ufee1')
+        self.assertEqual(shape('ختمة'), '\ufea7\ufe98\ufee4\ufe94')
+        self.assertEqual(shape_for_display('التقدم: 40%'), '40% :' + shape('التقدم')[::-1])
+
+
+@override_settings(QUERY_METRICS_SAMPLE_RATE=1.0, QUERY_METRICS_FLUSH_INTERVAL=None, QUERY_BUDGET_STRICT=True)
+class QueryBudgetMiddlewareTest(TestCase):
+    """Tests for the per-view request instrumentation and query budgets."""
+
+    def setUp(self):
+        cache.clear()
+        metrics_aggregator.take()
+        self.addCleanup(metrics_aggregator.take)
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'password')
+        self.client.force_login(self.user)
+
+    def test_collect_counts_queries_templates_and_cache(self):
+        cache.set('present', 1)
+        with collect() as metrics:
+            User.objects.count()
+            cache.get('present')
+            cache.get('absent')
+            cache.get_many(['present', 'absent'])
+            render_to_string('core/error.html', {'error': 'x'})
+        self.assertEqual(metrics.queries, 1)
+        self.assertEqual((metrics.cache_hits, metrics.cache_misses), (2, 2))
+        self.assertGreater(metrics.template_time, 0)
+        self.assertIsNone(cache.get('absent'))
+
+    def test_records_and_reports_sampled_views(self):
+        self.client.get('/api/activity/', {'scope': 'me'})
+        self.client.get('/api/activity/', {'scope': 'me'})
+        self.assertEqual(flush_metrics(), 1)
+        row = ViewMetrics.objects.get(view_name='core:activity_timeline_api')
+        self.assertEqual((row.requests, row.budget, row.over_budget), (2, 6, 0))
+        self.assertGreater(row.queries, 0)
+
+        self.client.get('/api/activity/')
+        flush_metrics()
+        report = get_view_metrics()
+        self.assertEqual([view['view'] for view in report], ['core:activity_timeline_api'])
+        self.assertEqual(report[0]['requests'], 3)
+
+        out = StringIO()
+        call_command('query_budget_report', stdout=out)
+        self.assertIn('core:activity_timeline_api', out.getvalue())
+
+    def test_staff_metrics_endpoint(self):
+        self.assertEqual(self.client.get('/admin/metrics/views/').status_code, 302)
+        self.user.is_staff = True
+        self.user.save()
+        data = self.client.get('/admin/metrics/views/').json()
+        # The previous request was flushed by this one
+        self.assertEqual(data['views'][0]['view'], 'view_metrics_api')
+
+    def test_budget_overrun_fails_in_strict_mode(self):
+        with override_settings(QUERY_BUDGETS={'core:activity_timeline_api': 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/api/activity/', {'scope': 'me'})
+            with override_settings(QUERY_BUDGET_STRICT=False), self.assertLogs('core.middleware', 'WARNING'):
+                self.assertEqual(self.client.get('/api/activity/', {'scope': 'me'}).status_code, 200)
+        flush_metrics()
+        self.assertEqual(ViewMetrics.objects.get(view_name='core:activity_timeline_api').over_budget, 2)
+
+    @override_settings(QUERY_METRICS_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_measured(self):
+        self.client.get('/api/activity/')
+        self.assertEqual(metrics_aggregator.take(), {})
+
+
+class LoadSeedingTest(TestCase):
+    """Tests for the synthetic load data and the view benchmarks."""
+
+    volumes = {'users': 30, 'groups': 3, 'members_per_group': 6, 'khatmas': 12, 'readings_per_part': 2, 'messages_per_khatma': 2, 'notifications_per_user': 3}
+
+    def setUp(self):
+        cache.clear()
+        self.counts = LoadSeeder(volumes=self.volumes, seed=1, batch_size=50, chunk_size=5).run()
+
+    def test_seeds_consistent_rows(self):
+        self.assertEqual(self.counts['users'], 30)
+        self.assertEqual(User.objects.filter(username__startswith=SEED_PREFIX).count(), 30)
+        self.assertEqual(Profile.objects.filter(user__username__startswith=SEED_PREFIX).count(), 30)
+        self.assertEqual(KhatmaPart.objects.count(), 12 * Khatma.TOTAL_PARTS)
+        self.assertEqual(Notification.objects.count(), 90)
+        for khatma in Khatma.objects.all():
+            completed = khatma.parts.filter(is_completed=True).count()
+            self.assertEqual(khatma.completed_parts_count, completed)
+            self.assertEqual(khatma.is_completed, completed == Khatma.TOTAL_PARTS)
+            self.assertTrue(Participant.objects.filter(khatma=khatma, user=khatma.creator).exists())
+        self.assertEqual(
+            sum(Participant.objects.values_list('parts_read', flat=True)),
+            KhatmaPart.objects.filter(is_completed=True, assigned_to__isnull=False).count(),
+        )
+        self.assertTrue(LeaderboardEntry.objects.filter(board='readers').exists())
+
+        self.assertTrue(has_seed_data())
+        clear_seed_data()
+        self.assertFalse(has_seed_data())
+        self.assertFalse(Khatma.objects.exists())
+
+    def test_benchmarks_report_and_compare(self):
+        user = pick_benchmark_user()
+        results = run_benchmarks(user, iterations=2, warmup=0)
+        self.assertEqual(set(results), set(BENCHMARK_VIEWS))
+        for name, row in results.items():
+            self.assertEqual(row['status'], 200, name)
+            self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+        self.assertFalse(ViewMetrics.objects.exists())
+
+        self.assertEqual(compare_to_baseline(results, results), [])
+        baseline = {'index': {**results['index'], 'max_queries': results['index']['max_queries'] - 1, 'p95_ms': results['index']['p95_ms'] / 2}}
+        self.assertEqual({regression['metric'] for regression in compare_to_baseline(results, baseline)}, {'max_queries', 'p95_ms'})
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            call_command('benchmark_views', iterations=1, warmup=0, view=['index'], baseline=path, save_baseline=True, stdout=StringIO())
+            self.assertEqual(list(load_baseline(path)), ['index'])
@@ -15,6 +15,8 @@ urlpatterns = [
     path('community/khatmas/', views.community_khatmas, name='community_khatmas'),
     # Remove the community/leaderboard path and use leaderboard directly
     path('leaderboard/', views.community_leaderboard, name='community_leaderboard'),
+    path('api/leaderboard/', views.leaderboard_page_api, name='leaderboard_page_api'),
+    path('api/activity/', views.activity_timeline_api, name='activity_timeline_api'),
     path('groups/', views.group_list, name='group_list'),  # Changed to use the group_list view
     path('groups/create/', views.create_group, name='create_group'),  # Added create_group view
     path('khatma/dashboard/', views.khatma_dashboard, name='khatma_dashboard'),
@@ -0,0 +1,114 @@
+"""Arabic shaping for drawing text with engines that do no complex layout.
+
+Pillow only shapes Arabic when it is built with libraqm. Without it letters
+are drawn in their isolated forms and left to right. ``shape_for_display``
+substitutes the contextual presentation forms (U+FE70-U+FEFF, including the
+lam-alef ligatures) and reorders a line visually, so the result can be drawn
+as plain left-to-right text. Runs of Latin letters and digits keep their
+order; everything else is treated as right-to-left, which is enough for the
+short single-line texts of the share images.
+"""
+import re
+
+# Letters of U+0621-U+064A in order with their number of contextual forms in the
+# U+FE80 block (isolated, final, and for dual-joining letters initial and medial)
+_FORM_COUNTS = (
+    ('ء', 1), ('آ', 2), ('أ', 2), ('ؤ', 2), ('إ', 2), ('ئ', 4),
+    ('ا', 2), ('ب', 4), ('ة', 2), ('ت', 4), ('ث', 4), ('ج', 4),
+    ('ح', 4), ('خ', 4), ('د', 2), ('ذ', 2), ('ر', 2), ('ز', 2),
+    ('س', 4), ('ش', 4), ('ص', 4), ('ض', 4), ('ط', 4), ('ظ', 4),
+    ('ع', 4), ('غ', 4), ('ف', 4), ('ق', 4), ('ك', 4), ('ل', 4),
+    ('م', 4), ('ن', 4), ('ه', 4), ('و', 2), ('ى', 2), ('ي', 4),
+)
+
+
+def _build_forms():
+    forms, code = {}, 0xFE80
+    for letter, count in _FORM_COUNTS:
+        forms[letter] = tuple(chr(code + index) for index in range(count))
+        code += count
+    return forms
+
+
+FORMS = _build_forms()
+TATWEEL = 'ـ'
+LAM = 'ل'
+# Isolated and final forms of lam followed by alef madda, hamza above, hamza below and plain alef
+LAM_ALEF = {'آ': ('ﻵ', 'ﻶ'), 'أ': ('ﻷ', 'ﻸ'), 'إ': ('ﻹ', 'ﻺ'), 'ا': ('ﻻ', 'ﻼ')}
+ISOLATED, FINAL, INITIAL, MEDIAL = range(4)
+MIRRORED = str.maketrans('()[]{}<>', ')(][}{><')
+CLUSTER = re.compile('.[\u064b-\u065f\u0670]*', re.DOTALL)
+LTR_RUN = re.compile(r'([0-9A-Za-z٠-٩](?:[0-9A-Za-z٠-٩.,:/%+\-]*[0-9A-Za-z٠-٩%])?)')
+
+
+def _is_mark(char):
+    """Return whether char is a harakat or other combining mark, which does not affect joining."""
+    return 'ً' <= char <= 'ٟ' or char == 'ٰ'
+
+
+def _joins_next(char):
+    """Return whether char connects to the letter after it."""
+    return char == TATWEEL or len(FORMS.get(char, ())) == 4
+
+
+def _joins_previous(char):
+    """Return whether char connects to the letter before it."""
+    return char == TATWEEL or len(FORMS.get(char, ())) > 1
+
+
+def shape(text):
+    """
+    Replace Arabic letters by their contextual presentation forms (logical order is kept).
+
+    Args:
+        text: Text in logical order
+
+    Returns:
+        str: The shaped text
+    """
+    letters = [index for index, char in enumerate(text) if not _is_mark(char)]
+    output = []
+    skip = None
+    for position, index in enumerate(letters):
+        char = text[index]
+        marks = text[index + 1:letters[position + 1]] if position + 1 < len(letters) else text[index + 1:]
+        if index == skip:
+            output.append(marks)
+            continue
+        previous = text[letters[position - 1]] if position else ''
+        following = text[letters[position + 1]] if position + 1 < len(letters) else ''
+        joined_before = _joins_next(previous)
+        if char == LAM and following in LAM_ALEF:
+            output.append(LAM_ALEF[following][FINAL if joined_before else ISOLATED] + marks)
+            skip = letters[position + 1]
+            continue
+        forms = FORMS.get(char)
+        if forms is None:
+            output.append(char + marks)
+            continue
+        joined_after = len(forms) == 4 and _joins_previous(following)
+        if joined_before and joined_after:
+            form = MEDIAL
+        elif joined_before:
+            form = FINAL
+        elif joined_after:
+            form = INITIAL
+        else:
+            form = ISOLATED
+        output.append(forms[min(form, len(forms) - 1)] + marks)
+    return ''.join(output)
+
+
+def visual_order(text):
+    """Reorder a right-to-left line for left-to-right drawing, keeping Latin and digit runs readable."""
+    parts = LTR_RUN.split(text)
+    # Letters are reversed with their combining marks so the marks stay on them
+    return ''.join(
+        part if index % 2 else ''.join(reversed(CLUSTER.findall(part))).translate(MIRRORED)
+        for index, part in reversed(list(enumerate(parts)))
+    )
+
+
+def shape_for_display(text):
+    """Shape and reorder a line of Arabic text for engines without complex layout support."""
+    return visual_order(shape(text))
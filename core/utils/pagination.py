@@ -0,0 +1,85 @@
+"""
+Keyset (cursor) pagination on (created_at, id).
+
+Cursors are opaque strings pointing at a row's position, so pages stay stable
+while new rows are inserted and every page is an index range scan instead of
+an OFFSET.
+"""
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(obj):
+    """Return an opaque cursor pointing at an object's (created_at, id) position."""
+    raw = f'{obj.created_at.isoformat()}|{obj.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Returns:
+        tuple: (created_at, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, object_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(object_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+
+def older_than(queryset, cursor):
+    """Filter a queryset to the rows positioned before a cursor."""
+    created_at, object_id = decode_cursor(cursor)
+    return queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=object_id))
+
+
+def newer_than(queryset, cursor):
+    """Filter a queryset to the rows positioned after a cursor."""
+    created_at, object_id = decode_cursor(cursor)
+    return queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=object_id))
+
+
+def encode_sort_cursor(obj, field):
+    """Return an opaque cursor pointing at an object's (field, created_at, id) position in a list sorted by field first."""
+    raw = f'{getattr(obj, field)}|{obj.created_at.isoformat()}|{obj.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_sort_cursor(cursor):
+    """
+    Decode a cursor produced by ``encode_sort_cursor``.
+
+    Returns:
+        tuple: (field value as a string, created_at, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        value, created_at, object_id = raw.rsplit('|', 2)
+        return value, datetime.fromisoformat(created_at), int(object_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+
+def past_sort_cursor(queryset, field, cursor, descending=True):
+    """
+    Filter a queryset to the rows positioned after a cursor, for lists ordered
+    by field (descending or ascending), then newest first.
+    """
+    value, created_at, object_id = decode_sort_cursor(cursor)
+    beyond = f'{field}__lt' if descending else f'{field}__gt'
+    return queryset.filter(
+        Q(**{beyond: value})
+        | Q(**{field: value, 'created_at__lt': created_at})
+        | Q(**{field: value, 'created_at': created_at, 'id__lt': object_id})
+    )
@@ -12,29 +12,44 @@ logger = logging.getLogger(__name__)
 def count_queries(func):
     """
     Decorator to count the number of database queries executed by a function.
-    Only works when DEBUG is True.
+    Counts through a database execute wrapper, so it also works with DEBUG off;
+    the SQL of the queries is only logged when DEBUG is True.
     """
 
     @wraps(func)
     def wrapper(*args, **kwargs):
         '''"""Function to wrapper."""'''
-        if not settings.DEBUG:
-            return func(*args, **kwargs)
-        reset_queries()
+        from core.instrumentation import collect
+        if settings.DEBUG:
+            reset_queries()
         start_time = time.time()
-        result = func(*args, **kwargs)
+        with collect() as metrics:
+            result = func(*args, **kwargs)
         end_time = time.time()
-        query_count = len(connection.queries)
-        query_time = sum((float(q.get('time', 0)) for q in connection.queries))
-        logger.debug(f'Function {func.__name__} executed {query_count} queries in {query_time:.4f}s')
+        logger.debug(f'Function {func.__name__} executed {metrics.queries} queries in {metrics.db_time:.4f}s')
         logger.debug(f'Total execution time: {end_time - start_time:.4f}s')
-        if query_count > 10:
-            logger.warning(f'Function {func.__name__} executed {query_count} queries. Consider optimizing.')
-            for i, query in enumerate(connection.queries):
-                logger.debug(f"Query {i + 1}: {query['sql']}")
+        if metrics.queries > 10:
+            logger.warning(f'Function {func.__name__} executed {metrics.queries} queries. Consider optimizing.')
+            if settings.DEBUG:
+                for i, query in enumerate(connection.queries):
+                    logger.debug(f"Query {i + 1}: {query['sql']}")
         return result
     return wrapper
 
+def query_budget(max_queries):
+    """
+    Decorator declaring the maximum number of queries a view may run per request.
+
+    The budget covers the whole request (session and user loading included)
+    and is checked by core.middleware.QueryBudgetMiddleware: requests over it
+    are logged, and fail the test that made them under ``manage.py test``.
+    """
+
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
 def optimize_queryset(queryset, related_fields=None, prefetch_fields=None):
     """
     Optimize a queryset by using select_related and prefetch_related.
@@ -4,7 +4,7 @@ from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.models import User
 from django.db.models import Q, Count
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.core.paginator import Paginator
 from django.views.decorators.http import require_POST
 from django.utils import timezone
@@ -13,22 +13,30 @@ from django.views import View
 from django.http import HttpResponseRedirect
 import logging
 import traceback
-import os
 
 # Import for social authentication
 from allauth.socialaccount.views import SignupView
 
 # Import models from other apps
 from users.models import Profile, UserAchievement
+from khatma.listing import get_public_khatma_page
 from khatma.models import Khatma, Deceased, PartAssignment, Participant, QuranReading
-from quran.models import QuranPart, Surah, Ayah
+from quran.models import QuranPart, QuranReciter, Surah, Ayah
+from quran.corpus import get_corpus
+from quran.catalog import get_reciter_surahs
 from groups.models import ReadingGroup, GroupMembership
 from notifications.models import Notification
 from .models import NewsletterSubscription
 from .forms import NewsletterSubscriptionForm
 
 # Import services
-from core.services import get_dashboard_data, get_community_data, search_global
+from core.services import (
+    get_dashboard_data, get_community_data, search_global,
+    get_leaderboard, get_leaderboard_page, get_user_rank,
+    get_user_timeline, get_group_timeline, get_site_timeline, serialize_activity,
+    LEADERBOARD_BOARDS, LEADERBOARD_PAGE_SIZE, ACTIVITY_PAGE_SIZE,
+)
+from core.utils.query_optimization import query_budget
 
 logger = logging.getLogger(__name__)
 
@@ -127,6 +135,7 @@ class CustomSocialSignupView(SignupView):
         return response
 
 
+@query_budget(12)
 def index(request):
     """
     Home page view.
@@ -143,7 +152,13 @@ def index(request):
             dashboard_data = get_dashboard_data(request.user)
             # Add a flag to prevent redirection
             dashboard_data['prevent_redirect'] = True
-            return render(request, 'core/user_dashboard.html', dashboard_data)
+            response = render(request, 'core/user_dashboard.html', dashboard_data)
+            # Per-section build times of the snapshot (shown in the browser's network panel)
+            response['Server-Timing'] = ', '.join(
+                [f'dashboard-{section};dur={duration}' for section, duration in dashboard_data['timings'].items()]
+                + [f'dashboard-cache;desc={"hit" if dashboard_data["cached"] else "miss"}']
+            )
+            return response
 
         # Otherwise show welcome page
         return render(request, 'core/welcome.html')
@@ -271,108 +286,131 @@ def community(request):
         return render(request, 'core/error.html', {'error': str(e)})
 
 
+@query_budget(8)
 def community_khatmas(request):
     """
     Community khatmas page view.
     """
     try:
-        khatma_type = request.GET.get('type')
+        khatma_type = request.GET.get('type') or None
 
-        # Get public khatmas
-        public_khatmas = Khatma.objects.filter(is_public=True).order_by('-created_at')
-
-        # Filter by type if specified
-        if khatma_type:
-            public_khatmas = public_khatmas.filter(khatma_type=khatma_type)
-
-        # Paginate results
-        paginator = Paginator(public_khatmas, 12)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        # First page of the public khatmas (keyset "load more" pages) and of the memorial ones
+        try:
+            page = get_public_khatma_page(khatma_type=khatma_type, after=request.GET.get('after'), with_count=False)
+        except ValueError:
+            page = get_public_khatma_page(khatma_type=khatma_type, with_count=False)
+        memorial_khatmas = get_public_khatma_page(khatma_type='memorial', limit=6, with_count=False)['khatmas']
 
-        # Get khatma types for filter
-        khatma_types = dict(Khatma.KHATMA_TYPE_CHOICES)
+        next_query = None
+        if page['next_cursor']:
+            query = request.GET.copy()
+            query['after'] = page['next_cursor']
+            next_query = query.urlencode()
 
         return render(request, 'core/community_khatmas.html', {
-            'page_obj': page_obj,
-            'khatma_types': khatma_types,
-            'selected_type': khatma_type
+            'community_khatmas': page['khatmas'],
+            'memorial_khatmas': memorial_khatmas,
+            'load_more_query': next_query,
+            'khatma_types': dict(Khatma.KHATMA_TYPE_CHOICES),
+            'selected_type': khatma_type,
+            'recent_activities': get_site_timeline(limit=10)['activities']
         })
     except Exception as e:
         logger.error(f"Error in community_khatmas view: {str(e)}")
         return render(request, 'core/error.html', {'error': str(e)})
 
 
+@query_budget(10)
 def community_leaderboard(request):
     """
     Community leaderboard page view.
     """
     try:
-        # Create a list of top readers with completed parts
-        users = User.objects.all()
-        top_readers_list = []
-
-        for user in users:
-            # Get profile or create if it doesn't exist
-            try:
-                profile = Profile.objects.get(user=user)
-            except Profile.DoesNotExist:
-                profile = Profile.objects.create(user=user)
-
-            # Count completed readings
-            completed_parts_count = QuranReading.objects.filter(
-                participant=user,
-                status='completed'
-            ).count()
-
-            if completed_parts_count > 0:
-                top_readers_list.append({
-                    'username': user.username,
-                    'date_joined': user.date_joined,
-                    'completed_parts': completed_parts_count,
-                    'profile': profile
-                })
-
-        # Sort by completed parts (descending)
-        top_readers_list.sort(key=lambda x: x['completed_parts'], reverse=True)
-        # Take top 10
-        top_readers = top_readers_list[:10]
-
-        # Create a list of top creators with khatma count
-        top_creators_list = []
-
-        for user in users:
-            # Get profile or create if it doesn't exist
-            try:
-                profile = Profile.objects.get(user=user)
-            except Profile.DoesNotExist:
-                profile = Profile.objects.create(user=user)
-
-            # Count created khatmas
-            created_khatmas_count = Khatma.objects.filter(creator=user).count()
-
-            if created_khatmas_count > 0:
-                top_creators_list.append({
-                    'username': user.username,
-                    'date_joined': user.date_joined,
-                    'created_khatmas': created_khatmas_count,
-                    'profile': profile
-                })
-
-        # Sort by created khatmas (descending)
-        top_creators_list.sort(key=lambda x: x['created_khatmas'], reverse=True)
-        # Take top 10
-        top_creators = top_creators_list[:10]
+        my_ranks = {}
+        if request.user.is_authenticated:
+            my_ranks = {board: get_user_rank(request.user, board) for board in LEADERBOARD_BOARDS}
 
         return render(request, 'core/community_leaderboard.html', {
-            'top_readers': top_readers,
-            'top_creators': top_creators
+            'top_readers': get_leaderboard('readers'),
+            'top_creators': get_leaderboard('creators'),
+            'my_reader_rank': my_ranks.get('readers'),
+            'my_creator_rank': my_ranks.get('creators')
         })
     except Exception as e:
         logger.error(f"Error in community_leaderboard view: {str(e)}")
         return render(request, 'core/error.html', {'error': str(e)})
 
 
+@query_budget(4)
+def leaderboard_page_api(request):
+    """
+    API view returning one page of a leaderboard, or the page holding the
+    current user when `me=1` is passed.
+    """
+    board = request.GET.get('board', 'readers')
+    if board not in LEADERBOARD_BOARDS:
+        return JsonResponse({'status': 'error', 'message': 'لوحة غير معروفة'}, status=400)
+    try:
+        page_size = min(max(int(request.GET.get('page_size', LEADERBOARD_PAGE_SIZE)), 1), 100)
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'طلب غير صالح'}, status=400)
+
+    if request.GET.get('me'):
+        if not request.user.is_authenticated:
+            return JsonResponse({'status': 'error', 'message': 'يجب تسجيل الدخول'}, status=401)
+        data = get_user_rank(request.user, board, page_size=page_size)
+        if data is None:
+            return JsonResponse({'status': 'success', 'board': board, 'rank': None, 'entries': []})
+    else:
+        data = get_leaderboard_page(board, page, page_size=page_size)
+
+    data['entries'] = [
+        {key: value for key, value in row.items() if key != 'profile'}
+        for row in data['entries']
+    ]
+    data['status'] = 'success'
+    return JsonResponse(data)
+
+
+@query_budget(6)
+def activity_timeline_api(request):
+    """
+    API view returning one page of an activity timeline, newest first.
+
+    `scope` is `site` (public activities), `me` (the current user's
+    activities) or `group` (with `group_id`, for group members). Pass the
+    returned `next_cursor` as `before` to load the following page.
+    """
+    scope = request.GET.get('scope', 'site')
+    before = request.GET.get('before') or None
+    try:
+        limit = int(request.GET.get('limit', ACTIVITY_PAGE_SIZE))
+        if scope == 'site':
+            page = get_site_timeline(before=before, limit=limit)
+        elif scope in ('me', 'group'):
+            if not request.user.is_authenticated:
+                return JsonResponse({'status': 'error', 'message': 'يجب تسجيل الدخول'}, status=401)
+            if scope == 'me':
+                page = get_user_timeline(request.user, before=before, limit=limit)
+            else:
+                group = get_object_or_404(ReadingGroup, pk=int(request.GET.get('group_id', 0)))
+                is_member = group.creator_id == request.user.pk or GroupMembership.objects.filter(group=group, user=request.user, is_active=True).exists()
+                if not group.is_public and not is_member:
+                    return JsonResponse({'status': 'error', 'message': 'ليس لديك صلاحية لعرض نشاطات هذه المجموعة'}, status=403)
+                page = get_group_timeline(group, before=before, limit=limit, public_only=not is_member)
+        else:
+            return JsonResponse({'status': 'error', 'message': 'نطاق غير معروف'}, status=400)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'طلب غير صالح'}, status=400)
+
+    return JsonResponse({
+        'status': 'success',
+        'activities': [serialize_activity(activity) for activity in page['activities']],
+        'next_cursor': page['next_cursor'],
+    })
+
+
 @login_required
 def khatma_dashboard(request):
     """
@@ -503,9 +541,10 @@ def quran_reciters(request):
     Quran reciters view.
     """
     try:
-        # This would typically come from a Reciter model, but for now we'll use a static list
+        # Reciters come from the catalog index built by `manage.py index_reciters`
         reciters = [
-            {'id': 1, 'name': 'محمد أحمد الزين', 'style': 'مرتل', 'image': 'reciters/alzain.mohamed.ahmed/profile.jpg', 'folder': 'alzain.mohamed.ahmed'},
+            _reciter_card(reciter)
+            for reciter in QuranReciter.objects.filter(folder__isnull=False, scanned_at__isnull=False).order_by('name_arabic')
         ]
 
         return render(request, 'core/quran_reciters.html', {
@@ -516,179 +555,28 @@ def quran_reciters(request):
         return render(request, 'core/error.html', {'error': str(e)})
 
 
+def _reciter_card(reciter):
+    """Return the template data of an indexed reciter."""
+    return {'id': reciter.pk, 'name': reciter.name_arabic, 'style': reciter.style or '', 'image': f'reciters/{reciter.folder}/profile.jpg', 'folder': reciter.folder}
+
+
 def reciter_detail(request, folder):
     """
     Reciter detail view.
     """
     try:
-        # Get the reciter information
-        reciters = [
-            {'id': 1, 'name': 'محمد أحمد الزين', 'style': 'مرتل', 'image': 'reciters/alzain.mohamed.ahmed/profile.jpg', 'folder': 'alzain.mohamed.ahmed'},
-        ]
-
-        reciter = next((r for r in reciters if r['folder'] == folder), None)
+        # Get the reciter and its audio files from the catalog index
+        reciter = QuranReciter.objects.filter(folder=folder, scanned_at__isnull=False).first()
 
         if not reciter:
             return render(request, 'core/error.html', {'error': 'Reciter not found'})
 
-        # Get the list of all 114 surahs
-        # Define a dictionary of all Quran surahs with their names and verse counts
-        all_surahs_data = {
-            1: {'name': 'الفاتحة', 'verses': 7},
-            2: {'name': 'البقرة', 'verses': 286},
-            3: {'name': 'آل عمران', 'verses': 200},
-            4: {'name': 'النساء', 'verses': 176},
-            5: {'name': 'المائدة', 'verses': 120},
-            6: {'name': 'الأنعام', 'verses': 165},
-            7: {'name': 'الأعراف', 'verses': 206},
-            8: {'name': 'الأنفال', 'verses': 75},
-            9: {'name': 'التوبة', 'verses': 129},
-            10: {'name': 'يونس', 'verses': 109},
-            11: {'name': 'هود', 'verses': 123},
-            12: {'name': 'يوسف', 'verses': 111},
-            13: {'name': 'الرعد', 'verses': 43},
-            14: {'name': 'إبراهيم', 'verses': 52},
-            15: {'name': 'الحجر', 'verses': 99},
-            16: {'name': 'النحل', 'verses': 128},
-            17: {'name': 'الإسراء', 'verses': 111},
-            18: {'name': 'الكهف', 'verses': 110},
-            19: {'name': 'مريم', 'verses': 98},
-            20: {'name': 'طه', 'verses': 135},
-            21: {'name': 'الأنبياء', 'verses': 112},
-            22: {'name': 'الحج', 'verses': 78},
-            23: {'name': 'المؤمنون', 'verses': 118},
-            24: {'name': 'النور', 'verses': 64},
-            25: {'name': 'الفرقان', 'verses': 77},
-            26: {'name': 'الشعراء', 'verses': 227},
-            27: {'name': 'النمل', 'verses': 93},
-            28: {'name': 'القصص', 'verses': 88},
-            29: {'name': 'العنكبوت', 'verses': 69},
-            30: {'name': 'الروم', 'verses': 60},
-            31: {'name': 'لقمان', 'verses': 34},
-            32: {'name': 'السجدة', 'verses': 30},
-            33: {'name': 'الأحزاب', 'verses': 73},
-            34: {'name': 'سبأ', 'verses': 54},
-            35: {'name': 'فاطر', 'verses': 45},
-            36: {'name': 'يس', 'verses': 83},
-            37: {'name': 'الصافات', 'verses': 182},
-            38: {'name': 'ص', 'verses': 88},
-            39: {'name': 'الزمر', 'verses': 75},
-            40: {'name': 'غافر', 'verses': 85},
-            41: {'name': 'فصلت', 'verses': 54},
-            42: {'name': 'الشورى', 'verses': 53},
-            43: {'name': 'الزخرف', 'verses': 89},
-            44: {'name': 'الدخان', 'verses': 59},
-            45: {'name': 'الجاثية', 'verses': 37},
-            46: {'name': 'الأحقاف', 'verses': 35},
-            47: {'name': 'محمد', 'verses': 38},
-            48: {'name': 'الفتح', 'verses': 29},
-            49: {'name': 'الحجرات', 'verses': 18},
-            50: {'name': 'ق', 'verses': 45},
-            51: {'name': 'الذاريات', 'verses': 60},
-            52: {'name': 'الطور', 'verses': 49},
-            53: {'name': 'النجم', 'verses': 62},
-            54: {'name': 'القمر', 'verses': 55},
-            55: {'name': 'الرحمن', 'verses': 78},
-            56: {'name': 'الواقعة', 'verses': 96},
-            57: {'name': 'الحديد', 'verses': 29},
-            58: {'name': 'المجادلة', 'verses': 22},
-            59: {'name': 'الحشر', 'verses': 24},
-            60: {'name': 'الممتحنة', 'verses': 13},
-            61: {'name': 'الصف', 'verses': 14},
-            62: {'name': 'الجمعة', 'verses': 11},
-            63: {'name': 'المنافقون', 'verses': 11},
-            64: {'name': 'التغابن', 'verses': 18},
-            65: {'name': 'الطلاق', 'verses': 12},
-            66: {'name': 'التحريم', 'verses': 12},
-            67: {'name': 'الملك', 'verses': 30},
-            68: {'name': 'القلم', 'verses': 52},
-            69: {'name': 'الحاقة', 'verses': 52},
-            70: {'name': 'المعارج', 'verses': 44},
-            71: {'name': 'نوح', 'verses': 28},
-            72: {'name': 'الجن', 'verses': 28},
-            73: {'name': 'المزمل', 'verses': 20},
-            74: {'name': 'المدثر', 'verses': 56},
-            75: {'name': 'القيامة', 'verses': 40},
-            76: {'name': 'الإنسان', 'verses': 31},
-            77: {'name': 'المرسلات', 'verses': 50},
-            78: {'name': 'النبأ', 'verses': 40},
-            79: {'name': 'النازعات', 'verses': 46},
-            80: {'name': 'عبس', 'verses': 42},
-            81: {'name': 'التكوير', 'verses': 29},
-            82: {'name': 'الانفطار', 'verses': 19},
-            83: {'name': 'المطففين', 'verses': 36},
-            84: {'name': 'الانشقاق', 'verses': 25},
-            85: {'name': 'البروج', 'verses': 22},
-            86: {'name': 'الطارق', 'verses': 17},
-            87: {'name': 'الأعلى', 'verses': 19},
-            88: {'name': 'الغاشية', 'verses': 26},
-            89: {'name': 'الفجر', 'verses': 30},
-            90: {'name': 'البلد', 'verses': 20},
-            91: {'name': 'الشمس', 'verses': 15},
-            92: {'name': 'الليل', 'verses': 21},
-            93: {'name': 'الضحى', 'verses': 11},
-            94: {'name': 'الشرح', 'verses': 8},
-            95: {'name': 'التين', 'verses': 8},
-            96: {'name': 'العلق', 'verses': 19},
-            97: {'name': 'القدر', 'verses': 5},
-            98: {'name': 'البينة', 'verses': 8},
-            99: {'name': 'الزلزلة', 'verses': 8},
-            100: {'name': 'العاديات', 'verses': 11},
-            101: {'name': 'القارعة', 'verses': 11},
-            102: {'name': 'التكاثر', 'verses': 8},
-            103: {'name': 'العصر', 'verses': 3},
-            104: {'name': 'الهمزة', 'verses': 9},
-            105: {'name': 'الفيل', 'verses': 5},
-            106: {'name': 'قريش', 'verses': 4},
-            107: {'name': 'الماعون', 'verses': 7},
-            108: {'name': 'الكوثر', 'verses': 3},
-            109: {'name': 'الكافرون', 'verses': 6},
-            110: {'name': 'النصر', 'verses': 3},
-            111: {'name': 'المسد', 'verses': 5},
-            112: {'name': 'الإخلاص', 'verses': 4},
-            113: {'name': 'الفلق', 'verses': 5},
-            114: {'name': 'الناس', 'verses': 6}
-        }
-
-        # Check if MP3 files exist for each surah
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        reciter_path = os.path.join(base_dir, 'reciters', folder)
-        existing_mp3s = {}
-
-        try:
-            if os.path.exists(reciter_path):
-                for file in os.listdir(reciter_path):
-                    if file.endswith('.mp3'):
-                        filename_without_ext = file.split('.')[0]
-                        if filename_without_ext.isdigit():
-                            surah_number = int(filename_without_ext)
-                            if 1 <= surah_number <= 114:
-                                existing_mp3s[surah_number] = file
-        except Exception as e:
-            logger.error(f'Error reading directory {reciter_path}: {e}')
-
-        # Generate the list of all 114 surahs
-        surahs = []
-        for surah_id in range(1, 115):  # 1 to 114 inclusive
-            surah_data = all_surahs_data.get(surah_id, {'name': f'سورة {surah_id}', 'verses': 0})
-
-            # Check if we have an MP3 file for this surah
-            if surah_id in existing_mp3s:
-                mp3_filename = existing_mp3s[surah_id]
-            else:
-                # Create a placeholder filename for surahs without MP3 files
-                mp3_filename = f"{surah_id}.mp3"
-
-            surahs.append({
-                'id': surah_id,
-                'name': surah_data['name'],
-                'verses': surah_data['verses'],
-                'filename': mp3_filename,
-                'has_audio': surah_id in existing_mp3s
-            })
+        surahs = get_reciter_surahs(reciter)
+        for surah in surahs:
+            surah['id'] = surah['number']
 
         return render(request, 'core/reciter_detail.html', {
-            'reciter': reciter,
+            'reciter': _reciter_card(reciter),
             'surahs': surahs
         })
     except Exception as e:
@@ -701,24 +589,14 @@ def quran_part(request, part_number):
     Quran part view.
     """
     try:
-        # Get the QuranPart object
-        quran_part = get_object_or_404(QuranPart, part_number=part_number)
-
-        # Get all ayahs in this part
-        ayahs = Ayah.objects.filter(quran_part=quran_part).order_by('surah__surah_number', 'ayah_number_in_surah')
-
-        # Group ayahs by surah
-        surahs = {}
-        for ayah in ayahs:
-            if ayah.surah.id not in surahs:
-                surahs[ayah.surah.id] = {
-                    'surah': ayah.surah,
-                    'ayahs': []
-                }
-            surahs[ayah.surah.id]['ayahs'].append(ayah)
-
-        # Convert to list for template
-        surahs_list = list(surahs.values())
+        # Read the part from the in-memory Quran corpus
+        corpus = get_corpus()
+        quran_part = corpus.part(part_number)
+        if quran_part is None:
+            raise Http404('Part not found')
+
+        # Ayahs grouped by surah, as a list for the template
+        surahs_list = list(corpus.part_surahs(part_number).values())
 
         return render(request, 'core/quran_part.html', {
             'quran_part': quran_part,
@@ -699,36 +699,15 @@ def create_group_khatma(request, group_id):
                 khatma.group = group
                 khatma.is_group_khatma = True
                 khatma.khatma_type = 'group'
-                khatma.save()
-
-                # Create parts for the khatma
-                from khatma.models import KhatmaPart
-                for i in range(1, 31):  # 30 parts of Quran
-                    KhatmaPart.objects.create(
-                        khatma=khatma,
-                        part_number=i
-                    )
-
-                # Add creator as participant
-                from khatma.models import Participant
-                Participant.objects.create(
-                    user=request.user,
-                    khatma=khatma
-                )
-
-                try:
-                    from notifications.models import Notification
-                    for member in group.members.all():
-                        if member != request.user:
-                            Notification.objects.create(
-                                user=member,
-                                notification_type='new_group_khatma',
-                                message=f'تم إنشاء ختمة جديدة في مجموعة "{group.name}": {khatma.title}',
-                                related_khatma=khatma,
-                                related_group=group
-                            )
-                except (ImportError, AttributeError):
-                    pass
+
+                # Create the khatma with its parts, the creator participant and
+                # the member notifications in bulk
+                from khatma.services import KhatmaFactory
+                KhatmaFactory(
+                    notification_type='new_group_khatma',
+                    notification_message=lambda khatma: f'تم إنشاء ختمة جديدة في مجموعة "{group.name}": {khatma.title}',
+                    notification_recipients=lambda khatma: group.members.exclude(pk=request.user.pk),
+                ).create(khatma)
 
                 messages.success(request, 'تم إنشاء الختمة بنجاح')
                 return redirect('khatma:khatma_detail', khatma_id=khatma.id)
@@ -23,7 +23,7 @@ class KhatmaAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
     inlines = [KhatmaPartInline, ParticipantInline]
     readonly_fields = ['sharing_link', 'created_at']
-    fieldsets = (('Basic Information', {'fields': ('title', 'creator', 'description', 'khatma_type', 'frequency')}), ('Group Settings', {'fields': ('group', 'is_group_khatma', 'auto_distribute_parts')}), ('Memorial Settings', {'fields': ('deceased', 'memorial_prayer', 'memorial_image')}), ('Social Features', {'fields': ('is_public', 'visibility', 'allow_comments', 'social_media_hashtags', 'social_media_image')}), ('Status', {'fields': ('is_completed', 'target_completion_date', 'completed_at', 'start_date', 'end_date')}), ('Sharing and Participants', {'fields': ('sharing_link', 'max_participants')}), ('Reminders', {'fields': ('send_reminders', 'reminder_frequency')}), ('Timestamps', {'fields': ('created_at',)}))
+    fieldsets = (('Basic Information', {'fields': ('title', 'creator', 'description', 'khatma_type', 'frequency')}), ('Group Settings', {'fields': ('group', 'is_group_khatma', 'division', 'auto_distribute_parts', 'distribution_strategy')}), ('Memorial Settings', {'fields': ('deceased', 'memorial_prayer', 'memorial_image')}), ('Social Features', {'fields': ('is_public', 'visibility', 'allow_comments', 'social_media_hashtags', 'social_media_image')}), ('Status', {'fields': ('is_completed', 'target_completion_date', 'completed_at', 'start_date', 'end_date')}), ('Sharing and Participants', {'fields': ('sharing_link', 'max_participants')}), ('Reminders', {'fields': ('send_reminders', 'reminder_frequency')}), ('Timestamps', {'fields': ('created_at',)}))
 
 @admin.register(Deceased)
 class DeceasedAdmin(admin.ModelAdmin):
@@ -10,4 +10,8 @@ import os
 '\n'
 from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'khatma.settings')
-application = get_asgi_application()
\ No newline at end of file
+application = get_asgi_application()
+
+# Load the Quran text into memory before the first request
+from quran.corpus import warm_corpus
+warm_corpus()
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""Automatic distribution of a khatma's parts among its participants.
+
+Khatmas with ``auto_distribute_parts`` hand out their parts when readers join
+and leave. The khatma's ``distribution_strategy`` sets each reader's share:
+
+- ``round_robin``: the same number of parts for everyone, dealt in part order.
+- ``speed``: shares proportional to each reader's past reading speed, from the
+  time between the start and completion of their completed ``QuranReading``
+  rows (readers without history count at the median speed).
+- ``ayah_weighted``: the same number of verses for everyone, counting each
+  part by its verses (juz 30 has almost four times as many as juz 2).
+
+Completed parts and parts whose reading is in progress never move. A join
+rebalances: the most loaded readers give up their last unstarted parts until
+every reader is within one part of their new share.
+A leave only hands out the parts left free. Khatmas created in bulk are
+inserted with their parts already assigned (``initial_assignments``). All changes are written with one
+``bulk_update``, published as one ``parts_distributed`` event, and every
+reader whose parts changed gets one notification listing them.
+"""
+import logging
+import statistics
+
+from django.db import transaction
+from django.db.models import Avg, DurationField, ExpressionWrapper, F
+
+from quran.boundaries import DIVISIONS, ayah_counts
+
+from . import events
+from .models import Khatma, KhatmaPart, Participant, QuranReading
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = 'round_robin'
+SPEED = 'speed'
+AYAH_WEIGHTED = 'ayah_weighted'
+STRATEGIES = (ROUND_ROBIN, SPEED, AYAH_WEIGHTED)
+
+
+def reader_weights(user_ids, strategy=ROUND_ROBIN):
+    """
+    Return the relative share of the parts each reader should get.
+
+    Args:
+        user_ids: Reader ids, in join order
+        strategy: One of STRATEGIES
+
+    Returns:
+        dict: Weight per user id
+    """
+    if strategy != SPEED or not user_ids:
+        return dict.fromkeys(user_ids, 1.0)
+    durations = (
+        QuranReading.objects.filter(participant_id__in=user_ids, status='completed', completion_date__isnull=False)
+        .values('participant')
+        .annotate(average=Avg(ExpressionWrapper(F('completion_date') - F('start_date'), output_field=DurationField())))
+        .values_list('participant', 'average')
+    )
+    # A faster reader (shorter average duration) gets a larger share
+    speeds = {user_id: 1 / max(average.total_seconds(), 60) for user_id, average in durations if average is not None}
+    default = statistics.median(speeds.values()) if speeds else 1.0
+    return {user_id: speeds.get(user_id, default) for user_id in user_ids}
+
+
+def part_costs(strategy=ROUND_ROBIN, division='juz'):
+    """Return the cost of each part number under a strategy (its verse count for ``ayah_weighted``)."""
+    if strategy == AYAH_WEIGHTED:
+        return dict(enumerate(ayah_counts(DIVISIONS[division]), start=1))
+    return dict.fromkeys(range(1, Khatma.PARTS_PER_DIVISION[division] + 1), 1)
+
+
+def plan_distribution(parts, user_ids, weights, costs, locked=(), rebalance=False):
+    """
+    Decide who reads each open part.
+
+    Args:
+        parts: (part_number, assigned_to_id) of the khatma's incomplete parts
+        user_ids: Participant ids, in join order
+        weights: Share of each participant (see ``reader_weights``)
+        costs: Cost of each part number (see ``part_costs``)
+        locked: Part numbers that keep their reader (readings in progress)
+        rebalance: Whether readers above their share give parts up
+
+    Returns:
+        dict: New assigned_to id per part number, for the parts that change
+    """
+    if not user_ids:
+        return {}
+    members = set(user_ids)
+    total_weight = sum(weights[user_id] for user_id in user_ids) or 1
+    total_cost = sum(costs[number] for number, _ in parts)
+    targets = {user_id: total_cost * weights[user_id] / total_weight for user_id in user_ids}
+    loads = dict.fromkeys(user_ids, 0)
+
+    current = dict(parts)
+    assignments = dict(current)
+    free = []
+    for number, user_id in parts:
+        if user_id in members:
+            loads[user_id] += costs[number]
+        else:
+            free.append(number)
+
+    # Deal the free parts to the reader furthest below their share; the heaviest
+    # parts go first when parts differ in cost
+    free.sort(key=lambda number: (-costs[number], number))
+    position = {user_id: index for index, user_id in enumerate(user_ids)}
+    for number in free:
+        user_id = max(user_ids, key=lambda user_id: (targets[user_id] - loads[user_id], -position[user_id]))
+        loads[user_id] += costs[number]
+        assignments[number] = user_id
+    if rebalance:
+        _rebalance(assignments, user_ids, targets, loads, costs, locked, position)
+    return {number: user_id for number, user_id in assignments.items() if user_id != current[number]}
+
+
+def _rebalance(assignments, user_ids, targets, loads, costs, locked, position):
+    """
+    Move parts from the most loaded readers to the least loaded ones, in place.
+
+    The most loaded reader gives up their last unlocked part while that narrows
+    the gap to the reader furthest below their share, so every load ends
+    within one part of its target.
+    """
+    movable = {user_id: [] for user_id in user_ids}
+    for number, user_id in sorted(assignments.items()):
+        if number not in locked and user_id in movable:
+            movable[user_id].append(number)
+    while True:
+        receiver = max(user_ids, key=lambda user_id: (targets[user_id] - loads[user_id], -position[user_id]))
+        donors = [user_id for user_id in user_ids if movable[user_id]]
+        if not donors:
+            return
+        donor = max(donors, key=lambda user_id: (loads[user_id] - targets[user_id], -position[user_id]))
+        number = movable[donor][-1]
+        gap = (loads[donor] - targets[donor]) - (loads[receiver] - targets[receiver])
+        if gap <= costs[number]:
+            return
+        movable[donor].pop()
+        loads[donor] -= costs[number]
+        loads[receiver] += costs[number]
+        assignments[number] = receiver
+
+
+def initial_assignments(khatmas, readers):
+    """
+    Plan the parts of new khatmas among their first readers.
+
+    Nothing is read per khatma: only a batch with several readers of a
+    ``speed`` khatma runs one query for their reading history.
+
+    Args:
+        khatmas: New Khatma instances
+        readers: Reader ids of each khatma, in join order
+
+    Returns:
+        list: assigned_to id per part number, for each khatma
+    """
+    speed_readers = sorted({
+        user_id for khatma, user_ids in zip(khatmas, readers)
+        if khatma.distribution_strategy == SPEED and len(user_ids) > 1 for user_id in user_ids})
+    speeds = reader_weights(speed_readers, SPEED)
+    plans = []
+    for khatma, user_ids in zip(khatmas, readers):
+        strategy = khatma.distribution_strategy if khatma.distribution_strategy in STRATEGIES else ROUND_ROBIN
+        weights = {user_id: speeds.get(user_id, 1.0) for user_id in user_ids}
+        parts = [(number, None) for number in range(1, khatma.total_parts + 1)]
+        plans.append(plan_distribution(parts, user_ids, weights, part_costs(strategy, khatma.division)))
+    return plans
+
+
+def distribute_parts(khatma, strategy=None, rebalance=False, notify=True):
+    """
+    Assign a khatma's open parts among its participants.
+
+    Args:
+        khatma: The Khatma
+        strategy: One of STRATEGIES (defaults to the khatma's ``distribution_strategy``)
+        rebalance: Whether to take parts from readers above their share (on join)
+        notify: Whether to notify the readers whose parts changed
+
+    Returns:
+        dict: List of newly assigned part numbers per user id
+    """
+    strategy = strategy or khatma.distribution_strategy
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown distribution strategy: {strategy}")
+
+    with transaction.atomic():
+        parts = {part.part_number: part for part in KhatmaPart.objects.select_for_update().filter(khatma=khatma, is_completed=False)}
+        user_ids = list(Participant.objects.filter(khatma=khatma).order_by('joined_at', 'pk').values_list('user_id', flat=True))
+        locked = set(
+            QuranReading.objects.filter(khatma=khatma, status='in_progress', part_number__in=parts)
+            .values_list('part_number', flat=True)
+        )
+        changes = plan_distribution(
+            [(number, part.assigned_to_id) for number, part in sorted(parts.items())],
+            user_ids, reader_weights(user_ids, strategy), part_costs(strategy, khatma.division), locked, rebalance)
+        if not changes:
+            return {}
+        for number, user_id in changes.items():
+            parts[number].assigned_to_id = user_id
+        KhatmaPart.objects.bulk_update([parts[number] for number in changes], ['assigned_to'])
+
+    assigned = {}
+    for number, user_id in sorted(changes.items()):
+        assigned.setdefault(user_id, []).append(number)
+    events.publish_khatma_event(khatma.id, events.PARTS_DISTRIBUTED, strategy=strategy,
+                                assignments={str(number): user_id for number, user_id in sorted(changes.items())})
+    if notify and assigned:
+        transaction.on_commit(lambda: _notify_readers(khatma, assigned))
+    return assigned
+
+
+def _notify_readers(khatma, assigned):
+    """Send every reader one notification listing the parts they were given."""
+    try:
+        from notifications.services import NotificationDispatcher
+    except ImportError:
+        return
+    messages = {
+        user_id: f"تم تعيين {khatma.unit_name if len(numbers) == 1 else Khatma.UNIT_PLURAL_NAMES[khatma.division]} {'، '.join(map(str, numbers))} لك في الختمة: {khatma.title}"
+        for user_id, numbers in assigned.items()
+    }
+    try:
+        NotificationDispatcher().dispatch_personal(messages, 'part_assigned', related_khatma_id=khatma.id)
+    except Exception as e:
+        logger.error(f"Error notifying readers of khatma {khatma.id}: {str(e)}")
+
+
+def schedule_distribution(khatma_id, rebalance=False):
+    """Distribute a khatma's parts once the current transaction commits, if it distributes automatically."""
+    def run():
+        khatma = Khatma.objects.filter(pk=khatma_id, auto_distribute_parts=True, is_completed=False).first()
+        if khatma is None:
+            return
+        try:
+            distribute_parts(khatma, rebalance=rebalance)
+        except Exception as e:
+            logger.error(f"Error distributing the parts of khatma {khatma_id}: {str(e)}")
+    transaction.on_commit(run)
@@ -0,0 +1,282 @@
+"""Real-time khatma progress events.
+
+Services, views and signals publish small JSON events (part completed, part
+assigned, participant joined, ...) for a khatma. ``khatma_progress_stream``
+relays them to the browser as Server-Sent Events, so an open khatma page is
+updated without polling ``khatma_progress_api``. The stream is an async view
+and needs the ASGI application (``khatma.asgi``).
+
+The broker is selected with the ``KHATMA_EVENT_BROKER`` setting:
+
+- ``khatma.events.InMemoryBroker`` (default) delivers events to the streams of
+  the publishing process, which is all ``runserver`` or a single ASGI worker
+  needs.
+- ``khatma.events.DatabaseBroker`` stores events as ``KhatmaEvent`` rows. Each
+  process polls the table once per ``KHATMA_EVENT_POLL_INTERVAL`` for every
+  khatma it has open streams for, so events reach all workers without Redis.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+PART_COMPLETED = 'part_completed'
+PART_UNCOMPLETED = 'part_uncompleted'
+PART_ASSIGNED = 'part_assigned'
+PARTICIPANT_JOINED = 'participant_joined'
+PARTS_DISTRIBUTED = 'parts_distributed'
+KHATMA_COMPLETED = 'khatma_completed'
+
+DEFAULT_BROKER = 'khatma.events.InMemoryBroker'
+
+# Sent for every published event once its transaction commits, whether or not a
+# stream is open; receivers get khatma_id, event_type and data.
+khatma_event = Signal()
+
+# Sent once KhatmaFactory's transaction commits; receivers get the created khatmas.
+# (Bulk creation bypasses post_save.)
+khatmas_created = Signal()
+
+
+class Subscription:
+    """
+    Async iterator over the events of one khatma for one open stream.
+
+    Yields ``(event_id, event)`` pairs, or None when no event arrived within
+    ``heartbeat`` seconds so the caller can keep the connection alive. Must be
+    created inside the event loop that consumes it and closed when done.
+    """
+
+    def __init__(self, broker, khatma_id, heartbeat=None, queue_size=100):
+        self.broker = broker
+        self.khatma_id = khatma_id
+        self.heartbeat = heartbeat
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(queue_size)
+        broker._add(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await asyncio.wait_for(self.queue.get(), self.heartbeat)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker._remove(self)
+
+    def deliver(self, item):
+        """Queue an event from any thread; events for a stream that fell behind are dropped."""
+        def put():
+            try:
+                self.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping event for a slow progress stream of khatma {self.khatma_id}")
+        try:
+            self.loop.call_soon_threadsafe(put)
+        except RuntimeError:
+            # The stream's event loop is closed
+            self.close()
+
+
+class EventBroker:
+    """Base class keeping track of the streams open in this process and fanning events out to them."""
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, khatma_id, event):
+        """Send an event to every stream of a khatma."""
+        raise NotImplementedError
+
+    def wants(self, khatma_id):
+        """Return whether an event for the khatma could reach a stream (to skip building unused events)."""
+        return True
+
+    def subscribe(self, khatma_id, heartbeat=None):
+        """Open a Subscription to the events of a khatma."""
+        return Subscription(self, khatma_id, heartbeat=heartbeat)
+
+    def stream_count(self, khatma_id):
+        """Return the number of streams of a khatma open in this process."""
+        with self._lock:
+            return len(self._subscriptions.get(khatma_id, ()))
+
+    def _add(self, subscription):
+        with self._lock:
+            self._subscriptions[subscription.khatma_id].add(subscription)
+
+    def _remove(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.khatma_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.khatma_id]
+
+    def _fan_out(self, khatma_id, event_id, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(khatma_id, ()))
+        for subscription in subscriptions:
+            subscription.deliver((event_id, event))
+
+
+class InMemoryBroker(EventBroker):
+    """Broker delivering events to the streams of the current process only."""
+
+    def __init__(self):
+        super().__init__()
+        self._ids = itertools.count(1)
+
+    def wants(self, khatma_id):
+        return self.stream_count(khatma_id) > 0
+
+    def publish(self, khatma_id, event):
+        self._fan_out(khatma_id, next(self._ids), event)
+
+
+class DatabaseBroker(EventBroker):
+    """
+    Broker storing events in the KhatmaEvent table, shared by every process using the database.
+
+    Events older than ``KHATMA_EVENT_RETENTION`` seconds are pruned while publishing.
+    """
+    prune_every = 100
+
+    def __init__(self):
+        super().__init__()
+        self.poll_interval = getattr(settings, 'KHATMA_EVENT_POLL_INTERVAL', 2)
+        self.retention = getattr(settings, 'KHATMA_EVENT_RETENTION', 60 * 60)
+        self._pollers = {}
+        self._published = itertools.count(1)
+
+    def publish(self, khatma_id, event):
+        from .models import KhatmaEvent
+        KhatmaEvent.objects.create(khatma_id=khatma_id, event_type=event['type'], payload=event)
+        if next(self._published) % self.prune_every == 0:
+            KhatmaEvent.objects.filter(created_at__lt=timezone.now() - timedelta(seconds=self.retention)).delete()
+
+    def _add(self, subscription):
+        super()._add(subscription)
+        with self._lock:
+            poller = self._pollers.get(subscription.khatma_id)
+            if poller is None or poller.done():
+                self._pollers[subscription.khatma_id] = subscription.loop.create_task(self._poll(subscription.khatma_id))
+
+    async def _poll(self, khatma_id):
+        """Relay new KhatmaEvent rows of a khatma to local streams while any are open."""
+        from .models import KhatmaEvent
+        last_id = await KhatmaEvent.objects.filter(khatma_id=khatma_id).order_by('-id').values_list('id', flat=True).afirst() or 0
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            with self._lock:
+                if not self._subscriptions.get(khatma_id):
+                    del self._pollers[khatma_id]
+                    return
+            try:
+                rows = [row async for row in KhatmaEvent.objects.filter(khatma_id=khatma_id, id__gt=last_id).values_list('id', 'payload')]
+            except Exception as e:
+                logger.error(f"Error polling events of khatma {khatma_id}: {str(e)}")
+                continue
+            for event_id, payload in rows:
+                self._fan_out(khatma_id, event_id, payload)
+                last_id = event_id
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker configured by ``KHATMA_EVENT_BROKER``."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(getattr(settings, 'KHATMA_EVENT_BROKER', DEFAULT_BROKER))()
+    return _broker
+
+
+def publish_khatma_event(khatma_id, event_type, **data):
+    """
+    Publish a progress event once the current transaction commits.
+
+    The event carries the khatma's current progress counters so clients can
+    update without another request.
+
+    Args:
+        khatma_id: The id of the khatma
+        event_type: One of the event type constants
+        data: Extra JSON-serializable event fields (e.g. part_number, user)
+    """
+    def send():
+        from .models import Khatma
+        for receiver, response in khatma_event.send_robust(sender=None, khatma_id=khatma_id, event_type=event_type, data=data):
+            if isinstance(response, Exception):
+                logger.error(f"Error in {event_type} event receiver {receiver.__name__}: {str(response)}")
+        broker = get_broker()
+        if not broker.wants(khatma_id):
+            return
+        try:
+            progress = Khatma.objects.filter(pk=khatma_id).values('completed_parts_count', 'progress', 'is_completed', 'division').first()
+            if progress is None:
+                return
+            broker.publish(khatma_id, {
+                'type': event_type,
+                'khatma_id': khatma_id,
+                'completed_parts': progress['completed_parts_count'],
+                'total_parts': Khatma.PARTS_PER_DIVISION.get(progress['division'], Khatma.TOTAL_PARTS),
+                'progress_percentage': progress['progress'],
+                'is_completed': progress['is_completed'],
+                **data,
+            })
+        except Exception as e:
+            logger.error(f"Error publishing {event_type} event for khatma {khatma_id}: {str(e)}")
+    transaction.on_commit(send)
+
+
+def format_sse(event_type, data, event_id=None):
+    """Format one Server-Sent Events message."""
+    lines = [f'id: {event_id}'] if event_id is not None else []
+    lines += [f'event: {event_type}', f'data: {json.dumps(data, ensure_ascii=False)}']
+    return '\n'.join(lines) + '\n\n'
+
+
+async def progress_event_stream(khatma_id, snapshot, heartbeat=15):
+    """
+    Yield the Server-Sent Events of a khatma progress stream.
+
+    The stream subscribes before sending ``snapshot`` (the current progress),
+    so no event published in between is lost.
+
+    Args:
+        khatma_id: The id of the khatma
+        snapshot: Callable returning the current progress data (run in a thread)
+        heartbeat: Seconds between keep-alive comments
+    """
+    subscription = get_broker().subscribe(khatma_id, heartbeat=heartbeat)
+    try:
+        yield f'retry: {heartbeat * 1000}\n' + format_sse('progress', await sync_to_async(snapshot)())
+        async for item in subscription:
+            if item is None:
+                yield ': keep-alive\n\n'
+                continue
+            event_id, event = item
+            yield format_sse(event['type'], event, event_id)
+    finally:
+        subscription.close()
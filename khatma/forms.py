@@ -22,7 +22,8 @@ class KhatmaCreationForm(forms.ModelForm):
     class Meta:
         model = Khatma
         fields = ['title', 'description', 'khatma_type', 'frequency', 'is_public', 'visibility',
-                 'allow_comments', 'target_completion_date', 'send_reminders', 'reminder_frequency']
+                 'allow_comments', 'target_completion_date', 'send_reminders', 'reminder_frequency',
+                 'division', 'auto_distribute_parts', 'distribution_strategy']
         widgets = {
             'title': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'أدخل عنوان الختمة'}),
             'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 4, 'placeholder': 'وصف الختمة (اختياري)'}),
@@ -31,6 +32,8 @@ class KhatmaCreationForm(forms.ModelForm):
             'visibility': forms.Select(attrs={'class': 'form-control'}),
             'target_completion_date': forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}),
             'reminder_frequency': forms.Select(attrs={'class': 'form-control'}),
+            'division': forms.Select(attrs={'class': 'form-control'}),
+            'distribution_strategy': forms.Select(attrs={'class': 'form-control'}),
         }
 
     def __init__(self, *args, **kwargs):
@@ -42,6 +45,7 @@ class KhatmaCreationForm(forms.ModelForm):
         self.fields['title'].help_text = 'أدخل عنواناً واضحاً للختمة'
         self.fields['khatma_type'].help_text = 'اختر نوع الختمة'
         self.fields['target_completion_date'].help_text = 'التاريخ المستهدف لإكمال الختمة (اختياري)'
+        self.fields['division'].help_text = 'قسّم الختمة إلى أحزاب أو أرباع ليشارك فيها عدد أكبر من القراء'
 
         # Add deceased field for memorial khatmas
         if self.user:
@@ -71,7 +75,7 @@ class KhatmaEditForm(forms.ModelForm):
     class Meta:
         '''"""Class representing Meta."""'''
         model = Khatma
-        fields = ['title', 'description', 'khatma_type', 'frequency', 'is_public', 'visibility', 'allow_comments', 'target_completion_date', 'send_reminders', 'reminder_frequency', 'memorial_prayer', 'social_media_hashtags']
+        fields = ['title', 'description', 'khatma_type', 'frequency', 'is_public', 'visibility', 'allow_comments', 'target_completion_date', 'send_reminders', 'reminder_frequency', 'auto_distribute_parts', 'distribution_strategy', 'memorial_prayer', 'social_media_hashtags']
         widgets = {'target_completion_date': forms.DateInput(attrs={'type': 'date'}), 'description': forms.Textarea(attrs={'rows': 4}), 'memorial_prayer': forms.Textarea(attrs={'rows': 3})}
 
     def __init__(self, *args, **kwargs):
@@ -146,6 +150,7 @@ class KhatmaFilterForm(forms.Form):
     khatma_type = forms.ChoiceField(choices=[('', 'جميع الأنواع')] + list(Khatma.KHATMA_TYPE_CHOICES), required=False, label='نوع الختمة')
     status = forms.ChoiceField(choices=[('', 'جميع الحالات'), ('completed', 'مكتملة'), ('in_progress', 'قيد التنفيذ')], required=False, label='الحالة')
     search = forms.CharField(max_length=100, required=False, label='بحث', widget=forms.TextInput(attrs={'placeholder': 'ابحث عن ختمة...'}))
+    sort = forms.ChoiceField(choices=[('', 'الأحدث'), ('progress', 'الأكثر تقدماً'), ('-progress', 'الأقل تقدماً')], required=False, label='الترتيب')
 
 class KhatmaChatForm(forms.ModelForm):
     """Form for sending messages in Khatma chat"""
@@ -0,0 +1,152 @@
+"""Public khatma listings with keyset ("load more") pagination.
+
+Every page is a range scan of one of the ``khatma_public_*`` indexes: the
+filters are equality conditions on the leading index columns and the page
+continues from a cursor on (created_at, id) instead of an OFFSET, so page 500
+costs the same as page 1. Lists sorted by progress continue from a
+(progress, created_at, id) cursor over ``khatma_public_progress_idx`` (most
+progressed first) or ``khatma_public_progress_asc_idx``.
+
+The total shown above a list is counted exactly up to ``COUNT_CAP`` rows
+(a bounded ``COUNT`` over a ``LIMIT``); beyond that PostgreSQL's planner
+estimate is used, and the result is cached per filter for
+``COUNT_CACHE_TIMEOUT`` seconds.
+"""
+import hashlib
+import json
+import logging
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.db.models import Count, Q
+
+from core.utils.pagination import encode_cursor, encode_sort_cursor, older_than, past_sort_cursor
+
+from .models import Khatma, Participant
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 12
+MAX_PAGE_SIZE = 50
+COUNT_CAP = 1000
+COUNT_CACHE_TIMEOUT = 300
+# Sort option of KhatmaFilterForm -> (field, descending); '' is newest first
+SORTS = {'progress': ('progress', True), '-progress': ('progress', False)}
+
+
+def public_khatmas(khatma_type=None, status=None, search=None):
+    """
+    Build the filtered queryset of public khatmas (unordered).
+
+    Args:
+        khatma_type: Optional Khatma.khatma_type
+        status: 'completed', 'in_progress' or None for all
+        search: Optional text matched in the title, description or creator's username
+
+    Returns:
+        QuerySet: The public khatmas
+    """
+    queryset = Khatma.objects.filter(is_public=True)
+    if khatma_type:
+        queryset = queryset.filter(khatma_type=khatma_type)
+    if status == 'completed':
+        queryset = queryset.filter(is_completed=True)
+    elif status == 'in_progress':
+        queryset = queryset.filter(is_completed=False)
+    if search:
+        # Matching creators are looked up first, so the listing scan never joins auth_user
+        creators = User.objects.filter(username__icontains=search).values('pk')
+        queryset = queryset.filter(Q(title__icontains=search) | Q(description__icontains=search) | Q(creator__in=creators))
+    return queryset
+
+
+def get_public_khatma_page(khatma_type=None, status=None, search=None, sort='', after=None, limit=PAGE_SIZE, user=None, with_count=True):
+    """
+    Get one page of public khatmas.
+
+    Args:
+        khatma_type, status, search: Filters (see ``public_khatmas``)
+        sort: '' (newest first), 'progress' (most progressed first) or '-progress'
+        after: Optional cursor from a previous page's 'next_cursor'
+        limit: Page size
+        user: Optional user, to mark the khatmas they participate in
+        with_count: Whether to count the matching khatmas
+
+    Returns:
+        dict: 'khatmas' (with ``participants_count`` and ``is_participant`` set),
+            'next_cursor' (None on the last page), 'count' and 'count_is_exact'
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    queryset = public_khatmas(khatma_type, status, search)
+    field, descending = SORTS.get(sort, (None, True))
+    page = queryset
+    if field:
+        if after:
+            page = past_sort_cursor(page, field, after, descending)
+        page = page.order_by(f"{'-' if descending else ''}{field}", '-created_at', '-id')
+    else:
+        if after:
+            page = older_than(page, after)
+        page = page.order_by('-created_at', '-id')
+    rows = list(page.select_related('creator', 'deceased')[:limit + 1])
+    khatmas = rows[:limit]
+    annotate_participation(khatmas, user)
+
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_sort_cursor(khatmas[-1], field) if field else encode_cursor(khatmas[-1])
+    result = {'khatmas': khatmas, 'next_cursor': next_cursor, 'count': None, 'count_is_exact': True}
+    if with_count:
+        result['count'], result['count_is_exact'] = count_public_khatmas(queryset, (khatma_type, status, search))
+    return result
+
+
+def annotate_participation(khatmas, user=None):
+    """
+    Set ``participants_count`` (and ``is_participant`` for a user) on a page of khatmas.
+
+    Costs one grouped query for the counts and one for the user, whatever the page size.
+    """
+    ids = [khatma.pk for khatma in khatmas]
+    counts = dict(Participant.objects.filter(khatma_id__in=ids).values('khatma').annotate(total=Count('id')).values_list('khatma', 'total')) if ids else {}
+    joined = set()
+    if ids and user is not None and user.is_authenticated:
+        joined = set(Participant.objects.filter(khatma_id__in=ids, user=user).values_list('khatma_id', flat=True))
+    for khatma in khatmas:
+        khatma.participants_count = counts.get(khatma.pk, 0)
+        khatma.is_participant = khatma.pk in joined
+    return khatmas
+
+
+def approximate_count(queryset, cap=COUNT_CAP):
+    """
+    Count a queryset exactly up to ``cap`` rows, and estimate beyond it.
+
+    Returns:
+        tuple: (count, is_exact)
+    """
+    queryset = queryset.order_by()
+    count = queryset[:cap + 1].count()
+    if count <= cap:
+        return count, True
+    if connections[queryset.db].vendor == 'postgresql':
+        try:
+            plan = json.loads(queryset.explain(format='json'))
+            return max(int(plan[0]['Plan']['Plan Rows']), cap), False
+        except (DatabaseError, ValueError, KeyError, IndexError, TypeError) as e:
+            logger.error(f"Error estimating khatma count: {str(e)}")
+    return cap, False
+
+
+def count_public_khatmas(queryset, filters):
+    """Return the (cached) approximate count of a filtered public khatma queryset as (count, is_exact)."""
+    key = 'khatma-list-count:' + hashlib.md5(repr(filters).encode()).hexdigest()
+    cached = cache.get(key)
+    if cached is None:
+        cached = approximate_count(queryset)
+        cache.set(key, cached, COUNT_CACHE_TIMEOUT)
+    return tuple(cached)
@@ -0,0 +1,56 @@
+"""Management command reporting the number of queries needed to create khatmas."""
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from khatma.models import Khatma, KhatmaPart, Participant
+from khatma.services import KhatmaFactory
+from notifications.models import Notification
+
+
+def create_row_by_row(khatma):
+    """Replay the previous creation path: one INSERT (plus part signals) per row."""
+    Khatma.objects.bulk_create([khatma])
+    for number in range(1, Khatma.TOTAL_PARTS + 1):
+        KhatmaPart.objects.create(khatma=khatma, part_number=number)
+    Participant.objects.get_or_create(user=khatma.creator, khatma=khatma)
+    Notification.objects.create(user=khatma.creator, notification_type='khatma_progress', message=f'تم إنشاء ختمة جديدة: {khatma.title}', related_khatma=khatma)
+
+
+class Command(BaseCommand):
+    help = 'Measure queries per khatma creation for the row-by-row path, the plain model save and KhatmaFactory (changes are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=50, help='Number of khatmas to create in each scenario.')
+        parser.add_argument('--user', help='Username of the creator; defaults to the first user.')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        creator = User.objects.filter(username=options['user']).first() if options['user'] else User.objects.order_by('pk').first()
+        if creator is None:
+            raise CommandError('No user available to act as khatma creator')
+
+        def build(label):
+            return [Khatma(title=f'benchmark {label} {i}', creator=creator) for i in range(count)]
+
+        scenarios = [
+            ('row-by-row (previous behaviour)', lambda: [create_row_by_row(khatma) for khatma in build('rows')]),
+            ('Khatma.save() + signal', lambda: [khatma.save() for khatma in build('save')]),
+            ('KhatmaFactory.create', lambda: [KhatmaFactory().create(khatma) for khatma in build('single')]),
+            ('KhatmaFactory.create_many', lambda: KhatmaFactory().create_many(build('bulk'))),
+        ]
+        for label, scenario in scenarios:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.monotonic()
+                    scenario()
+                    elapsed = time.monotonic() - start
+                transaction.set_rollback(True)
+            self.stdout.write(
+                f'{label}: {len(queries)} queries for {count} khatmas '
+                f'({len(queries) / count:.2f} per khatma, {elapsed * 1000 / count:.2f} ms per khatma)'
+            )
+        self.stdout.write(self.style.SUCCESS('Benchmark finished; all changes were rolled back'))
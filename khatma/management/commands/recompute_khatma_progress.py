@@ -0,0 +1,24 @@
+"""Management command to repair the stored khatma progress counters."""
+from django.core.management.base import BaseCommand
+
+from khatma.models import Khatma
+from khatma.services import recompute_khatma_progress
+
+
+class Command(BaseCommand):
+    help = 'Recalculate completed_parts_count and progress for khatmas from their parts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--khatma',
+            type=int,
+            action='append',
+            help='ID of a khatma to repair. May be repeated; defaults to all khatmas.',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Khatma.objects.all()
+        if options['khatma']:
+            queryset = queryset.filter(pk__in=options['khatma'])
+        repaired = recompute_khatma_progress(queryset)
+        self.stdout.write(self.style.SUCCESS(f'Repaired progress counters for {repaired} khatmas'))
@@ -0,0 +1,53 @@
+"""Management command running the recurring and memorial khatma scheduler."""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from khatma.scheduler import DEFAULT_BATCH_SIZE, tick
+
+
+class Command(BaseCommand):
+    help = 'Create the due recurring and memorial khatmas, once ("tick", e.g. from cron) or continuously ("run")'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'mode',
+            nargs='?',
+            choices=['run', 'tick'],
+            default='run',
+            help='"tick" runs one pass and exits; "run" (default) keeps running.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=300,
+            help='Seconds between passes in run mode (default: 300).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of due rows locked and created per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        if options['mode'] == 'tick':
+            self._tick(options['batch_size'])
+            return
+        self.stdout.write(f"Scheduler running every {options['interval']}s (Ctrl+C to stop)")
+        try:
+            while True:
+                close_old_connections()
+                started = time.monotonic()
+                try:
+                    self._tick(options['batch_size'])
+                except Exception as e:
+                    self.stderr.write(self.style.ERROR(f'Scheduler pass failed: {str(e)}'))
+                time.sleep(max(options['interval'] - (time.monotonic() - started), 0))
+        except KeyboardInterrupt:
+            self.stdout.write('Scheduler stopped')
+
+    def _tick(self, batch_size):
+        result = tick(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Created {result['recurring']} recurring and {result['memorial']} memorial khatmas"))
@@ -0,0 +1,29 @@
+"""Management command sending the due reading reminder digests."""
+from django.core.management.base import BaseCommand
+
+from khatma.reminders import DEFAULT_BATCH_SIZE, send_reminders
+
+
+class Command(BaseCommand):
+    help = 'Send every user with unfinished parts on khatmas due a reminder one digest (in-app and/or email)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Build the digests and report counts and timing without sending anything.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of users handled per batch.',
+        )
+
+    def handle(self, *args, **options):
+        result = send_reminders(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        for key in ('users', 'participants', 'parts', 'notifications', 'emails', 'emails_failed', 'deferred', 'skipped', 'batches'):
+            self.stdout.write(f'{key}: {result[key]}')
+        rate = result['users'] / result['seconds'] if result['seconds'] else 0
+        prefix = 'Dry run: would remind' if options['dry_run'] else 'Reminded'
+        self.stdout.write(self.style.SUCCESS(f"{prefix} {result['users']} users in {result['seconds']:.2f}s ({rate:.0f} users/s)"))
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_progress(apps, schema_editor):
+    Khatma = apps.get_model('khatma', 'Khatma')
+    rows = Khatma.objects.annotate(
+        actual_completed=Count('parts', filter=Q(parts__is_completed=True))
+    ).values_list('pk', 'actual_completed')
+    for khatma_id, completed in rows.iterator():
+        if completed:
+            Khatma.objects.filter(pk=khatma_id).update(completed_parts_count=completed, progress=completed * 100.0 / 30)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('khatma', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='khatma',
+            name='completed_parts_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='عدد الأجزاء المكتملة'),
+        ),
+        migrations.AddField(
+            model_name='khatma',
+            name='progress',
+            field=models.FloatField(default=0, verbose_name='نسبة الإنجاز'),
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('khatma', '0002_khatma_progress_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KhatmaEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=30, verbose_name='نوع الحدث')),
+                ('payload', models.JSONField(default=dict, verbose_name='بيانات الحدث')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('khatma', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='khatma.khatma')),
+            ],
+            options={
+                'verbose_name': 'حدث ختمة',
+                'verbose_name_plural': 'أحداث الختمات',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('khatma', '0003_khatmaevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='khatma',
+            index=models.Index(fields=['is_public', '-created_at', '-id'], name='khatma_public_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='khatma',
+            index=models.Index(fields=['is_public', 'khatma_type', '-created_at', '-id'], name='khatma_public_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='khatma',
+            index=models.Index(fields=['is_public', 'is_completed', '-created_at', '-id'], name='khatma_public_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='khatma',
+            index=models.Index(fields=['is_public', 'khatma_type', 'is_completed', '-created_at', '-id'], name='khatma_public_type_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='khatma',
+            index=models.Index(fields=['is_public', '-progress', '-created_at', '-id'], name='khatma_public_progress_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='khatma',
+            index=models.Index(fields=['is_public', 'progress', '-created_at', '-id'], name='khatma_public_progress_asc_idx'),
+        ),
+    ]
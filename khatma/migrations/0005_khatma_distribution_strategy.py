@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('khatma', '0004_khatma_public_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='khatma',
+            name='distribution_strategy',
+            field=models.CharField(choices=[('round_robin', 'بالتساوي بين المشاركين'), ('speed', 'حسب سرعة قراءة كل مشارك'), ('ayah_weighted', 'حسب عدد الآيات')], default='round_robin', max_length=20, verbose_name='طريقة توزيع الأجزاء'),
+        ),
+    ]
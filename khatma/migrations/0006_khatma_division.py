@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('khatma', '0005_khatma_distribution_strategy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='khatma',
+            name='division',
+            field=models.CharField(choices=[('juz', 'ثلاثون جزءاً'), ('hizb', 'ستون حزباً'), ('rub', 'مئتان وأربعون ربعاً')], default='juz', max_length=10, verbose_name='تقسيم الختمة'),
+        ),
+    ]
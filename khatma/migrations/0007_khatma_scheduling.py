@@ -0,0 +1,64 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+from khatma.recurrence import RECURRING_FREQUENCIES, next_memorial_date, upcoming_occurrence
+
+
+def schedule_existing(apps, schema_editor):
+    Khatma = apps.get_model('khatma', 'Khatma')
+    Deceased = apps.get_model('khatma', 'Deceased')
+    today = timezone.localdate()
+    khatmas = []
+    for khatma in Khatma.objects.filter(frequency__in=RECURRING_FREQUENCIES).iterator():
+        khatma.next_occurrence = upcoming_occurrence(khatma.frequency, khatma.start_date or timezone.localdate(khatma.created_at), today)
+        khatmas.append(khatma)
+    Khatma.objects.bulk_update(khatmas, ['next_occurrence'], batch_size=500)
+    deceased = []
+    for person in Deceased.objects.filter(memorial_day=True).iterator():
+        person.next_memorial_date = next_memorial_date(person.death_date, person.memorial_frequency, today)
+        deceased.append(person)
+    Deceased.objects.bulk_update(deceased, ['next_memorial_date'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('khatma', '0006_khatma_division'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deceased',
+            name='next_memorial_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='موعد الختمة التذكارية التالية'),
+        ),
+        migrations.AddField(
+            model_name='khatma',
+            name='next_occurrence',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='موعد التكرار التالي'),
+        ),
+        migrations.AddField(
+            model_name='khatma',
+            name='occurrence_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='تاريخ التكرار'),
+        ),
+        migrations.AddField(
+            model_name='khatma',
+            name='previous_occurrence',
+            field=models.OneToOneField(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='next_instance', to='khatma.khatma', verbose_name='التكرار السابق'),
+        ),
+        migrations.AddIndex(
+            model_name='deceased',
+            index=models.Index(condition=models.Q(('memorial_day', True)), fields=['next_memorial_date'], name='deceased_next_memorial_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='khatma',
+            index=models.Index(condition=models.Q(('next_occurrence__isnull', False)), fields=['next_occurrence'], name='khatma_next_occurrence_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='khatma',
+            constraint=models.UniqueConstraint(condition=models.Q(('previous_occurrence__isnull', True)), fields=('deceased', 'occurrence_date'), name='khatma_memorial_occurrence_unique'),
+        ),
+        migrations.RunPython(schedule_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('khatma', '0007_khatma_scheduling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='participant',
+            name='last_reminded_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='آخر تذكير'),
+        ),
+        migrations.AddIndex(
+            model_name='khatmapart',
+            index=models.Index(condition=models.Q(('assigned_to__isnull', False), ('is_completed', False)), fields=['assigned_to', 'khatma'], name='khatmapart_open_assignee_idx'),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('khatma', '0008_reading_reminders'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='khatma',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['id'], name='khatma_active_idx'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('khatma', '0009_khatma_active_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='participant',
+            name='reminder_email_pending',
+            field=models.BooleanField(default=False, verbose_name='بريد تذكير معلق'),
+        ),
+    ]
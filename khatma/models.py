@@ -20,6 +20,11 @@ class Deceased(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     memorial_day = models.BooleanField(default=False, verbose_name='إنشاء ختمة في ذكرى الوفاة')
     memorial_frequency = models.CharField(max_length=20, choices=[('yearly', 'سنوياً'), ('monthly', 'شهرياً'), ('weekly', 'أسبوعياً'), ('daily', 'يومياً')], default='yearly', blank=True, null=True, verbose_name='تكرار الختمة التذكارية')
+    next_memorial_date = models.DateField(null=True, blank=True, editable=False, verbose_name='موعد الختمة التذكارية التالية')
+
+    class Meta:
+        # khatma.scheduler looks up the due memorials by date
+        indexes = [models.Index(fields=['next_memorial_date'], condition=models.Q(memorial_day=True), name='deceased_next_memorial_idx')]
 
     def __str__(self):
         '''"""Function to   str  ."""'''
@@ -35,6 +40,8 @@ class Khatma(models.Model):
     """Main Khatma model"""
     FREQUENCY_CHOICES = [('once', 'مرة واحدة'), ('daily', 'يومية'), ('weekly', 'أسبوعية'), ('monthly', 'شهرية'), ('yearly', 'سنوية'), ('ramadan', 'رمضان'), ('friday', 'كل جمعة')]
     KHATMA_TYPE_CHOICES = [('regular', 'ختمة عادية'), ('memorial', 'ختمة للمتوفى'), ('charity', 'ختمة خيرية'), ('birth', 'ختمة مولود'), ('healing', 'ختمة شفاء'), ('graduation', 'ختمة تخرج'), ('wedding', 'ختمة زواج'), ('group', 'ختمة جماعية')]
+    DIVISION_CHOICES = [('juz', 'ثلاثون جزءاً'), ('hizb', 'ستون حزباً'), ('rub', 'مئتان وأربعون ربعاً')]
+    DISTRIBUTION_STRATEGY_CHOICES = [('round_robin', 'بالتساوي بين المشاركين'), ('speed', 'حسب سرعة قراءة كل مشارك'), ('ayah_weighted', 'حسب عدد الآيات')]
     VISIBILITY_CHOICES = [('public', 'عامة - متاحة للجميع'), ('private', 'خاصة - بدعوة فقط'), ('family', 'عائلية - للعائلة فقط'), ('group', 'مجموعة - لأعضاء المجموعة فقط')]
     title = models.CharField(max_length=200, verbose_name='عنوان الختمة')
     creator = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_khatmas', verbose_name='منشئ الختمة')
@@ -44,6 +51,8 @@ class Khatma(models.Model):
     group = models.ForeignKey('groups.ReadingGroup', on_delete=models.SET_NULL, null=True, blank=True, related_name='khatmas', verbose_name='المجموعة')
     is_group_khatma = models.BooleanField(default=False, verbose_name='ختمة جماعية')
     auto_distribute_parts = models.BooleanField(default=True, verbose_name='توزيع الأجزاء تلقائياً')
+    division = models.CharField(max_length=10, choices=DIVISION_CHOICES, default='juz', verbose_name='تقسيم الختمة')
+    distribution_strategy = models.CharField(max_length=20, choices=DISTRIBUTION_STRATEGY_CHOICES, default='round_robin', verbose_name='طريقة توزيع الأجزاء')
     deceased = models.ForeignKey(Deceased, on_delete=models.SET_NULL, null=True, blank=True, verbose_name='المتوفى')
     memorial_prayer = models.TextField(blank=True, null=True, verbose_name='دعاء للمتوفى')
     memorial_image = models.ImageField(upload_to='memorial_images/', null=True, blank=True, verbose_name='صورة تذكارية')
@@ -63,6 +72,37 @@ class Khatma(models.Model):
     send_reminders = models.BooleanField(default=True, verbose_name='إرسال تذكيرات')
     reminder_frequency = models.CharField(max_length=20, choices=[('daily', 'يومياً'), ('weekly', 'أسبوعياً'), ('never', 'لا ترسل')], default='weekly', verbose_name='تكرار التذكيرات')
     created_at = models.DateTimeField(default=timezone.now, verbose_name='تاريخ الإنشاء')
+    completed_parts_count = models.PositiveIntegerField(default=0, verbose_name='عدد الأجزاء المكتملة')
+    progress = models.FloatField(default=0, verbose_name='نسبة الإنجاز')
+    next_occurrence = models.DateField(null=True, blank=True, editable=False, verbose_name='موعد التكرار التالي')
+    occurrence_date = models.DateField(null=True, blank=True, editable=False, verbose_name='تاريخ التكرار')
+    previous_occurrence = models.OneToOneField('self', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='next_instance', verbose_name='التكرار السابق')
+
+    # Parts of a khatma divided into juz (the default); see PARTS_PER_DIVISION
+    TOTAL_PARTS = 30
+    PARTS_PER_DIVISION = {'juz': 30, 'hizb': 60, 'rub': 240}
+    UNIT_NAMES = {'juz': 'الجزء', 'hizb': 'الحزب', 'rub': 'الربع'}
+    UNIT_PLURAL_NAMES = {'juz': 'الأجزاء', 'hizb': 'الأحزاب', 'rub': 'الأرباع'}
+
+    class Meta:
+        # Public listings (khatma.listing) filter on these columns and page newest first by (created_at, id)
+        indexes = [
+            models.Index(fields=['is_public', '-created_at', '-id'], name='khatma_public_created_idx'),
+            models.Index(fields=['is_public', 'khatma_type', '-created_at', '-id'], name='khatma_public_type_idx'),
+            models.Index(fields=['is_public', 'is_completed', '-created_at', '-id'], name='khatma_public_status_idx'),
+            models.Index(fields=['is_public', 'khatma_type', 'is_completed', '-created_at', '-id'], name='khatma_public_type_status_idx'),
+            # Lists sorted by progress (most or least progressed first, newest first within a progress)
+            models.Index(fields=['is_public', '-progress', '-created_at', '-id'], name='khatma_public_progress_idx'),
+            models.Index(fields=['is_public', 'progress', '-created_at', '-id'], name='khatma_public_progress_asc_idx'),
+            # The admin dashboard counts the khatmas in progress from this index alone
+            models.Index(fields=['id'], condition=models.Q(is_completed=False), name='khatma_active_idx'),
+            # khatma.scheduler looks up the due recurring khatmas by date
+            models.Index(fields=['next_occurrence'], condition=models.Q(next_occurrence__isnull=False), name='khatma_next_occurrence_idx'),
+        ]
+        constraints = [
+            # One scheduled memorial khatma per deceased and date, whatever the number of scheduler runs
+            models.UniqueConstraint(fields=['deceased', 'occurrence_date'], condition=models.Q(previous_occurrence__isnull=True), name='khatma_memorial_occurrence_unique'),
+        ]
 
     def __str__(self):
         '''"""Function to   str  ."""'''
@@ -70,11 +110,19 @@ class Khatma(models.Model):
             return f'{self.title} - {self.group.name} (ختمة جماعية)'
         return f'{self.title} - {self.get_khatma_type_display()}'
 
+    @property
+    def total_parts(self):
+        """Return the number of parts (units) the khatma is divided into"""
+        return self.PARTS_PER_DIVISION.get(self.division, self.TOTAL_PARTS)
+
+    @property
+    def unit_name(self):
+        """Return the Arabic name of one part of the khatma (juz, hizb or rub')"""
+        return self.UNIT_NAMES.get(self.division, self.UNIT_NAMES['juz'])
+
     def get_progress_percentage(self):
-        '''"""Function to get progress percentage."""'''
-        total_parts = self.parts.count()
-        completed_parts = self.parts.filter(is_completed=True).count()
-        return completed_parts / total_parts * 100 if total_parts > 0 else 0
+        """Return the stored completion percentage (kept in sync by khatma.services)"""
+        return self.progress
 
 class Participant(models.Model):
     """Khatma participants"""
@@ -82,6 +130,8 @@ class Participant(models.Model):
     khatma = models.ForeignKey(Khatma, on_delete=models.CASCADE)
     parts_read = models.IntegerField(default=0)
     joined_at = models.DateTimeField(auto_now_add=True)
+    last_reminded_at = models.DateTimeField(null=True, blank=True, verbose_name='آخر تذكير')
+    reminder_email_pending = models.BooleanField(default=False, verbose_name='بريد تذكير معلق')
 
     class Meta:
         '''"""Class representing Meta."""'''
@@ -98,6 +148,7 @@ class KhatmaPart(models.Model):
     class Meta:
         '''"""Class representing Meta."""'''
         unique_together = ('khatma', 'part_number')
+        indexes = [models.Index(fields=['assigned_to', 'khatma'], condition=models.Q(is_completed=False, assigned_to__isnull=False), name='khatmapart_open_assignee_idx')]
 
     def __str__(self):
         '''"""Function to   str  ."""'''
@@ -220,4 +271,19 @@ class PostReaction(models.Model):
     def __str__(self):
         '''"""Function to   str  ."""'''
         target = self.khatma_chat or self.khatma_comment
-        return f'{self.get_reaction_type_display()} by {self.user.username} on {target}'
\ No newline at end of file
+        return f'{self.get_reaction_type_display()} by {self.user.username} on {target}'
+
+class KhatmaEvent(models.Model):
+    """Progress event of a khatma, stored for khatma.events.DatabaseBroker"""
+    khatma = models.ForeignKey(Khatma, on_delete=models.CASCADE, related_name='events')
+    event_type = models.CharField(max_length=30, verbose_name='نوع الحدث')
+    payload = models.JSONField(default=dict, verbose_name='بيانات الحدث')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'حدث ختمة'
+        verbose_name_plural = 'أحداث الختمات'
+
+    def __str__(self):
+        return f'{self.event_type} - {self.khatma_id}'
@@ -0,0 +1,115 @@
+"""Date arithmetic of recurring and memorial khatmas.
+
+``next_occurrence`` gives the date after which a recurring khatma
+(``Khatma.frequency``) starts again and ``next_memorial_date`` the next
+anniversary of a death (``Deceased.memorial_frequency``). Both are pure
+functions; ``khatma.scheduler`` stores their results on indexed date columns
+and creates the khatmas once the dates arrive.
+
+Ramadan is located with the tabular (arithmetic) Islamic calendar, which
+falls within a day or two of the announced start of the month.
+"""
+import calendar
+import math
+from datetime import date, timedelta
+
+RECURRING_FREQUENCIES = ('daily', 'weekly', 'monthly', 'yearly', 'ramadan', 'friday')
+FRIDAY = 4
+RAMADAN = 9
+
+
+def add_months(day, months):
+    """Move a date by whole months, clamping the day to the length of the month."""
+    index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(index, 12)
+    return date(year, month + 1, min(day.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def hijri_month_start(year, month):
+    """Return the Gregorian date of the first day of a month of the tabular Islamic calendar."""
+    julian_day = math.ceil(29.5 * (month - 1)) + (year - 1) * 354 + (3 + 11 * year) // 30 + 1948439.5
+    return date.fromordinal(int(julian_day - 1721424.5))
+
+
+def next_ramadan(after):
+    """Return the first day of the first Ramadan starting after a date."""
+    year = int((after.year - 621.5643) * 1.030684)
+    while hijri_month_start(year, RAMADAN) <= after:
+        year += 1
+    return hijri_month_start(year, RAMADAN)
+
+
+def next_occurrence(frequency, after):
+    """
+    Return the next start date of a recurring khatma, strictly after a date.
+
+    Args:
+        frequency: Khatma.frequency
+        after: The date of the current occurrence
+
+    Returns:
+        date or None: None for khatmas that do not recur ('once')
+    """
+    if frequency == 'daily':
+        return after + timedelta(days=1)
+    if frequency == 'weekly':
+        return after + timedelta(days=7)
+    if frequency == 'friday':
+        return after + timedelta(days=(FRIDAY - after.weekday() - 1) % 7 + 1)
+    if frequency == 'monthly':
+        return add_months(after, 1)
+    if frequency == 'yearly':
+        return add_months(after, 12)
+    if frequency == 'ramadan':
+        return next_ramadan(after)
+    return None
+
+
+def upcoming_occurrence(frequency, after, today):
+    """
+    Return the first occurrence after a date that is still ahead of today.
+
+    Occurrences missed while no scheduler ran are skipped rather than caught
+    up one by one, keeping the series on its original days.
+
+    Returns:
+        date or None: None for khatmas that do not recur
+    """
+    upcoming = next_occurrence(frequency, after)
+    while upcoming is not None and upcoming <= today:
+        upcoming = next_occurrence(frequency, upcoming)
+    return upcoming
+
+
+def next_memorial_date(death_date, frequency, on_or_after):
+    """
+    Return the first memorial date of a death on or after a date.
+
+    Anniversaries falling on days a month does not have (the 31st, or 29
+    February) move to the last day of the month. The first memorial is the
+    day after the death at the earliest.
+
+    Args:
+        death_date: Deceased.death_date
+        frequency: Deceased.memorial_frequency ('yearly', 'monthly', 'weekly' or 'daily')
+        on_or_after: The earliest acceptable date (usually today)
+
+    Returns:
+        date or None: None for an unknown frequency
+    """
+    start = max(on_or_after, death_date + timedelta(days=1))
+    if frequency == 'daily':
+        return start
+    if frequency == 'weekly':
+        return start + timedelta(days=(death_date.weekday() - start.weekday()) % 7)
+    if frequency in ('monthly', 'yearly'):
+        step = 1 if frequency == 'monthly' else 12
+        # Count whole steps from the death so clamped days (31st, 29 Feb) never drift
+        months = (start.year - death_date.year) * 12 + start.month - death_date.month
+        months -= months % step
+        candidate = add_months(death_date, months)
+        while candidate < start:
+            months += step
+            candidate = add_months(death_date, months)
+        return candidate
+    return None
@@ -0,0 +1,259 @@
+"""Reading reminders for participants with unfinished parts (``manage.py send_reminders``).
+
+Khatmas with ``send_reminders`` remind their readers daily or weekly
+(``reminder_frequency``). One pass finds every participant whose reminder is
+due and who still has unfinished parts assigned to them, and sends each user a
+single digest covering all their khatmas: an in-app notification and/or an
+email, as their ``NotificationSetting`` allows. Users in their quiet hours are
+left for a later pass.
+
+Users are taken in batches by id (keyset), so a pass over 100k users runs a
+fixed handful of queries per batch. Emails of the whole pass go through one
+SMTP connection, ``send_messages`` being called with ``EMAIL_BATCH_SIZE``
+messages at a time. The participants reminded get ``last_reminded_at``
+stamped, which is what makes the next reminder due. The participants of an
+email chunk that ``send_messages`` fails to send are marked
+``reminder_email_pending``: the next pass sends them the email again, without
+another in-app notification. A dry run builds the same digests without
+writing or sending anything and reports the counts and time.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+from django.urls import reverse
+from django.utils import timezone
+
+from notifications.models import Notification, NotificationSetting
+from notifications.services import count_new_notifications
+from notifications.signals import send_push_notification
+
+from .models import Khatma, KhatmaPart, Participant
+
+logger = logging.getLogger(__name__)
+
+REMINDER_TYPE = 'reading_reminder'
+REMINDER_INTERVALS = {'daily': timedelta(days=1), 'weekly': timedelta(days=7)}
+# A reminder sent a little early still counts, so a daily cron job is not skipped every other day
+REMINDER_SLACK = timedelta(hours=1)
+DEFAULT_BATCH_SIZE = 1000
+EMAIL_BATCH_SIZE = 100
+
+
+def _interval_elapsed(now):
+    """Build the condition of participants not reminded within their khatma's interval."""
+    elapsed = Q()
+    for frequency, interval in REMINDER_INTERVALS.items():
+        elapsed |= Q(khatma__reminder_frequency=frequency) & (
+            Q(last_reminded_at__isnull=True) | Q(last_reminded_at__lte=now - interval + REMINDER_SLACK))
+    return elapsed
+
+
+def due_participants(now=None):
+    """
+    Build the queryset of participants whose reminder is due.
+
+    Args:
+        now: Reference time (defaults to now)
+
+    Returns:
+        QuerySet: Participants of incomplete khatmas sending reminders, not
+            reminded within the khatma's interval or waiting for a failed
+            email, with unfinished parts assigned
+    """
+    now = now or timezone.now()
+    open_parts = KhatmaPart.objects.filter(khatma=OuterRef('khatma'), assigned_to=OuterRef('user'), is_completed=False)
+    return Participant.objects.filter(
+        _interval_elapsed(now) | Q(reminder_email_pending=True), Exists(open_parts),
+        khatma__send_reminders=True, khatma__is_completed=False)
+
+
+def build_digest(entries):
+    """
+    Write the digest of one user.
+
+    Args:
+        entries: (khatma title, division, part numbers) of each of the user's khatmas
+
+    Returns:
+        tuple: (subject, message)
+    """
+    lines = []
+    for title, division, numbers in entries:
+        unit = Khatma.UNIT_NAMES[division] if len(numbers) == 1 else Khatma.UNIT_PLURAL_NAMES[division]
+        lines.append(f"- {title}: {unit} {'، '.join(map(str, numbers))}")
+    subject = 'تذكير بقراءة أجزائك في الختمات'
+    message = 'لديك أجزاء لم تكتمل بعد:\n' + '\n'.join(lines)
+    return subject, message
+
+
+class ReminderDigest:
+    """
+    Send the due reading reminders, one digest per user.
+
+    Args:
+        batch_size: Number of users handled per batch (and transaction)
+        dry_run: Build the digests without creating notifications, sending emails or stamping participants
+        now: Reference time (defaults to now)
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, now=None):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.now = now or timezone.now()
+        self.stats = dict.fromkeys(('users', 'participants', 'parts', 'notifications', 'emails', 'emails_failed', 'deferred', 'skipped'), 0)
+        self._emails = []
+        self._connection = None
+        self._urls = {}
+
+    def run(self):
+        """
+        Run one pass.
+
+        Returns:
+            dict: Counts ('users' reminded, 'participants' and 'parts' covered,
+                'notifications' and 'emails' sent, 'emails_failed', users
+                'deferred' for quiet hours and 'skipped' for their settings),
+                'batches' and 'seconds'
+        """
+        started = time.monotonic()
+        due = due_participants(self.now)
+        batches = 0
+        last_user_id = 0
+        try:
+            while True:
+                user_ids = list(
+                    due.filter(user_id__gt=last_user_id).order_by('user_id')
+                    .values_list('user_id', flat=True).distinct()[:self.batch_size])
+                if not user_ids:
+                    break
+                last_user_id = user_ids[-1]
+                batches += 1
+                self._run_batch(due, user_ids)
+            self._flush_emails()
+        finally:
+            if self._connection is not None:
+                self._connection.close()
+        return {**self.stats, 'batches': batches, 'seconds': round(time.monotonic() - started, 3)}
+
+    def _run_batch(self, due, user_ids):
+        """Build and send the digests of a batch of users."""
+        participants = list(
+            due.filter(user_id__in=user_ids).order_by('user_id', 'khatma_id')
+            .annotate(interval_elapsed=ExpressionWrapper(_interval_elapsed(self.now), output_field=BooleanField()))
+            .values_list('pk', 'user_id', 'khatma_id', 'khatma__title', 'khatma__division', 'interval_elapsed'))
+        # Filtering on the users alone scans the open-assignee index; parts of khatmas not due are ignored below
+        parts = {}
+        for user_id, khatma_id, number in (
+            KhatmaPart.objects.filter(assigned_to_id__in=user_ids, is_completed=False)
+            .order_by('part_number').values_list('assigned_to_id', 'khatma_id', 'part_number')
+        ):
+            parts.setdefault((user_id, khatma_id), []).append(number)
+        user_settings = {setting.user_id: setting for setting in NotificationSetting.objects.filter(user_id__in=user_ids)}
+        emails = dict(User.objects.filter(pk__in=user_ids, is_active=True).exclude(email='').values_list('pk', 'email'))
+        default_settings = NotificationSetting()
+
+        digests = {}
+        for participant_id, user_id, khatma_id, title, division, interval_elapsed in participants:
+            numbers = parts.get((user_id, khatma_id))
+            if numbers:
+                digest = digests.setdefault(user_id, {'participants': [], 'khatmas': [], 'entries': [], 'email_only': True})
+                # Users due only because their last email failed already have the in-app digest
+                digest['email_only'] = digest['email_only'] and not interval_elapsed
+                digest['participants'].append(participant_id)
+                digest['khatmas'].append(khatma_id)
+                digest['entries'].append((title, division, numbers))
+
+        reminded, notifications, push_users = [], [], set()
+        for user_id, digest in digests.items():
+            setting = user_settings.get(user_id, default_settings)
+            if setting.is_quiet_hours():
+                self.stats['deferred'] += 1
+                continue
+            in_app = setting.should_notify(REMINDER_TYPE, 'in_app') and not digest['email_only']
+            email = setting.should_notify(REMINDER_TYPE, 'email') and user_id in emails
+            reminded.extend(digest['participants'])
+            if not (in_app or email):
+                # Users who turned reminders off are stamped too, so they are not reconsidered every pass
+                self.stats['skipped'] += 1
+                continue
+            self.stats['users'] += 1
+            self.stats['participants'] += len(digest['participants'])
+            self.stats['parts'] += sum(len(numbers) for _, _, numbers in digest['entries'])
+            subject, message = build_digest(digest['entries'])
+            if in_app:
+                # A digest about a single khatma links to it, a longer one to the user's khatmas
+                related_khatma_id = digest['khatmas'][0] if len(digest['khatmas']) == 1 else None
+                action_url = self._action_url(related_khatma_id)
+                notifications.append(Notification(user_id=user_id, notification_type=REMINDER_TYPE, message=message,
+                                                  related_khatma_id=related_khatma_id, action_url=action_url))
+                if setting.should_notify(REMINDER_TYPE, 'push'):
+                    push_users.add(user_id)
+            if email:
+                # Marked reminder_email_pending again if the email fails, see _flush_emails
+                self._emails.append((EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [emails[user_id]]), digest['participants']))
+
+        self.stats['notifications'] += len(notifications)
+        if self.dry_run:
+            self.stats['emails'] += len(self._emails)
+            self._emails = []
+            return
+        with transaction.atomic():
+            created = Notification.objects.bulk_create(notifications, batch_size=self.batch_size)
+            count_new_notifications(created)
+            Participant.objects.filter(pk__in=reminded).update(last_reminded_at=self.now, reminder_email_pending=False)
+        for notification in created:
+            if notification.user_id in push_users:
+                send_push_notification(notification)
+        if len(self._emails) >= EMAIL_BATCH_SIZE:
+            self._flush_emails()
+
+    def _action_url(self, khatma_id):
+        """Return the link of a digest, reversing each URL once per pass."""
+        if khatma_id not in self._urls:
+            self._urls[khatma_id] = reverse('khatma:khatma_detail', args=[khatma_id]) if khatma_id else reverse('khatma:my_khatmas')
+        return self._urls[khatma_id]
+
+    def _flush_emails(self):
+        """
+        Send the pending emails through the pass's SMTP connection, EMAIL_BATCH_SIZE at a time.
+
+        ``send_messages`` does not say which messages of a failed chunk went
+        out, so the participants of the whole chunk are marked
+        ``reminder_email_pending`` and emailed again next pass.
+        """
+        if self.dry_run or not self._emails:
+            return
+        if self._connection is None:
+            self._connection = get_connection()
+        pending, self._emails = self._emails, []
+        for start in range(0, len(pending), EMAIL_BATCH_SIZE):
+            chunk = pending[start:start + EMAIL_BATCH_SIZE]
+            try:
+                sent = self._connection.send_messages([message for message, _ in chunk]) or 0
+            except Exception as e:
+                logger.error(f"Error sending {len(chunk)} reminder emails: {str(e)}")
+                sent = 0
+            self.stats['emails'] += sent
+            self.stats['emails_failed'] += len(chunk) - sent
+            if sent < len(chunk):
+                pending_ids = [participant_id for _, participants in chunk for participant_id in participants]
+                Participant.objects.filter(pk__in=pending_ids).update(reminder_email_pending=True)
+
+
+def send_reminders(batch_size=DEFAULT_BATCH_SIZE, dry_run=False, now=None):
+    """
+    Send every due reading reminder (see ``ReminderDigest``).
+
+    Returns:
+        dict: Counts and timing of the pass
+    """
+    result = ReminderDigest(batch_size, dry_run, now).run()
+    if result['users'] and not dry_run:
+        logger.info(f"Sent reading reminders to {result['users']} users ({result['emails']} emails)")
+    return result
@@ -0,0 +1,139 @@
+"""Creation of the due recurring and memorial khatmas (``manage.py run_scheduler``).
+
+Recurring khatmas store the date they start again in ``Khatma.next_occurrence``
+and memorials their next date in ``Deceased.next_memorial_date``; both columns
+are covered by partial indexes, so finding what is due is a range scan however
+many series exist. Each ``tick`` takes the due rows in batches with
+``SELECT ... FOR UPDATE SKIP LOCKED``, creates the new khatmas with
+``KhatmaFactory.create_many`` and moves the dates forward with one
+``bulk_update``, all in the batch's transaction. Concurrent schedulers
+therefore never take the same rows, and a row whose khatma was created is no
+longer due once its transaction commits. The one-to-one
+``previous_occurrence`` link and the unique (deceased, occurrence_date) of
+memorial khatmas back this up at the database level.
+
+Series created by bulk inserts get their first date from ``KhatmaFactory``;
+the save signals set it for everything else.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Deceased, Khatma, Participant
+from .recurrence import RECURRING_FREQUENCIES, next_memorial_date, upcoming_occurrence
+from .services import KhatmaFactory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+MEMORIAL_DURATION = timedelta(days=30)
+# Settings copied from a recurring khatma to its next instance
+CARRIED_FIELDS = (
+    'title', 'creator_id', 'description', 'khatma_type', 'frequency', 'group_id', 'is_group_khatma', 'division',
+    'auto_distribute_parts', 'distribution_strategy', 'deceased_id', 'memorial_prayer', 'is_public', 'visibility',
+    'allow_comments', 'social_media_hashtags', 'max_participants', 'send_reminders', 'reminder_frequency',
+)
+
+
+def _lock_due(queryset):
+    """Lock a batch of due rows, skipping the ones another scheduler holds."""
+    if connection.features.has_select_for_update_skip_locked:
+        return queryset.select_for_update(skip_locked=True)
+    return queryset.select_for_update()
+
+
+def _next_instance(khatma, today):
+    """Build the unsaved next instance of a recurring khatma."""
+    day = khatma.next_occurrence
+    instance = Khatma(**{field: getattr(khatma, field) for field in CARRIED_FIELDS})
+    instance.previous_occurrence_id = khatma.pk
+    instance.occurrence_date = instance.start_date = day
+    if khatma.start_date and khatma.target_completion_date:
+        instance.target_completion_date = day + (khatma.target_completion_date - khatma.start_date)
+    instance.next_occurrence = upcoming_occurrence(khatma.frequency, day, today)
+    return instance
+
+
+def create_due_recurring_khatmas(today=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Create the next instance of every recurring khatma due by today.
+
+    The new instance takes over the series (and its participants); the
+    previous one stops recurring.
+
+    Returns:
+        int: Number of khatmas created
+    """
+    today = today or timezone.localdate()
+    factory = KhatmaFactory(notification_message=lambda khatma: f'بدأت دورة جديدة من الختمة: {khatma.title}')
+    created = 0
+    while True:
+        with transaction.atomic():
+            due = list(_lock_due(Khatma.objects.filter(next_occurrence__lte=today, frequency__in=RECURRING_FREQUENCIES).order_by('next_occurrence', 'pk'))[:batch_size])
+            if not due:
+                break
+            members = {khatma.pk: [] for khatma in due}
+            for khatma_id, user_id in Participant.objects.filter(khatma__in=due).order_by('joined_at', 'pk').values_list('khatma_id', 'user_id'):
+                members[khatma_id].append(user_id)
+            instances = factory.create_many([_next_instance(khatma, today) for khatma in due], [members[khatma.pk] for khatma in due])
+            for khatma in due:
+                khatma.next_occurrence = None
+            Khatma.objects.bulk_update(due, ['next_occurrence'])
+        created += len(instances)
+    return created
+
+
+def build_memorial_khatma(deceased, day):
+    """Build the unsaved memorial khatma of a deceased for a date."""
+    years = day.year - deceased.death_date.year
+    return Khatma(
+        title=f'ختمة تذكارية: {deceased.name} - الذكرى {years}', creator_id=deceased.added_by_id,
+        description=f'ختمة تذكارية في ذكرى وفاة {deceased.name}', khatma_type='memorial', deceased=deceased,
+        is_public=True, visibility='public', start_date=day, occurrence_date=day,
+        target_completion_date=day + MEMORIAL_DURATION)
+
+
+def create_due_memorial_khatmas(today=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Create the memorial khatma of every deceased whose memorial date has come.
+
+    Returns:
+        int: Number of khatmas created
+    """
+    today = today or timezone.localdate()
+    factory = KhatmaFactory(notification_type='memorial_khatma', notification_message=lambda khatma: f'تم إنشاء ختمة تذكارية للمتوفى: {khatma.deceased.name}')
+    created = 0
+    while True:
+        with transaction.atomic():
+            due = list(_lock_due(Deceased.objects.filter(memorial_day=True, next_memorial_date__lte=today).order_by('next_memorial_date', 'pk'))[:batch_size])
+            if not due:
+                break
+            # A memorial already created for its date (e.g. by a run that then failed to move the date) is skipped
+            existing = set(Khatma.objects.filter(deceased__in=due, occurrence_date__lte=today, previous_occurrence__isnull=True).values_list('deceased_id', 'occurrence_date'))
+            khatmas = factory.create_many(
+                build_memorial_khatma(deceased, deceased.next_memorial_date) for deceased in due
+                if (deceased.pk, deceased.next_memorial_date) not in existing)
+            for deceased in due:
+                deceased.next_memorial_date = next_memorial_date(deceased.death_date, deceased.memorial_frequency, today + timedelta(days=1))
+            Deceased.objects.bulk_update(due, ['next_memorial_date'])
+        created += len(khatmas)
+    return created
+
+
+def tick(today=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Run one scheduler pass.
+
+    Returns:
+        dict: Number of 'recurring' and 'memorial' khatmas created
+    """
+    today = today or timezone.localdate()
+    result = {
+        'recurring': create_due_recurring_khatmas(today, batch_size),
+        'memorial': create_due_memorial_khatmas(today, batch_size),
+    }
+    if result['recurring'] or result['memorial']:
+        logger.info(f"Scheduler created {result['recurring']} recurring and {result['memorial']} memorial khatmas")
+    return result
@@ -1 +1,265 @@
-"""Business logic for khatma app."""
\ No newline at end of file
+"""Business logic for khatma app."""
+import logging
+
+from django.db import transaction
+from django.db.models import Case, Count, ExpressionWrapper, F, FloatField, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from . import events
+from .distribution import initial_assignments
+from .models import Khatma, KhatmaPart, Participant
+from .recurrence import RECURRING_FREQUENCIES, upcoming_occurrence
+
+logger = logging.getLogger(__name__)
+
+
+class KhatmaFactory:
+    """
+    Create khatmas together with their parts, creator participant and notifications.
+
+    Every row type is written with a single bulk_create inside one transaction, so
+    creating a khatma costs a constant number of queries instead of one INSERT per
+    part. Many khatmas can be created at once, e.g. for memorial or recurring
+    generation.
+
+    Args:
+        notification_type: Notification type to send, or None to skip notifications
+        notification_message: Callable returning the message for a khatma
+        notification_recipients: Callable returning the users to notify for a khatma
+            (defaults to the creator)
+        batch_size: Maximum number of rows per INSERT
+    """
+
+    def __init__(self, notification_type='khatma_progress', notification_message=None, notification_recipients=None, batch_size=500):
+        self.notification_type = notification_type
+        self.notification_message = notification_message or (lambda khatma: f'تم إنشاء ختمة جديدة: {khatma.title}')
+        self.notification_recipients = notification_recipients or (lambda khatma: [khatma.creator])
+        self.batch_size = batch_size
+
+    def create(self, khatma):
+        """
+        Create a single unsaved khatma.
+
+        Args:
+            khatma: An unsaved Khatma instance
+
+        Returns:
+            Khatma: The saved khatma
+        """
+        return self.create_many([khatma])[0]
+
+    def create_many(self, khatmas, members=None):
+        """
+        Create several unsaved khatmas in one transaction.
+
+        The parts of khatmas with ``auto_distribute_parts`` are inserted
+        already assigned to their readers (the creator and ``members``).
+
+        Args:
+            khatmas: Iterable of unsaved Khatma instances
+            members: Optional list of the ids of the users joining each khatma
+                besides its creator, in join order
+
+        Returns:
+            list: The saved khatmas
+        """
+        khatmas = list(khatmas)
+        if not khatmas:
+            return khatmas
+        today = timezone.localdate()
+        for khatma in khatmas:
+            # bulk_create skips the pre_save signal that schedules recurring khatmas
+            if khatma.next_occurrence is None and khatma.frequency in RECURRING_FREQUENCIES:
+                khatma.next_occurrence = upcoming_occurrence(khatma.frequency, khatma.start_date or today, today)
+        readers = [
+            [khatma.creator_id] + [user_id for user_id in (members[index] if members else ()) if user_id != khatma.creator_id]
+            for index, khatma in enumerate(khatmas)
+        ]
+        # bulk_create skips the post_save signal that hands the parts to the readers
+        plans = initial_assignments(
+            [khatma for khatma in khatmas if khatma.auto_distribute_parts],
+            [user_ids for khatma, user_ids in zip(khatmas, readers) if khatma.auto_distribute_parts])
+        assignments = iter(plans)
+        with transaction.atomic():
+            Khatma.objects.bulk_create(khatmas, batch_size=self.batch_size)
+            parts = []
+            for khatma in khatmas:
+                plan = next(assignments) if khatma.auto_distribute_parts else {}
+                parts.extend(KhatmaPart(khatma=khatma, part_number=number, assigned_to_id=plan.get(number))
+                             for number in range(1, khatma.total_parts + 1))
+            KhatmaPart.objects.bulk_create(parts, batch_size=self.batch_size)
+            Participant.objects.bulk_create(
+                [Participant(user_id=user_id, khatma=khatma) for khatma, user_ids in zip(khatmas, readers) for user_id in user_ids],
+                batch_size=self.batch_size, ignore_conflicts=True)
+            notifications = self._create_notifications(khatmas)
+        if notifications:
+            _enqueue_delivery(notifications)
+        transaction.on_commit(lambda: events.khatmas_created.send(sender=Khatma, khatmas=khatmas))
+        return khatmas
+
+    def _create_notifications(self, khatmas):
+        """Bulk insert the creation notifications for the given khatmas."""
+        if not self.notification_type:
+            return []
+        try:
+            from notifications.models import Notification
+            from notifications.services import count_new_notifications
+        except ImportError:
+            return []
+        notifications = [
+            Notification(user=user, notification_type=self.notification_type, message=self.notification_message(khatma), related_khatma=khatma, related_group_id=khatma.group_id)
+            for khatma in khatmas
+            for user in self.notification_recipients(khatma)
+        ]
+        notifications = Notification.objects.bulk_create(notifications, batch_size=self.batch_size)
+        count_new_notifications(notifications)
+        return notifications
+
+
+def _enqueue_delivery(notifications):
+    """Send bulk created notifications by email and push from the notification worker, after commit."""
+    from notifications.services import enqueue_delivery
+    enqueue_delivery(notifications)
+
+
+def _total_parts_expression():
+    """Build the SQL expression of a khatma's number of parts, from its division."""
+    return Case(
+        *[When(division=division, then=Value(total)) for division, total in Khatma.PARTS_PER_DIVISION.items()],
+        default=Value(Khatma.TOTAL_PARTS), output_field=IntegerField())
+
+
+def _progress_expression():
+    """Build the SQL expression deriving ``progress`` from ``completed_parts_count``."""
+    return ExpressionWrapper(F('completed_parts_count') * 100.0 / _total_parts_expression(), output_field=FloatField())
+
+
+def set_part_completion(part, is_completed, user=None):
+    """
+    Mark a khatma part as completed or not completed and keep the khatma counters in sync.
+
+    The part row is only updated when its completion state actually changes, so
+    repeated or concurrent requests never count the same part twice. The khatma
+    counters are adjusted with F() expressions instead of re-counting its parts.
+
+    Args:
+        part: The KhatmaPart to update
+        is_completed: The new completion state
+        user: The user making the change (defaults to the part's reader)
+
+    Returns:
+        bool: True if the completion state changed
+    """
+    completed_at = timezone.now() if is_completed else None
+    with transaction.atomic():
+        changed = KhatmaPart.objects.filter(pk=part.pk, is_completed=not is_completed).update(
+            is_completed=is_completed, completed_at=completed_at)
+        if changed:
+            delta = 1 if is_completed else -1
+            khatmas = Khatma.objects.filter(pk=part.khatma_id)
+            khatmas.update(completed_parts_count=F('completed_parts_count') + delta)
+            khatmas.update(progress=_progress_expression())
+
+    if changed:
+        part.is_completed = is_completed
+        part.completed_at = completed_at
+        if is_completed:
+            _complete_khatma_if_finished(part.khatma_id)
+        events.publish_khatma_event(
+            part.khatma_id, events.PART_COMPLETED if is_completed else events.PART_UNCOMPLETED, part_number=part.part_number,
+            user_id=user.pk if user else part.assigned_to_id)
+    return bool(changed)
+
+
+def _complete_khatma_if_finished(khatma_id):
+    """Flag a khatma as completed once its counter reaches the total number of parts."""
+    finished = Khatma.objects.filter(
+        pk=khatma_id, is_completed=False, completed_parts_count__gte=_total_parts_expression()
+    ).update(is_completed=True, completed_at=timezone.now())
+    if not finished:
+        return
+    events.publish_khatma_event(khatma_id, events.KHATMA_COMPLETED, newly_completed=True)
+    khatma = Khatma.objects.select_related('creator').get(pk=khatma_id)
+    try:
+        from notifications.models import Notification
+        Notification.objects.create(user=khatma.creator, notification_type='khatma_completed', message=f'تم إكمال الختمة: {khatma.title}', related_khatma=khatma)
+    except ImportError:
+        pass
+
+
+def complete_all_parts(khatma):
+    """
+    Mark every remaining part of a khatma as completed.
+
+    Args:
+        khatma: The Khatma to complete
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        parts_completed = KhatmaPart.objects.filter(khatma=khatma, is_completed=False).update(is_completed=True, completed_at=now)
+        newly_completed = Khatma.objects.filter(pk=khatma.pk, is_completed=False).update(is_completed=True, completed_at=now)
+        Khatma.objects.filter(pk=khatma.pk).update(completed_parts_count=khatma.total_parts, progress=100.0)
+    khatma.completed_parts_count = khatma.total_parts
+    khatma.progress = 100.0
+    khatma.is_completed = True
+    if newly_completed:
+        khatma.completed_at = now
+    if newly_completed or parts_completed:
+        events.publish_khatma_event(khatma.pk, events.KHATMA_COMPLETED, parts_completed=parts_completed, newly_completed=bool(newly_completed))
+
+
+def get_progress_snapshot(khatma, recent=5):
+    """
+    Return the progress data served by ``khatma_progress_api`` and the progress stream.
+
+    Args:
+        khatma: The Khatma, ideally loaded with select_related('creator')
+        recent: Number of recent completions to include
+
+    Returns:
+        dict: Progress counters and the most recent completions
+    """
+    recent_completions = KhatmaPart.objects.filter(khatma=khatma, is_completed=True).select_related('assigned_to').order_by('-completed_at')[:recent]
+    return {
+        'total_parts': khatma.total_parts,
+        'unit_name': khatma.unit_name,
+        'completed_parts': khatma.completed_parts_count,
+        'progress_percentage': khatma.progress,
+        'recent_completions': [
+            {
+                'part_number': part.part_number,
+                'completed_by': part.assigned_to.username if part.assigned_to else khatma.creator.username,
+                'completed_at': part.completed_at.strftime('%Y-%m-%d %H:%M') if part.completed_at else None,
+            }
+            for part in recent_completions
+        ],
+        'is_completed': khatma.is_completed,
+    }
+
+
+def recompute_khatma_progress(queryset=None):
+    """
+    Recalculate the stored progress counters from the actual part rows.
+
+    Args:
+        queryset: Optional Khatma queryset to restrict the repair to
+
+    Returns:
+        int: Number of khatmas whose counters were out of date
+    """
+    if queryset is None:
+        queryset = Khatma.objects.all()
+    rows = queryset.annotate(
+        actual_completed=Count('parts', filter=Q(parts__is_completed=True))
+    ).values_list('pk', 'division', 'completed_parts_count', 'progress', 'actual_completed')
+
+    repaired = 0
+    for khatma_id, division, stored, stored_progress, actual in rows.iterator():
+        progress = actual * 100.0 / Khatma.PARTS_PER_DIVISION.get(division, Khatma.TOTAL_PARTS)
+        if stored == actual and stored_progress == progress:
+            continue
+        Khatma.objects.filter(pk=khatma_id).update(completed_parts_count=actual, progress=progress)
+        repaired += 1
+    if repaired:
+        logger.info(f"Repaired progress counters for {repaired} khatmas")
+    return repaired
@@ -1,5 +1,6 @@
 """Django settings for Khatma project."""
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,7 @@ SITE_DOMAIN = os.environ.get('SITE_DOMAIN', 'localhost:8000')
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -175,6 +177,47 @@ SOCIALACCOUNT_PROVIDERS = {
     }
 }
 
+# Leaderboard: seconds before the materialized ranking is rebuilt in the
+# background (run `manage.py refresh_leaderboard` from cron to keep it warm)
+LEADERBOARD_REFRESH_INTERVAL = int(os.environ.get('LEADERBOARD_REFRESH_INTERVAL', 15 * 60))
+
+# Quran corpus cache: stamp file rewritten by the Quran import commands; every
+# worker reloads its in-memory copy of the text when the stamp changes
+QURAN_CORPUS_VERSION_FILE = os.environ.get('QURAN_CORPUS_VERSION_FILE', os.path.join(BASE_DIR, '.quran_corpus_version'))
+
+# Reciter audio: one folder of <surah>.mp3 files per reciter, indexed into
+# QuranReciter/ReciterSurah by `manage.py index_reciters`
+RECITERS_DIR = os.environ.get('RECITERS_DIR', os.path.join(BASE_DIR, 'reciters'))
+# How /media/reciters/ files are sent: '' streams them from Django (Range and
+# ETag aware), 'x-accel-redirect' hands them to an nginx internal location at
+# RECITER_AUDIO_ACCEL_PREFIX aliased to RECITERS_DIR, 'x-sendfile' to Apache/lighttpd
+RECITER_AUDIO_OFFLOAD = os.environ.get('RECITER_AUDIO_OFFLOAD', '')
+RECITER_AUDIO_ACCEL_PREFIX = os.environ.get('RECITER_AUDIO_ACCEL_PREFIX', '/protected/reciters/')
+# Seconds browsers and CDNs may cache an audio file before revalidating its ETag
+RECITER_AUDIO_MAX_AGE = int(os.environ.get('RECITER_AUDIO_MAX_AGE', 7 * 24 * 60 * 60))
+
+# Khatma share images (core/share_images.py): cached under SHARE_IMAGE_ROOT and
+# drawn again only when the progress crosses a SHARE_IMAGE_PROGRESS_STEP bucket.
+# SHARE_IMAGE_WORKERS renderer processes (0 renders in the request thread) with
+# at most SHARE_IMAGE_MAX_PENDING images waiting; further requests get a 503.
+# A request for an image being rendered gets a 202 and retries.
+SHARE_IMAGE_ROOT = os.path.join(MEDIA_ROOT, 'share')
+SHARE_IMAGE_PROGRESS_STEP = 10
+SHARE_IMAGE_WORKERS = int(os.environ.get('SHARE_IMAGE_WORKERS', 2))
+SHARE_IMAGE_MAX_PENDING = 8
+SHARE_IMAGE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Request instrumentation (core.middleware.QueryBudgetMiddleware): the sampled
+# fraction of requests is measured per view and flushed to ViewMetrics every
+# QUERY_METRICS_FLUSH_INTERVAL seconds (see `manage.py query_budget_report`).
+# Under `manage.py test` every request is measured and a view running more
+# queries than its @query_budget (or QUERY_BUDGETS entry) fails the test.
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+QUERY_METRICS_SAMPLE_RATE = 1.0 if TESTING else float(os.environ.get('QUERY_METRICS_SAMPLE_RATE', 0.05))
+QUERY_METRICS_FLUSH_INTERVAL = None if TESTING else 60
+QUERY_BUDGET_STRICT = TESTING
+QUERY_BUDGETS = {}
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -208,4 +251,22 @@ LOGGING = {
             'propagate': True,
         },
     },
-}
\ No newline at end of file
+}
+# Notifications: seconds a cached per-user unread counter lives before it is recounted
+NOTIFICATION_UNREAD_COUNT_TIMEOUT = int(os.environ.get('NOTIFICATION_UNREAD_COUNT_TIMEOUT', 60 * 60))
+
+# Notifications: run chat notification fan-out in a background worker thread
+# after the request's transaction commits (False runs it inline)
+NOTIFICATION_DISPATCH_ASYNC = os.environ.get('NOTIFICATION_DISPATCH_ASYNC', 'True') == 'True'
+
+# Khatma progress events: broker relaying events to the progress streams.
+# InMemoryBroker serves a single process; DatabaseBroker shares events between
+# worker processes through the KhatmaEvent table.
+KHATMA_EVENT_BROKER = os.environ.get('KHATMA_EVENT_BROKER', 'khatma.events.InMemoryBroker')
+# Seconds between DatabaseBroker polls, and how long stored events are kept
+KHATMA_EVENT_POLL_INTERVAL = float(os.environ.get('KHATMA_EVENT_POLL_INTERVAL', 2))
+KHATMA_EVENT_RETENTION = int(os.environ.get('KHATMA_EVENT_RETENTION', 60 * 60))
+
+# Dashboard: seconds a cached per-user dashboard snapshot lives; events
+# (part completion, joining a khatma, new notifications) invalidate it earlier
+DASHBOARD_SNAPSHOT_TIMEOUT = int(os.environ.get('DASHBOARD_SNAPSHOT_TIMEOUT', 5 * 60))
@@ -1,18 +1,19 @@
 '''"""This module contains Module functionality."""'''
-import datetime
 '\n'
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 '\n'
-from .models import Khatma, KhatmaPart, QuranReading, Deceased
+from . import events
+from .distribution import schedule_distribution
+from .recurrence import RECURRING_FREQUENCIES, next_memorial_date, upcoming_occurrence
+from .models import Khatma, KhatmaPart, Participant, QuranReading, Deceased
 
 @receiver(post_save, sender=Khatma)
 def create_khatma_parts(sender, instance, created, **kwargs):
-    """Create parts for a new Khatma"""
+    """Create parts for a new Khatma (khatma.services.KhatmaFactory creates them itself)"""
     if created:
-        for i in range(1, 31):
-            KhatmaPart.objects.create(khatma=instance, part_number=i)
+        KhatmaPart.objects.bulk_create([KhatmaPart(khatma=instance, part_number=i) for i in range(1, instance.total_parts + 1)], ignore_conflicts=True)
 
 @receiver(post_save, sender=KhatmaPart)
 def update_khatma_completion(sender, instance, **kwargs):
@@ -22,7 +23,8 @@ def update_khatma_completion(sender, instance, **kwargs):
     if all_parts_completed and (not khatma.is_completed):
         khatma.is_completed = True
         khatma.completed_at = timezone.now()
-        khatma.save()
+        khatma.save(update_fields=['is_completed', 'completed_at'])
+        events.publish_khatma_event(khatma.id, events.KHATMA_COMPLETED, newly_completed=True)
         try:
             from notifications.models import Notification
             Notification.objects.create(user=khatma.creator, notification_type='khatma_completed', message=f'تم إكمال الختمة: {khatma.title}', related_khatma=khatma)
@@ -40,6 +42,18 @@ def update_part_completion_date(sender, instance, **kwargs):
         except KhatmaPart.DoesNotExist:
             pass
 
+@receiver(post_save, sender=Participant)
+def publish_participant_joined(sender, instance, created, **kwargs):
+    """Push a participant-joined event to open progress streams"""
+    if created:
+        events.publish_khatma_event(instance.khatma_id, events.PARTICIPANT_JOINED, user=instance.user.username)
+        schedule_distribution(instance.khatma_id, rebalance=True)
+
+@receiver(post_delete, sender=Participant)
+def redistribute_parts_on_leave(sender, instance, **kwargs):
+    """Hand the parts a participant leaves behind to the remaining readers"""
+    schedule_distribution(instance.khatma_id)
+
 @receiver(post_save, sender=QuranReading)
 def update_participant_parts_read(sender, instance, **kwargs):
     """Update participant's parts_read count when a reading is completed"""
@@ -55,31 +69,19 @@ def update_participant_parts_read(sender, instance, **kwargs):
         except Participant.DoesNotExist:
             pass
 
-@receiver(post_save, sender=Deceased)
-def schedule_memorial_khatma(sender, instance, created, **kwargs):
-    """Schedule memorial Khatma if memorial_day is enabled"""
-    if instance.memorial_day:
-        today = timezone.now().date()
-        if instance.memorial_frequency == 'yearly':
-            if today.month == instance.death_date.month and today.day == instance.death_date.day:
-                create_memorial_khatma(instance)
-        elif instance.memorial_frequency == 'monthly':
-            if today.day == instance.death_date.day:
-                create_memorial_khatma(instance)
-        elif instance.memorial_frequency == 'weekly':
-            if (today - instance.death_date).days % 7 == 0:
-                create_memorial_khatma(instance)
-        elif instance.memorial_frequency == 'daily':
-            create_memorial_khatma(instance)
+@receiver(pre_save, sender=Deceased)
+def schedule_memorial_khatma(sender, instance, **kwargs):
+    """Store the next memorial date; khatma.scheduler creates the memorial khatma when it arrives"""
+    if instance.memorial_day and instance.death_date:
+        instance.next_memorial_date = next_memorial_date(instance.death_date, instance.memorial_frequency, timezone.localdate())
+    else:
+        instance.next_memorial_date = None
 
-def create_memorial_khatma(deceased):
-    """Helper function to create a memorial Khatma"""
-    today = timezone.now().date()
-    years_since_death = today.year - deceased.death_date.year
-    khatma = Khatma.objects.create(title=f'ختمة تذكارية: {deceased.name} - الذكرى {years_since_death}', creator=deceased.added_by, description=f'ختمة تذكارية في ذكرى وفاة {deceased.name}', khatma_type='memorial', deceased=deceased, is_public=True, visibility='public', start_date=today, target_completion_date=today + datetime.timedelta(days=30))
-    try:
-        from notifications.models import Notification
-        Notification.objects.create(user=deceased.added_by, notification_type='memorial_khatma', message=f'تم إنشاء ختمة تذكارية للمتوفى: {deceased.name}', related_khatma=khatma)
-    except ImportError:
-        pass
-    return khatma
\ No newline at end of file
+@receiver(pre_save, sender=Khatma)
+def schedule_next_occurrence(sender, instance, **kwargs):
+    """Store when a recurring khatma starts again; khatma.scheduler creates the next instance then"""
+    if instance.frequency not in RECURRING_FREQUENCIES:
+        instance.next_occurrence = None
+    elif instance.next_occurrence is None and not (instance.pk and Khatma.objects.filter(previous_occurrence_id=instance.pk).exists()):
+        today = timezone.localdate()
+        instance.next_occurrence = upcoming_occurrence(instance.frequency, instance.start_date or today, today)
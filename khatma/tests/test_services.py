@@ -1,2 +1,506 @@
 """Service tests for khatma app."""
-from django.test import TestCase
\ No newline at end of file
+from datetime import timedelta
+from io import StringIO
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from khatma import events
+from khatma.distribution import distribute_parts, part_costs, plan_distribution, reader_weights
+from khatma.listing import approximate_count, get_public_khatma_page
+from khatma.models import Deceased, Khatma, KhatmaPart, Participant, QuranReading
+from khatma.recurrence import next_memorial_date, next_occurrence
+from khatma.reminders import send_reminders
+from khatma.scheduler import tick
+from notifications.models import Notification, NotificationSetting
+from khatma.services import KhatmaFactory, complete_all_parts, get_progress_snapshot, recompute_khatma_progress, set_part_completion
+from quran.models import QuranReciter
+
+
+class KhatmaProgressCounterTest(TestCase):
+    """Tests for the denormalized progress counters."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('creator', 'creator@example.com', 'password')
+        self.khatma = Khatma.objects.create(title='ختمة', creator=self.user)
+
+    def part(self, number):
+        return KhatmaPart.objects.get(khatma=self.khatma, part_number=number)
+
+    def test_completion_updates_counters_once(self):
+        part = self.part(1)
+        self.assertTrue(set_part_completion(part, True))
+        self.assertFalse(set_part_completion(self.part(1), True))
+        set_part_completion(self.part(2), True)
+        self.khatma.refresh_from_db()
+        self.assertEqual(self.khatma.completed_parts_count, 2)
+        self.assertAlmostEqual(self.khatma.get_progress_percentage(), 2 * 100 / 30)
+        self.assertIsNotNone(self.part(1).completed_at)
+
+        set_part_completion(self.part(1), False)
+        set_part_completion(self.part(1), False)
+        self.khatma.refresh_from_db()
+        self.assertEqual(self.khatma.completed_parts_count, 1)
+
+    def test_completing_last_part_completes_khatma(self):
+        KhatmaPart.objects.filter(khatma=self.khatma).exclude(part_number=30).update(is_completed=True)
+        recompute_khatma_progress()
+        set_part_completion(self.part(30), True)
+        self.khatma.refresh_from_db()
+        self.assertTrue(self.khatma.is_completed)
+        self.assertEqual(self.khatma.progress, 100.0)
+
+    def test_complete_all_parts(self):
+        complete_all_parts(self.khatma)
+        self.khatma.refresh_from_db()
+        self.assertEqual(self.khatma.completed_parts_count, 30)
+        self.assertFalse(KhatmaPart.objects.filter(khatma=self.khatma, is_completed=False).exists())
+
+    def test_recompute_command_repairs_drift(self):
+        KhatmaPart.objects.filter(khatma=self.khatma, part_number__lte=3).update(is_completed=True)
+        out = StringIO()
+        call_command('recompute_khatma_progress', stdout=out)
+        self.assertIn('1 khatmas', out.getvalue())
+        self.khatma.refresh_from_db()
+        self.assertEqual(self.khatma.completed_parts_count, 3)
+        self.assertAlmostEqual(self.khatma.progress, 10.0)
+        self.assertEqual(recompute_khatma_progress(), 0)
+
+    def test_part_playlist_api(self):
+        QuranReciter.objects.create(name='Reciter', name_arabic='قارئ', folder='test.reciter')
+        self.client.force_login(self.user)
+        url = reverse('khatma:part_playlist_api', args=[self.khatma.id, 30])
+        data = self.client.get(url, {'reciter': 'test.reciter'}).json()
+        self.assertEqual((data['part_number'], data['from'], data['to']), (30, '78:1', '114:6'))
+        self.assertEqual(len(data['segments']), 37)
+        self.assertFalse(data['complete'])
+        self.assertEqual(self.client.get(url, {'reciter': 'unknown'}).status_code, 404)
+
+
+class KhatmaFactoryTest(TestCase):
+    """Tests for bulk khatma creation."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('creator', 'creator@example.com', 'password')
+
+    def test_create_builds_parts_participant_and_notification(self):
+        from notifications.models import Notification
+        with self.assertNumQueries(6):
+            khatma = KhatmaFactory().create(Khatma(title='ختمة', creator=self.user))
+        self.assertEqual(khatma.parts.count(), 30)
+        self.assertTrue(Participant.objects.filter(user=self.user, khatma=khatma).exists())
+        self.assertTrue(Notification.objects.filter(user=self.user, related_khatma=khatma, notification_type='khatma_progress').exists())
+
+    def test_member_notifications_are_delivered_after_commit_with_constant_queries(self):
+        from notifications.models import Notification
+        from notifications.services import NotificationDispatcher
+        members = [User.objects.create_user(f'member{i}', f'member{i}@example.com', 'password') for i in range(5)]
+        factory = KhatmaFactory(notification_recipients=lambda khatma: members)
+        mail.outbox = []
+        with override_settings(NOTIFICATION_DISPATCH_ASYNC=False), self.captureOnCommitCallbacks(execute=True):
+            khatma = factory.create(Khatma(title='ختمة', creator=self.user, auto_distribute_parts=False))
+            self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [f'member{i}@example.com' for i in range(5)])
+        notifications = list(Notification.objects.filter(related_khatma=khatma))
+        with self.assertNumQueries(2):
+            NotificationDispatcher().deliver(notifications)
+
+    def test_create_many_uses_constant_queries(self):
+        with self.assertNumQueries(5):
+            khatmas = KhatmaFactory(notification_type=None).create_many(
+                Khatma(title=f'ختمة {i}', creator=self.user) for i in range(5))
+        self.assertEqual(KhatmaPart.objects.filter(khatma__in=khatmas).count(), 5 * 30)
+
+    def test_benchmark_command_rolls_back(self):
+        out = StringIO()
+        call_command('benchmark_khatma_creation', count=3, stdout=out)
+        self.assertIn('KhatmaFactory.create_many', out.getvalue())
+        self.assertFalse(Khatma.objects.exists())
+
+
+class RecordingBroker(events.EventBroker):
+    """Broker keeping published events in a list."""
+
+    def __init__(self):
+        super().__init__()
+        self.published = []
+
+    def publish(self, khatma_id, event):
+        self.published.append(event)
+
+
+class KhatmaProgressEventTest(TestCase):
+    """Tests for real-time khatma progress events."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('creator', 'creator@example.com', 'password')
+        self.khatma = Khatma.objects.create(title='ختمة', creator=self.user)
+        self.broker = RecordingBroker()
+        previous, events._broker = events._broker, self.broker
+        self.addCleanup(setattr, events, '_broker', previous)
+
+    def test_services_and_signals_publish_events(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            set_part_completion(KhatmaPart.objects.get(khatma=self.khatma, part_number=3), True)
+            Participant.objects.create(user=User.objects.create(username='reader'), khatma=self.khatma)
+        completed, joined, distributed = self.broker.published
+        self.assertEqual(completed['type'], events.PART_COMPLETED)
+        self.assertEqual((completed['part_number'], completed['completed_parts']), (3, 1))
+        self.assertEqual(joined, dict(joined, type=events.PARTICIPANT_JOINED, user='reader'))
+        self.assertEqual((distributed['type'], len(distributed['assignments'])), (events.PARTS_DISTRIBUTED, 29))
+
+    def test_in_memory_broker_delivers_to_open_streams(self):
+        broker = events.InMemoryBroker()
+
+        async def receive():
+            subscription = broker.subscribe(self.khatma.id, heartbeat=1)
+            try:
+                self.assertTrue(broker.wants(self.khatma.id))
+                broker.publish(self.khatma.id, {'type': events.PART_ASSIGNED})
+                return await subscription.__anext__()
+            finally:
+                subscription.close()
+
+        self.assertEqual(async_to_sync(receive)(), (1, {'type': events.PART_ASSIGNED}))
+        self.assertFalse(broker.wants(self.khatma.id))
+
+    async def test_progress_stream_starts_with_snapshot(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('khatma:khatma_progress_stream', args=[self.khatma.id]))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        first = await anext(stream)
+        await stream.aclose()
+        self.assertIn('event: progress', first.decode())
+        self.assertIn('"completed_parts": 0', first.decode())
+
+    def test_wsgi_pages_poll_instead_of_streaming(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('khatma:khatma_detail', args=[self.khatma.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'data-progress-stream-url')
+        self.assertEqual(self.client.get(reverse('khatma:khatma_progress_stream', args=[self.khatma.id])).status_code, 204)
+
+
+class PublicKhatmaListingTest(TestCase):
+    """Tests for the keyset-paginated public khatma listing."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('lister', 'lister@example.com', 'password')
+        start = timezone.now() - timedelta(days=30)
+        khatmas = [
+            Khatma(title=f'ختمة {number}', creator=self.user, is_public=number % 5 != 0, khatma_type='memorial' if number % 3 == 0 else 'regular',
+                   created_at=start + timedelta(hours=number // 2), progress=(number * 7) % 100)
+            for number in range(40)
+        ]
+        self.khatmas = KhatmaFactory(notification_type=None).create_many(khatmas)
+        Participant.objects.create(user=User.objects.create_user('reader', 'reader@example.com', 'password'), khatma=self.khatmas[1])
+
+    def walk(self, **filters):
+        seen, cursor = [], None
+        while True:
+            page = get_public_khatma_page(after=cursor, limit=7, **filters)
+            seen.extend(page['khatmas'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                return seen
+
+    def test_cursor_pages_cover_every_public_khatma_once(self):
+        seen = self.walk()
+        expected = Khatma.objects.filter(is_public=True).order_by('-created_at', '-id')
+        self.assertEqual([khatma.pk for khatma in seen], [khatma.pk for khatma in expected])
+
+        memorial = self.walk(khatma_type='memorial', status='in_progress')
+        self.assertTrue(memorial)
+        self.assertTrue(all(k.is_public and k.khatma_type == 'memorial' and not k.is_completed for k in memorial))
+
+        by_progress = self.walk(sort='progress')
+        self.assertEqual(len(by_progress), expected.count())
+        self.assertEqual([k.progress for k in by_progress], sorted((k.progress for k in by_progress), reverse=True))
+
+        with self.assertRaises(ValueError):
+            get_public_khatma_page(after='not-a-cursor')
+
+    def test_page_annotations_and_search(self):
+        with self.assertNumQueries(4):
+            page = get_public_khatma_page(user=self.user)
+        self.assertEqual(page['count'], 32)
+        self.assertTrue(page['count_is_exact'])
+        self.assertTrue(all(khatma.is_participant for khatma in page['khatmas']))
+        counts = {khatma.pk: khatma.participants_count for khatma in self.walk()}
+        self.assertEqual(counts[self.khatmas[1].pk], 2)
+        self.assertEqual(counts[self.khatmas[2].pk], 1)
+
+        self.assertEqual({k.pk for k in get_public_khatma_page(search='lister')['khatmas']}, {k.pk for k in page['khatmas']})
+        self.assertEqual([k.title for k in get_public_khatma_page(search='ختمة 13')['khatmas']], ['ختمة 13'])
+        self.assertEqual(approximate_count(Khatma.objects.all(), cap=10), (10, False))
+        self.assertEqual(approximate_count(Khatma.objects.all()), (40, True))
+
+    def test_list_views_load_more(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('khatma:khatma_list'), {'khatma_type': 'regular'})
+        self.assertTemplateNotUsed(response, 'core/error.html')
+        self.assertEqual(len(response.context['khatmas']), 12)
+        self.assertIn('after=', response.context['load_more_query'])
+        response = self.client.get(f"{reverse('khatma:khatma_list')}?{response.context['load_more_query']}")
+        self.assertTrue(all(k.khatma_type == 'regular' for k in response.context['khatmas']))
+        self.assertIsNone(response.context['load_more_query'])
+
+        response = self.client.get(reverse('khatma:khatma_list'), {'after': 'bogus'})
+        self.assertEqual(len(response.context['khatmas']), 12)
+
+        response = self.client.get(reverse('core:community_khatmas'))
+        self.assertTemplateUsed(response, 'core/community_khatmas.html')
+        self.assertTemplateNotUsed(response, 'core/error.html')
+        self.assertEqual(len(response.context['community_khatmas']), 12)
+        self.assertTrue(all(k.khatma_type == 'memorial' for k in response.context['memorial_khatmas']))
+
+
+class PartDistributionTest(TestCase):
+    """Tests for the automatic part distribution."""
+
+    def setUp(self):
+        self.creator = User.objects.create_user('creator', 'creator@example.com', 'password')
+        self.readers = [User.objects.create(username=f'reader{i}') for i in range(3)]
+        self.khatma = KhatmaFactory(notification_type=None).create(Khatma(title='ختمة', creator=self.creator))
+
+    def assignments(self):
+        return dict(KhatmaPart.objects.filter(khatma=self.khatma).values_list('part_number', 'assigned_to'))
+
+    def test_plan_round_robin_and_ayah_weighted(self):
+        parts = [(number, None) for number in range(1, 31)]
+        plan = plan_distribution(parts, [1, 2, 3], reader_weights([1, 2, 3]), part_costs())
+        self.assertEqual([plan[number] for number in range(1, 7)], [1, 2, 3, 1, 2, 3])
+        self.assertEqual(sorted(list(plan.values()).count(user) for user in (1, 2, 3)), [10, 10, 10])
+
+        costs = part_costs('ayah_weighted')
+        plan = plan_distribution(parts, [1, 2, 3], reader_weights([1, 2, 3]), costs)
+        verses = [sum(costs[number] for number, user in plan.items() if user == reader) for reader in (1, 2, 3)]
+        self.assertEqual(sum(verses), 6236)
+        self.assertLess(max(verses) - min(verses), max(costs.values()))
+
+    def test_plan_rebalance_keeps_locked_parts(self):
+        parts = [(number, 1) for number in range(1, 31)]
+        plan = plan_distribution(parts, [1, 2], reader_weights([1, 2]), part_costs(), locked={30}, rebalance=True)
+        self.assertEqual(sorted(plan), list(range(15, 30)))
+        self.assertEqual(set(plan.values()), {2})
+        self.assertEqual(plan_distribution(parts, [1, 2], reader_weights([1, 2]), part_costs()), {})
+
+    def test_plan_rebalance_takes_from_the_most_loaded_readers(self):
+        parts = [(number, (number - 1) // 10 + 1) for number in range(1, 31)]
+        plan = plan_distribution(parts, [1, 2, 3, 4], reader_weights([1, 2, 3, 4]), part_costs(), rebalance=True)
+        assignments = {**dict(parts), **plan}
+        loads = [list(assignments.values()).count(user) for user in (1, 2, 3, 4)]
+        self.assertTrue(all(abs(load - 7.5) < 1 for load in loads), loads)
+        self.assertEqual(len(plan), loads[3])
+
+    def test_factory_khatmas_are_distributed_to_their_creator(self):
+        def create(count):
+            return KhatmaFactory(notification_type=None).create_many(
+                [Khatma(title=f'موزعة {i}', creator=self.readers[0]) for i in range(count)]
+                + [Khatma(title='يدوية', creator=self.readers[0], auto_distribute_parts=False)])
+        with self.captureOnCommitCallbacks(execute=True):
+            create(1)
+        # The parts are inserted assigned: the commit callbacks run no distribution
+        with self.assertNumQueries(7), self.captureOnCommitCallbacks(execute=True):
+            create(1)
+        with self.assertNumQueries(7), self.captureOnCommitCallbacks(execute=True):
+            khatmas = create(5)
+        self.assertEqual(set(khatmas[0].parts.values_list('assigned_to', flat=True)), {self.readers[0].pk})
+        self.assertEqual(set(khatmas[-1].parts.values_list('assigned_to', flat=True)), {None})
+        self.assertFalse(Notification.objects.filter(notification_type='part_assigned').exists())
+
+    def test_join_and_leave_redistribute_with_one_notification_each(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Participant.objects.create(user=self.readers[0], khatma=self.khatma)
+        with self.captureOnCommitCallbacks(execute=True):
+            Participant.objects.create(user=self.readers[1], khatma=self.khatma)
+        counts = list(self.assignments().values())
+        self.assertEqual([counts.count(user.pk) for user in (self.creator, *self.readers[:2])], [10, 10, 10])
+        self.assertEqual(Notification.objects.filter(user=self.readers[1], notification_type='part_assigned').count(), 1)
+        # The creator was given every part at creation and only gave some up
+        self.assertFalse(Notification.objects.filter(user=self.creator, notification_type='part_assigned').exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            KhatmaPart.objects.filter(khatma=self.khatma, assigned_to=self.readers[0]).update(assigned_to=None)
+            Participant.objects.filter(user=self.readers[0]).delete()
+        counts = list(self.assignments().values())
+        self.assertEqual([counts.count(user.pk) for user in (self.creator, self.readers[1])], [15, 15])
+
+    def test_speed_strategy_favours_faster_readers(self):
+        now = timezone.now()
+        for user, hours in ((self.creator, 1), (self.readers[0], 3)):
+            QuranReading.objects.create(participant=user, khatma=self.khatma, part_number=1, status='completed',
+                                        start_date=now - timedelta(hours=hours), completion_date=now)
+        Participant.objects.bulk_create([Participant(user=self.readers[0], khatma=self.khatma)])
+        with self.captureOnCommitCallbacks(execute=True):
+            assigned = distribute_parts(self.khatma, strategy='speed', rebalance=True)
+        self.assertEqual(list(assigned), [self.readers[0].pk])
+        counts = list(self.assignments().values())
+        self.assertEqual([counts.count(user.pk) for user in (self.creator, self.readers[0])], [23, 7])
+
+        self.client.force_login(self.creator)
+        response = self.client.post(reverse('khatma:distribute_parts', args=[self.khatma.id]), {'strategy': 'round_robin'})
+        self.assertRedirects(response, reverse('khatma:khatma_detail', args=[self.khatma.id]), fetch_redirect_response=False)
+        counts = list(self.assignments().values())
+        self.assertEqual([counts.count(user.pk) for user in (self.creator, self.readers[0])], [15, 15])
+
+
+class KhatmaDivisionTest(TestCase):
+    """Tests for khatmas divided into hizb or rub' units."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('creator', 'creator@example.com', 'password')
+        self.khatma = KhatmaFactory(notification_type=None).create(Khatma(title='ختمة', creator=self.user, division='rub'))
+
+    def test_units_and_progress(self):
+        self.assertEqual(KhatmaPart.objects.filter(khatma=self.khatma).count(), 240)
+        self.assertEqual(Khatma.objects.create(title='أحزاب', creator=self.user, division='hizb').parts.count(), 60)
+        set_part_completion(KhatmaPart.objects.get(khatma=self.khatma, part_number=24), True)
+        self.khatma.refresh_from_db()
+        self.assertAlmostEqual(self.khatma.progress, 100 / 240)
+        self.assertEqual(get_progress_snapshot(self.khatma)['total_parts'], 240)
+
+        KhatmaPart.objects.filter(khatma=self.khatma).exclude(part_number=240).update(is_completed=True)
+        self.assertEqual(recompute_khatma_progress(), 1)
+        set_part_completion(KhatmaPart.objects.get(khatma=self.khatma, part_number=240), True)
+        self.khatma.refresh_from_db()
+        self.assertTrue(self.khatma.is_completed)
+        self.assertEqual(self.khatma.progress, 100.0)
+
+    def test_distribution_and_playlist_use_units(self):
+        readers = [User.objects.create(username=f'reader{i}') for i in range(3)]
+        Participant.objects.bulk_create([Participant(user=user, khatma=self.khatma) for user in readers])
+        assigned = distribute_parts(self.khatma, strategy='ayah_weighted', rebalance=True, notify=False)
+        self.assertEqual(set(assigned), {user.pk for user in readers})
+
+        QuranReciter.objects.create(name='Reciter', name_arabic='قارئ', folder='test.reciter')
+        self.client.force_login(self.user)
+        data = self.client.get(reverse('khatma:part_playlist_api', args=[self.khatma.id, 240]), {'reciter': 'test.reciter'}).json()
+        self.assertEqual((data['from'], data['to']), ('100:9', '114:6'))
+
+
+class KhatmaSchedulerTest(TestCase):
+    """Tests for the recurring and memorial khatma scheduler."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('creator', 'creator@example.com', 'password')
+        self.today = timezone.localdate()
+
+    def test_recurrence_dates(self):
+        self.assertEqual(next_occurrence('ramadan', timezone.datetime(2026, 1, 1).date()), timezone.datetime(2026, 2, 18).date())
+        self.assertEqual(next_occurrence('friday', timezone.datetime(2026, 10, 16).date()), timezone.datetime(2026, 10, 23).date())
+        self.assertIsNone(next_occurrence('once', self.today))
+        leap = timezone.datetime(2020, 2, 29).date()
+        self.assertEqual(next_memorial_date(leap, 'yearly', timezone.datetime(2026, 3, 1).date()), timezone.datetime(2027, 2, 28).date())
+        self.assertEqual(next_memorial_date(leap, 'yearly', timezone.datetime(2028, 1, 1).date()), leap.replace(year=2028))
+
+    def test_tick_creates_next_recurring_instances_once(self):
+        reader = User.objects.create(username='reader')
+        khatmas = KhatmaFactory(notification_type=None).create_many(
+            Khatma(title=f'ختمة {i}', creator=self.user, frequency='weekly', start_date=self.today) for i in range(3))
+        self.assertEqual(khatmas[0].next_occurrence, self.today + timedelta(days=7))
+        Participant.objects.bulk_create([Participant(user=reader, khatma=khatmas[0])])
+        Khatma.objects.filter(pk__in=[k.pk for k in khatmas]).update(next_occurrence=self.today)
+
+        self.assertEqual(tick(), {'recurring': 3, 'memorial': 0})
+        self.assertEqual(tick(), {'recurring': 0, 'memorial': 0})
+        successor = Khatma.objects.get(previous_occurrence=khatmas[0])
+        self.assertEqual((successor.occurrence_date, successor.next_occurrence), (self.today, self.today + timedelta(days=7)))
+        self.assertEqual(successor.parts.count(), 30)
+        self.assertEqual(set(successor.participants.values_list('username', flat=True)), {'creator', 'reader'})
+        self.assertEqual(successor.parts.filter(assigned_to=reader).count(), 15)
+        self.assertIsNone(Khatma.objects.get(pk=khatmas[0].pk).next_occurrence)
+
+    def test_memorial_khatmas_are_created_on_the_anniversary_only_once(self):
+        deceased = Deceased.objects.create(name='فلان', death_date=self.today - timedelta(days=14), added_by=self.user, memorial_day=True, memorial_frequency='weekly')
+        self.assertEqual(deceased.next_memorial_date, self.today)
+        out = StringIO()
+        call_command('run_scheduler', 'tick', stdout=out)
+        self.assertIn('1 memorial', out.getvalue())
+        memorial = Khatma.objects.get(deceased=deceased)
+        self.assertEqual((memorial.khatma_type, memorial.occurrence_date, memorial.parts.count()), ('memorial', self.today, 30))
+        self.assertTrue(Notification.objects.filter(user=self.user, notification_type='memorial_khatma').exists())
+
+        deceased.save()
+        self.assertEqual(tick()['memorial'], 0)
+        deceased.refresh_from_db()
+        self.assertEqual(deceased.next_memorial_date, self.today + timedelta(days=7))
+        self.assertEqual(Khatma.objects.filter(deceased=deceased).count(), 1)
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    """Email backend whose every send fails, like an unreachable SMTP server."""
+
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError('SMTP server unreachable')
+
+
+class ReadingReminderTest(TestCase):
+    """Tests for the reading reminder digests."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('creator', 'creator@example.com', 'password')
+        self.reader = User.objects.create_user('reader', 'reader@example.com', 'password')
+        self.daily = Khatma.objects.create(title='ختمة يومية', creator=self.user, reminder_frequency='daily')
+        self.weekly = Khatma.objects.create(title='ختمة أسبوعية', creator=self.user, reminder_frequency='weekly')
+        for khatma, numbers in ((self.daily, [3, 4]), (self.weekly, [7])):
+            Participant.objects.get_or_create(user=self.reader, khatma=khatma)
+            KhatmaPart.objects.filter(khatma=khatma).update(assigned_to=None)
+            KhatmaPart.objects.filter(khatma=khatma, part_number__in=numbers).update(assigned_to=self.reader)
+        KhatmaPart.objects.filter(khatma=self.daily, part_number=4).update(is_completed=True)
+        Notification.objects.all().delete()
+        mail.outbox = []
+
+    def test_one_digest_per_user_until_the_next_interval(self):
+        result = send_reminders()
+        self.assertEqual((result['users'], result['participants'], result['parts'], result['emails']), (1, 2, 2, 1))
+        notification = Notification.objects.get(user=self.reader, notification_type='reading_reminder')
+        self.assertIn('ختمة يومية: الجزء 3', notification.message)
+        self.assertIn('ختمة أسبوعية: الجزء 7', notification.message)
+        self.assertEqual(mail.outbox[0].to, ['reader@example.com'])
+
+        self.assertEqual(send_reminders()['users'], 0)
+        tomorrow = send_reminders(now=timezone.now() + timedelta(days=1))
+        self.assertEqual((tomorrow['users'], tomorrow['participants']), (1, 1))
+        self.assertIn('ختمة يومية', Notification.objects.filter(user=self.reader).latest('created_at').message)
+
+    def test_failed_emails_are_retried_without_another_notification(self):
+        with override_settings(EMAIL_BACKEND='khatma.tests.test_services.FailingEmailBackend'):
+            result = send_reminders()
+        self.assertEqual((result['users'], result['notifications'], result['emails'], result['emails_failed']), (1, 1, 0, 1))
+        self.assertEqual(Participant.objects.filter(user=self.reader, last_reminded_at__isnull=False, reminder_email_pending=True).count(), 2)
+
+        retry = send_reminders()
+        self.assertEqual((retry['users'], retry['notifications'], retry['emails']), (1, 0, 1))
+        self.assertEqual(Notification.objects.filter(user=self.reader, notification_type='reading_reminder').count(), 1)
+        self.assertFalse(Participant.objects.filter(reminder_email_pending=True).exists())
+        self.assertEqual(send_reminders()['users'], 0)
+
+    def test_settings_quiet_hours_and_dry_run(self):
+        settings = NotificationSetting.objects.get(user=self.reader)
+        settings.email_notifications = False
+        settings.save()
+        dry_run = send_reminders(dry_run=True)
+        self.assertEqual((dry_run['users'], dry_run['notifications'], dry_run['emails']), (1, 1, 0))
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(Participant.objects.filter(last_reminded_at__isnull=False).exists())
+
+        settings.enable_quiet_hours = True
+        settings.quiet_hours_start, settings.quiet_hours_end = timezone.datetime.min.time(), timezone.datetime.max.time()
+        settings.save()
+        self.assertEqual(send_reminders()['deferred'], 1)
+        settings.enable_quiet_hours = False
+        settings.reading_reminders = False
+        settings.save()
+        self.assertEqual(send_reminders()['skipped'], 1)
+        self.assertEqual((Notification.objects.count(), len(mail.outbox)), (0, 0))
+        self.assertEqual(send_reminders()['skipped'], 0)
@@ -5,12 +5,14 @@ from django.conf import settings
 from django.conf.urls.static import static
 
 from core.social_views import CustomSocialSignupView
-from core.admin_views import admin_dashboard
+from core.admin_views import admin_dashboard, view_metrics_api
+from quran.views import reciter_audio
 from . import views
 
 urlpatterns = [
     # Admin URLs
     path('admin/dashboard/', admin_dashboard, name='admin_dashboard'),
+    path('admin/metrics/views/', view_metrics_api, name='view_metrics_api'),
     path('admin/', admin.site.urls),
 
     # Authentication URLs - All handled by django-allauth
@@ -41,6 +43,7 @@ khatma_patterns = [
     path('<int:khatma_id>/delete/', views.delete_khatma, name='delete_khatma'),
     path('<int:khatma_id>/complete/', views.complete_khatma, name='complete_khatma'),
     path('<int:khatma_id>/dashboard/', views.khatma_dashboard, name='khatma_dashboard'),
+    path('<int:khatma_id>/distribute/', views.distribute_khatma_parts, name='distribute_parts'),
 
     # Reading plan
     path('reading-plan/', views.khatma_reading_plan, name='khatma_reading_plan'),
@@ -67,6 +70,7 @@ khatma_patterns = [
 
     # Sharing
     path('share/<uuid:sharing_link>/', views.shared_khatma, name='shared_khatma'),
+    path('share/<uuid:sharing_link>/image/<str:version>.png', views.khatma_share_image, name='share_image'),
     path('<int:khatma_id>/share/', views.share_khatma, name='share_khatma'),
 
     # Posts and community
@@ -78,11 +82,17 @@ khatma_patterns = [
 
     # API endpoints
     path('api/khatma/<int:khatma_id>/progress/', views.khatma_progress_api, name='khatma_progress_api'),
+    path('api/khatma/<int:khatma_id>/progress/stream/', views.khatma_progress_stream, name='khatma_progress_stream'),
     path('api/khatma/<int:khatma_id>/part/<int:part_id>/status/', views.part_status_api, name='part_status_api'),
+    path('api/khatma/<int:khatma_id>/part/<int:part_id>/playlist/', views.part_playlist_api, name='part_playlist_api'),
 ]
 
 # Include khatma patterns with namespace
 urlpatterns += [path('khatma/', include((khatma_patterns, 'khatma'), namespace='khatma'))]
 
+# Reciter audio lives outside MEDIA_ROOT and is served with Range/ETag support
+# (or handed to the web server with X-Accel-Redirect, see RECITER_AUDIO_OFFLOAD)
+urlpatterns += [path(f"{settings.MEDIA_URL.lstrip('/')}reciters/<str:folder>/<str:filename>", reciter_audio, name='reciter_audio')]
+
 # Serve media files in development
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
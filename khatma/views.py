@@ -1,21 +1,32 @@
 import logging
 '"""This module contains Module functionality."""'
-from django.shortcuts import render, redirect, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
 from django.db.models import Count, Q
-from django.http import JsonResponse
+from django.http import FileResponse, HttpResponse, HttpResponseNotFound, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_safe
 from django.core.paginator import Paginator
 from django.core.mail import send_mail
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.urls import reverse
 from django.db import transaction
 '\n'
 from chat.models import KhatmaChat
-from quran.models import QuranPart
+from core.share_images import BUSY, DEFAULT_MAX_AGE, READY, ensure_share_image, queue_share_image, share_image_job
+from core.utils.query_optimization import query_budget
+from quran.corpus import get_corpus
+from quran.models import QuranPart, QuranReciter
+from quran.boundaries import juz_for, unit_range
+from quran.timing import build_unit_playlist
 '\n'
 from .models import Khatma, Deceased, Participant, PartAssignment, KhatmaPart, QuranReading, PublicKhatma, KhatmaComment, KhatmaInteraction
+from .distribution import STRATEGIES, distribute_parts
+from .listing import get_public_khatma_page
+from .services import KhatmaFactory, set_part_completion, complete_all_parts, get_progress_snapshot
+from . import events
 from .forms import KhatmaCreationForm, KhatmaEditForm, DeceasedForm, PartAssignmentForm, QuranReadingForm, KhatmaPartForm, KhatmaShareForm, KhatmaFilterForm, KhatmaChatForm, KhatmaInteractionForm
 
 @login_required
@@ -37,30 +48,9 @@ def create_khatma(request):
                         if khatma.khatma_type == 'memorial' and 'deceased' in form.cleaned_data:
                             khatma.deceased = form.cleaned_data['deceased']
 
-                        # Save the khatma to the database
-                        khatma.save()
-
-                        # Create the 30 parts for the khatma, but first check if they already exist
-                        existing_parts = set(KhatmaPart.objects.filter(khatma=khatma).values_list('part_number', flat=True))
-                        for i in range(1, 31):
-                            if i not in existing_parts:
-                                KhatmaPart.objects.create(khatma=khatma, part_number=i)
-
-                        # Add the creator as a participant if not already a participant
-                        Participant.objects.get_or_create(user=request.user, khatma=khatma)
-
-                        # Create a notification
-                        try:
-                            from notifications.models import Notification
-                            Notification.objects.create(
-                                user=request.user,
-                                notification_type='khatma_progress',
-                                message=f'تم إنشاء ختمة جديدة: {khatma.title}',
-                                related_khatma=khatma
-                            )
-                        except ImportError:
-                            # If the notifications app is not available, just skip this step
-                            pass
+                        # Save the khatma with its 30 parts, the creator participant
+                        # and the creation notification in bulk
+                        KhatmaFactory().create(khatma)
 
                     messages.success(request, 'تم إنشاء الختمة بنجاح')
                     return redirect('khatma:khatma_detail', khatma_id=khatma.id)
@@ -123,24 +113,25 @@ def edit_khatma(request, khatma_id):
             'error_details': str(e)
         })
 
+@query_budget(12)
 def khatma_detail(request, khatma_id):
     """View for displaying Khatma details"""
     try:
         # Get the khatma object or return 404 if not found
-        khatma = get_object_or_404(Khatma, id=khatma_id)
+        khatma = get_object_or_404(Khatma.objects.select_related('creator'), id=khatma_id)
 
         # Check if the user is a participant
         is_participant = False
         if request.user.is_authenticated:
             is_participant = Participant.objects.filter(user=request.user, khatma=khatma).exists()
 
-        # Get all parts for this khatma
-        parts = KhatmaPart.objects.filter(khatma=khatma).order_by('part_number')
+        # Get all parts for this khatma with their readers (shown on every assigned part)
+        parts = KhatmaPart.objects.filter(khatma=khatma).select_related('assigned_to').order_by('part_number')
 
-        # Calculate progress
-        total_parts = parts.count()
-        completed_parts = parts.filter(is_completed=True).count()
-        progress_percentage = completed_parts / total_parts * 100 if total_parts > 0 else 0
+        # Progress counters are maintained on the khatma row
+        total_parts = khatma.total_parts
+        completed_parts = khatma.completed_parts_count
+        progress_percentage = khatma.progress
 
         # Handle POST request (joining the khatma)
         if request.method == 'POST' and request.user.is_authenticated and (not is_participant):
@@ -173,7 +164,8 @@ def khatma_detail(request, khatma_id):
             'is_creator': request.user.is_authenticated and khatma.creator == request.user,
             'completed_parts': completed_parts,
             'total_parts': total_parts,
-            'progress_percentage': progress_percentage
+            'progress_percentage': progress_percentage,
+            'progress_stream': request.user.is_authenticated and _serves_event_streams(request),
         }
 
         return render(request, 'khatma/khatma_detail.html', context)
@@ -186,32 +178,38 @@ def khatma_detail(request, khatma_id):
             'error_details': str(e)
         })
 
+@query_budget(8)
 def khatma_list(request):
     try:
         'View for listing public Khatmas'
         form = KhatmaFilterForm(request.GET)
-        khatmas = Khatma.objects.filter(is_public=True).order_by('-created_at')
-        if form.is_valid():
-            khatma_type = form.cleaned_data.get('khatma_type')
-            status = form.cleaned_data.get('status')
-            search = form.cleaned_data.get('search')
-            if khatma_type:
-                khatmas = khatmas.filter(khatma_type=khatma_type)
-            if status == 'completed':
-                khatmas = khatmas.filter(is_completed=True)
-            elif status == 'in_progress':
-                khatmas = khatmas.filter(is_completed=False)
-            if search:
-                khatmas = khatmas.filter(Q(title__icontains=search) | Q(description__icontains=search) | Q(creator__username__icontains=search))
-        paginator = Paginator(khatmas, 12)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
-        context = {'page_obj': page_obj, 'form': form}
+        filters = form.cleaned_data if form.is_valid() else {}
+        page = _public_khatma_page(request, khatma_type=filters.get('khatma_type'), status=filters.get('status'),
+                                   search=filters.get('search'), sort=filters.get('sort', ''))
+        context = {'form': form, **page, 'load_more_query': _load_more_query(request, page['next_cursor'])}
         return render(request, 'khatma/khatma_list.html', context)
     except Exception as e:
         logging.error('Error in khatma_list: ' + str(e))
         return render(request, 'core/error.html', context={'error': e})
 
+
+def _public_khatma_page(request, **filters):
+    """Get the page of public khatmas after the ?after= cursor, starting over if the cursor is invalid."""
+    try:
+        return get_public_khatma_page(after=request.GET.get('after'), user=request.user, **filters)
+    except ValueError:
+        return get_public_khatma_page(user=request.user, **filters)
+
+
+def _load_more_query(request, cursor):
+    """Return the query string of the next page of a listing, keeping its filters."""
+    if not cursor:
+        return None
+    query = request.GET.copy()
+    query.pop('page', None)
+    query['after'] = cursor
+    return query.urlencode()
+
 @login_required
 def my_khatmas(request):
     try:
@@ -256,10 +254,7 @@ def complete_khatma(request, khatma_id):
             messages.error(request, 'ليس لديك صلاحية لإكمال هذه الختمة')
             return redirect('khatma:khatma_detail', khatma_id=khatma.id)
         if request.method == 'POST':
-            KhatmaPart.objects.filter(khatma=khatma, is_completed=False).update(is_completed=True, completed_at=timezone.now())
-            khatma.is_completed = True
-            khatma.completed_at = timezone.now()
-            khatma.save()
+            complete_all_parts(khatma)
             messages.success(request, 'تم إكمال الختمة بنجاح')
             return redirect('khatma:khatma_detail', khatma_id=khatma.id)
         context = {'khatma': khatma}
@@ -272,6 +267,33 @@ def complete_khatma(request, khatma_id):
             'error_details': str(e)
         })
 
+@login_required
+def distribute_khatma_parts(request, khatma_id):
+    try:
+        'View for redistributing the open parts of a Khatma among its participants'
+        khatma = get_object_or_404(Khatma, id=khatma_id)
+        if khatma.creator != request.user:
+            messages.error(request, 'ليس لديك صلاحية لتوزيع الأجزاء')
+            return redirect('khatma:khatma_detail', khatma_id=khatma.id)
+        if request.method == 'POST':
+            strategy = request.POST.get('strategy') or khatma.distribution_strategy
+            if strategy not in STRATEGIES:
+                messages.error(request, 'طريقة التوزيع غير صالحة')
+                return redirect('khatma:khatma_detail', khatma_id=khatma.id)
+            assigned = distribute_parts(khatma, strategy=strategy, rebalance=True)
+            if assigned:
+                messages.success(request, 'تم توزيع الأجزاء على المشاركين بنجاح')
+            else:
+                messages.info(request, 'الأجزاء موزعة بالفعل بشكل متوازن')
+        return redirect('khatma:khatma_detail', khatma_id=khatma.id)
+    except Exception as e:
+        logging.error(f"Error in distribute_khatma_parts view: {str(e)}")
+        return render(request, 'core/error.html', context={
+            'error_title': 'خطأ في توزيع الأجزاء',
+            'error_message': 'حدث خطأ أثناء محاولة توزيع الأجزاء. يرجى المحاولة مرة أخرى.',
+            'error_details': str(e)
+        })
+
 @login_required
 def part_detail(request, khatma_id, part_id):
     try:
@@ -286,9 +308,7 @@ def part_detail(request, khatma_id, part_id):
             form = KhatmaPartForm(request.POST, instance=part, user=request.user)
             if form.is_valid():
                 part = form.save(commit=False)
-                if part.is_completed and (not part.completed_at):
-                    part.completed_at = timezone.now()
-                part.save()
+                set_part_completion(part, part.is_completed, user=request.user)
                 reading, created = QuranReading.objects.get_or_create(participant=request.user if part.assigned_to == request.user else khatma.creator, khatma=khatma, part_number=part.part_number, defaults={'status': 'completed' if part.is_completed else 'in_progress', 'recitation_method': 'reading', 'notes': form.cleaned_data.get('completion_notes', ''), 'dua': form.cleaned_data.get('completion_dua', '')})
                 if not created and part.is_completed:
                     reading.status = 'completed'
@@ -296,26 +316,16 @@ def part_detail(request, khatma_id, part_id):
                     reading.notes = form.cleaned_data.get('completion_notes', '')
                     reading.dua = form.cleaned_data.get('completion_dua', '')
                     reading.save()
-                messages.success(request, f'تم تحديث حالة الجزء {part.part_number} بنجاح')
+                messages.success(request, f'تم تحديث حالة {khatma.unit_name} {part.part_number} بنجاح')
                 return redirect('khatma:khatma_detail', khatma_id=khatma.id)
         else:
             form = KhatmaPartForm(instance=part, user=request.user)
-        # Get the QuranPart object
-        quran_part = QuranPart.objects.get(part_number=part.part_number)
-
-        # Get all ayahs for this part
-        from quran.models import Ayah
-        ayahs = Ayah.objects.filter(quran_part=quran_part).order_by('surah__surah_number', 'ayah_number_in_surah')
-
-        # Group ayahs by surah
-        surahs_in_part = {}
-        for ayah in ayahs:
-            if ayah.surah.id not in surahs_in_part:
-                surahs_in_part[ayah.surah.id] = {
-                    'surah': ayah.surah,
-                    'ayahs': []
-                }
-            surahs_in_part[ayah.surah.id]['ayahs'].append(ayah)
+        # Read the unit's ayahs grouped by surah from the in-memory corpus
+        corpus = get_corpus()
+        quran_part = corpus.part(juz_for(*unit_range(khatma.division, part.part_number)[0]))
+        if quran_part is None:
+            raise QuranPart.DoesNotExist
+        surahs_in_part = corpus.unit_surahs(khatma.division, part.part_number)
 
         context = {
             'khatma': khatma,
@@ -353,6 +363,7 @@ def assign_part(request, khatma_id, part_id):
                 # Assign the part to the selected participant
                 part.assigned_to = participant
                 part.save()
+                events.publish_khatma_event(khatma.id, events.PART_ASSIGNED, part_number=part.part_number, user=participant.username)
 
                 # Create a notification for the participant
                 try:
@@ -360,13 +371,13 @@ def assign_part(request, khatma_id, part_id):
                     Notification.objects.create(
                         user=participant,
                         notification_type='part_assigned',
-                        message=f'تم تعيين الجزء {part.part_number} لك في الختمة: {khatma.title}',
+                        message=f'تم تعيين {khatma.unit_name} {part.part_number} لك في الختمة: {khatma.title}',
                         related_khatma=khatma
                     )
                 except ImportError:
                     pass
 
-                messages.success(request, f'تم تعيين الجزء {part.part_number} للمشارك {participant.username} بنجاح')
+                messages.success(request, f'تم تعيين {khatma.unit_name} {part.part_number} للمشارك {participant.username} بنجاح')
                 return redirect('khatma:khatma_detail', khatma_id=khatma.id)
         else:
             # Display the form
@@ -397,9 +408,7 @@ def complete_part(request, khatma_id, part_id):
     if part.assigned_to != request.user and khatma.creator != request.user:
         messages.error(request, 'ليس لديك صلاحية لإكمال هذا الجزء')
         return redirect('khatma:khatma_detail', khatma_id=khatma.id)
-    part.is_completed = True
-    part.completed_at = timezone.now()
-    part.save()
+    set_part_completion(part, True, user=request.user)
     reading, created = QuranReading.objects.get_or_create(participant=request.user if part.assigned_to == request.user else khatma.creator, khatma=khatma, part_number=part.part_number, defaults={'status': 'completed', 'recitation_method': 'reading', 'completion_date': timezone.now()})
     if not created:
         reading.status = 'completed'
@@ -407,10 +416,10 @@ def complete_part(request, khatma_id, part_id):
         reading.save()
     try:
         from notifications.models import Notification
-        Notification.objects.create(user=khatma.creator, notification_type='part_completed', message=f'{request.user.username} أكمل الجزء {part.part_number} في الختمة: {khatma.title}', related_khatma=khatma)
+        Notification.objects.create(user=khatma.creator, notification_type='part_completed', message=f'{request.user.username} أكمل {khatma.unit_name} {part.part_number} في الختمة: {khatma.title}', related_khatma=khatma)
     except ImportError:
         pass
-    messages.success(request, f'تم إكمال الجزء {part.part_number} بنجاح')
+    messages.success(request, f'تم إكمال {khatma.unit_name} {part.part_number} بنجاح')
     return redirect('khatma:khatma_detail', khatma_id=khatma.id)
 
 @login_required
@@ -421,9 +430,7 @@ def uncomplete_part(request, khatma_id, part_id):
     if khatma.creator != request.user:
         messages.error(request, 'ليس لديك صلاحية لإلغاء إكمال هذا الجزء')
         return redirect('khatma:khatma_detail', khatma_id=khatma.id)
-    part.is_completed = False
-    part.completed_at = None
-    part.save()
+    set_part_completion(part, False, user=request.user)
     try:
         reading = QuranReading.objects.get(khatma=khatma, part_number=part.part_number, participant=part.assigned_to if part.assigned_to else khatma.creator)
         reading.status = 'in_progress'
@@ -431,7 +438,7 @@ def uncomplete_part(request, khatma_id, part_id):
         reading.save()
     except QuranReading.DoesNotExist:
         pass
-    messages.success(request, f'تم إلغاء إكمال الجزء {part.part_number} بنجاح')
+    messages.success(request, f'تم إلغاء إكمال {khatma.unit_name} {part.part_number} بنجاح')
     return redirect('khatma:khatma_detail', khatma_id=khatma.id)
 
 @login_required
@@ -650,7 +657,7 @@ def share_khatma(request, khatma_id):
         else:
             form = KhatmaShareForm()
         sharing_url = request.build_absolute_uri(reverse('khatma:shared_khatma', args=[khatma.sharing_link]))
-        context = {'form': form, 'khatma': khatma, 'sharing_url': sharing_url}
+        context = {'form': form, 'khatma': khatma, 'sharing_url': sharing_url, 'share_image_url': request.build_absolute_uri(queue_share_image(khatma))}
         return render(request, 'khatma/share_khatma.html', context)
     except Exception as e:
         logging.error('Error in share_khatma: ' + str(e))
@@ -662,49 +669,87 @@ def shared_khatma(request, sharing_link):
         khatma = get_object_or_404(Khatma, sharing_link=sharing_link)
         is_participant = request.user.is_authenticated and Participant.objects.filter(user=request.user, khatma=khatma).exists()
         parts = KhatmaPart.objects.filter(khatma=khatma).order_by('part_number')
-        total_parts = parts.count()
-        completed_parts = parts.filter(is_completed=True).count()
-        progress_percentage = completed_parts / total_parts * 100 if total_parts > 0 else 0
-        context = {'khatma': khatma, 'parts': parts, 'is_participant': is_participant, 'is_creator': request.user.is_authenticated and khatma.creator == request.user, 'completed_parts': completed_parts, 'total_parts': total_parts, 'progress_percentage': progress_percentage, 'is_shared_view': True}
+        total_parts = khatma.total_parts
+        completed_parts = khatma.completed_parts_count
+        progress_percentage = khatma.progress
+        context = {'khatma': khatma, 'parts': parts, 'is_participant': is_participant, 'is_creator': request.user.is_authenticated and khatma.creator == request.user, 'completed_parts': completed_parts, 'total_parts': total_parts, 'progress_percentage': progress_percentage, 'is_shared_view': True, 'share_image_url': request.build_absolute_uri(queue_share_image(khatma))}
         return render(request, 'khatma/shared_khatma.html', context)
     except Exception as e:
         logging.error('Error in shared_khatma: ' + str(e))
         return render(request, 'core/error.html', context={'error': e})
 
+@require_safe
+def khatma_share_image(request, sharing_link, version):
+    """Serve the cached share image of a khatma, queueing its rendering off the web workers on first request"""
+    khatma = Khatma.objects.select_related('deceased').filter(sharing_link=sharing_link).first()
+    if khatma is None:
+        return HttpResponseNotFound()
+    job = share_image_job(khatma)
+    if version != job['version']:
+        # An older card (the progress moved to another bucket): point to the current one
+        return redirect('khatma:share_image', sharing_link=sharing_link, version=job['version'])
+    state = ensure_share_image(job)
+    if state != READY:
+        # Rendering (202) or renderer backlog full (503): the client retries and gets the cached file
+        response = HttpResponse(status=503 if state == BUSY else 202)
+        response['Retry-After'] = 5
+        response['Cache-Control'] = 'no-store'
+        return response
+    response = FileResponse(open(job['path'], 'rb'), content_type='image/png')
+    response['Cache-Control'] = f"public, max-age={getattr(settings, 'SHARE_IMAGE_MAX_AGE', DEFAULT_MAX_AGE)}, immutable"
+    return response
+
+@query_budget(6)
 @login_required
 def khatma_progress_api(request, khatma_id):
     try:
         'API view for getting Khatma progress'
-        khatma = get_object_or_404(Khatma, id=khatma_id)
-        total_parts = 30
-        completed_parts = KhatmaPart.objects.filter(khatma=khatma, is_completed=True).count()
-        progress_percentage = completed_parts / total_parts * 100 if total_parts > 0 else 0
-        recent_completions = KhatmaPart.objects.filter(khatma=khatma, is_completed=True).order_by('-completed_at')[:5]
-        recent_completions_data = []
-        for part in recent_completions:
-            recent_completions_data.append({'part_number': part.part_number, 'completed_by': part.assigned_to.username if part.assigned_to else khatma.creator.username, 'completed_at': part.completed_at.strftime('%Y-%m-%d %H:%M') if part.completed_at else None})
-        data = {'total_parts': total_parts, 'completed_parts': completed_parts, 'progress_percentage': progress_percentage, 'recent_completions': recent_completions_data, 'is_completed': khatma.is_completed}
-        return JsonResponse(data)
+        khatma = get_object_or_404(Khatma.objects.select_related('creator'), id=khatma_id)
+        return JsonResponse(get_progress_snapshot(khatma))
     except Exception as e:
         logging.error('Error in khatma_progress_api: ' + str(e))
         return render(request, 'core/error.html', context={'error': e})
 
+def _serves_event_streams(request):
+    """Whether the server can hold a Server-Sent Events stream open (ASGI); under WSGI a stream would pin a worker"""
+    return isinstance(request, ASGIRequest)
+
+@login_required
+async def khatma_progress_stream(request, khatma_id):
+    """Server-Sent Events stream pushing progress events of a khatma (requires ASGI)"""
+    if not _serves_event_streams(request):
+        # 204 tells EventSource not to reconnect; the page falls back to polling
+        return HttpResponse(status=204)
+    khatma = await aget_object_or_404(Khatma.objects.select_related('creator'), id=khatma_id)
+    response = StreamingHttpResponse(events.progress_event_stream(khatma.id, lambda: get_progress_snapshot(khatma)), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@login_required
+def part_playlist_api(request, khatma_id, part_id):
+    """API view returning the audio segments of a khatma part for the reciter folder given as ?reciter="""
+    part = KhatmaPart.objects.filter(khatma_id=khatma_id, part_number=part_id).select_related('khatma').first()
+    reciter = QuranReciter.objects.filter(folder=request.GET.get('reciter') or None).first()
+    if part is None or reciter is None:
+        return JsonResponse({'status': 'error', 'message': 'الجزء أو القارئ غير موجود'}, status=404)
+    try:
+        playlist = build_unit_playlist(reciter, part.khatma.division, part.part_number)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'رقم الجزء غير صالح'}, status=400)
+    return JsonResponse({'khatma_id': part.khatma_id, 'part_number': part.part_number, **playlist})
+
 @login_required
 def part_status_api(request, khatma_id, part_id):
     try:
         'API view for updating part status'
-        if request.method == 'POST' and request.is_ajax():
+        if request.method == 'POST' and request.headers.get('x-requested-with') == 'XMLHttpRequest':
             khatma = get_object_or_404(Khatma, id=khatma_id)
             part = get_object_or_404(KhatmaPart, khatma=khatma, part_number=part_id)
             if part.assigned_to != request.user and khatma.creator != request.user:
                 return JsonResponse({'status': 'error', 'message': 'ليس لديك صلاحية لتحديث هذا الجزء'})
             is_completed = request.POST.get('is_completed') == 'true'
-            part.is_completed = is_completed
-            if is_completed and (not part.completed_at):
-                part.completed_at = timezone.now()
-            elif not is_completed:
-                part.completed_at = None
-            part.save()
+            set_part_completion(part, is_completed, user=request.user)
             reading, created = QuranReading.objects.get_or_create(participant=request.user if part.assigned_to == request.user else khatma.creator, khatma=khatma, part_number=part.part_number, defaults={'status': 'completed' if is_completed else 'in_progress', 'recitation_method': 'reading', 'completion_date': timezone.now() if is_completed else None})
             if not created:
                 reading.status = 'completed' if is_completed else 'in_progress'
@@ -713,7 +758,7 @@ def part_status_api(request, khatma_id, part_id):
             try:
                 from notifications.models import Notification
                 if is_completed:
-                    Notification.objects.create(user=khatma.creator if khatma.creator != request.user else None, notification_type='part_completed', message=f'{request.user.username} أكمل الجزء {part.part_number} في الختمة: {khatma.title}', related_khatma=khatma)
+                    Notification.objects.create(user=khatma.creator if khatma.creator != request.user else None, notification_type='part_completed', message=f'{request.user.username} أكمل {khatma.unit_name} {part.part_number} في الختمة: {khatma.title}', related_khatma=khatma)
             except (ImportError, AttributeError):
                 pass
             return JsonResponse({'status': 'success', 'is_completed': part.is_completed})
@@ -732,9 +777,9 @@ def khatma_dashboard(request, khatma_id):
             return redirect('khatma:khatma_list')
         parts = KhatmaPart.objects.filter(khatma=khatma).order_by('part_number')
         participants = Participant.objects.filter(khatma=khatma)
-        total_parts = 30
-        completed_parts = parts.filter(is_completed=True).count()
-        progress_percentage = completed_parts / total_parts * 100 if total_parts > 0 else 0
+        total_parts = khatma.total_parts
+        completed_parts = khatma.completed_parts_count
+        progress_percentage = khatma.progress
         recent_completions = parts.filter(is_completed=True).order_by('-completed_at')[:5]
         context = {'khatma': khatma, 'parts': parts, 'participants': participants, 'total_parts': total_parts, 'completed_parts': completed_parts, 'progress_percentage': progress_percentage, 'recent_completions': recent_completions, 'is_participant': Participant.objects.filter(khatma=khatma, user=request.user).exists(), 'is_creator': khatma.creator == request.user}
         return render(request, 'khatma/khatma_dashboard.html', context)
@@ -764,25 +809,26 @@ def khatma_part_reading(request, khatma_id, part_id):
         if not (khatma.creator == request.user or part.assigned_to == request.user or Participant.objects.filter(khatma=khatma, user=request.user).exists()):
             messages.error(request, 'ليس لديك صلاحية لقراءة هذا الجزء')
             return redirect('khatma:khatma_detail', khatma_id=khatma_id)
-        quran_part = QuranPart.objects.get(part_number=part_id)
+        corpus = get_corpus()
+        quran_part = corpus.part(juz_for(*unit_range(khatma.division, part_id)[0]))
+        if quran_part is None:
+            raise QuranPart.DoesNotExist
         reading, created = QuranReading.objects.get_or_create(participant=request.user, khatma=khatma, part_number=part_id, defaults={'status': 'in_progress', 'recitation_method': 'reading', 'start_date': timezone.now()})
         if request.method == 'POST':
             if 'complete_part' in request.POST:
-                part.is_completed = True
-                part.completed_at = timezone.now()
-                part.save()
+                set_part_completion(part, True, user=request.user)
                 reading.status = 'completed'
                 reading.completion_date = timezone.now()
                 reading.save()
-                messages.success(request, f'تم إكمال الجزء {part_id} بنجاح')
+                messages.success(request, f'تم إكمال {khatma.unit_name} {part_id} بنجاح')
                 try:
                     from notifications.models import Notification
                     if khatma.creator != request.user:
-                        Notification.objects.create(user=khatma.creator, notification_type='part_completed', message=f'{request.user.username} أكمل الجزء {part_id} في الختمة: {khatma.title}', related_khatma=khatma)
+                        Notification.objects.create(user=khatma.creator, notification_type='part_completed', message=f'{request.user.username} أكمل {khatma.unit_name} {part_id} في الختمة: {khatma.title}', related_khatma=khatma)
                 except (ImportError, AttributeError):
                     pass
                 return redirect('khatma:khatma_detail', khatma_id=khatma_id)
-        context = {'khatma': khatma, 'part': part, 'quran_part': quran_part, 'reading': reading}
+        context = {'khatma': khatma, 'part': part, 'quran_part': quran_part, 'reading': reading, 'surahs_in_part': corpus.unit_surahs(khatma.division, part_id)}
         return render(request, 'khatma/part_reading.html', context)
     except Exception as e:
         logging.error('Error in khatma_part_reading: ' + str(e))
@@ -819,20 +865,17 @@ def khatma_chat(request, khatma_id):
         logging.error('Error in khatma_chat: ' + str(e))
         return render(request, 'core/error.html', context={'error': e})
 
+@query_budget(8)
 @login_required
 def community_khatmas(request):
     try:
         'View for displaying public khatmas in the community'
-        public_khatmas = Khatma.objects.filter(is_public=True).order_by('-created_at')
-        khatma_type = request.GET.get('type')
-        if khatma_type:
-            public_khatmas = public_khatmas.filter(khatma_type=khatma_type)
-        paginator = Paginator(public_khatmas, 12)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
-        khatma_types = dict(Khatma.KHATMA_TYPE_CHOICES)
-        context = {'page_obj': page_obj, 'khatma_types': khatma_types, 'selected_type': khatma_type}
-        return render(request, 'khatma/community_khatmas.html', context)
+        khatma_type = request.GET.get('type') or None
+        form = KhatmaFilterForm({'khatma_type': khatma_type or ''})
+        page = _public_khatma_page(request, khatma_type=khatma_type)
+        context = {'form': form, **page, 'load_more_query': _load_more_query(request, page['next_cursor']),
+                   'khatma_types': dict(Khatma.KHATMA_TYPE_CHOICES), 'selected_type': khatma_type}
+        return render(request, 'khatma/khatma_list.html', context)
     except Exception as e:
         logging.error('Error in community_khatmas: ' + str(e))
         return render(request, 'core/error.html', context={'error': e})
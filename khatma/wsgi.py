@@ -17,4 +17,8 @@ except ImportError:
     sys.exit(1)
 load_dotenv()
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'khatma.settings')
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# Load the Quran text into memory before the first request
+from quran.corpus import warm_corpus
+warm_corpus()
\ No newline at end of file
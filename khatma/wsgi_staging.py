@@ -5,4 +5,8 @@ import os
 '\n'
 from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'khatma.settings_staging')
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# Load the Quran text into memory before the first request
+from quran.corpus import warm_corpus
+warm_corpus()
\ No newline at end of file
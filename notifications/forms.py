@@ -9,13 +9,13 @@ class NotificationSettingsForm(forms.ModelForm):
     class Meta:
         '''"""Class representing Meta."""'''
         model = NotificationSetting
-        fields = ['khatma_progress', 'khatma_completed', 'part_assigned', 'part_completed', 'memorial_khatma', 'group_member_changes', 'join_requests', 'group_announcements', 'group_events', 'system_notifications', 'achievements', 'email_notifications', 'push_notifications', 'in_app_notifications', 'enable_quiet_hours', 'quiet_hours_start', 'quiet_hours_end']
+        fields = ['khatma_progress', 'khatma_completed', 'part_assigned', 'part_completed', 'memorial_khatma', 'reading_reminders', 'group_member_changes', 'join_requests', 'group_announcements', 'group_events', 'system_notifications', 'achievements', 'email_notifications', 'push_notifications', 'in_app_notifications', 'enable_quiet_hours', 'quiet_hours_start', 'quiet_hours_end']
         widgets = {'quiet_hours_start': forms.TimeInput(attrs={'type': 'time'}), 'quiet_hours_end': forms.TimeInput(attrs={'type': 'time'})}
 
     def __init__(self, *args, **kwargs):
         '''"""Function to   init  ."""'''
         super().__init__(*args, **kwargs)
-        self.khatma_fields = ['khatma_progress', 'khatma_completed', 'part_assigned', 'part_completed', 'memorial_khatma']
+        self.khatma_fields = ['khatma_progress', 'khatma_completed', 'part_assigned', 'part_completed', 'memorial_khatma', 'reading_reminders']
         self.group_fields = ['group_member_changes', 'join_requests', 'group_announcements', 'group_events']
         self.system_fields = ['system_notifications', 'achievements']
         self.channel_fields = ['email_notifications', 'push_notifications', 'in_app_notifications']
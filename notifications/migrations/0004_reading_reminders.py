@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_coalesced_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationsetting',
+            name='reading_reminders',
+            field=models.BooleanField(default=True, verbose_name='تذكيرات القراءة'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('khatma_progress', 'تقدم الختمة'), ('khatma_completed', 'اكتمال الختمة'), ('part_assigned', 'تعيين جزء'), ('part_completed', 'إكمال جزء'), ('memorial_khatma', 'ختمة تذكارية'), ('new_group_member', 'عضو جديد في المجموعة'), ('group_member_left', 'مغادرة عضو للمجموعة'), ('join_request', 'طلب انضمام'), ('join_request_approved', 'قبول طلب انضمام'), ('join_request_rejected', 'رفض طلب انضمام'), ('role_changed', 'تغيير الدور'), ('removed_from_group', 'إزالة من المجموعة'), ('new_announcement', 'إعلان جديد'), ('new_event', 'حدث جديد'), ('system', 'إشعار النظام'), ('welcome', 'ترحيب'), ('achievement', 'إنجاز'), ('khatma_chat', 'رسالة في الختمة'), ('group_chat', 'رسالة في المجموعة'), ('reading_reminder', 'تذكير بالقراءة')], max_length=30, verbose_name='نوع الإشعار'),
+        ),
+    ]
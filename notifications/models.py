@@ -5,7 +5,7 @@ from django.utils import timezone
 
 class Notification(models.Model):
     """Model for user notifications"""
-    NOTIFICATION_TYPES = [('khatma_progress', 'تقدم الختمة'), ('khatma_completed', 'اكتمال الختمة'), ('part_assigned', 'تعيين جزء'), ('part_completed', 'إكمال جزء'), ('memorial_khatma', 'ختمة تذكارية'), ('new_group_member', 'عضو جديد في المجموعة'), ('group_member_left', 'مغادرة عضو للمجموعة'), ('join_request', 'طلب انضمام'), ('join_request_approved', 'قبول طلب انضمام'), ('join_request_rejected', 'رفض طلب انضمام'), ('role_changed', 'تغيير الدور'), ('removed_from_group', 'إزالة من المجموعة'), ('new_announcement', 'إعلان جديد'), ('new_event', 'حدث جديد'), ('system', 'إشعار النظام'), ('welcome', 'ترحيب'), ('achievement', 'إنجاز')]
+    NOTIFICATION_TYPES = [('khatma_progress', 'تقدم الختمة'), ('khatma_completed', 'اكتمال الختمة'), ('part_assigned', 'تعيين جزء'), ('part_completed', 'إكمال جزء'), ('memorial_khatma', 'ختمة تذكارية'), ('new_group_member', 'عضو جديد في المجموعة'), ('group_member_left', 'مغادرة عضو للمجموعة'), ('join_request', 'طلب انضمام'), ('join_request_approved', 'قبول طلب انضمام'), ('join_request_rejected', 'رفض طلب انضمام'), ('role_changed', 'تغيير الدور'), ('removed_from_group', 'إزالة من المجموعة'), ('new_announcement', 'إعلان جديد'), ('new_event', 'حدث جديد'), ('system', 'إشعار النظام'), ('welcome', 'ترحيب'), ('achievement', 'إنجاز'), ('khatma_chat', 'رسالة في الختمة'), ('group_chat', 'رسالة في المجموعة'), ('reading_reminder', 'تذكير بالقراءة')]
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications', verbose_name='المستخدم')
     notification_type = models.CharField(max_length=30, choices=NOTIFICATION_TYPES, verbose_name='نوع الإشعار')
     message = models.TextField(verbose_name='الرسالة')
@@ -15,12 +15,14 @@ class Notification(models.Model):
     related_group = models.ForeignKey('groups.ReadingGroup', null=True, blank=True, on_delete=models.SET_NULL, verbose_name='المجموعة المرتبطة')
     related_user = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='related_notifications', verbose_name='المستخدم المرتبط')
     action_url = models.CharField(max_length=255, blank=True, null=True, verbose_name='رابط الإجراء')
+    coalesced_count = models.PositiveIntegerField(default=1, verbose_name='عدد الأحداث المجمعة')
 
     class Meta:
         '''"""Class representing Meta."""'''
         ordering = ['-created_at']
         verbose_name = 'إشعار'
         verbose_name_plural = 'إشعارات'
+        indexes = [models.Index(fields=['user', 'is_read', 'created_at'], name='notif_user_read_created_idx')]
 
     def __str__(self):
         '''"""Function to   str  ."""'''
@@ -28,8 +30,8 @@ class Notification(models.Model):
 
     def mark_as_read(self):
         """Mark notification as read"""
-        self.is_read = True
-        self.save()
+        from .services import mark_notification_read
+        mark_notification_read(self)
 
 class NotificationSetting(models.Model):
     """Model for user notification settings"""
@@ -40,6 +42,7 @@ class NotificationSetting(models.Model):
     part_assigned = models.BooleanField(default=True, verbose_name='تعيين جزء')
     part_completed = models.BooleanField(default=True, verbose_name='إكمال جزء')
     memorial_khatma = models.BooleanField(default=True, verbose_name='ختمة تذكارية')
+    reading_reminders = models.BooleanField(default=True, verbose_name='تذكيرات القراءة')
     group_member_changes = models.BooleanField(default=True, verbose_name='تغييرات أعضاء المجموعة')
     join_requests = models.BooleanField(default=True, verbose_name='طلبات الانضمام')
     group_announcements = models.BooleanField(default=True, verbose_name='إعلانات المجموعة')
@@ -78,6 +81,8 @@ class NotificationSetting(models.Model):
             return self.part_completed
         elif notification_type == 'memorial_khatma':
             return self.memorial_khatma
+        elif notification_type == 'reading_reminder':
+            return self.reading_reminders
         elif notification_type in ['new_group_member', 'group_member_left', 'role_changed', 'removed_from_group']:
             return self.group_member_changes
         elif notification_type in ['join_request', 'join_request_approved', 'join_request_rejected']:
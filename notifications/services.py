@@ -1 +1,380 @@
-"""Business logic for notifications app."""
\ No newline at end of file
+"""Business logic for notifications app."""
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
+
+from .models import Notification, NotificationSetting
+from .signals import notifications_changed
+
+logger = logging.getLogger(__name__)
+
+UNREAD_COUNT_KEY = 'notifications:unread:{user_id}'
+
+
+def _unread_key(user_id):
+    """Return the cache key of a user's unread counter."""
+    return UNREAD_COUNT_KEY.format(user_id=user_id)
+
+
+def _unread_timeout():
+    """Return how long a cached counter may live before it is recounted."""
+    return getattr(settings, 'NOTIFICATION_UNREAD_COUNT_TIMEOUT', 60 * 60)
+
+
+def get_unread_count(user_id):
+    """
+    Return the number of unread notifications of a user.
+
+    The count is served from the cache and only queried (using the
+    user/is_read/created_at index) when the counter is missing or expired.
+
+    Args:
+        user_id: The id of the user
+
+    Returns:
+        int: Number of unread notifications
+    """
+    key = _unread_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.set(key, count, _unread_timeout())
+    return count
+
+
+def adjust_unread_count(user_id, delta):
+    """
+    Add delta to a cached unread counter.
+
+    Missing counters are left missing, so the next read recounts them. The
+    counter is dropped instead of going negative.
+
+    Args:
+        user_id: The id of the user
+        delta: Amount to add (negative to subtract)
+    """
+    key = _unread_key(user_id)
+    try:
+        count = cache.incr(key, delta)
+    except ValueError:
+        return
+    if count < 0:
+        cache.delete(key)
+
+
+def reset_unread_count(user_id, count=0):
+    """Set a user's unread counter to a known value."""
+    cache.set(_unread_key(user_id), count, _unread_timeout())
+
+
+def invalidate_unread_count(user_ids):
+    """Drop the unread counters of the given users so they are recounted."""
+    cache.delete_many([_unread_key(user_id) for user_id in set(user_ids)])
+
+
+def count_new_notifications(notifications):
+    """
+    Increment the unread counters for newly created notifications once the transaction commits.
+
+    ``notifications_changed`` is sent for the recipients at the same time.
+
+    Args:
+        notifications: Iterable of created Notification instances
+    """
+    deltas = {}
+    user_ids = set()
+    for notification in notifications:
+        user_ids.add(notification.user_id)
+        if not notification.is_read:
+            deltas[notification.user_id] = deltas.get(notification.user_id, 0) + 1
+    if deltas:
+        transaction.on_commit(lambda: [adjust_unread_count(user_id, delta) for user_id, delta in deltas.items()])
+    if user_ids:
+        transaction.on_commit(lambda: notifications_changed.send(sender=Notification, user_ids=user_ids))
+
+
+def mark_notification_read(notification):
+    """
+    Mark a single notification as read.
+
+    Args:
+        notification: The Notification to mark
+
+    Returns:
+        bool: True if the notification was unread
+    """
+    changed = Notification.objects.filter(pk=notification.pk, is_read=False).update(is_read=True)
+    notification.is_read = True
+    if changed:
+        adjust_unread_count(notification.user_id, -1)
+    return bool(changed)
+
+
+def mark_all_read(user):
+    """
+    Mark every notification of a user as read.
+
+    Returns:
+        int: Number of notifications that were unread
+    """
+    updated = Notification.objects.filter(user=user, is_read=False).update(is_read=True)
+    reset_unread_count(user.pk)
+    return updated
+
+
+def delete_notification(notification):
+    """Delete a notification and keep the unread counter in sync."""
+    was_unread = not notification.is_read
+    notification.delete()
+    if was_unread:
+        adjust_unread_count(notification.user_id, -1)
+
+
+def delete_all_notifications(user):
+    """Delete every notification of a user."""
+    Notification.objects.filter(user=user).delete()
+    reset_unread_count(user.pk)
+
+
+class NotificationDispatcher:
+    """
+    Fan a notification out to many users with a constant number of queries.
+
+    Recipient settings are loaded with one query and filtered through
+    ``should_notify``. New notifications are written with bulk_create. When a
+    ``coalesce_message`` is given, a recipient who still has an unread
+    notification of the same type about the same khatma/group gets that row
+    bumped ("5 new messages") instead of a new one. Email and push delivery
+    honour quiet hours.
+
+    Args:
+        batch_size: Maximum number of rows per INSERT
+    """
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+
+    def dispatch(self, user_ids, notification_type, message, coalesce_message=None, related_khatma_id=None, related_group_id=None, related_user_id=None, action_url=None):
+        """
+        Notify a set of users.
+
+        Args:
+            user_ids: Iterable of recipient user ids
+            notification_type: Notification type
+            message: Message of a new notification
+            coalesce_message: Optional message for coalesced notifications, containing ``{count}``
+            related_khatma_id, related_group_id, related_user_id, action_url: Notification fields
+
+        Returns:
+            dict: {'created': int, 'coalesced': int, 'skipped': int}
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return {'created': 0, 'coalesced': 0, 'skipped': 0}
+        user_settings, recipients = self._recipients(user_ids, notification_type)
+        skipped = len(user_ids) - len(recipients)
+
+        coalesced = set()
+        with transaction.atomic():
+            if coalesce_message and recipients:
+                coalesced = self._coalesce(recipients, notification_type, coalesce_message, related_khatma_id, related_group_id, related_user_id)
+                if coalesced:
+                    transaction.on_commit(lambda: notifications_changed.send(sender=Notification, user_ids=coalesced))
+            notifications = Notification.objects.bulk_create([
+                Notification(user_id=user_id, notification_type=notification_type, message=message, related_khatma_id=related_khatma_id,
+                             related_group_id=related_group_id, related_user_id=related_user_id, action_url=action_url)
+                for user_id in recipients - coalesced
+            ], batch_size=self.batch_size)
+            count_new_notifications(notifications)
+        if notifications:
+            transaction.on_commit(lambda: self._deliver(notifications, user_settings))
+        return {'created': len(notifications), 'coalesced': len(coalesced), 'skipped': skipped}
+
+    def dispatch_personal(self, messages, notification_type, related_khatma_id=None, related_group_id=None, action_url=None):
+        """
+        Notify several users with a message of their own (e.g. the parts assigned to each).
+
+        Args:
+            messages: Dict of recipient user id to message
+            notification_type: Notification type
+            related_khatma_id, related_group_id, action_url: Notification fields
+
+        Returns:
+            dict: {'created': int, 'coalesced': 0, 'skipped': int}
+        """
+        if not messages:
+            return {'created': 0, 'coalesced': 0, 'skipped': 0}
+        user_settings, recipients = self._recipients(messages, notification_type)
+        with transaction.atomic():
+            notifications = Notification.objects.bulk_create([
+                Notification(user_id=user_id, notification_type=notification_type, message=messages[user_id],
+                             related_khatma_id=related_khatma_id, related_group_id=related_group_id, action_url=action_url)
+                for user_id in recipients
+            ], batch_size=self.batch_size)
+            count_new_notifications(notifications)
+        if notifications:
+            transaction.on_commit(lambda: self._deliver(notifications, user_settings))
+        return {'created': len(notifications), 'coalesced': 0, 'skipped': len(messages) - len(recipients)}
+
+    def deliver(self, notifications):
+        """
+        Send email and push notifications for notifications created elsewhere (e.g. in bulk).
+
+        The recipients and their settings are loaded with one query each.
+
+        Args:
+            notifications: Iterable of saved Notification instances
+        """
+        notifications = list(notifications)
+        user_ids = {notification.user_id for notification in notifications}
+        users = User.objects.in_bulk(user_ids)
+        for notification in notifications:
+            if notification.user_id in users:
+                notification.user = users[notification.user_id]
+        user_settings = {setting.user_id: setting for setting in NotificationSetting.objects.filter(user_id__in=user_ids)}
+        self._deliver(notifications, user_settings, users)
+
+    def _recipients(self, user_ids, notification_type):
+        """Load the users' settings with one query and return them with the ids of the users accepting in-app notifications."""
+        user_settings = {setting.user_id: setting for setting in NotificationSetting.objects.filter(user_id__in=user_ids)}
+        default_settings = NotificationSetting()
+        recipients = {
+            user_id for user_id in user_ids
+            if user_settings.get(user_id, default_settings).should_notify(notification_type, 'in_app')
+        }
+        return user_settings, recipients
+
+    def _coalesce(self, recipients, notification_type, coalesce_message, related_khatma_id, related_group_id, related_user_id):
+        """Bump matching unread notifications and return the ids of their users."""
+        matching = Notification.objects.filter(
+            user_id__in=recipients, notification_type=notification_type, is_read=False,
+            related_khatma_id=related_khatma_id, related_group_id=related_group_id,
+        ).order_by('user_id', '-created_at')
+        latest = {}
+        for notification_id, user_id in matching.values_list('id', 'user_id'):
+            latest.setdefault(user_id, notification_id)
+        if not latest:
+            return set()
+        prefix, _, suffix = coalesce_message.partition('{count}')
+        Notification.objects.filter(pk__in=latest.values()).update(
+            coalesced_count=F('coalesced_count') + 1,
+            message=Concat(Value(prefix), Cast(F('coalesced_count') + 1, output_field=CharField()), Value(suffix), output_field=CharField()),
+            related_user_id=related_user_id,
+            created_at=timezone.now(),
+        )
+        return set(latest)
+
+    def _deliver(self, notifications, user_settings, users=None):
+        """
+        Send email and push notifications using the settings loaded for the fan-out.
+
+        The email recipients are loaded with one query (unless ``users`` is
+        given) and every email goes out over a single connection.
+        """
+        from .signals import email_subject, send_push_notification
+        default_settings = NotificationSetting()
+        emailed = []
+        for notification in notifications:
+            setting = user_settings.get(notification.user_id, default_settings)
+            if setting.is_quiet_hours():
+                continue
+            if setting.should_notify(notification.notification_type, 'email'):
+                emailed.append(notification)
+            if setting.should_notify(notification.notification_type, 'push'):
+                send_push_notification(notification)
+        if not emailed:
+            return
+        if users is None:
+            users = User.objects.in_bulk({notification.user_id for notification in emailed})
+        messages = [
+            EmailMessage(email_subject(notification), notification.message, settings.DEFAULT_FROM_EMAIL, [users[notification.user_id].email])
+            for notification in emailed
+            if notification.user_id in users and users[notification.user_id].email
+        ]
+        if messages:
+            try:
+                get_connection(fail_silently=True).send_messages(messages)
+            except Exception as e:
+                logger.error(f"Error sending {len(messages)} notification emails: {str(e)}")
+
+
+class NotificationQueue:
+    """
+    In-process queue with a background worker thread for notification jobs.
+
+    Jobs are callables queued after the surrounding transaction commits, so
+    request handlers return before the fan-out runs. Set
+    ``NOTIFICATION_DISPATCH_ASYNC = False`` to run jobs inline (e.g. in tests
+    or management commands).
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def put(self, job):
+        """Run job after the current transaction commits, in the worker thread when async dispatch is enabled."""
+        if not getattr(settings, 'NOTIFICATION_DISPATCH_ASYNC', True):
+            transaction.on_commit(job)
+            return
+        self._ensure_worker()
+        transaction.on_commit(lambda: self._queue.put(job))
+
+    def join(self):
+        """Block until every queued job has run."""
+        self._queue.join()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='notification-dispatcher', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                close_old_connections()
+                job()
+            except Exception as e:
+                logger.error(f"Error running notification job: {str(e)}")
+            finally:
+                close_old_connections()
+                self._queue.task_done()
+
+
+notification_queue = NotificationQueue()
+
+
+def enqueue_notifications(user_ids, notification_type, message, **kwargs):
+    """
+    Queue a NotificationDispatcher fan-out to run off the request path.
+
+    Args:
+        user_ids: Iterable of recipient user ids (evaluated immediately)
+        notification_type, message, kwargs: See ``NotificationDispatcher.dispatch``
+    """
+    user_ids = list(user_ids)
+    notification_queue.put(lambda: NotificationDispatcher().dispatch(user_ids, notification_type, message, **kwargs))
+
+
+def enqueue_delivery(notifications):
+    """
+    Queue the email and push delivery of bulk created notifications to run off the request path.
+
+    Args:
+        notifications: Iterable of saved Notification instances (evaluated immediately)
+    """
+    notifications = list(notifications)
+    if notifications:
+        notification_queue.put(lambda: NotificationDispatcher().deliver(notifications))
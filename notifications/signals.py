@@ -1,10 +1,13 @@
 '''"""This module contains Module functionality."""'''
 from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.dispatch import Signal, receiver
 from django.contrib.auth.models import User
 '\n'
 from .models import NotificationSetting, Notification
 
+# Sent after commit with the ids of users who received new or coalesced notifications
+notifications_changed = Signal()
+
 @receiver(post_save, sender=User)
 def create_notification_settings(sender, instance, created, **kwargs):
     """Create notification settings for new users"""
@@ -12,6 +15,13 @@ def create_notification_settings(sender, instance, created, **kwargs):
         NotificationSetting.objects.create(user=instance)
         Notification.objects.create(user=instance, notification_type='welcome', message='مرحباً بك في تطبيق الختمة! نتمنى لك تجربة مفيدة ومثمرة.', action_url='/')
 
+@receiver(post_save, sender=Notification)
+def update_unread_count(sender, instance, created, **kwargs):
+    """Count new unread notifications in the cached per-user counter"""
+    if created:
+        from .services import count_new_notifications
+        count_new_notifications([instance])
+
 @receiver(post_save, sender=Notification)
 def handle_notification_delivery(sender, instance, created, **kwargs):
     """Handle notification delivery to different channels"""
@@ -27,12 +37,16 @@ def handle_notification_delivery(sender, instance, created, **kwargs):
         except NotificationSetting.DoesNotExist:
             NotificationSetting.objects.create(user=instance.user)
 
+def email_subject(notification):
+    """Return the subject of a notification's email"""
+    return f'إشعار من تطبيق الختمة: {notification.get_notification_type_display()}'
+
 def send_email_notification(notification):
     """Send email notification"""
     try:
         from django.core.mail import send_mail
         from django.conf import settings
-        subject = f'إشعار من تطبيق الختمة: {notification.get_notification_type_display()}'
+        subject = email_subject(notification)
         message = notification.message
         from_email = settings.DEFAULT_FROM_EMAIL
         recipient_list = [notification.user.email]
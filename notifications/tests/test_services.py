@@ -1,2 +1,127 @@
 """Service tests for notifications app."""
-from django.test import TestCase
\ No newline at end of file
+from django.contrib.auth.models import User
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.core import mail
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core.context_processors import unread_notifications
+from notifications import services
+from notifications.models import Notification, NotificationSetting
+
+
+class UnreadCountTest(TestCase):
+    """Tests for the cached per-user unread notification counter."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(username='reader', password='password')
+        self.other = User.objects.create_user(username='other', password='password')
+
+    def _notify(self, user=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notification.objects.create(user=user or self.user, notification_type='system', message='test')
+
+    def test_count_is_cached_and_incremented_on_create(self):
+        self.assertEqual(services.get_unread_count(self.user.pk), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(services.get_unread_count(self.user.pk), 1)
+        self._notify()
+        self._notify(self.other)
+        with self.assertNumQueries(0):
+            self.assertEqual(services.get_unread_count(self.user.pk), 2)
+
+    def test_read_and_delete_keep_counter_in_sync(self):
+        first, second, third = self._notify(), self._notify(), self._notify()
+        self.assertEqual(services.get_unread_count(self.user.pk), 4)
+        self.assertTrue(services.mark_notification_read(first))
+        self.assertFalse(services.mark_notification_read(first))
+        services.delete_notification(first)
+        services.delete_notification(second)
+        self.assertEqual(services.get_unread_count(self.user.pk), 2)
+        services.mark_all_read(self.user)
+        self.assertEqual(services.get_unread_count(self.user.pk), 0)
+        third.refresh_from_db()
+        self.assertTrue(third.is_read)
+        self._notify()
+        services.delete_all_notifications(self.user)
+        self.assertEqual(services.get_unread_count(self.user.pk), 0)
+        self.assertFalse(Notification.objects.filter(user=self.user).exists())
+
+    def test_missing_counter_is_recounted(self):
+        services.get_unread_count(self.user.pk)
+        Notification.objects.filter(user=self.user).update(is_read=True)
+        services.invalidate_unread_count([self.user.pk])
+        services.adjust_unread_count(self.user.pk, 1)
+        self.assertEqual(services.get_unread_count(self.user.pk), 0)
+
+    def test_context_processor_and_views_use_counter(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        services.get_unread_count(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(unread_notifications(request), {'unread_count': 1})
+
+        self.client.login(username='reader', password='password')
+        response = self.client.get(reverse('notifications:get_unread_count'))
+        self.assertEqual(response.json(), {'unread_count': 1})
+        notification = Notification.objects.get(user=self.user)
+        response = self.client.get(reverse('notifications:mark_notification_read', args=[notification.pk]), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.json(), {'status': 'success'})
+        self.assertEqual(self.client.get(reverse('notifications:get_unread_count')).json(), {'unread_count': 0})
+
+
+@override_settings(NOTIFICATION_DISPATCH_ASYNC=False)
+class NotificationDispatcherTest(TestCase):
+    """Tests for the bulk notification fan-out."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.users = User.objects.bulk_create([User(username=f'member{index}') for index in range(20)])
+        self.user_ids = [user.pk for user in self.users]
+        NotificationSetting.objects.bulk_create([NotificationSetting(user=user, in_app_notifications=index > 0) for index, user in enumerate(self.users) if index != 1])
+
+    def test_fan_out_uses_constant_queries_and_respects_settings(self):
+        with self.assertNumQueries(5):
+            result = services.NotificationDispatcher().dispatch(self.user_ids, 'group_chat', 'new message', coalesce_message='{count} new messages')
+        self.assertEqual(result, {'created': 19, 'coalesced': 0, 'skipped': 1})
+        self.assertFalse(Notification.objects.filter(user=self.users[0]).exists())
+        self.assertTrue(Notification.objects.filter(user=self.users[1]).exists())
+
+    def test_emails_are_sent_with_constant_queries(self):
+        User.objects.filter(pk__in=self.user_ids).update(email=Concat(F('username'), Value('@example.com')))
+        mail.outbox = []
+        dispatcher = services.NotificationDispatcher()
+        # Settings, the notifications' INSERT in its savepoint and, after commit, the recipients' addresses
+        with self.assertNumQueries(5), self.captureOnCommitCallbacks(execute=True):
+            dispatcher.dispatch_personal({user_id: 'parts' for user_id in self.user_ids}, 'part_assigned')
+        self.assertEqual(len(mail.outbox), 19)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), sorted(f'{user.username}@example.com' for user in self.users[1:]))
+
+    def test_repeated_messages_are_coalesced_per_recipient(self):
+        dispatcher = services.NotificationDispatcher()
+        dispatcher.dispatch(self.user_ids[1:3], 'group_chat', 'new message', coalesce_message='{count} new messages')
+        Notification.objects.filter(user=self.users[2]).update(is_read=True)
+        for _ in range(4):
+            result = dispatcher.dispatch(self.user_ids[1:3], 'group_chat', 'new message', coalesce_message='{count} new messages')
+        self.assertEqual(result, {'created': 0, 'coalesced': 2, 'skipped': 0})
+        notification = Notification.objects.get(user=self.users[1])
+        self.assertEqual((notification.message, notification.coalesced_count), ('5 new messages', 5))
+        self.assertEqual(list(Notification.objects.filter(user=self.users[2]).values_list('message', flat=True).order_by('id')), ['new message', '4 new messages'])
+        self.assertEqual(services.get_unread_count(self.users[1].pk), 1)
+
+    def test_queue_runs_jobs_after_commit(self):
+        calls = []
+        with self.captureOnCommitCallbacks(execute=True):
+            services.enqueue_notifications(self.user_ids[2:4], 'system', 'hello')
+            self.assertFalse(Notification.objects.exists())
+        self.assertEqual(Notification.objects.count(), 2)
+        with override_settings(NOTIFICATION_DISPATCH_ASYNC=True), self.captureOnCommitCallbacks(execute=True):
+            services.notification_queue.put(lambda: calls.append('ran'))
+        services.notification_queue.join()
+        self.assertEqual(calls, ['ran'])
@@ -6,8 +6,10 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.core.paginator import Paginator
 '\n'
+from core.utils.query_optimization import query_budget
 from .models import Notification, NotificationSetting
 from .forms import NotificationSettingsForm
+from . import services
 
 @login_required
 def notification_list(request):
@@ -17,7 +19,7 @@ def notification_list(request):
         paginator = Paginator(notifications, 20)
         page_number = request.GET.get('page')
         page_obj = paginator.get_page(page_number)
-        unread_count = notifications.filter(is_read=False).count()
+        unread_count = services.get_unread_count(request.user.pk)
         context = {'page_obj': page_obj, 'unread_count': unread_count}
         return render(request, 'notifications/notification_list.html', context)
     except Exception as e:
@@ -48,9 +50,8 @@ def mark_notification_read(request, notification_id):
     try:
         'View for marking a notification as read'
         notification = get_object_or_404(Notification, id=notification_id, user=request.user)
-        notification.is_read = True
-        notification.save()
-        if request.is_ajax():
+        services.mark_notification_read(notification)
+        if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({'status': 'success'})
         return redirect('notifications:notification_list')
     except Exception as e:
@@ -61,8 +62,8 @@ def mark_notification_read(request, notification_id):
 def mark_all_read(request):
     try:
         'View for marking all notifications as read'
-        Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
-        if request.is_ajax():
+        services.mark_all_read(request.user)
+        if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({'status': 'success'})
         messages.success(request, 'تم تحديد جميع الإشعارات كمقروءة')
         return redirect('notifications:notification_list')
@@ -75,8 +76,8 @@ def delete_notification(request, notification_id):
     try:
         'View for deleting a notification'
         notification = get_object_or_404(Notification, id=notification_id, user=request.user)
-        notification.delete()
-        if request.is_ajax():
+        services.delete_notification(notification)
+        if request.headers.get('x-requested-with') == 'XMLHttpRequest':
             return JsonResponse({'status': 'success'})
         messages.success(request, 'تم حذف الإشعار بنجاح')
         return redirect('notifications:notification_list')
@@ -89,23 +90,25 @@ def delete_all_notifications(request):
     try:
         'View for deleting all notifications'
         if request.method == 'POST':
-            Notification.objects.filter(user=request.user).delete()
+            services.delete_all_notifications(request.user)
             messages.success(request, 'تم حذف جميع الإشعارات بنجاح')
         return redirect('notifications:notification_list')
     except Exception as e:
         logging.error('Error in delete_all_notifications: ' + str(e))
         return render(request, 'core/error.html', context={'error': e})
 
+@query_budget(4)
 @login_required
 def get_unread_count(request):
     try:
         'API view for getting unread notification count'
-        unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
+        unread_count = services.get_unread_count(request.user.pk)
         return JsonResponse({'unread_count': unread_count})
     except Exception as e:
         logging.error('Error in get_unread_count: ' + str(e))
         return render(request, 'core/error.html', context={'error': e})
 
+@query_budget(5)
 @login_required
 def get_recent_notifications(request):
     try:
@@ -127,7 +130,7 @@ def notifications(request):
         paginator = Paginator(user_notifications, 20)
         page_number = request.GET.get('page')
         page_obj = paginator.get_page(page_number)
-        unread_count = user_notifications.filter(is_read=False).count()
+        unread_count = services.get_unread_count(request.user.pk)
         context = {'page_obj': page_obj, 'unread_count': unread_count}
         return render(request, 'notifications/notifications.html', context)
     except Exception as e:
@@ -138,7 +141,7 @@ def notifications(request):
 def mark_all_notifications_read(request):
     try:
         'View for marking all notifications as read'
-        Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        services.mark_all_read(request.user)
         messages.success(request, 'تم تحديد جميع الإشعارات كمقروءة')
         return redirect('notifications:notification_list')
     except Exception as e:
@@ -1,7 +1,7 @@
 '''"""This module contains Module functionality."""'''
 from django.contrib import admin
 '\n'
-from .models import QuranPart, Surah, Ayah, QuranReciter, QuranRecitation, QuranTranslation, QuranBookmark, QuranReadingSettings
+from .models import QuranPart, Surah, Ayah, QuranReciter, ReciterSurah, QuranRecitation, QuranTranslation, QuranBookmark, QuranReadingSettings
 
 @admin.register(QuranPart)
 class QuranPartAdmin(admin.ModelAdmin):
@@ -35,12 +35,25 @@ class AyahAdmin(admin.ModelAdmin):
     search_fields = ['text_uthmani', 'translation', 'surah__name_arabic', 'surah__name_english']
     readonly_fields = ['surah', 'ayah_number_in_surah', 'text_uthmani', 'quran_part', 'page']
 
+class ReciterSurahInline(admin.TabularInline):
+    """Read-only list of the audio files indexed by `manage.py index_reciters`"""
+    model = ReciterSurah
+    fields = ['surah_number', 'filename', 'file_size', 'duration', 'bitrate', 'timings_source']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
 @admin.register(QuranReciter)
 class QuranReciterAdmin(admin.ModelAdmin):
     '''"""Class representing QuranReciterAdmin."""'''
-    list_display = ['name', 'name_arabic', 'style']
+    list_display = ['name', 'name_arabic', 'style', 'folder', 'scanned_at']
     search_fields = ['name', 'name_arabic', 'bio']
     list_filter = ['style']
+    readonly_fields = ['scanned_at']
+    inlines = [ReciterSurahInline]
 
 @admin.register(QuranRecitation)
 class QuranRecitationAdmin(admin.ModelAdmin):
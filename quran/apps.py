@@ -5,4 +5,8 @@ class QuranConfig(AppConfig):
     '''"""Class representing QuranConfig."""'''
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'quran'
-    verbose_name = 'القرآن الكريم'
\ No newline at end of file
+    verbose_name = 'القرآن الكريم'
+
+    def ready(self):
+        """Connect the corpus invalidation signals."""
+        import quran.signals
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""MP3 reading for the reciter audio catalog and the ayah timings.
+
+For the catalog, only the ID3v2 tag size, the first MPEG audio frame header
+and an optional Xing/Info or VBRI header are read (a few kilobytes per file),
+which is enough to get the duration and bitrate without decoding.
+
+``read_levels`` decodes a whole file with miniaudio and returns the loudness
+of every short window; ``quran.timing`` uses it to find the pauses between
+ayahs. The bits the encoder spends per frame are no substitute: a constant
+bitrate file spends about as many on its background noise as on the voice.
+"""
+import math
+import os
+from collections import namedtuple
+from operator import mul
+
+Mp3Info = namedtuple('Mp3Info', 'duration bitrate sample_rate audio_offset')
+AudioLevels = namedtuple('AudioLevels', 'window_duration levels')
+
+# Kilobits per second by [version is MPEG-1][layer][bitrate index]
+_BITRATES = {
+    True: {
+        1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+        2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    },
+    False: {
+        1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    },
+}
+# Hz by version bits (0: MPEG-2.5, 2: MPEG-2, 3: MPEG-1) and sample rate index
+_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+
+HEADER_READ_SIZE = 64 * 1024
+# Speech pauses show at a low sample rate, which keeps decoding and measuring cheap
+LEVEL_SAMPLE_RATE = 8000
+LEVEL_WINDOW_MS = 20
+
+
+def _id3v2_size(data):
+    """Return the number of bytes taken by a leading ID3v2 tag."""
+    if len(data) < 10 or data[:3] != b'ID3':
+        return 0
+    size = (data[6] & 0x7f) << 21 | (data[7] & 0x7f) << 14 | (data[8] & 0x7f) << 7 | (data[9] & 0x7f)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _parse_frame_header(data, offset):
+    """
+    Parse the MPEG audio frame header at offset.
+
+    Returns:
+        dict or None: Frame properties, or None if there is no valid header
+    """
+    if offset + 4 > len(data) or data[offset] != 0xff or data[offset + 1] & 0xe0 != 0xe0:
+        return None
+    version_bits = (data[offset + 1] >> 3) & 0x03
+    layer = 4 - ((data[offset + 1] >> 1) & 0x03)
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 0x03
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    mpeg1 = version_bits == 3
+    bitrate = _BITRATES[mpeg1][layer][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (data[offset + 2] >> 1) & 0x01
+    mono = (data[offset + 3] >> 6) == 3
+    if layer == 1:
+        samples, length = 384, (12 * bitrate * 1000 // sample_rate + padding) * 4
+    elif layer == 2 or mpeg1:
+        samples, length = 1152, 144 * bitrate * 1000 // sample_rate + padding
+    else:
+        samples, length = 576, 72 * bitrate * 1000 // sample_rate + padding
+    return {'mpeg1': mpeg1, 'mono': mono, 'layer': layer, 'crc': not data[offset + 1] & 0x01,
+            'bitrate': bitrate, 'sample_rate': sample_rate, 'samples': samples, 'length': length}
+
+
+def _find_first_frame(data, start):
+    """Return (offset, header) of the first frame whose successor also starts with a valid header."""
+    offset = data.find(b'\xff', start)
+    while 0 <= offset < len(data) - 4:
+        header = _parse_frame_header(data, offset)
+        if header:
+            following = offset + header['length']
+            if following == len(data) or _parse_frame_header(data, following):
+                return offset, header
+        offset = data.find(b'\xff', offset + 1)
+    return None, None
+
+
+def _vbr_frame_count(data, offset, header):
+    """Return the total frame count from a Xing/Info or VBRI header in the first frame, if present."""
+    side_info = (32 if not header['mono'] else 17) if header['mpeg1'] else (17 if not header['mono'] else 9)
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b'Xing', b'Info') and len(data) >= xing + 12:
+        flags = int.from_bytes(data[xing + 4:xing + 8], 'big')
+        if flags & 0x01:
+            return int.from_bytes(data[xing + 8:xing + 12], 'big')
+    vbri = offset + 4 + 32
+    if data[vbri:vbri + 4] == b'VBRI' and len(data) >= vbri + 18:
+        return int.from_bytes(data[vbri + 14:vbri + 18], 'big')
+    return None
+
+
+def read_mp3_info(path):
+    """
+    Read the duration and bitrate of an MP3 file from its headers.
+
+    Constant bitrate files are measured from the audio size and the first
+    frame's bitrate; VBR files from the frame count in their Xing/Info or VBRI
+    header.
+
+    Args:
+        path: Path of the MP3 file
+
+    Returns:
+        Mp3Info: duration (seconds), bitrate (kbps, average for VBR),
+            sample_rate (Hz) and audio_offset (bytes before the first frame)
+
+    Raises:
+        ValueError: If no MPEG audio frame is found
+    """
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as audio:
+        data = audio.read(HEADER_READ_SIZE)
+        base = start = _id3v2_size(data)
+        if start + 4 > len(data):
+            # Tags with embedded artwork can be larger than the first read
+            audio.seek(start)
+            data = audio.read(HEADER_READ_SIZE)
+            start = 0
+        else:
+            base = 0
+        offset, header = _find_first_frame(data, start)
+        if header is None:
+            raise ValueError(f'No MPEG audio frame found in {path}')
+        audio_size = file_size - base - offset
+        if file_size >= 128:
+            audio.seek(file_size - 128)
+            if audio.read(3) == b'TAG':
+                audio_size -= 128
+
+    frames = _vbr_frame_count(data, offset, header)
+    if frames:
+        duration = frames * header['samples'] / header['sample_rate']
+        bitrate = round(audio_size * 8 / duration / 1000) if duration else header['bitrate']
+    else:
+        bitrate = header['bitrate']
+        duration = audio_size * 8 / (bitrate * 1000)
+    return Mp3Info(duration=round(duration, 3), bitrate=bitrate, sample_rate=header['sample_rate'], audio_offset=base + offset)
+
+
+def read_levels(path, window_ms=LEVEL_WINDOW_MS):
+    """
+    Decode an MP3 file and measure the loudness of each window.
+
+    Args:
+        path: Path of the MP3 file
+        window_ms: Length of a window
+
+    Returns:
+        AudioLevels: window_duration (seconds) and levels (mean power of each
+            window of the mono signal in dB, 0 for digital silence, in playback order)
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file cannot be decoded
+    """
+    # Only the offline timing index decodes audio; the web workers never load the native decoder
+    import miniaudio
+    try:
+        sound = miniaudio.decode_file(path, output_format=miniaudio.SampleFormat.SIGNED16, nchannels=1, sample_rate=LEVEL_SAMPLE_RATE)
+    except miniaudio.DecodeError as e:
+        raise ValueError(f'Cannot decode {path}: {str(e)}')
+    samples = sound.samples
+    size = LEVEL_SAMPLE_RATE * window_ms // 1000
+    levels = []
+    for start in range(0, len(samples) - size + 1, size):
+        window = samples[start:start + size]
+        power = sum(map(mul, window, window)) / size
+        levels.append(10 * math.log10(power) if power else 0.0)
+    return AudioLevels(window_duration=size / LEVEL_SAMPLE_RATE, levels=levels)
@@ -0,0 +1,177 @@
+"""Persistent index of the reciter audio files behind ``manage.py index_reciters``.
+
+Every folder of ``settings.RECITERS_DIR`` is a reciter and every
+``<surah number>.mp3`` in it a surah recitation. ``refresh_catalog`` records
+them as ``QuranReciter``/``ReciterSurah`` rows with the size, duration and
+bitrate read from the MP3 headers. Files whose size and mtime are unchanged
+since the last scan are not opened again, so a refresh of an unchanged tree
+costs one directory listing per reciter. The reciter views read the index and
+never touch the filesystem.
+"""
+import logging
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .audio import read_mp3_info
+from .models import AyahTiming, QuranReciter, ReciterSurah
+from .surah_data import SURAHS
+
+logger = logging.getLogger(__name__)
+
+TOTAL_SURAHS = len(SURAHS)
+
+# Display names of known reciter folders; other folders are listed under their folder name until edited in the admin
+RECITER_DEFAULTS = {
+    'alzain.mohamed.ahmed': {'name_arabic': 'محمد أحمد الزين', 'style': 'مرتل'},
+}
+
+
+def get_reciters_dir():
+    """Return the root folder of the reciter audio files."""
+    return getattr(settings, 'RECITERS_DIR', os.path.join(settings.BASE_DIR, 'reciters'))
+
+
+def surah_number_for(filename):
+    """
+    Return the surah number of an audio file name like ``001.mp3``.
+
+    Returns:
+        int or None: The surah number, or None for other files
+    """
+    stem, extension = os.path.splitext(filename)
+    if extension.lower() != '.mp3' or not stem.isdigit():
+        return None
+    number = int(stem)
+    return number if 1 <= number <= TOTAL_SURAHS else None
+
+
+def scan_reciter(reciter, path, force=False):
+    """
+    Bring the ReciterSurah rows of one reciter in line with its folder.
+
+    Args:
+        reciter: The QuranReciter
+        path: Path of the reciter's folder
+        force: Re-read the headers of unchanged files too
+
+    Returns:
+        dict: {'added': int, 'updated': int, 'removed': int, 'unchanged': int, 'errors': int}
+    """
+    indexed = {entry.surah_number: entry for entry in ReciterSurah.objects.filter(reciter=reciter)}
+    found = {}
+    with os.scandir(path) as entries:
+        for entry in entries:
+            number = surah_number_for(entry.name)
+            if number is None or not entry.is_file():
+                continue
+            # Prefer the zero-padded name when both 1.mp3 and 001.mp3 exist
+            if number in found and len(found[number].name) >= len(entry.name):
+                continue
+            found[number] = entry
+
+    stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'errors': 0}
+    changed = []
+    for number, entry in found.items():
+        stat = entry.stat()
+        current = indexed.get(number)
+        if current and not force and current.filename == entry.name and current.file_size == stat.st_size and current.mtime == stat.st_mtime:
+            stats['unchanged'] += 1
+            continue
+        try:
+            info = read_mp3_info(entry.path)
+            duration, bitrate = info.duration, info.bitrate
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read MP3 headers of {entry.path}: {str(e)}")
+            duration = bitrate = None
+            stats['errors'] += 1
+        # Ayah timings of a replaced recording no longer apply
+        changed.append(ReciterSurah(reciter=reciter, surah_number=number, filename=entry.name, file_size=stat.st_size,
+                                    duration=duration, bitrate=bitrate, mtime=stat.st_mtime, timings_source=''))
+        stats['updated' if current else 'added'] += 1
+
+    removed = [number for number in indexed if number not in found]
+    with transaction.atomic():
+        if changed:
+            ReciterSurah.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                unique_fields=['reciter', 'surah_number'],
+                update_fields=['filename', 'file_size', 'duration', 'bitrate', 'mtime', 'timings_source'],
+            )
+            AyahTiming.objects.filter(recording__reciter=reciter, recording__surah_number__in=[row.surah_number for row in changed]).delete()
+        if removed:
+            stats['removed'] = ReciterSurah.objects.filter(reciter=reciter, surah_number__in=removed).delete()[0]
+        QuranReciter.objects.filter(pk=reciter.pk).update(scanned_at=timezone.now())
+    return stats
+
+
+def refresh_catalog(root=None, folders=None, force=False, prune=False):
+    """
+    Scan the reciter folders and update the index incrementally.
+
+    Args:
+        root: Root folder (defaults to ``settings.RECITERS_DIR``)
+        folders: Optional collection of reciter folder names to scan
+        force: Re-read the headers of unchanged files too
+        prune: Delete the index of reciters whose folder disappeared
+
+    Returns:
+        dict: Stats per reciter folder (see ``scan_reciter``)
+    """
+    root = root or get_reciters_dir()
+    if not os.path.isdir(root):
+        logger.warning(f"Reciters folder {root} does not exist")
+        return {}
+    results = {}
+    on_disk = set()
+    with os.scandir(root) as entries:
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+            on_disk.add(entry.name)
+            if folders and entry.name not in folders:
+                continue
+            defaults = {'name': entry.name, 'name_arabic': entry.name, **RECITER_DEFAULTS.get(entry.name, {})}
+            reciter, created = QuranReciter.objects.get_or_create(folder=entry.name, defaults=defaults)
+            if created:
+                logger.info(f"Indexed new reciter folder {entry.name}")
+            results[entry.name] = scan_reciter(reciter, entry.path, force=force)
+
+    if prune and not folders:
+        gone = QuranReciter.objects.filter(folder__isnull=False).exclude(folder__in=on_disk)
+        ReciterSurah.objects.filter(reciter__in=gone).delete()
+        gone.update(scanned_at=None)
+    return results
+
+
+def get_reciter_surahs(reciter):
+    """
+    List all surahs for a reciter with the indexed audio file of each, if any.
+
+    Args:
+        reciter: The QuranReciter
+
+    Returns:
+        list: One dict per surah with 'number', 'name', 'verses', 'filename',
+            'path' (audio URL), 'has_audio', 'duration', 'bitrate' and 'file_size'
+    """
+    files = {entry.surah_number: entry for entry in ReciterSurah.objects.filter(reciter=reciter)}
+    surahs = []
+    for number, name_arabic, _, _, verses_count, _ in SURAHS:
+        entry = files.get(number)
+        filename = entry.filename if entry else f'{number}.mp3'
+        surahs.append({
+            'number': number,
+            'name': name_arabic,
+            'verses': verses_count,
+            'filename': filename,
+            'path': f'{settings.MEDIA_URL}reciters/{reciter.folder}/{filename}',
+            'has_audio': entry is not None,
+            'duration': entry.duration if entry else None,
+            'bitrate': entry.bitrate if entry else None,
+            'file_size': entry.file_size if entry else None,
+        })
+    return surahs
@@ -0,0 +1,299 @@
+"""Process-wide, read-only cache of the Quran text.
+
+The Quran text only changes when it is (re)imported, so every worker process
+loads all surahs and ayahs once into compact ``__slots__`` records indexed by
+surah, juz and page, and serves the reading views from memory. Hizb and rub'
+units are sliced out of the ordered ayahs by bisecting their boundary verses.
+
+Invalidation uses a version stamp file (``settings.QURAN_CORPUS_VERSION_FILE``)
+shared by all processes on the host. The import commands call
+``bump_corpus_version()`` after writing; each process compares the stamp with
+the version it loaded and reloads on mismatch.
+"""
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .boundaries import unit_range
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_corpus = None
+
+
+class SurahRecord:
+    """Immutable, template-compatible snapshot of a Surah row."""
+    __slots__ = ('id', 'surah_number', 'name_arabic', 'name_english', 'revelation_type', 'verses_count', 'revelation_order')
+
+    def __init__(self, id, surah_number, name_arabic, name_english, revelation_type, verses_count, revelation_order):
+        self.id = id
+        self.surah_number = surah_number
+        self.name_arabic = name_arabic
+        self.name_english = name_english
+        self.revelation_type = revelation_type
+        self.verses_count = verses_count
+        self.revelation_order = revelation_order
+
+    def __str__(self):
+        """Return a string representation of the surah."""
+        return f'{self.surah_number}. {self.name_arabic}'
+
+    @property
+    def pk(self):
+        """Return the primary key of the underlying row."""
+        return self.id
+
+    def get_revelation_type_display(self):
+        """Return the display value for revelation_type."""
+        return dict([('meccan', 'مكية'), ('medinan', 'مدنية')]).get(self.revelation_type, self.revelation_type)
+
+    def get_revelation_order_display(self):
+        """Return the revelation order as string."""
+        return str(self.revelation_order) if self.revelation_order > 0 else '-'
+
+
+class AyahRecord:
+    """Immutable, template-compatible snapshot of an Ayah row."""
+    __slots__ = ('id', 'surah', 'ayah_number_in_surah', 'text_uthmani', 'translation', 'quran_part_id', 'page')
+
+    def __init__(self, id, surah, ayah_number_in_surah, text_uthmani, translation, quran_part_id, page):
+        self.id = id
+        self.surah = surah
+        self.ayah_number_in_surah = ayah_number_in_surah
+        self.text_uthmani = text_uthmani
+        self.translation = translation
+        self.quran_part_id = quran_part_id
+        self.page = page
+
+    @property
+    def pk(self):
+        """Return the primary key of the underlying row."""
+        return self.id
+
+    @property
+    def surah_id(self):
+        """Return the id of the surah this ayah belongs to."""
+        return self.surah.id
+
+
+class PartRecord:
+    """Immutable snapshot of a QuranPart (juz) row."""
+    __slots__ = ('part_number',)
+
+    def __init__(self, part_number):
+        self.part_number = part_number
+
+    def __str__(self):
+        """Return a string representation of the part."""
+        return f'الجزء {self.part_number}'
+
+    @property
+    def pk(self):
+        """Return the primary key of the underlying row."""
+        return self.part_number
+
+
+class QuranCorpus:
+    """All surahs and ayahs, ordered and indexed for O(1) lookups."""
+    __slots__ = ('version', 'surahs', 'ayahs', 'parts', '_surah_index', '_surah_ranges', '_part_ayahs', '_page_ayahs', '_surah_numbers', '_positions')
+
+    def __init__(self, version, surahs, ayahs, part_numbers):
+        self.version = version
+        self.surahs = tuple(surahs)
+        self.ayahs = tuple(ayahs)
+        self.parts = tuple(PartRecord(number) for number in sorted(part_numbers))
+        self._surah_index = {surah.surah_number: surah for surah in self.surahs}
+        self._surah_numbers = [surah.surah_number for surah in self.surahs]
+        self._positions = [(ayah.surah.surah_number, ayah.ayah_number_in_surah) for ayah in self.ayahs]
+
+        surah_ranges = {}
+        part_ayahs = {}
+        page_ayahs = {}
+        for index, ayah in enumerate(self.ayahs):
+            number = ayah.surah.surah_number
+            start, _ = surah_ranges.get(number, (index, index))
+            surah_ranges[number] = (start, index + 1)
+            part_ayahs.setdefault(ayah.quran_part_id, []).append(ayah)
+            if ayah.page is not None:
+                page_ayahs.setdefault(ayah.page, []).append(ayah)
+        self._surah_ranges = surah_ranges
+        self._part_ayahs = {number: tuple(ayahs) for number, ayahs in part_ayahs.items()}
+        self._page_ayahs = {number: tuple(ayahs) for number, ayahs in page_ayahs.items()}
+
+    def __len__(self):
+        return len(self.ayahs)
+
+    def surah(self, surah_number):
+        """Return the SurahRecord for a surah number, or None."""
+        return self._surah_index.get(surah_number)
+
+    def previous_surah(self, surah_number):
+        """Return the surah before the given surah number, or None."""
+        index = bisect_left(self._surah_numbers, surah_number)
+        return self.surahs[index - 1] if index > 0 else None
+
+    def next_surah(self, surah_number):
+        """Return the surah after the given surah number, or None."""
+        index = bisect_left(self._surah_numbers, surah_number + 1)
+        return self.surahs[index] if index < len(self.surahs) else None
+
+    def surah_ayahs(self, surah_number):
+        """Return the ayahs of a surah in order."""
+        start, end = self._surah_ranges.get(surah_number, (0, 0))
+        return self.ayahs[start:end]
+
+    def ayah(self, surah_number, ayah_number):
+        """Return a single ayah, or None."""
+        start, end = self._surah_ranges.get(surah_number, (0, 0))
+        index = start + ayah_number - 1
+        if start <= index < end and self.ayahs[index].ayah_number_in_surah == ayah_number:
+            return self.ayahs[index]
+        return next((ayah for ayah in self.ayahs[start:end] if ayah.ayah_number_in_surah == ayah_number), None)
+
+    def part(self, part_number):
+        """Return the PartRecord for a juz number, or None."""
+        if 1 <= part_number <= len(self.parts) and self.parts[part_number - 1].part_number == part_number:
+            return self.parts[part_number - 1]
+        return next((part for part in self.parts if part.part_number == part_number), None)
+
+    def part_ayahs(self, part_number):
+        """Return the ayahs of a juz in order."""
+        return self._part_ayahs.get(part_number, ())
+
+    def page_ayahs(self, page):
+        """Return the ayahs printed on a mushaf page in order."""
+        return self._page_ayahs.get(page, ())
+
+    def range_ayahs(self, first, following=None):
+        """
+        Return the ayahs from a verse up to (not including) another, in order.
+
+        Args:
+            first: (surah, ayah) of the first verse
+            following: (surah, ayah) of the first verse after the range, or None for the end
+
+        Returns:
+            tuple: A slice of the ordered ayahs, found by bisection
+        """
+        start = bisect_left(self._positions, first)
+        end = bisect_left(self._positions, following) if following else len(self.ayahs)
+        return self.ayahs[start:end]
+
+    def unit_ayahs(self, division, number):
+        """
+        Return the ayahs of a khatma unit (a juz, hizb or rub') in order.
+
+        Raises:
+            ValueError: If the division or unit number is unknown
+        """
+        return self.range_ayahs(*unit_range(division, number))
+
+    def part_surahs(self, part_number):
+        """
+        Group the ayahs of a juz by surah.
+
+        Returns:
+            dict: surah id -> {'surah': SurahRecord, 'ayahs': [AyahRecord, ...]} in mushaf order
+        """
+        return group_by_surah(self.part_ayahs(part_number))
+
+    def unit_surahs(self, division, number):
+        """Group the ayahs of a khatma unit by surah (see ``part_surahs``)."""
+        return group_by_surah(self.unit_ayahs(division, number))
+
+
+def group_by_surah(ayahs):
+    """Group ordered ayahs by surah as {surah id: {'surah': SurahRecord, 'ayahs': [...]}}."""
+    grouped = {}
+    for ayah in ayahs:
+        grouped.setdefault(ayah.surah.id, {'surah': ayah.surah, 'ayahs': []})['ayahs'].append(ayah)
+    return grouped
+
+
+def _version_file():
+    """Return the path of the shared corpus version stamp."""
+    return getattr(settings, 'QURAN_CORPUS_VERSION_FILE', os.path.join(settings.BASE_DIR, '.quran_corpus_version'))
+
+
+def current_version():
+    """Return the version stamp written by the last import, or '0' if none was written."""
+    try:
+        with open(_version_file()) as stamp:
+            return stamp.read().strip() or '0'
+    except OSError:
+        return '0'
+
+
+def bump_corpus_version():
+    """
+    Write a new corpus version stamp so every process reloads the corpus.
+
+    Call this after importing or editing Quran text.
+
+    Returns:
+        str: The new version
+    """
+    global _corpus
+    version = str(time.time_ns())
+    path = _version_file()
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w') as stamp:
+            stamp.write(version)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error(f"Could not write Quran corpus version stamp {path}: {str(e)}")
+    _corpus = None
+    return version
+
+
+def load_corpus(version=None):
+    """Build a QuranCorpus from the database."""
+    from .models import Ayah, QuranPart, Surah
+
+    surahs = {
+        row[0]: SurahRecord(*row)
+        for row in Surah.objects.order_by('surah_number').values_list(
+            'id', 'surah_number', 'name_arabic', 'name_english', 'revelation_type', 'verses_count', 'revelation_order')
+    }
+    ayahs = [
+        AyahRecord(ayah_id, surahs[surah_id], number, text, translation, part_id, page)
+        for ayah_id, surah_id, number, text, translation, part_id, page in Ayah.objects.order_by(
+            'surah__surah_number', 'ayah_number_in_surah').values_list(
+            'id', 'surah_id', 'ayah_number_in_surah', 'text_uthmani', 'translation', 'quran_part_id', 'page').iterator(chunk_size=2000)
+    ]
+    part_numbers = QuranPart.objects.values_list('part_number', flat=True)
+    return QuranCorpus(version or current_version(), surahs.values(), ayahs, part_numbers)
+
+
+def get_corpus():
+    """
+    Return the process-wide corpus, loading it if missing or out of date.
+
+    Returns:
+        QuranCorpus: The shared, read-only corpus
+    """
+    global _corpus
+    version = current_version()
+    corpus = _corpus
+    if corpus is not None and corpus.version == version:
+        return corpus
+    with _lock:
+        if _corpus is None or _corpus.version != version:
+            start = time.monotonic()
+            _corpus = load_corpus(version)
+            logger.info(f"Loaded Quran corpus version {version}: {len(_corpus)} ayahs in {time.monotonic() - start:.2f}s")
+        return _corpus
+
+
+def warm_corpus():
+    """Load the corpus at worker startup; failures are logged and retried on first use."""
+    try:
+        get_corpus()
+    except Exception as e:
+        logger.warning(f"Could not warm Quran corpus: {str(e)}")
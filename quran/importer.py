@@ -0,0 +1,115 @@
+"""Streaming importer for the Quran text.
+
+``quran-text.txt`` is read line by line (``surah|ayah|text``); every verse gets
+its juz and mushaf page from the boundary tables in ``quran.boundaries`` and is
+written with batched upserts, so a full import of 6236 verses costs a few dozen
+queries regardless of what is already in the database.
+"""
+import logging
+import time
+
+from django.db import transaction
+
+from .boundaries import TOTAL_JUZ, BoundaryCursor
+from .corpus import bump_corpus_version
+from .models import Ayah, QuranPart, Surah
+from .search import normalize_arabic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QURAN_TEXT = 'quran-text.txt'
+
+
+def iter_quran_text(lines):
+    """
+    Parse ``surah|ayah|text`` lines, skipping comments and malformed lines.
+
+    Args:
+        lines: Iterable of text lines (e.g. an open file)
+
+    Yields:
+        tuple: (surah_number, ayah_number, text)
+    """
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if not line or line.startswith('#'):
+            continue
+        fields = line.split('|', 2)
+        if len(fields) != 3:
+            logger.warning(f"Skipping malformed Quran text line: {line[:40]}")
+            continue
+        try:
+            yield int(fields[0]), int(fields[1]), fields[2]
+        except ValueError:
+            logger.warning(f"Skipping malformed Quran text line: {line[:40]}")
+
+
+def import_quran_text(path=DEFAULT_QURAN_TEXT, batch_size=1000, surahs=None, parts=None, progress=None):
+    """
+    Import (or re-import) the Quran text with correct juz and page numbers.
+
+    Existing verses are updated in place, so bookmarks and reading positions
+    pointing at them survive a re-import.
+
+    Args:
+        path: Path of the ``surah|ayah|text`` file
+        batch_size: Number of verses written per query
+        surahs: Optional collection of surah numbers to import
+        parts: Optional collection of juz numbers to import
+        progress: Optional callable receiving the number of verses written so far
+
+    Returns:
+        dict: {'imported': int, 'skipped': int, 'missing_surahs': list, 'elapsed': float}
+    """
+    start = time.monotonic()
+    surahs = set(surahs) if surahs else None
+    parts = set(parts) if parts else None
+    QuranPart.objects.bulk_create(
+        [QuranPart(part_number=number) for number in range(1, TOTAL_JUZ + 1)], ignore_conflicts=True)
+    surah_ids = dict(Surah.objects.values_list('surah_number', 'id'))
+
+    cursor = BoundaryCursor()
+    imported = skipped = 0
+    missing_surahs = set()
+    batch = []
+    with transaction.atomic(), open(path, encoding='utf-8') as source:
+        for surah_number, ayah_number, text in iter_quran_text(source):
+            juz, _, page = cursor.advance(surah_number, ayah_number)
+            if (surahs and surah_number not in surahs) or (parts and juz not in parts):
+                continue
+            surah_id = surah_ids.get(surah_number)
+            if surah_id is None:
+                missing_surahs.add(surah_number)
+                skipped += 1
+                continue
+            batch.append(Ayah(
+                surah_id=surah_id, ayah_number_in_surah=ayah_number, text_uthmani=text,
+                text_normalized=normalize_arabic(text), quran_part_id=juz, page=page))
+            if len(batch) >= batch_size:
+                imported += upsert_ayahs(batch)
+                batch = []
+                if progress:
+                    progress(imported)
+        if batch:
+            imported += upsert_ayahs(batch)
+            if progress:
+                progress(imported)
+
+    if imported:
+        bump_corpus_version()
+    elapsed = time.monotonic() - start
+    if missing_surahs:
+        logger.warning(f"Skipped {skipped} verses of {len(missing_surahs)} surahs missing from the database")
+    logger.info(f"Imported {imported} Quran verses in {elapsed:.2f}s")
+    return {'imported': imported, 'skipped': skipped, 'missing_surahs': sorted(missing_surahs), 'elapsed': elapsed}
+
+
+def upsert_ayahs(batch):
+    """Insert new verses and update existing ones in a single statement."""
+    Ayah.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=['surah', 'ayah_number_in_surah'],
+        update_fields=['text_uthmani', 'text_normalized', 'quran_part', 'page'],
+    )
+    return len(batch)
@@ -0,0 +1,317 @@
+"""Resumable, batched loading pipeline behind ``manage.py quran_load``.
+
+A source reads its input in fixed-size chunks of raw items, parses each chunk
+into plain tuples (optionally in worker processes) and writes it with one
+bulk upsert. Every chunk is committed together with its position in a
+``QuranLoadRun`` ledger keyed by the input checksum, so an interrupted load
+resumes after the last committed chunk and an unchanged input is skipped.
+
+Custom sources subclass ``QuranSource`` and are registered with
+``@register_source``, or passed to the command as a dotted class path.
+"""
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .boundaries import TOTAL_JUZ, juz_for, page_for
+from .corpus import bump_corpus_version
+from .importer import DEFAULT_QURAN_TEXT, iter_quran_text, upsert_ayahs
+from .models import Ayah, QuranLoadRun, QuranPart, QuranTranslation, Surah
+from .search import normalize_arabic
+from .surah_data import SURAHS
+
+logger = logging.getLogger(__name__)
+
+SOURCES = {}
+DEFAULT_SOURCES = ('surahs', 'text')
+
+
+def register_source(source_class):
+    """Class decorator registering a QuranSource under its ``name``."""
+    SOURCES[source_class.name] = source_class
+    return source_class
+
+
+def get_source(name, path=None, **options):
+    """
+    Instantiate a registered source, or a QuranSource subclass given by dotted path.
+
+    Raises:
+        ValueError: If the source is unknown
+    """
+    source_class = SOURCES.get(name)
+    if source_class is None and '.' in name:
+        try:
+            source_class = import_string(name)
+        except ImportError as e:
+            raise ValueError(f"Unknown Quran source '{name}': {str(e)}")
+    if source_class is None:
+        raise ValueError(f"Unknown Quran source '{name}'. Available: {', '.join(sorted(SOURCES))}")
+    return source_class(path, **options)
+
+
+class QuranSource:
+    """
+    Base class of a ``quran_load`` input.
+
+    Subclasses set ``name`` and implement ``read_items``, ``parse_chunk`` and
+    ``write``. ``parse_chunk`` must be picklable and free of database access
+    because it may run in a worker process.
+    """
+    name = None
+    default_path = None
+    updates_corpus = True
+
+    def __init__(self, path=None, **options):
+        self.path = path or self.default_path
+        self.options = options
+
+    def __str__(self):
+        return f'{self.name}:{self.path}' if self.path else self.name
+
+    def checksum(self):
+        """Return a SHA-256 of the input and the source options."""
+        digest = hashlib.sha256(f'{self.name}|{sorted(self.options.items())}'.encode())
+        if self.path:
+            with open(self.path, 'rb') as source:
+                for block in iter(lambda: source.read(1 << 20), b''):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def read_items(self):
+        """Yield the raw, unparsed items of the input in order."""
+        raise NotImplementedError
+
+    def parse_chunk(self, items):
+        """Turn a list of raw items into a list of records."""
+        raise NotImplementedError
+
+    def prepare(self):
+        """Load lookup data needed by ``write``; called once per load."""
+        return None
+
+    def write(self, records, context):
+        """Upsert parsed records; return the number of rows written."""
+        raise NotImplementedError
+
+
+@register_source
+class SurahSource(QuranSource):
+    """Surah names, revelation types and verse counts from ``quran.surah_data``."""
+    name = 'surahs'
+
+    def checksum(self):
+        return hashlib.sha256(repr(SURAHS).encode()).hexdigest()
+
+    def read_items(self):
+        return iter(SURAHS)
+
+    def parse_chunk(self, items):
+        return list(items)
+
+    def write(self, records, context):
+        Surah.objects.bulk_create(
+            [Surah(surah_number=number, name_arabic=name_arabic, name_english=name_english, revelation_type=revelation_type,
+                   verses_count=verses_count, revelation_order=revelation_order)
+             for number, name_arabic, name_english, revelation_type, verses_count, revelation_order in records],
+            update_conflicts=True,
+            unique_fields=['surah_number'],
+            update_fields=['name_arabic', 'name_english', 'revelation_type', 'verses_count', 'revelation_order'],
+        )
+        return len(records)
+
+
+class AyahTextSource(QuranSource):
+    """Base class of sources producing ``(surah, ayah, text)`` verses."""
+
+    def parse_chunk(self, items):
+        return [
+            (surah_number, ayah_number, text, normalize_arabic(text), juz_for(surah_number, ayah_number), page_for(surah_number, ayah_number))
+            for surah_number, ayah_number, text in self.parse_verses(items)
+        ]
+
+    def parse_verses(self, items):
+        """Yield ``(surah, ayah, text)`` for the raw items."""
+        raise NotImplementedError
+
+    def prepare(self):
+        QuranPart.objects.bulk_create(
+            [QuranPart(part_number=number) for number in range(1, TOTAL_JUZ + 1)], ignore_conflicts=True)
+        return dict(Surah.objects.values_list('surah_number', 'id'))
+
+    def write(self, records, context):
+        batch = [
+            Ayah(surah_id=context[surah_number], ayah_number_in_surah=ayah_number, text_uthmani=text,
+                 text_normalized=normalized, quran_part_id=juz, page=page)
+            for surah_number, ayah_number, text, normalized, juz, page in records
+            if surah_number in context
+        ]
+        if len(batch) < len(records):
+            logger.warning(f"{self}: skipped {len(records) - len(batch)} verses of surahs missing from the database")
+        return upsert_ayahs(batch) if batch else 0
+
+
+@register_source
+class PipeTextSource(AyahTextSource):
+    """Tanzil style ``surah|ayah|text`` file."""
+    name = 'text'
+    default_path = DEFAULT_QURAN_TEXT
+
+    def read_items(self):
+        with open(self.path, encoding='utf-8') as source:
+            yield from source
+
+    def parse_verses(self, items):
+        return iter_quran_text(items)
+
+
+@register_source
+class JsonTextSource(AyahTextSource):
+    """JSON list of ``{"surah": 1, "ayah": 1, "text": "..."}`` objects, optionally under a ``"verses"`` key."""
+    name = 'json'
+
+    def read_items(self):
+        with open(self.path, encoding='utf-8') as source:
+            data = json.load(source)
+        return iter(data['verses'] if isinstance(data, dict) else data)
+
+    def parse_verses(self, items):
+        for item in items:
+            yield int(item['surah']), int(item['ayah']), item['text']
+
+
+@register_source
+class TranslationSource(QuranSource):
+    """
+    ``surah|ayah|translation`` file stored as QuranTranslation rows.
+
+    Options:
+        language: Translation language code (default 'en')
+        translator: Translator name (default 'default')
+        primary: Also copy the text to ``Ayah.translation`` shown in the reading views
+    """
+    name = 'translation'
+
+    def __init__(self, path=None, language='en', translator='default', primary=False):
+        super().__init__(path, language=language, translator=translator, primary=primary)
+
+    @property
+    def updates_corpus(self):
+        return self.options['primary']
+
+    def read_items(self):
+        with open(self.path, encoding='utf-8') as source:
+            yield from source
+
+    def parse_chunk(self, items):
+        return list(iter_quran_text(items))
+
+    def prepare(self):
+        return {
+            (surah_number, ayah_number): ayah_id
+            for ayah_id, surah_number, ayah_number in Ayah.objects.values_list('id', 'surah__surah_number', 'ayah_number_in_surah').iterator()
+        }
+
+    def write(self, records, context):
+        rows = [(context[(surah_number, ayah_number)], text) for surah_number, ayah_number, text in records if (surah_number, ayah_number) in context]
+        QuranTranslation.objects.bulk_create(
+            [QuranTranslation(ayah_id=ayah_id, language=self.options['language'], translator=self.options['translator'], text=text) for ayah_id, text in rows],
+            update_conflicts=True,
+            unique_fields=['language', 'translator', 'ayah'],
+            update_fields=['text'],
+        )
+        if self.options['primary']:
+            Ayah.objects.bulk_update([Ayah(id=ayah_id, translation=text) for ayah_id, text in rows], ['translation'])
+        return len(rows)
+
+
+def _chunks(items, size):
+    """Split an iterator into lists of ``size`` items."""
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_source(source, batch_size=1000, workers=1, force=False, progress=None):
+    """
+    Load one source, resuming from its ledger.
+
+    Args:
+        source: A QuranSource instance
+        batch_size: Number of items parsed and written per chunk
+        workers: Number of processes parsing chunks in parallel
+        force: Reload even if this exact input was already loaded
+        progress: Optional callable receiving (source, chunks_done, rows_written)
+
+    Returns:
+        dict: {'source': str, 'status': 'loaded'|'resumed'|'unchanged', 'rows': int, 'elapsed': float}
+    """
+    start = time.monotonic()
+    run, _ = QuranLoadRun.objects.get_or_create(
+        source=source.name, checksum=source.checksum(),
+        defaults={'path': source.path or '', 'batch_size': batch_size})
+    if run.completed_at and not force:
+        logger.info(f"{source}: unchanged since {run.completed_at}, skipping")
+        return {'source': str(source), 'status': 'unchanged', 'rows': 0, 'elapsed': time.monotonic() - start}
+    if force or run.completed_at or run.batch_size != batch_size:
+        QuranLoadRun.objects.filter(pk=run.pk).update(batch_size=batch_size, chunks_done=0, rows_written=0, completed_at=None)
+        run.refresh_from_db()
+    resumed_from = run.chunks_done
+    if resumed_from:
+        logger.info(f"{source}: resuming after chunk {resumed_from}")
+
+    context = source.prepare()
+    chunks = _chunks(iter(source.read_items()), batch_size)
+    chunks = islice(chunks, resumed_from, None)
+    rows = 0
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=django.setup) if workers > 1 else None
+    try:
+        parsed = executor.map(source.parse_chunk, chunks) if executor else map(source.parse_chunk, chunks)
+        for index, records in enumerate(parsed, start=resumed_from + 1):
+            with transaction.atomic():
+                written = source.write(records, context)
+                QuranLoadRun.objects.filter(pk=run.pk).update(chunks_done=index, rows_written=F('rows_written') + written)
+            rows += written
+            if progress:
+                progress(source, index, run.rows_written + rows)
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    QuranLoadRun.objects.filter(pk=run.pk).update(completed_at=timezone.now())
+    elapsed = time.monotonic() - start
+    logger.info(f"{source}: wrote {rows} rows in {elapsed:.2f}s")
+    return {'source': str(source), 'status': 'resumed' if resumed_from else 'loaded', 'rows': rows, 'elapsed': elapsed}
+
+
+def load_quran(sources, batch_size=1000, workers=1, force=False, progress=None):
+    """
+    Load several sources in order and refresh the corpus cache once at the end.
+
+    Args:
+        sources: Iterable of QuranSource instances
+        batch_size, workers, force, progress: See ``load_source``
+
+    Returns:
+        list: One result dict per source
+    """
+    results = []
+    corpus_changed = False
+    for source in sources:
+        result = load_source(source, batch_size=batch_size, workers=workers, force=force, progress=progress)
+        corpus_changed = corpus_changed or (result['rows'] and source.updates_corpus)
+        results.append(result)
+    if corpus_changed:
+        bump_corpus_version()
+    return results
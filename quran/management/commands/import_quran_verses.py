@@ -1,8 +1,7 @@
 import os
 import logging
 from django.core.management.base import BaseCommand
-from quran.models import Surah, Ayah, QuranPart
-from django.db import transaction
+from quran.importer import DEFAULT_QURAN_TEXT, import_quran_text
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +14,17 @@ class Command(BaseCommand):
             type=str,
             help='Comma-separated list of surah numbers to import (e.g., "1,2,3"). If not provided, imports all surahs.',
         )
+        parser.add_argument(
+            '--file',
+            default=DEFAULT_QURAN_TEXT,
+            help='Path of the surah|ayah|text file to import.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of verses written per query.',
+        )
 
     def handle(self, *args, **options):
         # Get selected surahs if provided
@@ -28,96 +38,16 @@ class Command(BaseCommand):
                 return
 
         # Check if the file exists
-        if not os.path.exists('quran-text.txt'):
-            self.stdout.write(self.style.ERROR("quran-text.txt file not found!"))
+        if not os.path.exists(options['file']):
+            self.stdout.write(self.style.ERROR(f"{options['file']} file not found!"))
             return
-        
-        # Ensure all QuranPart objects exist (1-30)
-        for part_number in range(1, 31):
-            QuranPart.objects.get_or_create(part_number=part_number)
-        self.stdout.write(self.style.SUCCESS("Ensured all QuranPart objects exist"))
-        
-        # Read the file
-        with open('quran-text.txt', 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        
-        self.stdout.write(self.style.SUCCESS(f"Read {len(lines)} lines from quran-text.txt"))
-        
-        # Dictionary to store ayahs by surah
-        ayahs_by_surah = {}
-        
-        # Parse each line
-        for line in lines:
-            try:
-                # Split the line by |
-                parts = line.strip().split('|')
-                if len(parts) != 3:
-                    continue
-                
-                surah_number, ayah_number, text = parts
-                
-                # Skip if not in selected surahs
-                if selected_surahs and int(surah_number) not in selected_surahs:
-                    continue
-                
-                # Get the surah
-                try:
-                    surah = Surah.objects.get(surah_number=int(surah_number))
-                except Surah.DoesNotExist:
-                    self.stdout.write(self.style.WARNING(f"Surah {surah_number} not found in database. Skipping verse."))
-                    continue
-                
-                # Determine which part this ayah belongs to (simplified)
-                part_number = 1
-                if int(surah_number) > 2:
-                    part_number = min(int(surah_number) // 3 + 1, 30)
-                if int(surah_number) >= 78:
-                    part_number = 30
-                
-                # Get the QuranPart
-                quran_part = QuranPart.objects.get(part_number=part_number)
-                
-                # Add to ayahs_by_surah dictionary
-                if surah_number not in ayahs_by_surah:
-                    ayahs_by_surah[surah_number] = []
-                
-                ayahs_by_surah[surah_number].append({
-                    'surah': surah,
-                    'quran_part': quran_part,
-                    'ayah_number_in_surah': int(ayah_number),
-                    'text_uthmani': text,
-                    'page': 1 + (int(ayah_number) // 15)  # Approximate page number
-                })
-                
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"Error processing line: {line}. Error: {str(e)}"))
-        
-        # Process each surah's ayahs
-        for surah_number, ayahs in ayahs_by_surah.items():
-            if not ayahs:
-                self.stdout.write(self.style.WARNING(f"No verses found for Surah {surah_number}"))
-                continue
-                
-            try:
-                with transaction.atomic():
-                    # Delete existing ayahs for this surah
-                    surah = ayahs[0]['surah']
-                    count = Ayah.objects.filter(surah=surah).count()
-                    Ayah.objects.filter(surah=surah).delete()
-                    self.stdout.write(self.style.SUCCESS(f"Deleted {count} existing ayahs for Surah {surah_number}"))
-                    
-                    # Create new ayahs
-                    for ayah in ayahs:
-                        Ayah.objects.create(
-                            surah=ayah['surah'],
-                            quran_part=ayah['quran_part'],
-                            ayah_number_in_surah=ayah['ayah_number_in_surah'],
-                            text_uthmani=ayah['text_uthmani'],
-                            page=ayah['page']
-                        )
-                    
-                    self.stdout.write(self.style.SUCCESS(f"Imported {len(ayahs)} verses for Surah {surah_number}"))
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"Error importing verses for Surah {surah_number}: {str(e)}"))
-        
-        self.stdout.write(self.style.SUCCESS("Import complete!"))
+
+        result = import_quran_text(
+            options['file'],
+            batch_size=options['batch_size'],
+            surahs=selected_surahs,
+            progress=lambda count: self.stdout.write(f"Imported {count} verses"),
+        )
+        if result['missing_surahs']:
+            self.stdout.write(self.style.WARNING(f"Surahs not found in database, verses skipped: {result['missing_surahs']}"))
+        self.stdout.write(self.style.SUCCESS(f"Import complete! {result['imported']} verses in {result['elapsed']:.2f}s"))
@@ -0,0 +1,54 @@
+"""Management command to build the ayah timing index of a reciter."""
+from django.core.management.base import BaseCommand, CommandError
+
+from quran.models import QuranReciter
+from quran.timing import detect_timings, import_timing_file
+
+
+class Command(BaseCommand):
+    help = 'Index the ayah timings of a reciter from the pauses in the indexed MP3s or from a timing file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('folder', help='Reciter folder name (run index_reciters first).')
+        parser.add_argument(
+            '--import',
+            dest='timing_file',
+            metavar='FILE',
+            help='Import timings from a CSV (surah,ayah,start_ms,end_ms) or JSON file instead of detecting them.',
+        )
+        parser.add_argument(
+            '--surah',
+            type=int,
+            action='append',
+            help='Only detect the timings of this surah (repeatable).',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Detect again for files that already have timings, imported ones included.',
+        )
+        parser.add_argument(
+            '--no-basmala',
+            action='store_true',
+            help='The recitations do not open with a basmala before the first ayah.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            reciter = QuranReciter.objects.get(folder=options['folder'])
+        except QuranReciter.DoesNotExist:
+            raise CommandError(f"Reciter folder {options['folder']} is not indexed")
+
+        if options['timing_file']:
+            try:
+                stats = import_timing_file(reciter, options['timing_file'])
+            except (OSError, ValueError) as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(
+                f"Imported {stats['ayahs']} ayah timings for {stats['surahs']} surahs "
+                f"({stats['missing']} surahs without a recording)"))
+            return
+
+        stats = detect_timings(reciter, surahs=options['surah'], force=options['force'], basmala=not options['no_basmala'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{reciter.folder}: {stats['detected']} detected, {stats['skipped']} already indexed, {stats['failed']} failed"))
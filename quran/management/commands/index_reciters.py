@@ -0,0 +1,56 @@
+"""Management command to index the reciter audio folders."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from quran.catalog import get_reciters_dir, refresh_catalog
+
+
+class Command(BaseCommand):
+    help = 'Index the reciter MP3 folders (surah, size, duration, bitrate); only new or modified files are read'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'folders',
+            nargs='*',
+            help='Reciter folder names to scan (default: all folders).',
+        )
+        parser.add_argument(
+            '--path',
+            help='Root folder of the reciters (default: settings.RECITERS_DIR).',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-read the headers of unchanged files too.',
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Drop the index of reciters whose folder no longer exists.',
+        )
+        parser.add_argument(
+            '--watch',
+            type=float,
+            metavar='SECONDS',
+            help='Keep running and rescan every SECONDS (unchanged files cost one stat call).',
+        )
+
+    def handle(self, *args, **options):
+        root = options['path'] or get_reciters_dir()
+        force = options['force']
+        while True:
+            start = time.monotonic()
+            results = refresh_catalog(root, folders=options['folders'] or None, force=force, prune=options['prune'])
+            elapsed = time.monotonic() - start
+            for folder, stats in results.items():
+                if options['watch'] and not (stats['added'] or stats['updated'] or stats['removed']):
+                    continue
+                self.stdout.write(
+                    f"{folder}: {stats['added']} added, {stats['updated']} updated, {stats['removed']} removed, "
+                    f"{stats['unchanged']} unchanged, {stats['errors']} unreadable")
+            if not options['watch']:
+                self.stdout.write(self.style.SUCCESS(f'Indexed {len(results)} reciters from {root} in {elapsed:.2f}s'))
+                return
+            force = False
+            time.sleep(options['watch'])
@@ -0,0 +1,76 @@
+"""Management command to load the Quran text, surah metadata and translations."""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quran.loader import DEFAULT_SOURCES, SOURCES, get_source, load_quran
+
+
+class Command(BaseCommand):
+    help = (
+        'Load Quran data from one or more sources given as NAME[:PATH] '
+        f'(available: {", ".join(sorted(SOURCES))}; default: {" ".join(DEFAULT_SOURCES)}). '
+        'Unchanged inputs are skipped and interrupted loads resume.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'sources',
+            nargs='*',
+            help='Sources to load in order, e.g. "surahs text:quran-text.txt translation:en.sahih.txt".',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of items parsed and written per chunk.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes parsing chunks in parallel.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Reload sources even if the same input was already loaded.',
+        )
+        parser.add_argument('--language', default='en', help='Language code of translation sources.')
+        parser.add_argument('--translator', default='default', help='Translator name of translation sources.')
+        parser.add_argument(
+            '--primary',
+            action='store_true',
+            help='Also show translation sources in the reading views (Ayah.translation).',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--batch-size and --workers must be positive.')
+
+        sources = []
+        for spec in options['sources'] or DEFAULT_SOURCES:
+            name, _, path = spec.partition(':')
+            source_options = {}
+            if name == 'translation':
+                source_options = {'language': options['language'], 'translator': options['translator'], 'primary': options['primary']}
+            try:
+                sources.append(get_source(name, path or None, **source_options))
+            except (ValueError, TypeError) as e:
+                raise CommandError(str(e))
+
+        start = time.monotonic()
+        try:
+            results = load_quran(
+                sources,
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+                force=options['force'],
+                progress=lambda source, chunks, rows: self.stdout.write(f'{source}: {chunks} chunks, {rows} rows'),
+            )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for result in results:
+            self.stdout.write(f"{result['source']}: {result['status']}, {result['rows']} rows in {result['elapsed']:.2f}s")
+        self.stdout.write(self.style.SUCCESS(f'Quran load finished in {time.monotonic() - start:.2f}s'))
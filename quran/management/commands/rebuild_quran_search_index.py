@@ -0,0 +1,24 @@
+"""Management command to rebuild the Quran full-text search index."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from quran.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Recompute normalized ayah text and rebuild the database search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of ayahs updated per query.',
+        )
+
+    def handle(self, *args, **options):
+        start = time.monotonic()
+        updated = rebuild_search_index(batch_size=options['batch_size'])
+        elapsed = time.monotonic() - start
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt in {elapsed:.2f}s ({updated} ayahs renormalized)'))
@@ -0,0 +1,89 @@
+import re
+
+from django.db import migrations, models
+
+# A frozen copy of quran.search.normalize_arabic as of this migration, so later
+# changes to the search normalizer do not change what it writes
+DIACRITICS_RE = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06dc\u06df-\u06e8\u06ea-\u06ed\u08d3-\u08ff]')
+TATWEEL = '\u0640'
+LETTER_MAP = str.maketrans({
+    '\u0622': '\u0627',
+    '\u0623': '\u0627',
+    '\u0625': '\u0627',
+    '\u0671': '\u0627',
+    '\u0672': '\u0627',
+    '\u0673': '\u0627',
+    '\u0649': '\u064a',
+    '\u0629': '\u0647',
+})
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_arabic(text):
+    if not text:
+        return ''
+    text = DIACRITICS_RE.sub('', text).replace(TATWEEL, '')
+    return WHITESPACE_RE.sub(' ', text.translate(LETTER_MAP)).strip()
+
+
+def populate_text_normalized(apps, schema_editor):
+    Ayah = apps.get_model('quran', 'Ayah')
+    ayahs = list(Ayah.objects.only('id', 'text_uthmani'))
+    for ayah in ayahs:
+        ayah.text_normalized = normalize_arabic(ayah.text_uthmani)
+    Ayah.objects.bulk_update(ayahs, ['text_normalized'], batch_size=500)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute('CREATE INDEX IF NOT EXISTS quran_ayah_text_normalized_trgm ON quran_ayah USING gin (text_normalized gin_trgm_ops)')
+        schema_editor.execute('CREATE INDEX IF NOT EXISTS quran_ayah_translation_trgm ON quran_ayah USING gin (UPPER(translation) gin_trgm_ops)')
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS quran_ayah_fts USING fts5("
+            "text_normalized, translation, content='quran_ayah', content_rowid='id', tokenize='trigram')"
+        )
+        schema_editor.execute(
+            "CREATE TRIGGER IF NOT EXISTS quran_ayah_fts_ai AFTER INSERT ON quran_ayah BEGIN "
+            "INSERT INTO quran_ayah_fts(rowid, text_normalized, translation) VALUES (new.id, new.text_normalized, new.translation); END"
+        )
+        schema_editor.execute(
+            "CREATE TRIGGER IF NOT EXISTS quran_ayah_fts_ad AFTER DELETE ON quran_ayah BEGIN "
+            "INSERT INTO quran_ayah_fts(quran_ayah_fts, rowid, text_normalized, translation) VALUES ('delete', old.id, old.text_normalized, old.translation); END"
+        )
+        schema_editor.execute(
+            "CREATE TRIGGER IF NOT EXISTS quran_ayah_fts_au AFTER UPDATE ON quran_ayah BEGIN "
+            "INSERT INTO quran_ayah_fts(quran_ayah_fts, rowid, text_normalized, translation) VALUES ('delete', old.id, old.text_normalized, old.translation); "
+            "INSERT INTO quran_ayah_fts(rowid, text_normalized, translation) VALUES (new.id, new.text_normalized, new.translation); END"
+        )
+        schema_editor.execute("INSERT INTO quran_ayah_fts(quran_ayah_fts) VALUES('rebuild')")
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS quran_ayah_text_normalized_trgm')
+        schema_editor.execute('DROP INDEX IF EXISTS quran_ayah_translation_trgm')
+    elif vendor == 'sqlite':
+        for trigger in ('quran_ayah_fts_ai', 'quran_ayah_fts_ad', 'quran_ayah_fts_au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        schema_editor.execute('DROP TABLE IF EXISTS quran_ayah_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quran', '0002_surah_revelation_order'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ayah',
+            name='text_normalized',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='النص المطبع للبحث'),
+        ),
+        migrations.RunPython(populate_text_normalized, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quran', '0003_ayah_text_normalized'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuranLoadRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=100, verbose_name='المصدر')),
+                ('path', models.CharField(blank=True, max_length=500, verbose_name='المسار')),
+                ('checksum', models.CharField(max_length=64, verbose_name='البصمة')),
+                ('batch_size', models.PositiveIntegerField(verbose_name='حجم الدفعة')),
+                ('chunks_done', models.PositiveIntegerField(default=0, verbose_name='الدفعات المكتملة')),
+                ('rows_written', models.PositiveIntegerField(default=0, verbose_name='الصفوف المكتوبة')),
+                ('started_at', models.DateTimeField(auto_now_add=True, verbose_name='وقت البدء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='آخر تحديث')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='وقت الاكتمال')),
+            ],
+            options={
+                'verbose_name': 'عملية تحميل القرآن',
+                'verbose_name_plural': 'عمليات تحميل القرآن',
+                'unique_together': {('source', 'checksum')},
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quran', '0004_quranloadrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quranreciter',
+            name='folder',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True, verbose_name='مجلد التلاوات'),
+        ),
+        migrations.AddField(
+            model_name='quranreciter',
+            name='scanned_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='تاريخ آخر فهرسة'),
+        ),
+        migrations.CreateModel(
+            name='ReciterSurah',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('surah_number', models.PositiveSmallIntegerField(verbose_name='رقم السورة')),
+                ('filename', models.CharField(max_length=255, verbose_name='اسم الملف')),
+                ('file_size', models.BigIntegerField(verbose_name='حجم الملف')),
+                ('duration', models.FloatField(blank=True, null=True, verbose_name='المدة (ثوان)')),
+                ('bitrate', models.PositiveIntegerField(blank=True, null=True, verbose_name='معدل البت (kbps)')),
+                ('mtime', models.FloatField(verbose_name='تاريخ تعديل الملف')),
+                ('reciter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='surah_files', to='quran.quranreciter', verbose_name='القارئ')),
+            ],
+            options={
+                'verbose_name': 'سورة مسجلة',
+                'verbose_name_plural': 'السور المسجلة',
+                'ordering': ['reciter', 'surah_number'],
+                'unique_together': {('reciter', 'surah_number')},
+            },
+        ),
+    ]
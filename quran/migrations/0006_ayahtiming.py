@@ -0,0 +1,33 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quran', '0005_reciter_catalog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recitersurah',
+            name='timings_source',
+            field=models.CharField(blank=True, choices=[('silence', 'كشف السكتات'), ('file', 'ملف توقيت')], max_length=10, verbose_name='مصدر توقيت الآيات'),
+        ),
+        migrations.CreateModel(
+            name='AyahTiming',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ayah_number', models.PositiveSmallIntegerField(verbose_name='رقم الآية')),
+                ('start_ms', models.PositiveIntegerField(verbose_name='البداية (ملي ثانية)')),
+                ('end_ms', models.PositiveIntegerField(verbose_name='النهاية (ملي ثانية)')),
+                ('recording', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timings', to='quran.recitersurah', verbose_name='ملف السورة')),
+            ],
+            options={
+                'verbose_name': 'توقيت آية',
+                'verbose_name_plural': 'توقيتات الآيات',
+                'ordering': ['recording', 'ayah_number'],
+                'unique_together': {('recording', 'ayah_number')},
+            },
+        ),
+    ]
@@ -46,6 +46,7 @@ class Ayah(models.Model):
     surah = models.ForeignKey(Surah, on_delete=models.CASCADE, related_name='ayahs')
     ayah_number_in_surah = models.IntegerField()
     text_uthmani = models.TextField()
+    text_normalized = models.TextField(blank=True, default='', editable=False, verbose_name='النص المطبع للبحث')
     translation = models.TextField(blank=True)
     quran_part = models.ForeignKey(QuranPart, on_delete=models.CASCADE, related_name='ayahs')
     page = models.IntegerField(null=True, blank=True)
@@ -57,6 +58,15 @@ class Ayah(models.Model):
         verbose_name_plural = 'آيات'
         ordering = ['surah', 'ayah_number_in_surah']
 
+    def save(self, *args, **kwargs):
+        """Keep the normalized search text in sync with the Uthmani text."""
+        from .search import normalize_arabic
+        self.text_normalized = normalize_arabic(self.text_uthmani)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text_uthmani' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'text_normalized'}
+        super().save(*args, **kwargs)
+
 class QuranReciter(models.Model):
     """Model for Quran reciters."""
     name = models.CharField(max_length=100, unique=True, verbose_name='اسم القارئ')
@@ -64,6 +74,8 @@ class QuranReciter(models.Model):
     bio = models.TextField(blank=True, null=True, verbose_name='نبذة عن القارئ')
     photo = models.ImageField(upload_to='reciters/', null=True, blank=True, verbose_name='صورة القارئ')
     style = models.CharField(max_length=100, blank=True, null=True, verbose_name='نمط القراءة')
+    folder = models.CharField(max_length=100, unique=True, null=True, blank=True, verbose_name='مجلد التلاوات')
+    scanned_at = models.DateTimeField(null=True, blank=True, verbose_name='تاريخ آخر فهرسة')
 
     class Meta:
         """Meta options for the QuranReciter model."""
@@ -74,6 +86,46 @@ class QuranReciter(models.Model):
         """Return a string representation of the QuranReciter."""
         return self.name_arabic
 
+class ReciterSurah(models.Model):
+    """Index entry of a surah MP3 in a reciter's folder, maintained by quran.catalog."""
+    reciter = models.ForeignKey(QuranReciter, on_delete=models.CASCADE, related_name='surah_files', verbose_name='القارئ')
+    surah_number = models.PositiveSmallIntegerField(verbose_name='رقم السورة')
+    filename = models.CharField(max_length=255, verbose_name='اسم الملف')
+    file_size = models.BigIntegerField(verbose_name='حجم الملف')
+    duration = models.FloatField(null=True, blank=True, verbose_name='المدة (ثوان)')
+    bitrate = models.PositiveIntegerField(null=True, blank=True, verbose_name='معدل البت (kbps)')
+    mtime = models.FloatField(verbose_name='تاريخ تعديل الملف')
+    timings_source = models.CharField(max_length=10, blank=True, choices=[('silence', 'كشف السكتات'), ('file', 'ملف توقيت')], verbose_name='مصدر توقيت الآيات')
+
+    class Meta:
+        """Meta options for the ReciterSurah model."""
+        verbose_name = 'سورة مسجلة'
+        verbose_name_plural = 'السور المسجلة'
+        ordering = ['reciter', 'surah_number']
+        unique_together = ('reciter', 'surah_number')
+
+    def __str__(self):
+        """Return a string representation of the ReciterSurah."""
+        return f'{self.reciter.name} - {self.surah_number}'
+
+class AyahTiming(models.Model):
+    """Position of an ayah in a reciter's surah file, maintained by quran.timing (ayah 0 is the opening basmala)."""
+    recording = models.ForeignKey(ReciterSurah, on_delete=models.CASCADE, related_name='timings', verbose_name='ملف السورة')
+    ayah_number = models.PositiveSmallIntegerField(verbose_name='رقم الآية')
+    start_ms = models.PositiveIntegerField(verbose_name='البداية (ملي ثانية)')
+    end_ms = models.PositiveIntegerField(verbose_name='النهاية (ملي ثانية)')
+
+    class Meta:
+        """Meta options for the AyahTiming model."""
+        verbose_name = 'توقيت آية'
+        verbose_name_plural = 'توقيتات الآيات'
+        ordering = ['recording', 'ayah_number']
+        unique_together = ('recording', 'ayah_number')
+
+    def __str__(self):
+        """Return a string representation of the AyahTiming."""
+        return f'{self.recording_id}:{self.ayah_number} ({self.start_ms}-{self.end_ms})'
+
 class QuranRecitation(models.Model):
     """Model for Quran recitations (audio)."""
     reciter = models.ForeignKey(QuranReciter, on_delete=models.CASCADE, related_name='recitations', verbose_name='القارئ')
@@ -151,4 +203,26 @@ class QuranReadingSettings(models.Model):
 
     def __str__(self):
         """Return a string representation of the QuranReadingSettings."""
-        return f'Quran Settings for {self.user.username}'
\ No newline at end of file
+        return f'Quran Settings for {self.user.username}'
+
+class QuranLoadRun(models.Model):
+    """Progress ledger of a ``quran_load`` source, used to skip or resume imports."""
+    source = models.CharField(max_length=100, verbose_name='المصدر')
+    path = models.CharField(max_length=500, blank=True, verbose_name='المسار')
+    checksum = models.CharField(max_length=64, verbose_name='البصمة')
+    batch_size = models.PositiveIntegerField(verbose_name='حجم الدفعة')
+    chunks_done = models.PositiveIntegerField(default=0, verbose_name='الدفعات المكتملة')
+    rows_written = models.PositiveIntegerField(default=0, verbose_name='الصفوف المكتوبة')
+    started_at = models.DateTimeField(auto_now_add=True, verbose_name='وقت البدء')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='آخر تحديث')
+    completed_at = models.DateTimeField(null=True, blank=True, verbose_name='وقت الاكتمال')
+
+    class Meta:
+        """Meta options for the QuranLoadRun model."""
+        unique_together = ('source', 'checksum')
+        verbose_name = 'عملية تحميل القرآن'
+        verbose_name_plural = 'عمليات تحميل القرآن'
+
+    def __str__(self):
+        """Return a string representation of the load run."""
+        return f'{self.source} ({self.checksum[:12]})'
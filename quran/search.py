@@ -0,0 +1,309 @@
+"""Indexed full-text search over the Quran text.
+
+Ayah text is matched against ``Ayah.text_normalized``, a copy of the Uthmani
+text with tashkeel, Quranic annotation marks and tatweel removed and letter
+variants folded, so a query typed without diacritics matches the vocalised text.
+
+The index backend depends on the database:
+
+* PostgreSQL: a GIN ``gin_trgm_ops`` index on the normalized column (and on the
+  upper-cased translation) serves substring lookups; results are ranked with
+  ``similarity()``.
+* SQLite: an external-content FTS5 table using the trigram tokenizer, kept in
+  sync by triggers and ranked with ``bm25()``.
+* Anything else falls back to an unranked substring scan of the normalized column.
+"""
+import html
+import logging
+import re
+
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.utils import DatabaseError
+from django.utils.safestring import mark_safe
+
+from .models import Ayah
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'quran_ayah_fts'
+
+# Harakat, shadda, sukun, superscript alef and the Quranic annotation signs
+_DIACRITICS_RE = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06dc\u06df-\u06e8\u06ea-\u06ed\u08d3-\u08ff]')
+_TATWEEL = '\u0640'
+_LETTER_MAP = str.maketrans({
+    '\u0622': '\u0627',  # alef with madda
+    '\u0623': '\u0627',  # alef with hamza above
+    '\u0625': '\u0627',  # alef with hamza below
+    '\u0671': '\u0627',  # alef wasla
+    '\u0672': '\u0627',  # alef with wavy hamza above
+    '\u0673': '\u0627',  # alef with wavy hamza below
+    '\u0649': '\u064a',  # alef maqsura -> ya
+    '\u0629': '\u0647',  # ta marbuta -> ha
+})
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_arabic(text):
+    """
+    Normalize Arabic text for searching.
+
+    Args:
+        text: Arabic text, optionally with diacritics
+
+    Returns:
+        str: The text without tashkeel, annotation marks and tatweel, with alef,
+            alef maqsura and ta marbuta variants folded and whitespace collapsed
+    """
+    if not text:
+        return ''
+    text = _DIACRITICS_RE.sub('', text).replace(_TATWEEL, '')
+    return _WHITESPACE_RE.sub(' ', text.translate(_LETTER_MAP)).strip()
+
+
+def _normalize_with_offsets(text):
+    """Normalize text like normalize_arabic and map each output character to its source index."""
+    chars = []
+    offsets = []
+    previous_space = True
+    for index, char in enumerate(text):
+        if char == _TATWEEL or _DIACRITICS_RE.match(char):
+            continue
+        if char.isspace():
+            if previous_space:
+                continue
+            char = ' '
+            previous_space = True
+        else:
+            previous_space = False
+        chars.append(char.translate(_LETTER_MAP))
+        offsets.append(index)
+    return ''.join(chars), offsets
+
+
+def highlight(text, query, context_words=None):
+    """
+    Highlight every occurrence of a query in (possibly vocalised) text.
+
+    Matching is done on the normalized form; the marks are placed around the
+    corresponding span of the original text so diacritics are preserved.
+
+    Args:
+        text: The original text
+        query: The search query
+        context_words: If given, trim the text to this many words around the first match
+
+    Returns:
+        SafeString: HTML-escaped text with matches wrapped in <mark>
+    """
+    needle = normalize_arabic(query).lower()
+    normalized, offsets = _normalize_with_offsets(text or '')
+    normalized = normalized.lower()
+    spans = []
+    if needle:
+        start = normalized.find(needle)
+        while start != -1:
+            end = start + len(needle) - 1
+            # Extend the span over trailing diacritics of the last matched letter
+            source_end = offsets[end + 1] if end + 1 < len(offsets) else len(text)
+            while source_end > offsets[end] + 1 and text[source_end - 1].isspace():
+                source_end -= 1
+            spans.append((offsets[start], source_end))
+            start = normalized.find(needle, start + len(needle))
+
+    window_start, window_end = 0, len(text or '')
+    if context_words and spans:
+        words = [match.span() for match in re.finditer(r'\S+', text)]
+        first = next(i for i, (s, e) in enumerate(words) if e > spans[0][0])
+        lo, hi = max(0, first - context_words), min(len(words), first + context_words + 1)
+        window_start, window_end = words[lo][0], words[hi - 1][1]
+
+    parts = ['…'] if window_start > 0 else []
+    cursor = window_start
+    for start, end in spans:
+        if start < cursor or end > window_end:
+            continue
+        parts.append(html.escape(text[cursor:start]))
+        parts.append(f'<mark>{html.escape(text[start:end])}</mark>')
+        cursor = end
+    parts.append(html.escape(text[cursor:window_end]))
+    if window_end < len(text or ''):
+        parts.append('…')
+    return mark_safe(''.join(parts))
+
+
+def _backend():
+    """Return the search backend name for the default database."""
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite' and fts_table_exists():
+        return 'sqlite'
+    return 'basic'
+
+
+def fts_table_exists():
+    """Return True if the SQLite FTS5 index table exists."""
+    with connection.cursor() as cursor:
+        return FTS_TABLE in connection.introspection.table_names(cursor)
+
+
+def _fts_phrase(text):
+    """Quote text as a single FTS5 phrase."""
+    return '"{}"'.format(text.replace('"', '""'))
+
+
+def _ranked_ids_sqlite(text_query, translation_query, surah=None, juz=None):
+    """Return ayah ids ranked by bm25 using the FTS5 index."""
+    clauses = []
+    if text_query:
+        clauses.append(f'text_normalized : {_fts_phrase(text_query)}')
+    if translation_query:
+        clauses.append(f'translation : {_fts_phrase(translation_query)}')
+    sql = [
+        f'SELECT a.id FROM {FTS_TABLE} f JOIN quran_ayah a ON a.id = f.rowid',
+        f'WHERE {FTS_TABLE} MATCH %s',
+    ]
+    params = [' OR '.join(clauses)]
+    if surah:
+        sql.append('AND a.surah_id IN (SELECT id FROM quran_surah WHERE surah_number = %s)')
+        params.append(surah)
+    if juz:
+        sql.append('AND a.quran_part_id = %s')
+        params.append(juz)
+    sql.append(f'ORDER BY bm25({FTS_TABLE}), a.id')
+    with connection.cursor() as cursor:
+        cursor.execute(' '.join(sql), params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _filtered_queryset(text_query, translation_query, surah=None, juz=None):
+    """Return an ayah queryset filtered by substring on the indexed columns."""
+    query = Q()
+    if text_query:
+        query |= Q(text_normalized__contains=text_query)
+    if translation_query:
+        query |= Q(translation__icontains=translation_query)
+    ayahs = Ayah.objects.filter(query)
+    if surah:
+        ayahs = ayahs.filter(surah__surah_number=surah)
+    if juz:
+        ayahs = ayahs.filter(quran_part_id=juz)
+    return ayahs
+
+
+def search_ayahs(search_text, search_type='text', surah=None, juz=None, page=1, per_page=20, context_words=12):
+    """
+    Search the Quran using the normalized text index.
+
+    Args:
+        search_text: Text to search for; diacritics are optional
+        search_type: 'text', 'translation' or 'both'
+        surah: Surah number to limit the search to (optional)
+        juz: Juz number to limit the search to (optional)
+        page: Page number for pagination
+        per_page: Number of results per page
+        context_words: Number of words kept around the first match in snippets
+
+    Returns:
+        dict: 'results' (a Page of Ayah objects annotated with ``snippet`` and
+            ``translation_snippet``), 'total' and 'search_performed'
+    """
+    normalized = normalize_arabic(search_text)
+    if not normalized:
+        return {'results': [], 'total': 0, 'search_performed': False}
+    text_query = normalized if search_type in ('text', 'both') else None
+    translation_query = search_text.strip() if search_type in ('translation', 'both') else None
+
+    backend = _backend()
+    # The FTS5 trigram tokenizer cannot match terms shorter than three characters
+    if backend == 'sqlite' and min(len(q) for q in (text_query, translation_query) if q) < 3:
+        backend = 'basic'
+
+    if backend == 'sqlite':
+        paginator = Paginator(_ranked_ids_sqlite(text_query, translation_query, surah, juz), per_page)
+        results = paginator.get_page(page)
+        ayahs = Ayah.objects.select_related('surah').in_bulk(list(results.object_list))
+        results.object_list = [ayahs[pk] for pk in results.object_list if pk in ayahs]
+    else:
+        ayahs = _filtered_queryset(text_query, translation_query, surah, juz).select_related('surah')
+        if backend == 'postgresql' and text_query:
+            ayahs = ayahs.annotate(
+                rank=Func(F('text_normalized'), Value(text_query), function='similarity', output_field=FloatField())
+            ).order_by('-rank', 'surah__surah_number', 'ayah_number_in_surah')
+        else:
+            ayahs = ayahs.order_by('surah__surah_number', 'ayah_number_in_surah')
+        paginator = Paginator(ayahs, per_page)
+        results = paginator.get_page(page)
+
+    for ayah in results.object_list:
+        ayah.snippet = highlight(ayah.text_uthmani, search_text, context_words) if text_query else ayah.text_uthmani
+        ayah.translation_snippet = highlight(ayah.translation, search_text) if translation_query else ayah.translation
+    return {'results': results, 'total': paginator.count, 'search_performed': True}
+
+
+def ensure_search_index():
+    """
+    Create the database-specific search index if it is missing.
+
+    Returns:
+        str: The backend that will be used for searching
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute('CREATE INDEX IF NOT EXISTS quran_ayah_text_normalized_trgm ON quran_ayah USING gin (text_normalized gin_trgm_ops)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS quran_ayah_translation_trgm ON quran_ayah USING gin (UPPER(translation) gin_trgm_ops)')
+        elif connection.vendor == 'sqlite':
+            try:
+                for statement in SQLITE_FTS_SQL:
+                    cursor.execute(statement)
+            except DatabaseError as e:
+                logger.warning(f"SQLite FTS5 trigram index unavailable, falling back to substring search: {str(e)}")
+    return _backend()
+
+
+def rebuild_search_index(batch_size=1000):
+    """
+    Recompute the normalized text of every ayah and rebuild the search index.
+
+    Args:
+        batch_size: Number of ayahs updated per query
+
+    Returns:
+        int: Number of ayahs whose normalized text changed
+    """
+    backend = ensure_search_index()
+    changed = []
+    updated = 0
+    with transaction.atomic():
+        for ayah in Ayah.objects.only('id', 'text_uthmani', 'text_normalized').iterator(chunk_size=batch_size):
+            normalized = normalize_arabic(ayah.text_uthmani)
+            if normalized != ayah.text_normalized:
+                ayah.text_normalized = normalized
+                changed.append(ayah)
+            if len(changed) >= batch_size:
+                Ayah.objects.bulk_update(changed, ['text_normalized'], batch_size=batch_size)
+                updated += len(changed)
+                changed = []
+        if changed:
+            Ayah.objects.bulk_update(changed, ['text_normalized'], batch_size=batch_size)
+            updated += len(changed)
+        if backend == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+    logger.info(f"Quran search index rebuilt ({backend}), {updated} ayahs renormalized")
+    return updated
+
+
+SQLITE_FTS_SQL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "text_normalized, translation, content='quran_ayah', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS quran_ayah_fts_ai AFTER INSERT ON quran_ayah BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, text_normalized, translation) VALUES (new.id, new.text_normalized, new.translation); END",
+    f"CREATE TRIGGER IF NOT EXISTS quran_ayah_fts_ad AFTER DELETE ON quran_ayah BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text_normalized, translation) VALUES ('delete', old.id, old.text_normalized, old.translation); END",
+    f"CREATE TRIGGER IF NOT EXISTS quran_ayah_fts_au AFTER UPDATE ON quran_ayah BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text_normalized, translation) VALUES ('delete', old.id, old.text_normalized, old.translation); "
+    f"INSERT INTO {FTS_TABLE}(rowid, text_normalized, translation) VALUES (new.id, new.text_normalized, new.translation); END",
+]
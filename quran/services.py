@@ -1,10 +1,9 @@
 """Business logic for quran app."""
 
 import logging
-from django.db.models import Q
-from django.core.paginator import Paginator
-
 from .models import Surah, Ayah, QuranPart, QuranReciter, ReciterSurah, QuranReadingSettings
+from .corpus import get_corpus
+from .search import search_ayahs
 
 logger = logging.getLogger(__name__)
 
@@ -60,14 +59,15 @@ def get_surah_detail(surah_number, user=None):
         dict: Detailed information about the surah
     """
     try:
-        # Get the surah
-        surah = Surah.objects.get(surah_number=surah_number)
-
-        # Get all ayahs for the surah
-        ayahs = Ayah.objects.filter(surah=surah).order_by('ayah_number_in_surah')
+        # Get the surah and its ayahs from the in-memory corpus
+        corpus = get_corpus()
+        surah = corpus.surah(surah_number)
+        if surah is None:
+            raise Surah.DoesNotExist
+        ayahs = corpus.surah_ayahs(surah_number)
 
         # Get reciters who have recited this surah
-        reciters = QuranReciter.objects.filter(recitersurah__surah=surah).distinct()
+        reciters = QuranReciter.objects.filter(recitersurah__surah_id=surah.id).distinct()
 
         # Get user reading settings if user is authenticated
         reading_settings = None
@@ -75,8 +75,8 @@ def get_surah_detail(surah_number, user=None):
             reading_settings, _ = QuranReadingSettings.objects.get_or_create(user=user)
 
         # Get previous and next surahs
-        previous_surah = Surah.objects.filter(surah_number__lt=surah_number).order_by('-surah_number').first()
-        next_surah = Surah.objects.filter(surah_number__gt=surah_number).order_by('surah_number').first()
+        previous_surah = corpus.previous_surah(surah_number)
+        next_surah = corpus.next_surah(surah_number)
 
         return {
             'surah': surah,
@@ -105,21 +105,12 @@ def get_part_detail(part_number, user=None):
         dict: Detailed information about the part
     """
     try:
-        # Get the part
-        part = QuranPart.objects.get(part_number=part_number)
-
-        # Get all ayahs for the part
-        ayahs = Ayah.objects.filter(quran_part=part).order_by('surah__surah_number', 'ayah_number_in_surah')
-
-        # Group ayahs by surah
-        surahs_in_part = {}
-        for ayah in ayahs:
-            if ayah.surah.id not in surahs_in_part:
-                surahs_in_part[ayah.surah.id] = {
-                    'surah': ayah.surah,
-                    'ayahs': []
-                }
-            surahs_in_part[ayah.surah.id]['ayahs'].append(ayah)
+        # Get the part and its ayahs grouped by surah from the in-memory corpus
+        corpus = get_corpus()
+        part = corpus.part(part_number)
+        if part is None:
+            raise QuranPart.DoesNotExist
+        surahs_in_part = corpus.part_surahs(part_number)
 
         # Get user reading settings if user is authenticated
         reading_settings = None
@@ -127,8 +118,8 @@ def get_part_detail(part_number, user=None):
             reading_settings, _ = QuranReadingSettings.objects.get_or_create(user=user)
 
         # Get previous and next parts
-        previous_part = QuranPart.objects.filter(part_number__lt=part_number).order_by('-part_number').first()
-        next_part = QuranPart.objects.filter(part_number__gt=part_number).order_by('part_number').first()
+        previous_part = corpus.part(part_number - 1)
+        next_part = corpus.part(part_number + 1)
 
         return {
             'part': part,
@@ -158,8 +149,8 @@ def get_reciter_detail(reciter_id):
         # Get the reciter
         reciter = QuranReciter.objects.get(id=reciter_id)
 
-        # Get all surahs recited by this reciter
-        reciter_surahs = ReciterSurah.objects.filter(reciter=reciter).select_related('surah').order_by('surah__surah_number')
+        # Get the indexed audio files of this reciter
+        reciter_surahs = ReciterSurah.objects.filter(reciter=reciter).order_by('surah_number')
 
         return {
             'reciter': reciter,
@@ -231,40 +222,13 @@ def search_quran(search_text=None, search_type='both', surah=None, juz=None, pag
         dict: Search results and pagination information
     """
     try:
-        results = []
-
-        if search_text:
-            # Build query
-            query = Q()
-            if search_type in ['text', 'both']:
-                query |= Q(text_uthmani__icontains=search_text)
-            if search_type in ['translation', 'both']:
-                query |= Q(translation__icontains=search_text)
-
-            # Filter ayahs
-            ayahs = Ayah.objects.filter(query)
-
-            # Apply additional filters
-            if surah:
-                ayahs = ayahs.filter(surah__surah_number=surah)
-            if juz:
-                ayahs = ayahs.filter(quran_part__part_number=juz)
-
-            # Order results
-            ayahs = ayahs.order_by('surah__surah_number', 'ayah_number_in_surah')
-
-            # Paginate results
-            paginator = Paginator(ayahs, per_page)
-            results = paginator.get_page(page)
-
-        return {
-            'results': results,
-            'search_performed': bool(search_text)
-        }
+        if not search_text:
+            return {'results': [], 'search_performed': False}
+        return search_ayahs(search_text, search_type=search_type, surah=surah, juz=juz, page=page, per_page=per_page)
     except Exception as e:
         logger.error(f"Error searching Quran for '{search_text}': {str(e)}")
         return {
             'results': [],
             'search_performed': bool(search_text),
             'error': str(e)
-        }
\ No newline at end of file
+        }
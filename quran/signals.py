@@ -1,3 +1,19 @@
 """Signal handlers for quran app."""
-from django.db.models.signals import post_save, pre_save
-from django.dispatch import receiver
\ No newline at end of file
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .corpus import bump_corpus_version
+from .models import Ayah, QuranPart, Surah
+
+
+@receiver(post_save, sender=Ayah)
+@receiver(post_save, sender=Surah)
+@receiver(post_save, sender=QuranPart)
+@receiver(post_delete, sender=Ayah)
+@receiver(post_delete, sender=Surah)
+@receiver(post_delete, sender=QuranPart)
+def invalidate_quran_corpus(sender, **kwargs):
+    """Make every process reload the in-memory corpus once the edit of the Quran text is committed"""
+    # Bumping before commit would let another process cache the old rows under the new stamp
+    transaction.on_commit(bump_corpus_version)
@@ -0,0 +1,164 @@
+"""Conditional and partial responses for the reciter audio files.
+
+``serve_file`` answers ``Range`` requests with ``206 Partial Content`` so
+players can seek without downloading a whole surah, sends a strong ETag and
+answers ``If-None-Match``/``If-Range`` so cached copies are revalidated with a
+``304``, and can hand the transfer to the front-end web server:
+
+- ``RECITER_AUDIO_OFFLOAD = 'x-accel-redirect'`` returns an empty response
+  with ``X-Accel-Redirect: <RECITER_AUDIO_ACCEL_PREFIX><relative path>`` for
+  an nginx ``internal`` location, which then serves ranges itself.
+- ``RECITER_AUDIO_OFFLOAD = 'x-sendfile'`` returns ``X-Sendfile: <path>`` for
+  Apache mod_xsendfile or lighttpd.
+- Otherwise full files are returned as a FileResponse (sent with
+  ``sendfile(2)`` by servers providing ``wsgi.file_wrapper``) and ranges are
+  streamed from a bounded file reader.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+BLOCK_SIZE = 64 * 1024
+
+
+class FileRange:
+    """Read-only file object limited to ``length`` bytes starting at ``start``."""
+
+    def __init__(self, path, start, length):
+        self.file = open(path, 'rb')
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def make_etag(stat):
+    """Return a strong ETag derived from a file's size and modification time."""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    Parse a single-range ``Range`` header.
+
+    Args:
+        header: The header value, e.g. ``bytes=0-1023``, ``bytes=1024-`` or ``bytes=-500``
+        size: The file size
+
+    Returns:
+        tuple or None: (start, end) inclusive, or None when the header is
+            absent, malformed or asks for several ranges (served in full)
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError('Empty suffix range')
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def _etag_matches(header, etag):
+    """Return whether an If-None-Match header matches the ETag (weak comparison, as RFC 9110 requires)."""
+    if header.strip() == '*':
+        return True
+    return any(candidate.strip().removeprefix('W/') == etag for candidate in header.split(','))
+
+
+def serve_file(request, path, relative_path, content_type='application/octet-stream'):
+    """
+    Serve a file with Range, ETag and offload support.
+
+    Args:
+        request: The HttpRequest (GET or HEAD)
+        path: Absolute path of the file
+        relative_path: Path of the file below the offload prefix (for X-Accel-Redirect)
+        content_type: Content type of the file
+
+    Returns:
+        HttpResponse: 200, 206, 304 or 416 response
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = make_etag(stat)
+    max_age = getattr(settings, 'RECITER_AUDIO_MAX_AGE', DEFAULT_MAX_AGE)
+    validators = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': f'public, max-age={max_age}',
+        'Accept-Ranges': 'bytes',
+    }
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and _etag_matches(if_none_match, etag):
+        response = HttpResponseNotModified()
+        for header, value in validators.items():
+            response[header] = value
+        return response
+
+    offload = getattr(settings, 'RECITER_AUDIO_OFFLOAD', '')
+    if offload in ('x-accel-redirect', 'x-sendfile'):
+        response = HttpResponse(content_type=content_type)
+        if offload == 'x-accel-redirect':
+            prefix = getattr(settings, 'RECITER_AUDIO_ACCEL_PREFIX', '/protected/reciters/')
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + relative_path.lstrip('/')
+        else:
+            response['X-Sendfile'] = path
+        for header, value in validators.items():
+            response[header] = value
+        return response
+
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if not if_range or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            response['Accept-Ranges'] = 'bytes'
+            return response
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1 if size else 0
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+    elif byte_range:
+        response = FileResponse(FileRange(path, start, length), content_type=content_type)
+    else:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    response.block_size = BLOCK_SIZE
+    response['Content-Length'] = length
+    if byte_range:
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    for header, value in validators.items():
+        response[header] = value
+    return response
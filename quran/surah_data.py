@@ -1,19 +1,7 @@
-import os
-import django
-import logging
+"""Metadata of the 114 surahs used to seed the Surah table."""
 
-# Set up Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'khatma.settings')
-django.setup()
-
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-
-from quran.models import Surah
-
-# Complete list of all 114 surahs with their details
-# Format: (surah_number, name_arabic, name_english, revelation_type, verses_count, revelation_order)
-ALL_SURAHS = [
+# (surah_number, name_arabic, name_english, revelation_type, verses_count, revelation_order)
+SURAHS = (
     (1, 'الفاتحة', 'The Opening', 'meccan', 7, 5),
     (2, 'البقرة', 'The Cow', 'medinan', 286, 87),
     (3, 'آل عمران', 'The Family of Imran', 'medinan', 200, 89),
@@ -128,55 +116,4 @@ ALL_SURAHS = [
     (112, 'الإخلاص', 'The Sincerity', 'meccan', 4, 22),
     (113, 'الفلق', 'The Daybreak', 'meccan', 5, 20),
     (114, 'الناس', 'Mankind', 'meccan', 6, 21),
-]
-
-def populate_surahs():
-    print("Populating all 114 Surahs...")
-    
-    # Count existing surahs
-    existing_count = Surah.objects.count()
-    print(f"Found {existing_count} existing Surahs in the database")
-    
-    # Create or update each surah
-    created_count = 0
-    updated_count = 0
-    
-    for surah_data in ALL_SURAHS:
-        surah_number, name_arabic, name_english, revelation_type, verses_count, revelation_order = surah_data
-        
-        try:
-            # Try to get existing surah
-            surah = Surah.objects.get(surah_number=surah_number)
-            
-            # Update fields
-            surah.name_arabic = name_arabic
-            surah.name_english = name_english
-            surah.revelation_type = revelation_type
-            surah.verses_count = verses_count
-            surah.revelation_order = revelation_order
-            surah.save()
-            
-            print(f"Updated Surah {surah_number}: {name_arabic}")
-            updated_count += 1
-            
-        except Surah.DoesNotExist:
-            # Create new surah
-            surah = Surah.objects.create(
-                surah_number=surah_number,
-                name_arabic=name_arabic,
-                name_english=name_english,
-                revelation_type=revelation_type,
-                verses_count=verses_count,
-                revelation_order=revelation_order
-            )
-            
-            print(f"Created Surah {surah_number}: {name_arabic}")
-            created_count += 1
-    
-    print(f"Population complete! Created {created_count} new Surahs, updated {updated_count} existing Surahs.")
-    print(f"Total Surahs in database: {Surah.objects.count()}")
-
-if __name__ == '__main__':
-    print("Starting Surah population script...")
-    populate_surahs()
-    print("Script completed successfully!")
+)
@@ -1,2 +1,536 @@
 """Service tests for quran app."""
-from django.test import TestCase
\ No newline at end of file
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from quran import corpus as corpus_module
+from quran.audio import read_levels, read_mp3_info
+from quran.boundaries import JUZ_STARTS, PAGE_STARTS, RUB_STARTS, BoundaryCursor, ayah_counts, hizb_for, juz_for, juz_range, page_for, unit_range
+from quran.catalog import get_reciter_surahs, refresh_catalog
+from quran.corpus import bump_corpus_version, get_corpus
+from quran.importer import import_quran_text
+from quran.loader import PipeTextSource, get_source, load_quran
+from quran.models import Ayah, AyahTiming, QuranLoadRun, QuranPart, QuranReciter, QuranTranslation, ReciterSurah, Surah
+from quran.search import ensure_search_index, fts_table_exists, highlight, normalize_arabic, search_ayahs
+from quran.timing import build_juz_playlist, build_playlist, detect_timings, find_pauses, import_timing_file
+
+
+class ArabicNormalizationTest(TestCase):
+    """Tests for the search text normalization helpers."""
+
+    def test_strips_tashkeel_tatweel_and_folds_alef(self):
+        self.assertEqual(normalize_arabic('الرَّحْمَـٰنِ'), 'الرحمن')
+        self.assertEqual(normalize_arabic('إِنَّا أَعْطَيْنَاكَ'), 'انا اعطيناك')
+        self.assertEqual(normalize_arabic('ٱلْهُدَىٰ'), 'الهدي')
+
+    def test_highlight_keeps_diacritics(self):
+        self.assertEqual(
+            str(highlight('بِسْمِ اللَّهِ الرَّحْمَـٰنِ الرَّحِيمِ', 'الرحمن')),
+            'بِسْمِ اللَّهِ <mark>الرَّحْمَـٰنِ</mark> الرَّحِيمِ',
+        )
+
+    def test_highlight_escapes_html(self):
+        self.assertEqual(str(highlight('<b>mercy</b>', 'mercy')), '&lt;b&gt;<mark>mercy</mark>&lt;/b&gt;')
+
+
+@override_settings(QURAN_CORPUS_VERSION_FILE=os.path.join(tempfile.gettempdir(), 'quran_search_test_version'))
+class QuranSearchTest(TestCase):
+    """Tests for the indexed Quran search."""
+
+    def setUp(self):
+        ensure_search_index()
+        part = QuranPart.objects.create(part_number=1)
+        fatiha = Surah.objects.create(surah_number=1, name_arabic='الفاتحة', name_english='Al-Fatiha', revelation_type='meccan', verses_count=7)
+        baqara = Surah.objects.create(surah_number=2, name_arabic='البقرة', name_english='Al-Baqara', revelation_type='medinan', verses_count=286)
+        Ayah.objects.create(surah=fatiha, ayah_number_in_surah=1, quran_part=part, text_uthmani='بِسْمِ اللَّهِ الرَّحْمَـٰنِ الرَّحِيمِ', translation='In the name of Allah, the Most Gracious, the Most Merciful')
+        Ayah.objects.create(surah=fatiha, ayah_number_in_surah=3, quran_part=part, text_uthmani='الرَّحْمَـٰنِ الرَّحِيمِ', translation='The Most Gracious, the Most Merciful')
+        Ayah.objects.create(surah=baqara, ayah_number_in_surah=2, quran_part=part, text_uthmani='ذَٰلِكَ الْكِتَابُ لَا رَيْبَ ۛ فِيهِ ۛ هُدًى لِّلْمُتَّقِينَ', translation='This is the Book about which there is no doubt')
+
+    def test_sqlite_fts_index_is_used(self):
+        self.assertTrue(fts_table_exists())
+
+    def test_search_without_diacritics_matches_vocalised_text(self):
+        result = search_ayahs('الرحمن')
+        self.assertEqual(result['total'], 2)
+        snippets = [str(ayah.snippet) for ayah in result['results']]
+        self.assertTrue(all('<mark>الرَّحْمَـٰنِ</mark>' in snippet for snippet in snippets))
+
+    def test_ranking_prefers_shorter_match(self):
+        result = search_ayahs('الرحمن الرحيم')
+        self.assertEqual([ayah.ayah_number_in_surah for ayah in result['results']], [3, 1])
+
+    def test_filters_and_translation_search(self):
+        self.assertEqual(search_ayahs('الرحمن', surah=2)['total'], 0)
+        result = search_ayahs('merciful', search_type='translation')
+        self.assertEqual(result['total'], 2)
+        self.assertIn('<mark>Merciful</mark>', str(result['results'][0].translation_snippet))
+
+    def test_short_queries_fall_back_to_substring_scan(self):
+        self.assertEqual(search_ayahs('هد')['total'], 1)
+
+    def test_index_follows_updates_and_rebuild(self):
+        ayah = Ayah.objects.get(surah__surah_number=2)
+        ayah.text_uthmani = 'الم'
+        ayah.save()
+        self.assertEqual(search_ayahs('للمتقين')['total'], 0)
+        Ayah.objects.filter(pk=ayah.pk).update(text_normalized='')
+        out = StringIO()
+        call_command('rebuild_quran_search_index', stdout=out)
+        self.assertIn('1 ayahs renormalized', out.getvalue())
+        self.assertEqual(Ayah.objects.get(pk=ayah.pk).text_normalized, 'الم')
+
+    def test_search_view(self):
+        response = self.client.get('/quran/search/', {'search_text': 'الرحمن', 'search_type': 'text'})
+        self.assertContains(response, '<mark>الرَّحْمَـٰنِ</mark>', html=False)
+
+
+class QuranCorpusTest(TestCase):
+    """Tests for the in-process Quran corpus cache."""
+
+    def setUp(self):
+        stamp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(stamp_dir.cleanup)
+        settings_override = override_settings(QURAN_CORPUS_VERSION_FILE=os.path.join(stamp_dir.name, 'version'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        corpus_module._corpus = None
+
+        part_1 = QuranPart.objects.create(part_number=1)
+        part_2 = QuranPart.objects.create(part_number=2)
+        fatiha = Surah.objects.create(surah_number=1, name_arabic='الفاتحة', name_english='Al-Fatiha', revelation_type='meccan', verses_count=7)
+        baqara = Surah.objects.create(surah_number=2, name_arabic='البقرة', name_english='Al-Baqara', revelation_type='medinan', verses_count=286)
+        for number in range(1, 8):
+            Ayah.objects.create(surah=fatiha, ayah_number_in_surah=number, quran_part=part_1, text_uthmani=f'fatiha {number}', page=1)
+        Ayah.objects.create(surah=baqara, ayah_number_in_surah=1, quran_part=part_1, text_uthmani='الم', page=2)
+        Ayah.objects.create(surah=baqara, ayah_number_in_surah=142, quran_part=part_2, text_uthmani='سَيَقُولُ', page=22)
+
+    def test_lookups_are_served_from_memory(self):
+        get_corpus()
+        with self.assertNumQueries(0):
+            corpus = get_corpus()
+            self.assertEqual(corpus.surah(2).name_arabic, 'البقرة')
+            self.assertEqual([ayah.ayah_number_in_surah for ayah in corpus.surah_ayahs(1)], list(range(1, 8)))
+            self.assertEqual(corpus.ayah(2, 142).text_uthmani, 'سَيَقُولُ')
+            self.assertEqual(len(corpus.page_ayahs(1)), 7)
+            grouped = corpus.part_surahs(1)
+            self.assertEqual([item['surah'].surah_number for item in grouped.values()], [1, 2])
+            self.assertEqual(corpus.part_ayahs(2)[0].surah.name_english, 'Al-Baqara')
+            self.assertEqual(corpus.next_surah(1).surah_number, 2)
+            self.assertIsNone(corpus.previous_surah(1))
+            self.assertIsNone(corpus.part(3))
+
+    def test_unit_ayahs_are_sliced_by_boundaries(self):
+        corpus = get_corpus()
+        with self.assertNumQueries(0):
+            self.assertEqual([(a.surah.surah_number, a.ayah_number_in_surah) for a in corpus.unit_ayahs('rub', 1)], [(1, n) for n in range(1, 8)] + [(2, 1)])
+            self.assertEqual([a.ayah_number_in_surah for a in corpus.unit_ayahs('hizb', 3)], [142])
+            self.assertEqual(corpus.unit_ayahs('rub', 2), ())
+            self.assertEqual(list(corpus.unit_surahs('juz', 2)), [corpus.surah(2).id])
+
+    def test_version_bump_reloads(self):
+        corpus = get_corpus()
+        Ayah.objects.filter(surah__surah_number=2, ayah_number_in_surah=1).update(text_uthmani='الٓمٓ')
+        self.assertIs(get_corpus(), corpus)
+        bump_corpus_version()
+        reloaded = get_corpus()
+        self.assertIsNot(reloaded, corpus)
+        self.assertEqual(reloaded.ayah(2, 1).text_uthmani, 'الٓمٓ')
+
+    def test_saving_quran_text_invalidates_corpus(self):
+        corpus = get_corpus()
+        ayah = Ayah.objects.get(surah__surah_number=1, ayah_number_in_surah=1)
+        ayah.text_uthmani = 'edited'
+        with self.captureOnCommitCallbacks(execute=True):
+            ayah.save()
+            self.assertIs(get_corpus(), corpus)
+        self.assertNotEqual(get_corpus().version, corpus.version)
+        self.assertEqual(get_corpus().ayah(1, 1).text_uthmani, 'edited')
+
+    def test_surah_detail_view_uses_corpus(self):
+        response = self.client.get('/quran/surah/1/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'fatiha 7')
+
+
+class QuranBoundaryTest(TestCase):
+    """Tests for the juz, hizb and page boundary tables."""
+
+    def test_boundary_lookups(self):
+        self.assertEqual(len(PAGE_STARTS), 604)
+        self.assertEqual((juz_for(3, 92), juz_for(3, 93)), (3, 4))
+        self.assertEqual((page_for(1, 7), page_for(2, 1), page_for(2, 142), page_for(114, 6)), (1, 2, 22, 604))
+        self.assertEqual((hizb_for(2, 74), hizb_for(2, 75), hizb_for(114, 1)), (1, 2, 60))
+        self.assertEqual(juz_range(30), ((78, 1), None))
+        self.assertEqual(juz_range(1), ((1, 1), (2, 142)))
+        self.assertEqual((unit_range('hizb', 2), unit_range('rub', 240)), (((2, 75), (2, 142)), ((100, 9), None)))
+        self.assertRaises(ValueError, unit_range, 'rub', 241)
+        self.assertEqual((sum(ayah_counts(JUZ_STARTS)), len(ayah_counts(RUB_STARTS))), (6236, 240))
+        self.assertEqual(ayah_counts(JUZ_STARTS)[29], 564)
+
+    def test_cursor_matches_lookups_out_of_order(self):
+        cursor = BoundaryCursor()
+        for surah_number, ayah_number in [(1, 1), (2, 141), (2, 142), (18, 75), (2, 253), (114, 6)]:
+            self.assertEqual(
+                cursor.advance(surah_number, ayah_number),
+                (juz_for(surah_number, ayah_number), hizb_for(surah_number, ayah_number), page_for(surah_number, ayah_number)))
+
+
+@override_settings(QURAN_CORPUS_VERSION_FILE=os.path.join(tempfile.gettempdir(), 'quran_importer_test_version'))
+class QuranImporterTest(TestCase):
+    """Tests for the streaming Quran text importer."""
+
+    def setUp(self):
+        Surah.objects.bulk_create([
+            Surah(surah_number=number, name_arabic=f'سورة {number}', name_english=f'Surah {number}', revelation_type='meccan', verses_count=0)
+            for number in range(1, 115)
+        ])
+        self.text_file = tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8', delete=False)
+        self.addCleanup(os.remove, self.text_file.name)
+        self.text_file.write('1|1|بِسْمِ اللَّهِ\n2|141|تِلْكَ أُمَّةٌ\n2|142|سَيَقُولُ السُّفَهَاءُ\n3|92|لَن تَنَالُوا الْبِرَّ\n3|93|كُلُّ الطَّعَامِ\n114|6|مِنَ الْجِنَّةِ وَالنَّاسِ\n# comment\n')
+        self.text_file.close()
+
+    def test_import_assigns_parts_and_pages_in_batches(self):
+        with self.assertNumQueries(7):
+            result = import_quran_text(self.text_file.name, batch_size=2)
+        self.assertEqual(result['imported'], 6)
+        rows = dict(((surah, ayah), (part, page)) for surah, ayah, part, page in Ayah.objects.values_list(
+            'surah__surah_number', 'ayah_number_in_surah', 'quran_part_id', 'page'))
+        self.assertEqual(rows[(2, 141)], (1, 21))
+        self.assertEqual(rows[(2, 142)], (2, 22))
+        self.assertEqual(rows[(3, 92)], (3, 62))
+        self.assertEqual(rows[(3, 93)], (4, 62))
+        self.assertEqual(rows[(114, 6)], (30, 604))
+        self.assertEqual(QuranPart.objects.count(), 30)
+        self.assertEqual(Ayah.objects.get(surah__surah_number=1, ayah_number_in_surah=1).text_normalized, 'بسم الله')
+
+    def test_reimport_updates_rows_in_place(self):
+        import_quran_text(self.text_file.name)
+        ayah = Ayah.objects.get(surah__surah_number=2, ayah_number_in_surah=142)
+        Ayah.objects.filter(pk=ayah.pk).update(quran_part_id=1, page=3)
+        result = import_quran_text(self.text_file.name, parts=[2])
+        self.assertEqual(result['imported'], 1)
+        ayah.refresh_from_db()
+        self.assertEqual((ayah.quran_part_id, ayah.page), (2, 22))
+        self.assertEqual(Ayah.objects.count(), 6)
+
+    def test_missing_surahs_are_reported(self):
+        Surah.objects.filter(surah_number=114).delete()
+        result = import_quran_text(self.text_file.name, surahs=[3, 114])
+        self.assertEqual((result['imported'], result['skipped'], result['missing_surahs']), (2, 1, [114]))
+
+    def test_full_text_import_command(self):
+        out = StringIO()
+        call_command('import_quran_verses', stdout=out)
+        self.assertEqual(Ayah.objects.count(), 6236)
+        self.assertEqual(Ayah.objects.filter(quran_part_id=30).order_by('surah__surah_number', 'ayah_number_in_surah').first().surah.surah_number, 78)
+        self.assertEqual(Ayah.objects.values('page').distinct().count(), 604)
+
+
+class FailingTextSource(PipeTextSource):
+    """Text source that fails on its second chunk, simulating an interrupted deploy."""
+
+    def write(self, records, context):
+        if QuranLoadRun.objects.get(source=self.name).chunks_done == 1:
+            raise RuntimeError('interrupted')
+        return super().write(records, context)
+
+
+@override_settings(QURAN_CORPUS_VERSION_FILE=os.path.join(tempfile.gettempdir(), 'quran_loader_test_version'))
+class QuranLoaderTest(TestCase):
+    """Tests for the resumable quran_load pipeline."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.text_path = self._write('text.txt', '1|1|بِسْمِ اللَّهِ\n1|2|الْحَمْدُ لِلَّهِ\n2|142|سَيَقُولُ\n3|93|كُلُّ الطَّعَامِ\n114|6|وَالنَّاسِ\n')
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as target:
+            target.write(content)
+        return path
+
+    def test_load_then_skip_unchanged_input(self):
+        results = load_quran([get_source('surahs'), get_source('text', self.text_path)], batch_size=2)
+        self.assertEqual([(result['status'], result['rows']) for result in results], [('loaded', 114), ('loaded', 5)])
+        self.assertEqual(Surah.objects.get(surah_number=2).verses_count, 286)
+        self.assertEqual(Ayah.objects.get(surah__surah_number=3, ayah_number_in_surah=93).quran_part_id, 4)
+        with self.assertNumQueries(2):
+            results = load_quran([get_source('surahs'), get_source('text', self.text_path)], batch_size=2)
+        self.assertEqual([result['status'] for result in results], ['unchanged', 'unchanged'])
+
+    def test_interrupted_load_resumes_after_last_chunk(self):
+        load_quran([get_source('surahs')])
+        with self.assertRaises(RuntimeError):
+            load_quran([FailingTextSource(self.text_path)], batch_size=2)
+        self.assertEqual(Ayah.objects.count(), 2)
+
+        result = load_quran([get_source('text', self.text_path)], batch_size=2)[0]
+        self.assertEqual((result['status'], result['rows']), ('resumed', 3))
+        self.assertEqual(Ayah.objects.count(), 5)
+        run = QuranLoadRun.objects.get(source='text')
+        self.assertEqual((run.chunks_done, run.rows_written), (3, 5))
+        self.assertIsNotNone(run.completed_at)
+
+    def test_json_and_translation_sources(self):
+        json_path = self._write('text.json', '{"verses": [{"surah": 1, "ayah": 1, "text": "بِسْمِ"}, {"surah": 1, "ayah": 2, "text": "الْحَمْدُ"}]}')
+        translation_path = self._write('en.txt', '1|1|In the name of God\n1|2|Praise be to God\n9|9|missing verse\n')
+        load_quran([
+            get_source('surahs'),
+            get_source('json', json_path),
+            get_source('translation', translation_path, language='en', translator='test', primary=True),
+        ])
+        self.assertEqual(Ayah.objects.get(surah__surah_number=1, ayah_number_in_surah=2).text_normalized, 'الحمد')
+        self.assertEqual(QuranTranslation.objects.filter(language='en', translator='test').count(), 2)
+        self.assertEqual(Ayah.objects.get(surah__surah_number=1, ayah_number_in_surah=1).translation, 'In the name of God')
+
+    def test_parallel_workers_match_serial_parse(self):
+        load_quran([get_source('surahs')])
+        result = load_quran([get_source('text', self.text_path)], batch_size=2, workers=2)[0]
+        self.assertEqual(result['rows'], 5)
+        self.assertEqual(Ayah.objects.get(surah__surah_number=114, ayah_number_in_surah=6).page, 604)
+
+    def test_command_accepts_dotted_sources_and_rejects_unknown(self):
+        out = StringIO()
+        call_command('quran_load', 'surahs', f'quran.loader.PipeTextSource:{self.text_path}', '--batch-size', '2', stdout=out)
+        self.assertIn('text:', out.getvalue())
+        self.assertEqual(Ayah.objects.count(), 5)
+        with self.assertRaises(CommandError):
+            call_command('quran_load', 'nonexistent', stdout=StringIO())
+
+
+def write_cbr_mp3(path, frames):
+    """Write an ID3-tagged MPEG-1 Layer III file of 128 kbps, 44.1 kHz frames (417 bytes each)."""
+    with open(path, 'wb') as audio:
+        audio.write(b'ID3\x03\x00\x00\x00\x00\x00\x0a' + b'\x00' * 10)
+        audio.write((b'\xff\xfb\x90\x64' + b'\x00' * 413) * frames)
+
+
+class ReciterCatalogTest(TestCase):
+    """Tests for the reciter audio catalog index."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        self.folder = os.path.join(self.root, 'test.reciter')
+        os.makedirs(os.path.join(self.folder, 'audio'))
+        write_cbr_mp3(os.path.join(self.folder, '001.mp3'), 100)
+        write_cbr_mp3(os.path.join(self.folder, '2.mp3'), 200)
+        with open(os.path.join(self.folder, 'notes.txt'), 'w') as notes:
+            notes.write('not audio')
+        with open(os.path.join(self.folder, '115.mp3'), 'wb') as audio:
+            audio.write(b'not a surah')
+
+    def test_read_mp3_info_from_headers(self):
+        info = read_mp3_info(os.path.join(self.folder, '001.mp3'))
+        self.assertEqual((info.bitrate, info.sample_rate, info.audio_offset), (128, 44100, 20))
+        self.assertAlmostEqual(info.duration, 100 * 417 * 8 / 128000, places=2)
+        with self.assertRaises(ValueError):
+            read_mp3_info(os.path.join(self.folder, 'notes.txt'))
+
+    def test_refresh_indexes_new_and_changed_files_only(self):
+        stats = refresh_catalog(self.root)['test.reciter']
+        self.assertEqual((stats['added'], stats['errors']), (2, 0))
+        reciter = QuranReciter.objects.get(folder='test.reciter')
+        self.assertIsNotNone(reciter.scanned_at)
+        entry = ReciterSurah.objects.get(reciter=reciter, surah_number=2)
+        self.assertEqual((entry.filename, entry.file_size, entry.bitrate), ('2.mp3', 20 + 200 * 417, 128))
+
+        self.assertEqual(refresh_catalog(self.root)['test.reciter']['unchanged'], 2)
+
+        path = os.path.join(self.folder, '001.mp3')
+        write_cbr_mp3(path, 300)
+        os.utime(path, (1, 1))
+        os.remove(os.path.join(self.folder, '2.mp3'))
+        stats = refresh_catalog(self.root)['test.reciter']
+        self.assertEqual((stats['updated'], stats['removed'], stats['unchanged']), (1, 1, 0))
+        self.assertAlmostEqual(ReciterSurah.objects.get(reciter=reciter, surah_number=1).duration, 300 * 417 * 8 / 128000, places=2)
+
+        surahs = get_reciter_surahs(reciter)
+        self.assertEqual(len(surahs), 114)
+        self.assertEqual([surah['number'] for surah in surahs if surah['has_audio']], [1])
+        self.assertEqual(surahs[0]['path'], '/media/reciters/test.reciter/001.mp3')
+
+    def test_command_scans_folders(self):
+        out = StringIO()
+        call_command('index_reciters', '--path', self.root, stdout=out)
+        self.assertIn('test.reciter: 2 added', out.getvalue())
+        self.assertEqual(ReciterSurah.objects.count(), 2)
+
+
+class ReciterAudioStreamingTest(TestCase):
+    """Tests for serving reciter MP3s with Range and ETag support."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        os.makedirs(os.path.join(directory.name, 'test.reciter'))
+        self.data = bytes(range(256)) * 40
+        with open(os.path.join(directory.name, 'test.reciter', '001.mp3'), 'wb') as audio:
+            audio.write(self.data)
+        settings_override = override_settings(RECITERS_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.url = '/media/reciters/test.reciter/001.mp3'
+
+    def test_full_and_partial_content(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+        self.assertEqual((response['Accept-Ranges'], response['Content-Type']), ('bytes', 'audio/mpeg'))
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.data)}')
+        self.assertEqual(b''.join(response.streaming_content), self.data[100:200])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), self.data[-10:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.data)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.data)}')
+
+    def test_etag_revalidation_and_if_range(self):
+        etag = self.client.head(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+
+    @override_settings(RECITER_AUDIO_OFFLOAD='x-accel-redirect', RECITER_AUDIO_ACCEL_PREFIX='/internal/reciters/')
+    def test_offload_to_web_server(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/internal/reciters/test.reciter/001.mp3')
+        self.assertEqual(response.content, b'')
+
+    def test_rejects_unknown_files(self):
+        self.assertEqual(self.client.get('/media/reciters/test.reciter/notes.txt').status_code, 404)
+        self.assertEqual(self.client.get('/media/reciters/test.reciter/002.mp3').status_code, 404)
+        self.assertEqual(self.client.get('/media/reciters/../001.mp3').status_code, 404)
+
+
+class AyahTimingTest(TestCase):
+    """Tests for the ayah timing index and the part playlists."""
+
+    # al-Fatiha by a bundled reciter: a 64 kbps recording with background noise and stops inside ayahs
+    RECITATION = os.path.join(settings.BASE_DIR, 'reciters', 'alzain.mohamed.ahmed', '001.mp3')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        folder = os.path.join(directory.name, 'test.reciter')
+        os.makedirs(folder)
+        shutil.copy(self.RECITATION, os.path.join(folder, '001.mp3'))
+        write_cbr_mp3(os.path.join(folder, '108.mp3'), 100)
+        write_cbr_mp3(os.path.join(folder, '107.mp3'), 100)
+        self.folder = folder
+        settings_override = override_settings(RECITERS_DIR=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        refresh_catalog()
+        self.reciter = QuranReciter.objects.get(folder='test.reciter')
+
+    def load_fatiha_text(self):
+        part = QuranPart.objects.create(part_number=1)
+        fatiha = Surah.objects.create(surah_number=1, name_arabic='الفاتحة', name_english='Al-Fatiha', revelation_type='meccan', verses_count=7)
+        with open(os.path.join(settings.BASE_DIR, 'quran-text.txt'), encoding='utf-8') as text:
+            for line in text:
+                surah, ayah, verse = line.rstrip('\n').split('|')
+                if surah != '1':
+                    break
+                Ayah.objects.create(surah=fatiha, ayah_number_in_surah=int(ayah), quran_part=part, text_uthmani=verse)
+
+    def test_levels_measure_loudness(self):
+        audio = read_levels(self.RECITATION)
+        self.assertAlmostEqual(len(audio.levels) * audio.window_duration, read_mp3_info(self.RECITATION).duration, delta=0.5)
+        # Digital silence before the recitation, then the voice well above the background noise
+        self.assertEqual(audio.levels[0], 0)
+        self.assertGreater(max(audio.levels), 70)
+        self.assertEqual(len(find_pauses([0] * 10 + [60] * 50 + [40] * 10 + [60] * 50, 0.02)), 2)
+
+    def test_detects_ayahs_of_a_real_recitation(self):
+        self.load_fatiha_text()
+        stats = detect_timings(self.reciter)
+        # The silent test files fail; al-Fatiha is split at its pauses
+        self.assertEqual((stats['detected'], stats['failed']), (1, 2))
+        timings = {timing.ayah_number: (timing.start_ms, timing.end_ms)
+                   for timing in AyahTiming.objects.filter(recording__surah_number=1)}
+        self.assertEqual(sorted(timings), [1, 2, 3, 4, 5, 6, 7])
+        # Ayahs 2 to 7 start after the pauses heard at 7.9, 12.2, 15.6, 19.4, 24.5 and 28.9 seconds;
+        # the stops inside ayahs 5 to 7 are not boundaries
+        for ayah, start_ms in zip(range(2, 8), (7860, 12200, 15620, 19360, 24500, 28920)):
+            self.assertAlmostEqual(timings[ayah][0], start_ms, delta=200)
+        self.assertAlmostEqual(timings[7][1], 41760, delta=200)
+        self.assertEqual(detect_timings(self.reciter, surahs=[1])['skipped'], 1)
+        self.assertTrue(build_playlist(self.reciter, (1, 2), (1, 4))['complete'])
+
+        # A replaced recording loses its timings
+        path = os.path.join(self.folder, '001.mp3')
+        write_cbr_mp3(path, 50)
+        os.utime(path, (1, 1))
+        refresh_catalog()
+        self.assertFalse(AyahTiming.objects.exists())
+        self.assertEqual(ReciterSurah.objects.get(surah_number=1).timings_source, '')
+
+    def test_import_csv_and_quran_com_json(self):
+        csv_path = os.path.join(self.folder, 'timings.csv')
+        with open(csv_path, 'w') as timings:
+            timings.write('surah,ayah,start_ms,end_ms\n108,1,500,2000\n108,2,2100,4000\n108,3,4100,6000\n2,1,0,900\n')
+        self.assertEqual(import_timing_file(self.reciter, csv_path), {'surahs': 1, 'ayahs': 3, 'missing': 1})
+        self.assertEqual(ReciterSurah.objects.get(surah_number=108).timings_source, 'file')
+        # Imported timings are kept by detection
+        self.assertEqual(detect_timings(self.reciter, surahs=[108])['skipped'], 1)
+
+        json_path = os.path.join(self.folder, 'timings.json')
+        with open(json_path, 'w') as timings:
+            json.dump({'audio_files': [{'chapter_id': 108, 'verse_timings': [
+                {'verse_key': '108:1', 'timestamp_from': 0, 'timestamp_to': 1500},
+                {'verse_key': '108:2', 'timestamp_from': 1500, 'timestamp_to': 3000},
+            ]}]}, timings)
+        out = StringIO()
+        call_command('index_ayah_timings', 'test.reciter', '--import', json_path, stdout=out)
+        self.assertIn('Imported 2 ayah timings for 1 surahs', out.getvalue())
+        self.assertEqual(AyahTiming.objects.get(ayah_number=2).end_ms, 3000)
+
+        with open(csv_path, 'w') as timings:
+            timings.write('108,9,0,100\n')
+        with self.assertRaises(ValueError):
+            import_timing_file(self.reciter, csv_path)
+
+    def test_playlist_cuts_inside_surahs_with_timings(self):
+        csv_path = os.path.join(self.folder, 'timings.csv')
+        with open(csv_path, 'w') as timings:
+            timings.write('108,0,200,1000\n108,1,1200,2500\n108,2,2700,3800\n108,3,4000,5000\n')
+        import_timing_file(self.reciter, csv_path)
+        playlist = build_playlist(self.reciter, (107, 4), (108, 2))
+        first, second = playlist['segments']
+        # 107 has no timings: the whole file is listed
+        self.assertEqual((first['from_ayah'], first['to_ayah'], first['exact'], first['start_ms']), (4, 7, False, 0))
+        self.assertEqual(first['end_ms'], round(ReciterSurah.objects.get(surah_number=107).duration * 1000))
+        self.assertEqual(second['url'], '/media/reciters/test.reciter/108.mp3')
+        self.assertEqual((second['start_ms'], second['end_ms'], second['exact']), (0, 3800, True))
+        self.assertFalse(playlist['complete'])
+
+        juz = build_juz_playlist(self.reciter, 30)
+        self.assertEqual((juz['from'], juz['to'], len(juz['segments'])), ('78:1', '114:6', 37))
+        self.assertEqual(sum(1 for segment in juz['segments'] if segment['url']), 2)
+        self.assertEqual(build_juz_playlist(self.reciter, 2)['to'], '2:252')
+
+    def test_playlist_api(self):
+        response = self.client.get('/quran/api/reciters/test.reciter/playlist/', {'from': '108:1', 'to': '108:3'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['segments'][0]['to_ayah'], 3)
+        self.assertTrue(response.json()['complete'])
+        self.assertEqual(self.client.get('/quran/api/reciters/test.reciter/playlist/', {'juz': 31}).status_code, 400)
+        self.assertEqual(self.client.get('/quran/api/reciters/unknown/playlist/', {'juz': 1}).status_code, 404)
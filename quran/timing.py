@@ -0,0 +1,448 @@
+"""Ayah timing index of the reciter surah files and the playlists built on it.
+
+Every ``ReciterSurah`` can carry one ``AyahTiming`` row per ayah, in
+milliseconds from the start of the file. Timings come from two sources:
+
+- ``detect_timings`` finds the pauses between ayahs in the MP3 itself. The
+  file is decoded and measured in 20 ms windows (``quran.audio.read_levels``);
+  windows well below the recitation's median level, relative to its
+  background noise, are quiet. Reciters also pause inside long ayahs, so the
+  boundaries are the quiet runs that best split the recording into ayahs of
+  the lengths their texts predict (``split_at_pauses``).
+- ``import_timing_file`` loads published timings, either as CSV rows of
+  ``surah,ayah,start_ms,end_ms`` or as JSON (a list of objects with those keys,
+  or the ``audio_files``/``verse_timings`` layout of the quran.com API).
+  Imported timings are never overwritten by detection unless forced.
+
+``build_playlist`` turns an ayah range into the list of file segments that
+cover it, so a client can play exactly a juz or a khatma part by seeking
+inside the surah files (served with Range support) instead of downloading
+whole surahs.
+"""
+import csv
+import json
+import logging
+import math
+import os
+
+from django.conf import settings
+from django.db import transaction
+
+from .audio import read_levels
+from .boundaries import unit_range
+from .catalog import TOTAL_SURAHS, get_reciters_dir
+from .models import Ayah, AyahTiming, ReciterSurah
+from .surah_data import SURAHS
+
+logger = logging.getLogger(__name__)
+
+VERSE_COUNTS = {number: verses_count for number, _, _, _, verses_count, _ in SURAHS}
+# Surahs whose recitation does not open with a separate basmala (it is ayah 1 of al-Fatiha)
+NO_BASMALA_SURAHS = (1, 9)
+
+# The opening basmala as stored in Ayah.text_normalized
+BASMALA = 'بسم الله الرحمن الرحيم'
+
+# Level (dB) under which this fraction of a recording's windows lie: its background noise
+NOISE_FLOOR_PERCENTILE = 0.15
+# A window is quiet below this fraction of the way from the background noise to the median level
+SILENCE_RATIO = 0.5
+# Levels are averaged with this many windows on each side, so a single quiet syllable is no pause
+SMOOTHING_WINDOWS = 2
+# Shorter quiet runs are not taken as pauses
+MIN_PAUSE_MS = 100
+# An ayah lasts at most this many times its expected length (and at least its inverse)
+MAX_LENGTH_RATIO = 5
+
+
+def parse_verse(value):
+    """
+    Parse a verse reference like ``2:255``.
+
+    Returns:
+        tuple: (surah, ayah)
+
+    Raises:
+        ValueError: If the reference is malformed or outside the Quran
+    """
+    surah, _, ayah = str(value).partition(':')
+    surah, ayah = int(surah), int(ayah)
+    if not 1 <= surah <= TOTAL_SURAHS or not 1 <= ayah <= VERSE_COUNTS[surah]:
+        raise ValueError(f'No verse {value}')
+    return surah, ayah
+
+
+def verse_before(surah, ayah):
+    """Return the verse preceding (surah, ayah) in mushaf order."""
+    if ayah > 1:
+        return surah, ayah - 1
+    return surah - 1, VERSE_COUNTS[surah - 1]
+
+
+def find_pauses(levels, window_duration, ratio=SILENCE_RATIO, min_pause_ms=MIN_PAUSE_MS):
+    """
+    Find the quiet runs of a recording.
+
+    Args:
+        levels: Loudness of each window in dB (see ``read_levels``)
+        window_duration: Seconds per window
+        ratio: Quiet threshold, as a fraction of the way from the background
+            noise to the median level
+        min_pause_ms: Minimum length of a pause
+
+    Returns:
+        list: (start_ms, end_ms) of each pause, in order
+    """
+    smoothed = []
+    for index in range(len(levels)):
+        around = levels[max(index - SMOOTHING_WINDOWS, 0):index + SMOOTHING_WINDOWS + 1]
+        smoothed.append(sum(around) / len(around))
+    # Digital silence (lead-in, trailing padding) would drag the noise floor down
+    audible = sorted(level for level in smoothed if level > 0)
+    if not audible:
+        return [(0, round(len(levels) * window_duration * 1000))] if levels else []
+    floor = audible[int(len(audible) * NOISE_FLOOR_PERCENTILE)]
+    threshold = floor + (audible[len(audible) // 2] - floor) * ratio
+    window_ms = window_duration * 1000
+    pauses = []
+    run_start = None
+    for index, value in enumerate(smoothed + [threshold + 1]):
+        if value <= threshold:
+            if run_start is None:
+                run_start = index
+        elif run_start is not None:
+            if (index - run_start) * window_ms >= min_pause_ms:
+                pauses.append((round(run_start * window_ms), round(index * window_ms)))
+            run_start = None
+    return pauses
+
+
+def ayah_weights(surah, ayahs):
+    """
+    Return the expected relative length of ayahs: their number of letters.
+
+    Args:
+        surah: Surah number
+        ayahs: Ayah numbers (0 for the basmala)
+
+    Returns:
+        list: Weight of each ayah; all equal when the surah's text is not loaded
+    """
+    texts = dict(Ayah.objects.filter(surah__surah_number=surah, ayah_number_in_surah__in=ayahs)
+                 .values_list('ayah_number_in_surah', 'text_normalized'))
+    texts[0] = BASMALA
+    if any(not texts.get(ayah) for ayah in ayahs):
+        return [1] * len(ayahs)
+    if surah not in NO_BASMALA_SURAHS and texts[1].startswith(BASMALA):
+        # The text of ayah 1 may carry the basmala, which is recited (and timed) on its own
+        texts[1] = texts[1][len(BASMALA):]
+    return [max(len(texts[ayah].replace(' ', '')), 1) for ayah in ayahs]
+
+
+def split_at_pauses(pauses, total_ms, weights):
+    """
+    Split a recording into segments at the pauses that best fit their expected lengths.
+
+    Leading and trailing silence is trimmed. Each segment should last its
+    share of the recording by weight; the boundaries are chosen to keep the
+    segments close to their shares while preferring long pauses (a shortest
+    path over the pauses). Each segment ends where its pause starts and the
+    next one begins where the pause ends.
+
+    Args:
+        pauses: (start_ms, end_ms) pauses from ``find_pauses``
+        total_ms: Length of the recording
+        weights: Expected relative length of each segment (see ``ayah_weights``)
+
+    Returns:
+        list: (start_ms, end_ms) of each segment
+
+    Raises:
+        ValueError: If the recording has fewer pauses than boundaries needed,
+            or they cannot keep every segment within MAX_LENGTH_RATIO of its share
+    """
+    start, end = 0, total_ms
+    inner = list(pauses)
+    if inner and inner[0][0] == 0:
+        start = inner.pop(0)[1]
+    if inner and inner[-1][1] >= total_ms:
+        end = inner.pop()[0]
+    segments = len(weights)
+    if len(inner) < segments - 1:
+        raise ValueError(f'Found {len(inner)} pauses, {segments - 1} needed')
+
+    total_weight = sum(weights)
+    expected = [(end - start) * weight / total_weight for weight in weights]
+    # Boundary 0 is the start of the recitation, 1 to n its inner pauses and n + 1 its end
+    last = len(inner) + 1
+    starts = [start] + [pause_end for _, pause_end in inner]
+    ends = [pause_start for pause_start, _ in inner] + [end]
+    gains = [0] + [math.log1p((pause_end - pause_start) / 100) for pause_start, pause_end in inner] + [0]
+    limit = math.log(MAX_LENGTH_RATIO)
+    # steps[i] maps each boundary that can end segment i to (cost, boundary that starts it)
+    steps = [{0: (0, None)}]
+    for index in range(segments):
+        reachable = {}
+        for boundary, (cost, _) in steps[-1].items():
+            for following in ([last] if index == segments - 1 else range(boundary + 1, last)):
+                deviation = math.log((ends[following - 1] - starts[boundary]) / expected[index])
+                if deviation > limit:
+                    break
+                if deviation < -limit:
+                    continue
+                total = cost + deviation ** 2 - gains[following]
+                if following not in reachable or total < reachable[following][0]:
+                    reachable[following] = (total, boundary)
+        steps.append(reachable)
+    if last not in steps[-1]:
+        raise ValueError(f'No split of the {len(inner)} pauses fits {segments} segments')
+
+    boundaries = [last]
+    for reachable in reversed(steps[1:]):
+        boundaries.append(reachable[boundaries[-1]][1])
+    boundaries.reverse()
+    return [(starts[boundaries[index]], ends[boundaries[index + 1] - 1]) for index in range(segments)]
+
+
+def save_timings(recording, timings, source):
+    """
+    Replace the ayah timings of a surah file.
+
+    Args:
+        recording: The ReciterSurah
+        timings: Mapping of ayah number (0 for the basmala) to (start_ms, end_ms)
+        source: 'silence' or 'file'
+    """
+    with transaction.atomic():
+        AyahTiming.objects.filter(recording=recording).delete()
+        AyahTiming.objects.bulk_create(
+            AyahTiming(recording=recording, ayah_number=ayah, start_ms=start, end_ms=end)
+            for ayah, (start, end) in sorted(timings.items())
+        )
+        ReciterSurah.objects.filter(pk=recording.pk).update(timings_source=source)
+    recording.timings_source = source
+
+
+def detect_surah_timings(recording, path, basmala=True):
+    """
+    Detect the ayah timings of one surah file from its pauses and the lengths of its ayahs.
+
+    Args:
+        recording: The ReciterSurah
+        path: Path of its MP3 file
+        basmala: Whether the recitation opens with a basmala before ayah 1
+
+    Returns:
+        dict: Ayah number (0 for the basmala) to (start_ms, end_ms)
+
+    Raises:
+        ValueError: If the file cannot be read or has too few pauses
+    """
+    audio = read_levels(path)
+    total_ms = round(len(audio.levels) * audio.window_duration * 1000)
+    first = 0 if basmala and recording.surah_number not in NO_BASMALA_SURAHS else 1
+    ayahs = range(first, VERSE_COUNTS[recording.surah_number] + 1)
+    weights = ayah_weights(recording.surah_number, ayahs)
+    segments = split_at_pauses(find_pauses(audio.levels, audio.window_duration), total_ms, weights)
+    return dict(zip(ayahs, segments))
+
+
+def detect_timings(reciter, surahs=None, force=False, basmala=True):
+    """
+    Detect the ayah timings of a reciter's indexed surah files.
+
+    Files that already have timings are skipped unless ``force`` is set;
+    imported timings are only replaced when forced.
+
+    Args:
+        reciter: The QuranReciter (with a folder)
+        surahs: Optional collection of surah numbers
+        force: Detect again even if timings exist
+        basmala: Whether the recitations open with a basmala
+
+    Returns:
+        dict: {'detected': int, 'skipped': int, 'failed': int}
+    """
+    recordings = ReciterSurah.objects.filter(reciter=reciter)
+    if surahs:
+        recordings = recordings.filter(surah_number__in=surahs)
+    folder = os.path.join(get_reciters_dir(), reciter.folder)
+    stats = {'detected': 0, 'skipped': 0, 'failed': 0}
+    for recording in recordings:
+        if recording.timings_source and not force:
+            stats['skipped'] += 1
+            continue
+        path = os.path.join(folder, recording.filename)
+        try:
+            timings = detect_surah_timings(recording, path, basmala=basmala)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not detect ayah timings of {path}: {str(e)}")
+            stats['failed'] += 1
+            continue
+        save_timings(recording, timings, 'silence')
+        stats['detected'] += 1
+    return stats
+
+
+def _timing_rows(data):
+    """Yield (surah, ayah, start_ms, end_ms) from a parsed JSON timing file."""
+    if isinstance(data, dict):
+        files = data.get('audio_files') or [data]
+        for audio_file in files:
+            for timing in audio_file.get('verse_timings', []):
+                surah, ayah = parse_verse(timing['verse_key'])
+                yield surah, ayah, timing['timestamp_from'], timing['timestamp_to']
+        return
+    for row in data:
+        yield row['surah'], row['ayah'], row['start_ms'], row['end_ms']
+
+
+def parse_timing_file(path):
+    """
+    Read a CSV or JSON timing file.
+
+    Args:
+        path: Path of the file (``.json`` files are read as JSON, others as CSV)
+
+    Returns:
+        dict: Surah number to {ayah number: (start_ms, end_ms)}
+
+    Raises:
+        ValueError: If a row is malformed
+    """
+    with open(path, encoding='utf-8') as source:
+        if path.endswith('.json'):
+            try:
+                rows = list(_timing_rows(json.load(source)))
+            except (KeyError, TypeError, AttributeError) as e:
+                raise ValueError(f'Unrecognised timing file {path}: {str(e)}')
+        else:
+            # Rows that do not start with a number are headers or comments
+            rows = [row for row in csv.reader(source) if row and row[0].strip().isdigit()]
+
+    timings = {}
+    for row in rows:
+        if len(row) < 4:
+            raise ValueError(f'Malformed timing row {row}')
+        surah, ayah, start, end = (int(value) for value in row[:4])
+        if not 1 <= surah <= TOTAL_SURAHS or not 0 <= ayah <= VERSE_COUNTS[surah] or not 0 <= start <= end:
+            raise ValueError(f'Invalid timing row {row}')
+        timings.setdefault(surah, {})[ayah] = (start, end)
+    return timings
+
+
+def import_timing_file(reciter, path):
+    """
+    Import published ayah timings for a reciter's surah files.
+
+    Args:
+        reciter: The QuranReciter
+        path: Path of a CSV or JSON timing file
+
+    Returns:
+        dict: {'surahs': int, 'ayahs': int, 'missing': int} where 'missing'
+            counts surahs of the file without an indexed recording
+
+    Raises:
+        ValueError: If the file is malformed
+    """
+    timings = parse_timing_file(path)
+    recordings = {recording.surah_number: recording for recording in ReciterSurah.objects.filter(reciter=reciter, surah_number__in=timings)}
+    stats = {'surahs': 0, 'ayahs': 0, 'missing': 0}
+    for surah, ayahs in sorted(timings.items()):
+        recording = recordings.get(surah)
+        if recording is None:
+            stats['missing'] += 1
+            continue
+        save_timings(recording, ayahs, 'file')
+        stats['surahs'] += 1
+        stats['ayahs'] += len(ayahs)
+    return stats
+
+
+def build_playlist(reciter, first, last):
+    """
+    Build the list of file segments covering an ayah range for a reciter.
+
+    A surah covered from its first ayah starts at 0 (with its basmala) and one
+    covered to its last ayah plays to the end of the file; a cut inside a surah
+    uses the ayah timings. Without timings the whole file is listed and the
+    segment is marked as not exact.
+
+    Args:
+        reciter: The QuranReciter (with a folder)
+        first: (surah, ayah) of the first verse
+        last: (surah, ayah) of the last verse, inclusive
+
+    Returns:
+        dict: 'reciter', 'from', 'to', 'segments' (dicts with 'surah',
+            'from_ayah', 'to_ayah', 'url', 'start_ms', 'end_ms', 'exact';
+            url and times are None when the surah has no recording),
+            'duration_ms' and 'complete'
+
+    Raises:
+        ValueError: If the range is empty
+    """
+    if last < first:
+        raise ValueError(f'Empty verse range {first} - {last}')
+    recordings = {
+        recording.surah_number: recording
+        for recording in ReciterSurah.objects.filter(reciter=reciter, surah_number__range=(first[0], last[0]))
+    }
+    # Only the first and last surah can be cut inside
+    edges = {
+        (surah, ayah): (start, end)
+        for surah, ayah, start, end in AyahTiming.objects.filter(
+            recording__reciter=reciter, recording__surah_number__in={first[0], last[0]},
+        ).values_list('recording__surah_number', 'ayah_number', 'start_ms', 'end_ms')
+    }
+
+    segments = []
+    for surah in range(first[0], last[0] + 1):
+        from_ayah = first[1] if surah == first[0] else 1
+        to_ayah = last[1] if surah == last[0] else VERSE_COUNTS[surah]
+        segment = {'surah': surah, 'from_ayah': from_ayah, 'to_ayah': to_ayah, 'url': None, 'start_ms': None, 'end_ms': None, 'exact': False}
+        recording = recordings.get(surah)
+        if recording:
+            file_end = round(recording.duration * 1000) if recording.duration is not None else None
+            start = 0 if from_ayah == 1 else edges.get((surah, from_ayah), (None,))[0]
+            end = file_end if to_ayah == VERSE_COUNTS[surah] else edges.get((surah, to_ayah), (None, None))[1]
+            exact = start is not None and end is not None
+            segment.update({
+                'url': f'{settings.MEDIA_URL}reciters/{reciter.folder}/{recording.filename}',
+                'start_ms': start if exact else 0,
+                'end_ms': end if exact else file_end,
+                'exact': exact,
+            })
+        segments.append(segment)
+
+    return {
+        'reciter': reciter.folder,
+        'from': f'{first[0]}:{first[1]}',
+        'to': f'{last[0]}:{last[1]}',
+        'segments': segments,
+        'duration_ms': sum(segment['end_ms'] - segment['start_ms'] for segment in segments if segment['end_ms'] is not None),
+        'complete': all(segment['exact'] for segment in segments),
+    }
+
+
+def build_juz_playlist(reciter, juz_number):
+    """
+    Build the playlist of one juz (a khatma part).
+
+    Raises:
+        ValueError: If the juz number is out of range
+    """
+    return build_unit_playlist(reciter, 'juz', juz_number)
+
+
+def build_unit_playlist(reciter, division, number):
+    """
+    Build the playlist of one khatma unit (a juz, hizb or rub').
+
+    Raises:
+        ValueError: If the division or unit number is unknown
+    """
+    first, following = unit_range(division, number)
+    last = verse_before(*following) if following else (TOTAL_SURAHS, VERSE_COUNTS[TOTAL_SURAHS])
+    return build_playlist(reciter, first, last)
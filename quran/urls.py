@@ -14,6 +14,7 @@ urlpatterns = [
     path('reciters/', views.reciter_list, name='reciter_list'),
     path('reciters/<int:reciter_id>/', views.reciter_detail, name='reciter_detail'),
     path('reciters/<str:reciter_name>/', views.reciter_surahs, name='reciter_surahs'),
+    path('api/reciters/<str:folder>/playlist/', views.reciter_playlist, name='reciter_playlist'),
     path('search/', views.search_quran, name='search'),
     path('bookmark/<int:surah_number>/<int:ayah_number>/', views.bookmark_ayah, name='bookmark_ayah'),
     path('bookmarks/', views.bookmarks_list, name='bookmarks_list'),
@@ -8,12 +8,16 @@ from django.contrib import messages
 from django.db.models import Q
 from django.utils import timezone
 from django.core.paginator import Paginator
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_safe
 
+from .catalog import get_reciter_surahs, get_reciters_dir, surah_number_for
+from .corpus import get_corpus
+from .streaming import serve_file
+from .timing import build_juz_playlist, build_playlist, parse_verse
 from .models import QuranPart, Surah, Ayah, QuranReciter, QuranRecitation, QuranBookmark, QuranReadingSettings
 from .forms import QuranBookmarkForm, QuranReadingSettingsForm, QuranSearchForm, ReciterFilterForm
 logger = logging.getLogger(__name__)
-SURAH_NAMES = {'001': 'الفاتحة', '002': 'البقرة', '003': 'آل عمران', '004': 'النساء', '005': 'المائدة', '006': 'الأنعام', '007': 'الأعراف', '008': 'الأنفال', '009': 'التوبة', '010': 'يونس', '011': 'هود', '012': 'يوسف', '013': 'الرعد', '014': 'إبراهيم', '015': 'الحجر', '016': 'النحل', '017': 'الإسراء', '018': 'الكهف', '019': 'مريم', '020': 'طه', '021': 'الأنبياء', '022': 'الحج', '023': 'المؤمنون', '024': 'النور', '025': 'الفرقان', '026': 'الشعراء', '027': 'النمل', '028': 'القصص', '029': 'العنكبوت', '030': 'الروم', '031': 'لقمان', '032': 'السجدة', '033': 'الأحزاب', '034': 'سبأ', '035': 'فاطر', '036': 'يس', '037': 'الصافات', '038': 'ص', '039': 'الزمر', '040': 'غافر', '041': 'فصلت', '042': 'الشورى', '043': 'الزخرف', '044': 'الدخان', '045': 'الجاثية', '046': 'الأحقاف', '047': 'محمد', '048': 'الفتح', '049': 'الحجرات', '050': 'ق', '051': 'الذاريات', '052': 'الطور', '053': 'النجم', '054': 'القمر', '055': 'الرحمن', '056': 'الواقعة', '057': 'الحديد', '058': 'المجادلة', '059': 'الحشر', '060': 'الممتحنة', '061': 'الصف', '062': 'الجمعة', '063': 'المنافقون', '064': 'التغابن', '065': 'الطلاق', '066': 'التحريم', '067': 'الملك', '068': 'القلم', '069': 'الحاقة', '070': 'المعارج', '071': 'نوح', '072': 'الجن', '073': 'المزمل', '074': 'المدثر', '075': 'القيامة', '076': 'الإنسان', '077': 'المرسلات', '078': 'النبأ', '079': 'النازعات', '080': 'عبس', '081': 'التكوير', '082': 'الانفطار', '083': 'المطففين', '084': 'الانشقاق', '085': 'البروج', '086': 'الطارق', '087': 'الأعلى', '088': 'الغاشية', '089': 'الفجر', '090': 'البلد', '091': 'الشمس', '092': 'الليل', '093': 'الضحى', '094': 'الشرح', '095': 'التين', '096': 'العلق', '097': 'القدر', '098': 'البينة', '099': 'الزلزلة', '100': 'العاديات', '101': 'القارعة', '102': 'التكاثر', '103': 'العصر', '104': 'الهمزة', '105': 'الفيل', '106': 'قريش', '107': 'الماعون', '108': 'الكوثر', '109': 'الكافرون', '110': 'النصر', '111': 'المسد', '112': 'الإخلاص', '113': 'الفلق', '114': 'الناس'}
 
 def surah_list(request):
     try:
@@ -60,11 +64,12 @@ def surah_list(request):
 def surah_detail(request, surah_number):
     """View for displaying a specific Surah"""
     try:
-        # Get the surah directly
-        surah = get_object_or_404(Surah, surah_number=surah_number)
-
-        # Get all ayahs for the surah
-        ayahs = Ayah.objects.filter(surah=surah).order_by('ayah_number_in_surah')
+        # Read the surah and its ayahs from the in-memory corpus
+        corpus = get_corpus()
+        surah = corpus.surah(surah_number)
+        if surah is None:
+            raise Http404('Surah not found')
+        ayahs = corpus.surah_ayahs(surah_number)
 
         # Get reciters who have recited this surah
         reciters = QuranReciter.objects.all()[:5]  # Just get a few for now
@@ -75,12 +80,12 @@ def surah_detail(request, surah_number):
             reading_settings, _ = QuranReadingSettings.objects.get_or_create(user=request.user)
 
         # Get previous and next surahs
-        previous_surah = Surah.objects.filter(surah_number__lt=surah_number).order_by('-surah_number').first()
-        next_surah = Surah.objects.filter(surah_number__gt=surah_number).order_by('surah_number').first()
+        previous_surah = corpus.previous_surah(surah_number)
+        next_surah = corpus.next_surah(surah_number)
 
         # Add recitations to the context
         recitations = QuranRecitation.objects.filter(
-            surah=surah,
+            surah_id=surah.id,
             start_ayah__isnull=True,
             end_ayah__isnull=True
         )
@@ -187,8 +192,8 @@ def search_quran(request):
         form = QuranSearchForm(request.GET)
 
         if form.is_valid() and 'search_text' in request.GET:
-            # Use the service to search the Quran
-            from .services import search_quran as search_quran_service
+            # Use the normalized full-text index to search the Quran
+            from .search import search_ayahs
 
             # Get search parameters from form
             search_text = form.cleaned_data['search_text']
@@ -197,8 +202,8 @@ def search_quran(request):
             juz = form.cleaned_data['juz']
             page_number = request.GET.get('page', 1)
 
-            # Call the service
-            search_results = search_quran_service(
+            # Call the search index
+            search_results = search_ayahs(
                 search_text=search_text,
                 search_type=search_type,
                 surah=surah,
@@ -210,6 +215,7 @@ def search_quran(request):
             context = {
                 'form': form,
                 'results': search_results['results'],
+                'total': search_results['total'],
                 'search_performed': search_results['search_performed']
             }
         else:
@@ -383,13 +389,7 @@ def list_reciters(request):
     try:
         'View for listing available Quran reciters'
         db_reciters = QuranReciter.objects.all().order_by('name_arabic')
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        reciters_path = os.path.join(current_dir, 'reciters')
-        fs_reciters = []
-        if os.path.exists(reciters_path):
-            for item in os.listdir(reciters_path):
-                if os.path.isdir(os.path.join(reciters_path, item)):
-                    fs_reciters.append(item)
+        fs_reciters = [reciter.folder for reciter in db_reciters if reciter.folder and reciter.scanned_at]
         context = {'db_reciters': db_reciters, 'fs_reciters': fs_reciters}
         return render(request, 'quran/reciters.html', context)
     except Exception as e:
@@ -397,78 +397,42 @@ def list_reciters(request):
         return render(request, 'core/error.html', context={'error': e})
 
 def reciter_surahs(request, reciter_name):
-    """View for displaying surahs available for a specific reciter"""
-    logger.info(f'Attempting to access reciter: {reciter_name}')
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    potential_paths = [os.path.join(base_dir, 'reciters', reciter_name), os.path.join(base_dir, 'core', 'reciters', reciter_name), os.path.join(base_dir, reciter_name)]
-    reciter_path = None
-    for path in potential_paths:
-        logger.info(f'Checking path: {path}')
-        if os.path.exists(path):
-            reciter_path = path
-            break
-    if not reciter_path:
-        reciter_path = potential_paths[0]
-        logger.warning(f'No existing path found. Using: {reciter_path}')
-        try:
-            os.makedirs(reciter_path, exist_ok=True)
-        except Exception as e:
-            logger.error(f'Failed to create reciter directory: {e}')
-    reciters_path = os.path.join(base_dir, 'reciters')
-    available_reciters = []
-    if os.path.exists(reciters_path):
-        for item in os.listdir(reciters_path):
-            if os.path.isdir(os.path.join(reciters_path, item)):
-                available_reciters.append(item)
-    if reciter_name not in available_reciters:
+    """View for displaying surahs available for a specific reciter, served from the reciter catalog index"""
+    reciter = QuranReciter.objects.filter(folder=reciter_name, scanned_at__isnull=False).first()
+    if reciter is None:
+        available_reciters = list(QuranReciter.objects.filter(folder__isnull=False, scanned_at__isnull=False).order_by('folder').values_list('folder', flat=True))
         error_message = f'القارئ {reciter_name} غير موجود'
         return render(request, 'quran/reciter_surahs.html', {'reciter_name': reciter_name, 'surahs': [], 'error': error_message, 'available_reciters': available_reciters})
-    # Get existing MP3 files
-    mp3_files = []
+    surahs = get_reciter_surahs(reciter)
+    for surah in surahs:
+        surah['number'] = str(surah['number']).zfill(3)
+    return render(request, 'quran/reciter_surahs.html', {'reciter_name': reciter_name, 'reciter': reciter, 'surahs': surahs})
+
+@require_safe
+def reciter_audio(request, folder, filename):
+    """Serve a reciter's surah MP3 with Range, ETag and X-Accel-Redirect/X-Sendfile support"""
+    if folder.startswith('.') or os.sep in folder or surah_number_for(filename) is None:
+        raise Http404('Audio file not found')
     try:
-        for file in os.listdir(reciter_path):
-            if file.endswith('.mp3'):
-                mp3_files.append(file)
-    except Exception as e:
-        logger.error(f'Error reading directory {reciter_path}: {e}')
-        # Continue with empty mp3_files list instead of returning an error
-        # This allows us to generate all 114 chapters even if no MP3 files exist
-
-    # Create a dictionary to track which surahs have MP3 files
-    existing_mp3s = {}
-    for mp3 in mp3_files:
-        try:
-            filename_without_ext = mp3.split('.')[0]
-            if filename_without_ext.isdigit():
-                surah_number = int(filename_without_ext)
-                if 1 <= surah_number <= 114:
-                    existing_mp3s[surah_number] = mp3
-        except Exception as e:
-            logger.error(f'Error processing MP3 filename {mp3}: {e}')
-
-    # Generate all 114 chapters
-    surahs = []
-    for surah_num in range(1, 115):  # 1 to 114 inclusive
-        surah_number_str = str(surah_num).zfill(3)
-        surah_name = SURAH_NAMES.get(surah_number_str, f'سورة {surah_num}')
-
-        # Check if we have an MP3 file for this surah
-        if surah_num in existing_mp3s:
-            mp3_filename = existing_mp3s[surah_num]
+        return serve_file(request, os.path.join(get_reciters_dir(), folder, filename), f'{folder}/{filename}', content_type='audio/mpeg')
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404('Audio file not found')
+
+@require_safe
+def reciter_playlist(request, folder):
+    """API view returning the audio segments of a juz (?juz=N) or an ayah range (?from=2:1&to=2:141) for a reciter"""
+    reciter = QuranReciter.objects.filter(folder=folder).first()
+    if reciter is None:
+        return JsonResponse({'status': 'error', 'message': 'القارئ غير موجود'}, status=404)
+    try:
+        if request.GET.get('juz'):
+            playlist = build_juz_playlist(reciter, int(request.GET['juz']))
         else:
-            # Create a placeholder filename for surahs without MP3 files
-            mp3_filename = f"{surah_num}.mp3"
-
-        template_path = f'/media/reciters/{reciter_name}/{mp3_filename}'
-        surahs.append({
-            'number': surah_number_str,
-            'name': surah_name,
-            'filename': mp3_filename,
-            'path': template_path,
-            'has_audio': surah_num in existing_mp3s
-        })
-    surahs.sort(key=lambda x: x['number'])
-    return render(request, 'quran/reciter_surahs.html', {'reciter_name': reciter_name, 'surahs': surahs})
+            first = parse_verse(request.GET.get('from', ''))
+            playlist = build_playlist(reciter, first, parse_verse(request.GET.get('to') or request.GET.get('from', '')))
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'نطاق الآيات غير صالح'}, status=400)
+    return JsonResponse(playlist)
 
 def quran_part_view(request, part_number):
     """View for displaying a specific Quran part for reading"""
@@ -7,6 +7,9 @@ Usage:
     python run_tests.py                  # Run all tests
     python run_tests.py core.tests.test_models  # Run specific test module
     python run_tests.py core.tests.test_models.ProfileModelTest  # Run specific test class
+
+Performance is measured separately: see ``manage.py seed_load`` and
+``manage.py benchmark_views``.
 """
 
 import os
@@ -9,7 +9,7 @@ from .models import Profile
 def create_user_profile(sender, instance, created, **kwargs):
     """Create a Profile for each new User"""
     if created:
-        Profile.objects.create(user=instance)
+        Profile.objects.get_or_create(user=instance)
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):